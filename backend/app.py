@@ -4,16 +4,30 @@ from flask_cors import CORS
 import os
 import logging
 from routes import register_routes
-from utils.database import init_db, teardown_db
+from utils.database import init_db, teardown_db, register_db_commands
+from utils.reference_data import (
+    preload_reference_data,
+    use_shared_store,
+    register_reference_data_commands
+)
 from utils.error_handlers import register_error_handlers
-from config import get_config, init_logging
+from utils.json_provider import init_json_provider
+from utils.compression import init_compression
+from utils.result_cache import init_result_cache
+from utils.warmup import init_warmup, readiness_report
+from utils.jobs import init_jobs
+from utils.admission import init_admission
+from utils.log import init_logging
+from utils.zones import init_zones
+from config import get_config
 
-def create_app(config_name=os.environ.get('FLASK_ENV', 'default')):
+def create_app(config_name=os.environ.get('FLASK_ENV', 'default'), overrides=None):
     """
     Application factory function that creates and configures the Flask app.
     
     Args:
         config_name (str): Name of the configuration to use (default, development, testing, production)
+        overrides (dict): Optional config values applied on top of the selected configuration
     
     Returns:
         Flask: Configured Flask application
@@ -25,24 +39,48 @@ def create_app(config_name=os.environ.get('FLASK_ENV', 'default')):
         # Load configuration
         config = get_config(config_name)
         app.config.from_object(config)
+        if overrides:
+            app.config.update(overrides)
         
         # Initialize logging
         init_logging(app)
         logger = logging.getLogger(__name__)
-        logger.info(f"Starting application with {config_name} configuration")
+        logger.info("Starting application with %s configuration", config_name)
+        
+        # Install the JSON provider (native NumPy serialization)
+        init_json_provider(app)
         
         # Configure CORS
         CORS(app, resources={r"/*": {"origins": "*"}})
         
         # Initialize database connections
         init_db(app)
+        register_db_commands(app)
         logger.info("Database initialized successfully")
         
+        # Load reference datasets before serving (and before forking workers)
+        if app.config.get('PRELOAD_REFERENCE_DATA'):
+            preload_reference_data()
+        use_shared_store(app.config.get('SHARED_STORE_NAME'))
+        register_reference_data_commands(app)
+        
+        # Result cache (memory, then the on-disk tier shared by all workers)
+        init_result_cache(app)
+        
+        # Background jobs (the process pool starts with the first job)
+        init_jobs(app)
+        
+        # Storage zones, indexed once and reloaded when the file changes
+        init_zones(app)
+        
+        # Per-endpoint concurrency limits for expensive calculations
+        init_admission(app)
+        
         # Register teardown function
         @app.teardown_appcontext
         def shutdown_session(exception=None):
             if exception:
-                logger.error(f"Error during request: {str(exception)}")
+                logger.error("Error during request: %s", exception)
             teardown_db()
         
         # Register blueprints for all routes
@@ -53,6 +91,9 @@ def create_app(config_name=os.environ.get('FLASK_ENV', 'default')):
         register_error_handlers(app)
         logger.info("Error handlers registered successfully")
         
+        # Compress large responses
+        init_compression(app)
+        
         # Health check endpoint
         @app.route('/health')
         def health_check():
@@ -62,6 +103,21 @@ def create_app(config_name=os.environ.get('FLASK_ENV', 'default')):
                 "environment": config_name
             })
         
+        # Readiness probe: 503 until the warm-up has finished
+        @app.route('/ready')
+        def readiness_check():
+            report, ready = readiness_report(app)
+            return jsonify(report), 200 if ready else 503
+        
+        # Admission control and cache statistics
+        @app.route('/metrics')
+        def metrics():
+            cache = app.extensions.get('result_cache')
+            return jsonify({
+                "admission": app.extensions['admission'].stats(),
+                "result_cache": cache.stats() if cache is not None else None,
+            })
+        
         # Add basic info to app context
         @app.context_processor
         def inject_globals():
@@ -70,11 +126,14 @@ def create_app(config_name=os.environ.get('FLASK_ENV', 'default')):
                 'version': app.config.get('API_VERSION', 'v1')
             }
         
+        # Warm caches before serving (last: it sends requests through the app)
+        init_warmup(app)
+        
         return app
         
     except Exception as e:
         logger = logging.getLogger(__name__)
-        logger.critical(f"Failed to create application: {str(e)}")
+        logger.critical("Failed to create application: %s", e)
         raise
 
 def run_app():
@@ -109,5 +168,7 @@ if __name__ == '__main__':
 
 # # Set environment
 # export FLASK_ENV=production
+# # Create the database tables (once per deployment)
+# flask --app wsgi init-db
 # # Run with gunicorn
 # gunicorn wsgi:app
\ No newline at end of file
@@ -0,0 +1,102 @@
+# backend/benchmarks/bench_admission.py
+"""
+Tail latency of cheap endpoints while heavy calculations saturate a worker.
+
+A fixed pool of server threads (like a gunicorn gthread worker) serves a
+steady stream of heavy /api/hydrogen-demand/total requests, with distinct
+inputs so nothing is coalesced or cached, alongside /health and
+/api/storage/calculate probes. Probe latency includes the time spent
+waiting for a free server thread, and is reported with admission control
+off and on.
+
+Usage (from backend/):
+    python -m benchmarks.bench_admission --threads 4 --heavy-clients 8 --scale 20
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import make_benchmark_app, read_aircraft_rows, summarize
+
+STORAGE_INPUTS = {
+    "total_h2_volume_gal": 5000000, "number_of_tanks": 20, "tank_diameter_ft": 10,
+    "tank_length_ft": 40, "cost_per_sqft_construction": 580, "cost_per_cuft_insulation": 15
+}
+
+
+def run(admission, threads, heavy_clients, scale, duration):
+    app, tmpdir = make_benchmark_app(overrides={
+        'ADMISSION_ENABLED': admission,
+        'ADMISSION_LIMITS': {'hydrogen_demand': {'concurrency': 2, 'queue': 1, 'timeout': 2.0}},
+        'RESULT_CACHE_ENABLED': False,
+        'SINGLE_FLIGHT_ENABLED': False,
+    }, aircraft_rows=read_aircraft_rows() * scale)
+    with tmpdir:
+        server = ThreadPoolExecutor(max_workers=threads)
+        client = app.test_client()
+        stop = threading.Event()
+        heavy_statuses = []
+        sliders = itertools.count()
+
+        def serve(method, path, payload=None):
+            """Queue a request on the server pool; return (status, latency)."""
+            start = time.perf_counter()
+            future = server.submit(lambda: client.open(path, method=method, json=payload).status_code)
+            return future.result(), time.perf_counter() - start
+
+        def heavy_client():
+            while not stop.is_set():
+                payload = {"slider_perc": (next(sliders) % 1000) / 1000, "gse": ["F250"], "end_year": 2040}
+                status, _ = serve('POST', '/api/hydrogen-demand/total', payload)
+                heavy_statuses.append(status)
+                if status != 200:
+                    time.sleep(0.05)  # a well-behaved client backs off
+
+        loaders = [threading.Thread(target=heavy_client) for _ in range(heavy_clients)]
+        for t in loaders:
+            t.start()
+        time.sleep(0.5)  # let the load build up
+
+        probes = {"health": [], "storage": []}
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            probes["health"].append(serve('GET', '/health')[1])
+            probes["storage"].append(serve('POST', '/api/storage/calculate', STORAGE_INPUTS)[1])
+            time.sleep(0.02)
+
+        stop.set()
+        for t in loaders:
+            t.join()
+        server.shutdown()
+
+        report = {name: summarize(samples) for name, samples in probes.items()}
+        report["heavy"] = {
+            "completed": heavy_statuses.count(200),
+            "rejected": len(heavy_statuses) - heavy_statuses.count(200),
+        }
+        report["admission"] = app.extensions['admission'].stats()
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=4, help="server threads")
+    parser.add_argument('--heavy-clients', type=int, default=8)
+    parser.add_argument('--scale', type=int, default=20, help="aircraft dataset multiplier")
+    parser.add_argument('--duration', type=float, default=5.0, help="seconds of probing")
+    args = parser.parse_args()
+
+    results = {
+        ("admission" if admission else "no_admission"): run(
+            admission, args.threads, args.heavy_clients, args.scale, args.duration
+        )
+        for admission in (False, True)
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
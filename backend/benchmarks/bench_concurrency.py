@@ -0,0 +1,109 @@
+# backend/benchmarks/bench_concurrency.py
+"""
+Latency benchmark for concurrent sub-computations in /api/hydrogen-demand/total.
+
+Total demand is aircraft demand plus GSE demand, read from two databases.
+The endpoint is timed with the parts run sequentially and concurrently, next
+to the aircraft-only and GSE-only endpoints: concurrent latency should
+approach the slower part rather than the sum of both. Caching and
+coalescing are disabled so every request computes.
+
+The bundled SQLite files are local and reading them is mostly Python work
+under the GIL, so there is little to overlap; --db-latency-ms adds a sleep
+to every query to model a database reached over the network, which is where
+the concurrent path pays off.
+
+Usage (from backend/):
+    python -m benchmarks.bench_concurrency --scale 1 10 --db-latency-ms 0 5 20
+"""
+import argparse
+import json
+import time
+
+from sqlalchemy import event
+
+import utils.database as database
+
+from benchmarks.common import make_benchmark_app, read_aircraft_rows, read_gse_rows, summarize, timed
+from utils.reference_data import preload_reference_data, set_reference_data
+
+PAYLOAD = {"slider_perc": 0.5, "gse": ["F250", "FMC Commander 15", "TLD 1410"], "end_year": 2035}
+ENDPOINTS = {
+    "aircraft": ('/api/hydrogen-demand/aircraft', {"slider_perc": 0.5, "end_year": 2035}),
+    "gse": ('/api/hydrogen-demand/gse', {"gse": PAYLOAD["gse"], "end_year": 2035}),
+    "total": ('/api/hydrogen-demand/total', PAYLOAD),
+}
+
+
+def measure(client, url, payload, requests):
+    for _ in range(3):
+        client.post(url, json=payload)
+    samples = []
+    for _ in range(requests):
+        response, elapsed = timed(client.post, url, json=payload)
+        assert response.status_code == 200, response.status_code
+        samples.append(elapsed)
+    return summarize(samples)
+
+
+def add_query_latency(seconds):
+    """Sleep before every query on both engines (releases the GIL, like network I/O)."""
+    def before_cursor_execute(*args):
+        time.sleep(seconds)
+
+    for engine in (database.aircraft_engine, database.gse_engine):
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def run(scale, gse_scale, requests, preload, db_latency):
+    rows = read_aircraft_rows() * scale
+    gse_rows = read_gse_rows() * gse_scale
+    report = {}
+    for concurrent in (False, True):
+        app, tmpdir = make_benchmark_app(overrides={
+            'CONCURRENCY_ENABLED': concurrent,
+            'RESULT_CACHE_ENABLED': False,
+            'SINGLE_FLIGHT_ENABLED': False,
+        }, aircraft_rows=rows, gse_rows=gse_rows)
+        with tmpdir:
+            set_reference_data(None)
+            if db_latency:
+                add_query_latency(db_latency)
+            if preload:
+                with app.app_context():
+                    preload_reference_data()
+            client = app.test_client()
+            label = "concurrent" if concurrent else "sequential"
+            if not concurrent:
+                for name in ("aircraft", "gse"):
+                    report[name] = measure(client, *ENDPOINTS[name], requests)
+            report[f"total_{label}"] = measure(client, *ENDPOINTS["total"], requests)
+            set_reference_data(None)
+    parts_sum = report["aircraft"]["p50_ms"] + report["gse"]["p50_ms"]
+    parts_max = max(report["aircraft"]["p50_ms"], report["gse"]["p50_ms"])
+    report["p50_parts_sum_ms"] = parts_sum
+    report["p50_parts_max_ms"] = parts_max
+    report["p50_speedup"] = report["total_sequential"]["p50_ms"] / report["total_concurrent"]["p50_ms"]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 10, 50], help="aircraft dataset multiplier")
+    parser.add_argument('--gse-scale', type=int, default=200, help="GSE catalog multiplier")
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--db-latency-ms', type=float, nargs='+', default=[0, 5, 20],
+                        help="simulated per-query database latency")
+    parser.add_argument('--preload', action='store_true', help="serve from preloaded reference data")
+    args = parser.parse_args()
+
+    results = {
+        f"x{scale}_latency{latency:g}ms": run(scale, args.gse_scale, args.requests, args.preload, latency / 1000)
+        for scale in args.scale
+        for latency in args.db_latency_ms
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# backend/benchmarks/bench_json.py
+"""
+Serialization benchmark for the JSON providers on large payloads.
+
+Compares Flask's default provider (which needs NumPy values converted to
+Python lists first) with the NumPy-aware provider on columnar arrays and on
+row-wise breakdowns.
+
+Usage (from backend/):
+    python -m benchmarks.bench_json --size 1000000
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from benchmarks.common import summarize
+from utils.json_provider import NumpyJSONProvider
+
+
+def make_payloads(size):
+    rng = np.random.default_rng(0)
+    columns = {
+        "year": np.repeat(np.arange(2023, 2051), size // 28 + 1)[:size],
+        "demand": rng.random(size) * 1e4,
+        "cost": rng.random(size) * 1e7,
+    }
+    rows = [
+        {"type": f"GSE {i}", "fuel_used": "Diesel", "hydrogen_volume": np.float64(v)}
+        for i, v in enumerate(columns["demand"][: size // 10])
+    ]
+    return {"columnar": columns, "rows": {"gse_details": rows}}
+
+
+def as_python(obj):
+    """What callers of the default provider must do before serializing."""
+    if isinstance(obj, dict):
+        return {k: as_python(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [as_python(v) for v in obj]
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    return obj
+
+
+def bench(provider, payload, convert, repeat):
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = provider.response(as_python(payload) if convert else payload).get_data()
+        samples.append(time.perf_counter() - start)
+        size = len(body)
+    return {"bytes": size, **summarize(samples)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=1_000_000, help="elements per column")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    providers = {
+        "default": (DefaultJSONProvider(app), True),
+        "numpy": (NumpyJSONProvider(app), False),
+    }
+    results = {}
+    with app.app_context():
+        for payload_name, payload in make_payloads(args.size).items():
+            results[payload_name] = {
+                name: bench(provider, payload, convert, args.repeat)
+                for name, (provider, convert) in providers.items()
+            }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
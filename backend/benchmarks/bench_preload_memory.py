@@ -0,0 +1,111 @@
+# backend/benchmarks/bench_preload_memory.py
+"""
+Memory benchmark for preloaded, copy-on-write-shared reference data.
+
+Mimics a pre-fork server: a master process creates the app and forks N
+workers that each serve demand requests. With preload the master loads the
+reference datasets before forking; without it every worker loads its own
+copy after the fork. Total proportional set size (PSS, which splits shared
+pages between the processes using them) across master and workers is
+reported for each N. Linux only (reads /proc/<pid>/smaps_rollup).
+
+Usage (from backend/):
+    python -m benchmarks.bench_preload_memory --workers 1 2 4 8 --scale 1000
+"""
+import argparse
+import gc
+import json
+import os
+import signal
+
+from benchmarks.common import make_benchmark_app, read_aircraft_rows
+from utils.database import dispose_engines
+from utils.reference_data import preload_reference_data, set_reference_data
+
+PAYLOAD = {"slider_perc": 0.5, "gse": ["F250", "FMC Commander 15"], "end_year": 2035}
+
+
+def memory_kb(pid):
+    """Return (rss_kb, pss_kb) of a process."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                values[parts[0][:-1]] = int(parts[1])
+    return values["Rss"], values["Pss"]
+
+
+def worker(app, preload, ready_fd, requests):
+    dispose_engines()
+    if not preload:
+        with app.app_context():
+            preload_reference_data()
+    client = app.test_client()
+    for _ in range(requests):
+        assert client.post('/api/hydrogen-demand/total', json=PAYLOAD).status_code == 200
+    os.write(ready_fd, b'.')
+    signal.pause()
+
+
+def measure(app, preload, n_workers, requests):
+    read_fd, write_fd = os.pipe()
+    pids = []
+    for _ in range(n_workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            try:
+                worker(app, preload, write_fd, requests)
+            finally:
+                os._exit(0)
+        pids.append(pid)
+    os.close(write_fd)
+    for _ in range(n_workers):
+        os.read(read_fd, 1)
+    os.close(read_fd)
+
+    processes = [os.getpid()] + pids
+    usage = [memory_kb(pid) for pid in processes]
+    for pid in pids:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+    return {
+        "workers": n_workers,
+        "total_rss_mb": sum(rss for rss, _ in usage) / 1024,
+        "total_pss_mb": sum(pss for _, pss in usage) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--scale', type=int, default=1000, help="July domestic dataset multiplier")
+    parser.add_argument('--requests', type=int, default=20, help="requests served by each worker")
+    args = parser.parse_args()
+
+    rows = [r for r in read_aircraft_rows() if r['month'] == 7 and r['data_source'] == 'DU'] * args.scale
+    app, tmpdir = make_benchmark_app(aircraft_rows=rows)
+    del rows
+    results = {}
+    with tmpdir:
+        for preload in (False, True):
+            set_reference_data(None)
+            if preload:
+                with app.app_context():
+                    reference = preload_reference_data()
+                gc.freeze()
+            series = [measure(app, preload, n, args.requests) for n in args.workers]
+            if preload:
+                gc.unfreeze()
+            for low, high in zip(series, series[1:]):
+                high["pss_mb_per_added_worker"] = (
+                    (high["total_pss_mb"] - low["total_pss_mb"]) / (high["workers"] - low["workers"])
+                )
+            results["preload" if preload else "per_worker"] = series
+        results["reference_data_mb"] = reference.nbytes() / 2**20
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# backend/benchmarks/bench_singleflight.py
+"""
+Concurrency benchmark for single-flight coalescing on /api/hydrogen-demand/total.
+
+A burst of identical requests is released at the same instant, once with
+coalescing disabled and once enabled, and the wall time, per-request latency
+and number of executions are reported.
+
+Usage (from backend/):
+    python -m benchmarks.bench_singleflight --concurrency 32 --scale 20
+"""
+import argparse
+import json
+import threading
+import time
+
+from benchmarks.common import make_benchmark_app, read_aircraft_rows, summarize
+from routes.hydrogen_demand import demand_flight
+
+PAYLOAD = {
+    "slider_perc": 0.5,
+    "gse": ["F250", "FMC Commander 15"],
+    "end_year": 2035
+}
+
+
+def burst(app, concurrency):
+    """Release `concurrency` identical requests at once; return latencies and wall time."""
+    barrier = threading.Barrier(concurrency + 1)
+    latencies = [None] * concurrency
+    statuses = [None] * concurrency
+
+    def worker(i):
+        client = app.test_client()
+        barrier.wait()
+        start = time.perf_counter()
+        response = client.post('/api/hydrogen-demand/total', json=PAYLOAD)
+        latencies[i] = time.perf_counter() - start
+        statuses[i] = response.status_code
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    return latencies, statuses, wall
+
+
+def run(concurrency, scale, rounds):
+    rows = read_aircraft_rows() * scale
+    results = {}
+    for enabled in (False, True):
+        app, tmpdir = make_benchmark_app(overrides={'SINGLE_FLIGHT_ENABLED': enabled}, aircraft_rows=rows)
+        with tmpdir:
+            before = demand_flight.stats()["executions"]
+            latencies, walls, errors = [], [], 0
+            for _ in range(rounds):
+                lat, statuses, wall = burst(app, concurrency)
+                latencies.extend(lat)
+                walls.append(wall)
+                errors += sum(1 for s in statuses if s != 200)
+            executions = demand_flight.stats()["executions"] - before
+        results["coalesced" if enabled else "uncoalesced"] = {
+            "wall_ms_mean": 1000 * sum(walls) / len(walls),
+            "latency": summarize(latencies),
+            "executions": executions if enabled else concurrency * rounds,
+            "errors": errors,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--scale', type=int, default=20, help="aircraft dataset multiplier")
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.concurrency, args.scale, args.rounds), indent=2))
+
+
+if __name__ == '__main__':
+    main()
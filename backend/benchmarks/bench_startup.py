@@ -0,0 +1,126 @@
+# backend/benchmarks/bench_startup.py
+"""
+Worker cold-start benchmark with a regression budget.
+
+Each run starts a fresh interpreter, imports the app, creates it with the
+production configuration and issues the first request to each endpoint. The
+median of several runs is compared with benchmarks/startup_budget.json and
+the script exits non-zero when a budget is exceeded.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import populate_databases
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_budget.json')
+
+FIRST_REQUESTS = {
+    "health": ('get', '/health', None),
+    "storage": ('post', '/api/storage/calculate', {
+        "total_h2_volume_gal": 5000000, "number_of_tanks": 20, "tank_diameter_ft": 10,
+        "tank_length_ft": 40, "cost_per_sqft_construction": 580, "cost_per_cuft_insulation": 15
+    }),
+    "economic": ('post', '/api/economic/impact', {
+        "fleet_percentage": 0.3, "total_flights": 100000, "atlanta_fraction": 0.4,
+        "hydrogen_demand": 5000000, "turnaround_time": 30, "tax_credits": 0.1
+    }),
+    "total_demand": ('post', '/api/hydrogen-demand/total', {
+        "slider_perc": 0.5, "gse": ["F250"], "end_year": 2030
+    }),
+}
+
+# Executed in a fresh interpreter; prints one JSON line of timings
+PROBE = r'''
+import json, sys, time
+start = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+app = app_module.create_app('production', json.loads(sys.argv[1]))
+created = time.perf_counter()
+# Deferred optional modules are only in sys.modules once first used
+modules_at_start = {m: m in sys.modules for m in ('pandas', 'pyarrow')}
+client = app.test_client()
+first = {}
+for name, (method, url, payload) in json.loads(sys.argv[2]).items():
+    t = time.perf_counter()
+    response = getattr(client, method)(url, json=payload)
+    assert response.status_code == 200, (name, response.status_code)
+    first[name] = (time.perf_counter() - t) * 1000
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "first_request_ms": first,
+    "loaded_at_start": modules_at_start,
+}))
+'''
+
+
+def probe(overrides):
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE, json.dumps(overrides), json.dumps(FIRST_REQUESTS)],
+        cwd=BACKEND_DIR, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def median_report(runs):
+    report = {
+        "import_ms": statistics.median(r["import_ms"] for r in runs),
+        "create_app_ms": statistics.median(r["create_app_ms"] for r in runs),
+        "first_request_ms": {
+            name: statistics.median(r["first_request_ms"][name] for r in runs)
+            for name in FIRST_REQUESTS
+        },
+        "loaded_at_start": runs[-1]["loaded_at_start"],
+    }
+    return report
+
+
+def check_budget(report, budget):
+    """Return a list of budget violations."""
+    violations = []
+    for key in ("import_ms", "create_app_ms"):
+        if report[key] > budget[key]:
+            violations.append(f"{key}: {report[key]:.1f} > {budget[key]}")
+    for name, limit in budget["first_request_ms"].items():
+        value = report["first_request_ms"].get(name)
+        if value is not None and value > limit:
+            violations.append(f"first_request_ms.{name}: {value:.1f} > {limit}")
+    for module in budget.get("not_loaded_at_start", []):
+        if report["loaded_at_start"].get(module):
+            violations.append(f"{module} imported during startup")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', default=BUDGET_PATH)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='h2-startup-') as tmpdir:
+        overrides = {
+            'AIRCRAFT_DATABASE_URI': f"sqlite:///{os.path.join(tmpdir, 'aircraft_data.db')}",
+            'GSE_DATABASE_URI': f"sqlite:///{os.path.join(tmpdir, 'gse_data.db')}",
+        }
+        populate_databases(overrides['AIRCRAFT_DATABASE_URI'], overrides['GSE_DATABASE_URI'])
+        report = median_report([probe(overrides) for _ in range(args.runs)])
+
+    with open(args.budget) as f:
+        budget = json.load(f)
+    report["violations"] = check_budget(report, budget)
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if report["violations"] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+# backend/benchmarks/common.py
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run in-process from the backend directory, e.g.
+    python -m benchmarks.bench_singleflight
+"""
+import csv
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+
+from models.aircraft import Aircraft, Base as AircraftBase
+from models.gse import GroundSupportEquipment, Base as GSEBase
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+# CSV header -> model column
+AIRCRAFT_COLUMNS = {
+    'DEPARTURES_PERFORMED': 'departures_performed',
+    'DISTANCE': 'distance',
+    'AIR_TIME': 'air_time',
+    'UNIQUE_CARRIER': 'unique_carrier',
+    'UNIQUE_CARRIER_NAME': 'unique_carrier_name',
+    'ORIGIN_AIRPORT_ID': 'origin_airport_id',
+    'ORIGIN': 'origin',
+    'ORIGIN_CITY_NAME': 'origin_city_name',
+    'DEST_AIRPORT_ID': 'dest_airport_id',
+    'DEST': 'dest',
+    'DEST_CITY_NAME': 'dest_city_name',
+    'AIRCRAFT_TYPE': 'aircraft_type',
+    'MONTH': 'month',
+    'DATA_SOURCE': 'data_source',
+    'FUEL_CONSUMPTION': 'fuel_consumption',
+}
+
+GSE_COLUMNS = [
+    'ground_support_equipment',
+    'fuel_used',
+    'fuel_consumption_online',
+    'average_speed_mi_hr',
+    'usable_fuel_consumption_ft3_min',
+    'operating_time_departure',
+    'operating_time_arrival',
+    'notes',
+    'link',
+]
+
+INTEGER_COLUMNS = {
+    'departures_performed', 'origin_airport_id', 'dest_airport_id',
+    'aircraft_type', 'month', 'average_speed_mi_hr',
+    'operating_time_departure', 'operating_time_arrival',
+}
+FLOAT_COLUMNS = {
+    'distance', 'air_time', 'fuel_consumption', 'usable_fuel_consumption_ft3_min',
+}
+
+
+def _convert(column, value):
+    if column in INTEGER_COLUMNS:
+        return int(float(value)) if value not in ('', None) else None
+    if column in FLOAT_COLUMNS:
+        return float(value) if value not in ('', None) else None
+    return value.strip() if isinstance(value, str) else value
+
+
+def read_aircraft_rows():
+    """Read the bundled aircraft CSV as a list of model-keyed dicts."""
+    with open(os.path.join(DATA_DIR, 'aircraft_data.csv'), newline='') as f:
+        return [
+            {column: _convert(column, row[header]) for header, column in AIRCRAFT_COLUMNS.items()}
+            for row in csv.DictReader(f)
+        ]
+
+
+def read_gse_rows():
+    """Read the bundled GSE CSV as a list of model-keyed dicts."""
+    with open(os.path.join(DATA_DIR, 'gse_data.csv'), newline='', encoding='utf-8', errors='ignore') as f:
+        reader = csv.reader(f)
+        next(reader)
+        return [
+            {column: _convert(column, value) for column, value in zip(GSE_COLUMNS, row)}
+            for row in reader
+            if row and row[0].strip()
+        ]
+
+
+def populate_databases(aircraft_uri, gse_uri, aircraft_rows=None, gse_rows=None):
+    """Create the schemas and bulk load rows (the bundled CSVs by default)."""
+    aircraft_engine = create_engine(aircraft_uri)
+    gse_engine = create_engine(gse_uri)
+    AircraftBase.metadata.create_all(aircraft_engine)
+    GSEBase.metadata.create_all(gse_engine)
+
+    aircraft_rows = read_aircraft_rows() if aircraft_rows is None else aircraft_rows
+    gse_rows = read_gse_rows() if gse_rows is None else gse_rows
+    with aircraft_engine.begin() as conn:
+        conn.execute(insert(Aircraft), aircraft_rows)
+    with gse_engine.begin() as conn:
+        conn.execute(insert(GroundSupportEquipment), gse_rows)
+
+    aircraft_engine.dispose()
+    gse_engine.dispose()
+
+
+def make_benchmark_app(config_name='production', overrides=None, aircraft_rows=None, gse_rows=None):
+    """
+    Create an app backed by temporary SQLite files loaded with benchmark data.
+
+    Returns:
+        tuple: (app, temporary directory) - keep the directory alive while benchmarking
+    """
+    from app import create_app
+
+    tmpdir = tempfile.TemporaryDirectory(prefix='h2-bench-')
+    aircraft_uri = f"sqlite:///{os.path.join(tmpdir.name, 'aircraft_data.db')}"
+    gse_uri = f"sqlite:///{os.path.join(tmpdir.name, 'gse_data.db')}"
+    populate_databases(aircraft_uri, gse_uri, aircraft_rows, gse_rows)
+
+    config = {
+        'AIRCRAFT_DATABASE_URI': aircraft_uri,
+        'GSE_DATABASE_URI': gse_uri,
+    }
+    config.update(overrides or {})
+    return create_app(config_name, config), tmpdir
+
+
+def percentiles(samples, points=(50, 95, 99)):
+    """Return the requested percentiles (in the samples' unit) keyed as p50, p95, ..."""
+    if not samples:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(samples)
+    result = {}
+    for p in points:
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        result[f"p{p}"] = ordered[index]
+    return result
+
+
+def summarize(samples):
+    """Latency summary in milliseconds for a list of durations in seconds."""
+    ms = [s * 1000 for s in samples]
+    summary = {"count": len(ms), "mean_ms": statistics.fmean(ms) if ms else None}
+    summary.update({f"{k}_ms": v for k, v in percentiles(ms).items()})
+    return summary
+
+
+def timed(fn, *args, **kwargs):
+    """Call fn and return (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
@@ -0,0 +1,390 @@
+# backend/benchmarks/loadtest.py
+"""
+Load test of the deployed WSGI app with a dashboard-like request mix.
+
+The app is started in a subprocess under gunicorn with gunicorn.conf.py
+(or, where gunicorn is not installed, werkzeug's threaded server), on
+synthetic databases (see benchmarks/synthetic.py), or an already running
+server is targeted with --url. Requests go over HTTP with keep-alive.
+
+Scenarios come from the frontend's route table
+(frontend/src/constants/apiEndpoints.js): every route defined there gets a
+payload generator that mimics the dashboard's controls (fleet slider, year
+selector, GSE checkboxes, storage and economic forms) and a weight in the
+mix. A route without a generator stops the run, so the two stay in sync.
+
+Two load models:
+    closed  --concurrency users send requests back to back (optionally
+            with --think-time between them)
+    open    requests start at --rate per second regardless of how fast
+            earlier ones finish; latency is measured from the scheduled
+            start, so a slow server is not hidden by the client slowing down
+
+The report gives p50/p95/p99 latency, error rate, status counts and
+throughput, per route and overall, as JSON.
+
+Usage (from backend/):
+    python -m benchmarks.loadtest --concurrency 16 --duration 30
+    python -m benchmarks.loadtest --rate 200 --duration 30 --workers 4 --threads 4
+    python -m benchmarks.loadtest --url http://localhost:5000 --mix total=1
+"""
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+from benchmarks.common import summarize
+from benchmarks.synthetic import DEFAULT_DATA_DIR, build_databases, gse_names
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_ENDPOINTS_JS = os.path.join(
+    os.path.dirname(BACKEND_DIR), 'frontend', 'src', 'constants', 'apiEndpoints.js'
+)
+
+# Share of requests per route (keys are "GROUP.NAME" from apiEndpoints.js).
+# Moving a slider refreshes the total; the forms are submitted less often.
+DEFAULT_MIX = {
+    "HYDROGEN_DEMAND.TOTAL": 0.6,
+    "HYDROGEN_DEMAND.AIRCRAFT": 0.05,
+    "HYDROGEN_DEMAND.GSE": 0.05,
+    "STORAGE.CALCULATE": 0.15,
+    "ECONOMIC.IMPACT": 0.15,
+}
+
+
+def read_routes(path=API_ENDPOINTS_JS):
+    """
+    Parse the frontend's route table.
+
+    Returns:
+        dict: "GROUP.NAME" -> absolute path (API_BASE_URL's path prefixed)
+    """
+    with open(path) as f:
+        source = f.read()
+    base = urlparse(re.search(r'API_BASE_URL\s*=\s*"([^"]*)"', source).group(1)).path.rstrip('/')
+    endpoints = source[source.index('ENDPOINTS'):]
+    routes = {}
+    for group, body in re.findall(r'(\w+)\s*:\s*\{([^{}]*)\}', endpoints):
+        for name, route in re.findall(r'(\w+)\s*:\s*"([^"]*)"', body):
+            routes[f"{group}.{name}"] = base + route
+    return routes
+
+
+class Dashboard:
+    """Generates request payloads the way a user moving the controls would."""
+
+    def __init__(self, gse_catalog, rng):
+        self.rng = rng
+        self.gse_catalog = gse_catalog
+        self.slider = 0.5
+        self.year = 2035
+        self.gse = gse_catalog[:2]
+
+    def _move(self):
+        # Sliders move in small steps (fleet fraction must stay above zero for
+        # the economic form); the year and GSE selection change rarely
+        self.slider = min(1.0, max(0.05, round(self.slider + self.rng.choice((-0.05, 0.05)), 2)))
+        if self.rng.random() < 0.1:
+            self.year = self.rng.randint(2023, 2050)
+        if self.rng.random() < 0.1:
+            self.gse = self.rng.sample(self.gse_catalog, self.rng.randint(0, min(5, len(self.gse_catalog))))
+
+    def payload(self, route):
+        self._move()
+        rng = self.rng
+        if route == "HYDROGEN_DEMAND.TOTAL":
+            return {"slider_perc": self.slider, "gse": self.gse, "end_year": self.year}
+        if route == "HYDROGEN_DEMAND.AIRCRAFT":
+            return {"slider_perc": self.slider, "end_year": self.year}
+        if route == "HYDROGEN_DEMAND.GSE":
+            return {"gse": self.gse, "end_year": self.year}
+        if route == "STORAGE.CALCULATE":
+            return {
+                "total_h2_volume_gal": rng.randrange(1_000_000, 10_000_000, 100_000),
+                "number_of_tanks": rng.randint(5, 40),
+                "tank_diameter_ft": rng.choice((8, 10, 12)),
+                "tank_length_ft": rng.choice((30, 40, 50)),
+                "cost_per_sqft_construction": 580,
+                "cost_per_cuft_insulation": 15,
+            }
+        if route == "ECONOMIC.IMPACT":
+            return {
+                "fleet_percentage": self.slider,
+                "total_flights": 100000,
+                "atlanta_fraction": 0.4,
+                "hydrogen_demand": rng.randrange(1_000_000, 10_000_000, 100_000),
+                "turnaround_time": rng.choice((15, 30, 45)),
+                "tax_credits": rng.choice((0.0, 0.1, 0.2)),
+            }
+        raise KeyError(route)
+
+
+def parse_mix(values, routes):
+    """Turn ["total=3", "STORAGE.CALCULATE=1"] into weights keyed by route."""
+    if not values:
+        mix = dict(DEFAULT_MIX)
+    else:
+        mix = {}
+        for value in values:
+            name, _, weight = value.partition('=')
+            matches = [route for route in routes if route == name or route.split('.')[-1].lower() == name.lower()]
+            if len(matches) != 1:
+                raise SystemExit(f"Unknown or ambiguous route {name!r}; routes: {', '.join(routes)}")
+            mix[matches[0]] = float(weight or 1)
+    missing = [route for route in mix if route not in routes]
+    if missing:
+        raise SystemExit(f"Routes not in apiEndpoints.js: {', '.join(missing)}")
+    return {route: weight for route, weight in mix.items() if weight > 0}
+
+
+class Recorder:
+    """Thread-safe collection of (route, latency, status) samples."""
+
+    def __init__(self):
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def add(self, route, latency, status):
+        with self._lock:
+            self.samples.append((route, latency, status))
+
+    def report(self, wall):
+        by_route = {}
+        for route, latency, status in self.samples:
+            by_route.setdefault(route, []).append((latency, status))
+        by_route["ALL"] = [(latency, status) for _, latency, status in self.samples]
+
+        report = {}
+        for route, samples in by_route.items():
+            statuses = {}
+            for _, status in samples:
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+            errors = sum(1 for _, status in samples if not (isinstance(status, int) and status < 400))
+            entry = summarize([latency for latency, _ in samples])
+            entry.update({
+                "throughput_per_s": len(samples) / wall if wall > 0 else None,
+                "errors": errors,
+                "error_rate": errors / len(samples) if samples else 0.0,
+                "statuses": statuses,
+            })
+            report[route] = entry
+        return report
+
+
+def send(session, base_url, routes, route, payload, timeout):
+    """POST one request; return the status code or the exception's name."""
+    try:
+        response = session.post(base_url + routes[route], json=payload, timeout=timeout)
+        response.content  # read the whole body
+        return response.status_code
+    except requests.RequestException as e:
+        return type(e).__name__
+
+
+def run_closed(base_url, routes, mix, args, gse_catalog):
+    recorder = Recorder()
+    deadline = time.monotonic() + args.duration
+    names, weights = list(mix), list(mix.values())
+
+    def user(index):
+        rng = random.Random(args.seed + index)
+        dashboard = Dashboard(gse_catalog, rng)
+        with requests.Session() as session:
+            while time.monotonic() < deadline:
+                route = rng.choices(names, weights)[0]
+                payload = dashboard.payload(route)
+                start = time.perf_counter()
+                status = send(session, base_url, routes, route, payload, args.timeout)
+                recorder.add(route, time.perf_counter() - start, status)
+                if args.think_time:
+                    time.sleep(rng.expovariate(1 / args.think_time))
+
+    start = time.monotonic()
+    users = [threading.Thread(target=user, args=(i,)) for i in range(args.concurrency)]
+    for t in users:
+        t.start()
+    for t in users:
+        t.join()
+    return recorder.report(time.monotonic() - start)
+
+
+def run_open(base_url, routes, mix, args, gse_catalog):
+    recorder = Recorder()
+    rng = random.Random(args.seed)
+    dashboard = Dashboard(gse_catalog, rng)
+    names, weights = list(mix), list(mix.values())
+    local = threading.local()
+
+    def fire(route, payload, scheduled):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        status = send(session, base_url, routes, route, payload, args.timeout)
+        recorder.add(route, time.perf_counter() - scheduled, status)
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.max_in_flight) as pool:
+        next_at = time.perf_counter()
+        end = next_at + args.duration
+        while next_at < end:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            route = rng.choices(names, weights)[0]
+            pool.submit(fire, route, dashboard.payload(route), next_at)
+            next_at += rng.expovariate(args.rate)  # Poisson arrivals
+    return recorder.report(time.monotonic() - start)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(args):
+    """Start the app in a subprocess; return (process, its environment, base URL, server name)."""
+    aircraft_uri, gse_uri = build_databases(args.scale, args.gse_count, args.seed, args.data_dir)
+    port = free_port()
+    env = dict(
+        os.environ,
+        FLASK_ENV='production',
+        PROD_AIRCRAFT_DATABASE_URI=aircraft_uri,
+        PROD_GSE_DATABASE_URI=gse_uri,
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+        GUNICORN_WORKERS=str(args.workers),
+        GUNICORN_THREADS=str(args.threads),
+        RESULT_CACHE_PATH=os.path.abspath(os.path.join(args.data_dir, f"loadtest-cache-{port}.sqlite")),
+        JOB_STORE_PATH=os.path.abspath(os.path.join(args.data_dir, f"loadtest-jobs-{port}.sqlite")),
+    )
+    env.setdefault('PRELOAD_REFERENCE_DATA', '1')
+    server = args.server
+    if server == 'auto':
+        server = 'gunicorn' if shutil.which('gunicorn') else 'werkzeug'
+    if server == 'gunicorn':
+        command = ['gunicorn', '-c', 'gunicorn.conf.py']
+    else:
+        command = [sys.executable, '-c',
+                   'from werkzeug.serving import run_simple; from wsgi import app; '
+                   f'run_simple("127.0.0.1", {port}, app, threaded=True)']
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL if args.quiet else None)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(base_url, args.startup_timeout, process)
+    except BaseException:
+        stop_server(process, env)
+        raise
+    print(f"Started {server} on {base_url}", file=sys.stderr)
+    return process, env, base_url, server
+
+
+def wait_ready(base_url, timeout, process=None):
+    """Poll /ready until it returns 200."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise SystemExit(f"Server exited with status {process.returncode}")
+        try:
+            if requests.get(base_url + '/ready', timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Server at {base_url} not ready after {timeout}s")
+
+
+def stop_server(process, env):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+    # Per-run cache and job store files
+    for name in ('RESULT_CACHE_PATH', 'JOB_STORE_PATH'):
+        for suffix in ('', '-wal', '-shm'):
+            path = env[name] + suffix
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', help="target a running server instead of starting one")
+    parser.add_argument('--server', choices=('auto', 'gunicorn', 'werkzeug'), default='auto')
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn workers (werkzeug: one process)")
+    parser.add_argument('--threads', type=int, default=4,
+                        help="gunicorn threads per worker (werkzeug: a thread per connection)")
+    parser.add_argument('--scale', type=int, default=1, help="aircraft dataset multiple")
+    parser.add_argument('--gse-count', type=int, default=100, help="GSE catalog size")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--concurrency', type=int, default=8, help="closed loop: concurrent users")
+    parser.add_argument('--think-time', type=float, default=0.0, help="closed loop: mean pause (s)")
+    parser.add_argument('--rate', type=float, help="open loop: requests per second")
+    parser.add_argument('--max-in-flight', type=int, default=256, help="open loop: client threads")
+    parser.add_argument('--duration', type=float, default=20.0, help="seconds")
+    parser.add_argument('--timeout', type=float, default=30.0, help="per-request timeout (s)")
+    parser.add_argument('--startup-timeout', type=float, default=120.0)
+    parser.add_argument('--mix', nargs='*', help="route=weight, e.g. total=6 calculate=2 impact=2")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quiet', action='store_true', help="hide the server's log output")
+    parser.add_argument('--output', help="write the report here (default: stdout)")
+    args = parser.parse_args()
+
+    routes = read_routes()
+    mix = parse_mix(args.mix, routes)
+    # Generators for every route of the frontend, so new routes are not forgotten
+    unsupported = [route for route in routes if route not in DEFAULT_MIX]
+    if unsupported:
+        raise SystemExit(f"No payload generator for {', '.join(unsupported)}")
+    gse_catalog = gse_names(args.gse_count, args.seed)
+
+    process, server = None, 'external'
+    base_url = args.url.rstrip('/') if args.url else None
+    if base_url is None:
+        process, env, base_url, server = start_server(args)
+    else:
+        wait_ready(base_url, args.startup_timeout)
+    try:
+        model = 'open' if args.rate else 'closed'
+        runner = run_open if args.rate else run_closed
+        results = runner(base_url, routes, mix, args, gse_catalog)
+    finally:
+        if process is not None:
+            stop_server(process, env)
+
+    report = {
+        "config": {
+            "server": server,
+            "model": model,
+            "concurrency": args.concurrency if model == 'closed' else None,
+            "rate": args.rate,
+            "duration_s": args.duration,
+            "workers": args.workers if process is not None else None,
+            "threads": args.threads if process is not None else None,
+            "scale": args.scale,
+            "mix": mix,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+# backend/benchmarks/suite.py
+"""
+Endpoint and service benchmark suite on synthetic scaled datasets.
+
+Every case runs in-process, against the endpoints through the Flask test
+client and against the service functions directly. Each case runs at every
+dataset scale (multiples of the bundled aircraft data, see
+benchmarks/synthetic.py) and in both data modes:
+
+    db       datasets are queried from SQLite on every request
+    preload  datasets are loaded into reference arrays at startup
+
+The result and single-flight caches and admission control are off, so every
+call computes. For each case the suite reports latency percentiles,
+throughput (calls per second, one at a time) and the peak Python memory of
+one call (tracemalloc, which also sees NumPy buffers).
+
+Results are written as JSON. With --baseline the run is compared with an
+earlier results file and the script exits non-zero when a case regresses by
+more than --max-regression (relative) and more than --min-delta-ms.
+
+Usage (from backend/):
+    python -m benchmarks.suite --scales 1 10 100 --output results.json
+    python -m benchmarks.suite --baseline baseline.json --output results.json
+    python -m benchmarks.suite --compare results.json --baseline baseline.json
+"""
+import argparse
+import fnmatch
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import summarize
+from benchmarks.synthetic import DEFAULT_DATA_DIR, build_databases, gse_names
+from utils.warmup import DEFAULT_ECONOMIC_INPUTS, DEFAULT_STORAGE_INPUTS
+
+MODES = ('db', 'preload')
+# Metrics checked against the baseline, with the absolute change below which
+# a difference is treated as noise (ms for latencies, KiB for memory)
+REGRESSION_METRICS = {"p50_ms": None, "p95_ms": None, "peak_memory_kib": 64}
+
+
+def endpoint_cases(gse_selection):
+    """(method, path, payload) keyed by case name."""
+    return {
+        "health": ('GET', '/health', None),
+        "storage.calculate": ('POST', '/api/storage/calculate', DEFAULT_STORAGE_INPUTS),
+        "storage.sweep": ('POST', '/api/storage/calculate', dict(
+            DEFAULT_STORAGE_INPUTS,
+            number_of_tanks={"start": 1, "stop": 40, "step": 1},
+            tank_diameter_ft={"start": 6, "stop": 16, "num": 16},
+            tank_length_ft={"start": 20, "stop": 80, "num": 16},
+        )),  # 10240 combinations
+        "storage.optimize": ('POST', '/api/storage/optimize', {
+            "h2_demand_cuft": 50_000, "storage_days": 3,
+            "diameters_ft": {"start": 6, "stop": 16, "num": 41},
+            "lengths_ft": {"start": 20, "stop": 80, "num": 61},
+            "max_tanks": 1000,
+        }),
+        "economic.impact": ('POST', '/api/economic/impact', DEFAULT_ECONOMIC_INPUTS),
+        "economic.cashflow": ('POST', '/api/economic/cashflow', {
+            "demand": {"slider_perc": 0.5, "gse": gse_selection},
+            "scenarios": [{"tax_credits": 0.01 * i, "discount_rate": 0.03 + 0.0002 * i} for i in range(200)],
+        }),
+        "solver.solve": ('POST', '/api/solver/solve', {
+            "model": "economic", "output": "revenue_drop", "solve_for": "fleet_percentage",
+            "targets": [10_000 * i for i in range(1, 1001)],
+            "inputs": {name: value for name, value in DEFAULT_ECONOMIC_INPUTS.items() if name != "fleet_percentage"},
+        }),
+        "demand.aircraft": ('POST', '/api/hydrogen-demand/aircraft', {"slider_perc": 0.5, "end_year": 2035}),
+        "demand.gse": ('POST', '/api/hydrogen-demand/gse', {"gse": gse_selection, "end_year": 2035}),
+        "demand.total": ('POST', '/api/hydrogen-demand/total',
+                         {"slider_perc": 0.5, "gse": gse_selection, "end_year": 2035}),
+    }
+
+
+def service_cases(gse_selection):
+    """Zero-argument callables keyed by case name (called in an app context)."""
+    from repositories.aircraft_repository import AircraftRepository
+    from repositories.gse_repository import GSERepository
+    from services.economic_service import calculate_hydrogen_economic_impact
+    from services.hydrogen_service import HydrogenService
+    from services.storage_service import calculate_h2_storage_cost
+    from utils.database import get_aircraft_db_session, get_gse_db_session
+    from utils.reference_data import get_reference_data, load_reference_data
+
+    def service():
+        return HydrogenService(
+            AircraftRepository(next(get_aircraft_db_session())),
+            GSERepository(next(get_gse_db_session())),
+            reference_data=get_reference_data()
+        )
+
+    return {
+        "aircraft_demand": lambda: service().calculate_aircraft_hydrogen_demand(0.5, 2035),
+        "gse_demand": lambda: service().calculate_gse_hydrogen_demand(gse_selection, 2035),
+        "storage_cost": lambda: calculate_h2_storage_cost(**DEFAULT_STORAGE_INPUTS),
+        "economic_impact": lambda: calculate_hydrogen_economic_impact(**DEFAULT_ECONOMIC_INPUTS),
+        "load_reference_data": lambda: load_reference_data(
+            next(get_aircraft_db_session()), next(get_gse_db_session())
+        ),
+    }
+
+
+def measure(fn, min_iterations, min_time, max_iterations):
+    """
+    Time repeated calls of fn.
+
+    Calls continue until both min_iterations and min_time are reached, or
+    max_iterations is.
+    """
+    fn()
+    fn()  # warm-up
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < max_iterations and (
+            len(samples) < min_iterations or time.perf_counter() - start < min_time):
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    wall = time.perf_counter() - start
+
+    report = summarize(samples)
+    report["throughput_per_s"] = len(samples) / wall if wall > 0 else None
+
+    tracemalloc.start()
+    try:
+        fn()
+        report["peak_memory_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+    return report
+
+
+def selected(name, patterns):
+    return not patterns or any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def run_scale(scale, mode, args):
+    """Run every selected case at one scale and data mode."""
+    from app import create_app
+    from utils.database import teardown_db
+    from utils.reference_data import set_reference_data
+
+    aircraft_uri, gse_uri = build_databases(scale, args.gse_count, args.seed, args.data_dir)
+    gse_selection = gse_names(args.gse_selection, args.seed)
+    set_reference_data(None)
+    app = create_app('production', {
+        'AIRCRAFT_DATABASE_URI': aircraft_uri,
+        'GSE_DATABASE_URI': gse_uri,
+        'PRELOAD_REFERENCE_DATA': mode == 'preload',
+        'RESULT_CACHE_ENABLED': False,
+        'RESULT_CACHE_PATH': None,
+        'SINGLE_FLIGHT_ENABLED': False,
+        'ADMISSION_ENABLED': False,
+        'WARMUP_MODE': 'off',
+    })
+    client = app.test_client()
+    results = {}
+    try:
+        for name, (method, path, payload) in endpoint_cases(gse_selection).items():
+            key = f"x{scale}/{mode}/endpoint/{name}"
+            if not selected(key, args.cases):
+                continue
+
+            def call():
+                response = client.open(path, method=method, json=payload)
+                assert response.status_code == 200, (key, response.status_code)
+
+            results[key] = measure(call, args.min_iterations, args.min_time, args.max_iterations)
+            print(f"{key}: p50 {results[key]['p50_ms']:.2f} ms", file=sys.stderr)
+
+        with app.app_context():
+            for name, fn in service_cases(gse_selection).items():
+                key = f"x{scale}/{mode}/service/{name}"
+                if not selected(key, args.cases):
+                    continue
+
+                def call():
+                    try:
+                        fn()
+                    finally:
+                        teardown_db()
+
+                results[key] = measure(call, args.min_iterations, args.min_time, args.max_iterations)
+                print(f"{key}: p50 {results[key]['p50_ms']:.2f} ms", file=sys.stderr)
+    finally:
+        set_reference_data(None)
+    return results
+
+
+def compare(baseline, current, max_regression, min_delta_ms):
+    """
+    Return the regressions of current against baseline.
+
+    A metric regresses when it grew by more than max_regression (relative)
+    and by more than the metric's noise floor (min_delta_ms for latencies).
+    """
+    regressions = []
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        for metric, floor in REGRESSION_METRICS.items():
+            floor = min_delta_ms if floor is None else floor
+            old, new = base.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + max_regression) and new - old > floor:
+                regressions.append({
+                    "case": key, "metric": metric, "baseline": old, "current": new,
+                    "change": (new - old) / old if old else None,
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help="aircraft dataset multiples (generating 1000 takes about a minute)")
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--gse-count', type=int, default=1000, help="GSE catalog size")
+    parser.add_argument('--gse-selection', type=int, default=50, help="GSE types per request")
+    parser.add_argument('--cases', nargs='*', help="glob patterns of case keys, e.g. '*/endpoint/demand.*'")
+    parser.add_argument('--min-iterations', type=int, default=5)
+    parser.add_argument('--max-iterations', type=int, default=1000)
+    parser.add_argument('--min-time', type=float, default=1.0, help="seconds per case")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help="where generated databases are kept")
+    parser.add_argument('--output', help="write results JSON here (default: stdout)")
+    parser.add_argument('--baseline', help="results JSON to compare against")
+    parser.add_argument('--compare', help="compare this results JSON with --baseline instead of running")
+    parser.add_argument('--max-regression', type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument('--min-delta-ms', type=float, default=0.5, help="ignore smaller latency changes")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare) as f:
+            report = json.load(f)
+    else:
+        report = {
+            "meta": {
+                "timestamp": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "scales": args.scales,
+                "gse_count": args.gse_count,
+                "gse_selection": args.gse_selection,
+                "seed": args.seed,
+            },
+            "results": {},
+        }
+        for scale in args.scales:
+            for mode in args.modes:
+                report["results"].update(run_scale(scale, mode, args))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(baseline, report, args.max_regression, args.min_delta_ms)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    if report.get("regressions"):
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression['case']} {regression['metric']}: "
+                  f"{regression['baseline']:.2f} -> {regression['current']:.2f}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
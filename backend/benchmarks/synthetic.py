@@ -0,0 +1,138 @@
+# backend/benchmarks/synthetic.py
+"""
+Synthetic datasets at multiples of the bundled data.
+
+The aircraft table is scaled by repeating the bundled CSV; every copy after
+the first has its distance, air time and fuel consumption jittered by a few
+percent, so the result is not a set of exact duplicates but keeps the same
+mix of routes, months and sources. GSE catalogs are padded with synthetic
+equipment drawn from the ranges of the bundled types.
+
+Generated databases are written with the sqlite3 module directly (an ORM
+insert of millions of rows takes minutes) and kept in a cache directory,
+keyed by their parameters, so later runs reuse them.
+"""
+import os
+import sqlite3
+
+import numpy as np
+from sqlalchemy import create_engine
+
+from benchmarks.common import read_aircraft_rows, read_gse_rows
+from models.aircraft import Aircraft, Base as AircraftBase
+from models.gse import GroundSupportEquipment, Base as GSEBase
+
+DEFAULT_DATA_DIR = os.path.join('cache', 'benchmarks')
+
+# Columns jittered in the synthetic copies, and the relative standard deviation
+AIRCRAFT_JITTER = {'distance': 0.05, 'air_time': 0.05, 'fuel_consumption': 0.05}
+
+AIRCRAFT_FIELDS = [c.name for c in Aircraft.__table__.columns if c.name != 'id']
+GSE_FIELDS = [c.name for c in GroundSupportEquipment.__table__.columns if c.name != 'id']
+
+
+def aircraft_chunks(scale, seed=0):
+    """
+    Yield the synthetic aircraft table one copy of the bundled data at a time.
+
+    Yields:
+        list: Row tuples in AIRCRAFT_FIELDS order
+    """
+    base = read_aircraft_rows()
+    columns = {field: [row[field] for row in base] for field in AIRCRAFT_FIELDS}
+    rng = np.random.default_rng(seed)
+    jitter_base = {
+        field: np.array([np.nan if v is None else v for v in columns[field]], dtype=np.float64)
+        for field in AIRCRAFT_JITTER
+    }
+    for copy in range(scale):
+        if copy:
+            for field, std in AIRCRAFT_JITTER.items():
+                values = jitter_base[field] * rng.normal(1.0, std, len(base))
+                columns[field] = [None if np.isnan(v) else v for v in values.tolist()]
+        yield list(zip(*(columns[field] for field in AIRCRAFT_FIELDS)))
+
+
+def gse_rows(count, seed=0):
+    """
+    Return a GSE catalog of at least `count` types.
+
+    The bundled types come first; the rest are "Synthetic GSE nnnnn" entries
+    with fuel use and operating times drawn from the bundled ranges.
+    """
+    rows = read_gse_rows()
+    rng = np.random.default_rng(seed)
+    rates = [row['usable_fuel_consumption_ft3_min'] for row in rows]
+    times = [row['operating_time_departure'] for row in rows] + [row['operating_time_arrival'] for row in rows]
+    fuels = sorted({row['fuel_used'] for row in rows})
+    for i in range(count - len(rows)):
+        rows.append({
+            'ground_support_equipment': f"Synthetic GSE {i:05d}",
+            'fuel_used': fuels[int(rng.integers(len(fuels)))],
+            'fuel_consumption_online': None,
+            'average_speed_mi_hr': int(rng.integers(5, 30)),
+            'usable_fuel_consumption_ft3_min': float(rng.uniform(min(rates), max(rates))),
+            'operating_time_departure': int(rng.integers(min(times), max(times) + 1)),
+            'operating_time_arrival': int(rng.integers(min(times), max(times) + 1)),
+            'notes': None,
+            'link': None,
+        })
+    return rows
+
+
+def gse_names(count, seed=0):
+    """Names of the first `count` types of the synthetic catalog."""
+    return [row['ground_support_equipment'] for row in gse_rows(count, seed)[:count]]
+
+
+def _write(path, metadata, table, fields, chunks):
+    uri = f"sqlite:///{path}"
+    engine = create_engine(uri)
+    metadata.create_all(engine)
+    engine.dispose()
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        statement = f"INSERT INTO {table} ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})"
+        for chunk in chunks:
+            conn.executemany(statement, chunk)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def build_databases(scale, gse_count, seed=0, data_dir=DEFAULT_DATA_DIR):
+    """
+    Create (or reuse) the synthetic databases.
+
+    Args:
+        scale: Multiple of the bundled aircraft data
+        gse_count: Minimum number of GSE types
+        seed: Seed of the jitter and of the synthetic GSE
+        data_dir: Directory the databases are cached in
+
+    Returns:
+        tuple: (aircraft database URI, GSE database URI)
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    paths = {
+        'aircraft': os.path.abspath(os.path.join(data_dir, f"aircraft_x{scale}_s{seed}.db")),
+        'gse': os.path.abspath(os.path.join(data_dir, f"gse_{gse_count}_s{seed}.db")),
+    }
+    builders = {
+        'aircraft': lambda path: _write(path, AircraftBase.metadata, Aircraft.__tablename__,
+                                        AIRCRAFT_FIELDS, aircraft_chunks(scale, seed)),
+        'gse': lambda path: _write(path, GSEBase.metadata, GroundSupportEquipment.__tablename__, GSE_FIELDS,
+                                   [[tuple(row[f] for f in GSE_FIELDS) for row in gse_rows(gse_count, seed)]]),
+    }
+    for name, path in paths.items():
+        if not os.path.exists(path):
+            # Build under a temporary name so an interrupted run leaves nothing behind
+            partial = f"{path}.partial"
+            if os.path.exists(partial):
+                os.remove(partial)
+            builders[name](partial)
+            os.replace(partial, path)
+    return f"sqlite:///{paths['aircraft']}", f"sqlite:///{paths['gse']}"
@@ -26,20 +26,104 @@ class Config:
     # SQLAlchemy config
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQL_ECHO = False
+    DB_CREATE_TABLES = False  # create tables at startup instead of via `flask init-db`
     
-    # Logging config
+    # Load the reference datasets into shared read-only arrays at startup
+    # (enabled by gunicorn.conf.py so the master loads them before forking)
+    PRELOAD_REFERENCE_DATA = os.environ.get('PRELOAD_REFERENCE_DATA', '0') == '1'
+    # Shared-memory store published by `flask publish-data` (unset: disabled)
+    SHARED_STORE_NAME = os.environ.get('SHARED_STORE_NAME')
+    # Without either, cached results are keyed by a fingerprint of the
+    # databases, re-read at most this often (seconds)
+    DATABASE_VERSION_TTL = 5.0
+    
+    # Logging config (see utils/log.py); the LOG_LEVEL env var overrides LOG_LEVEL
     LOG_LEVEL = logging.INFO
-    LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
+    LOG_JSON = os.environ.get('LOG_JSON', '0') == '1'
+    LOG_ASYNC = True  # write records from a background thread
+    LOG_SAMPLING = {}  # logger name -> fraction of DEBUG/INFO records kept
     
     # API config
     API_TITLE = 'Hydrogen Dashboard API'
     API_VERSION = 'v1'
     CORS_HEADERS = 'Content-Type'
+    JSON_PROVIDER = 'numpy'  # 'numpy' (orjson-backed) or 'default' (Flask's)
+    VALIDATE_RESPONSES = True  # re-validate response payloads against their schemas
+    
+    # Response compression config
+    COMPRESS_ENABLED = True
+    COMPRESS_MIN_SIZE = 1024  # bytes
+    COMPRESS_LEVEL = 5
+
+    # Request coalescing config
+    SINGLE_FLIGHT_ENABLED = True
+    SINGLE_FLIGHT_TIMEOUT = 30  # seconds a coalesced request waits for the leader
+
+    # Independent parts of composite endpoints run on a shared thread pool
+    CONCURRENCY_ENABLED = os.environ.get('CONCURRENCY_ENABLED', '1') == '1'
+    CONCURRENCY_WORKERS = int(os.environ.get('CONCURRENCY_WORKERS', 8))
+
+    # Admission control: per-endpoint ("blueprint.view") or per-blueprint
+    # concurrency limits (see utils/admission.py). A queued request still holds
+    # a server thread, so concurrency + queue should stay below the threads per
+    # worker (GUNICORN_THREADS, default 4) to leave room for cheap endpoints.
+    # The uncached calculations share the 'heavy' slots; the demand endpoints
+    # are served from the result cache and single-flight and are not limited.
+    ADMISSION_ENABLED = os.environ.get('ADMISSION_ENABLED', '1') == '1'
+    ADMISSION_LIMITS = {
+        'heavy': {'concurrency': 2, 'queue': 1, 'timeout': 2.0},
+        'storage.sweep': 'heavy',  # sweeps of /api/storage/calculate
+        'economic.sweep': 'heavy',  # grids of /api/economic/impact
+        'storage.tank_optimization_endpoint': 'heavy',
+        'storage.inventory_simulation_endpoint': 'heavy',
+        'storage.tank_placement_endpoint': 'heavy',  # packs up to 5000 zones
+        'economic.cash_flow_endpoint': 'heavy',
+        'solver.solve_endpoint': 'heavy',
+        'zones.zones_containing_points': 'heavy',  # up to 100k point lookups
+        'jobs.job_events': {'concurrency': 2},  # streams hold a thread for the job's lifetime
+    }
+
+    # Largest storage cost sweep (combinations) evaluated in one request
+    STORAGE_SWEEP_MAX_POINTS = 1_000_000
+
+    # Largest economic impact grid (combinations) evaluated in one request
+    ECONOMIC_SWEEP_MAX_POINTS = 1_000_000
+
+    # Largest inventory simulation (scenarios x days) run in one request
+    INVENTORY_MAX_CELLS = 2_000_000
+
+    # Zones available for storage (see utils/zones.py): the file is checked
+    # for changes at most every ZONES_CHECK_INTERVAL seconds. Also the most
+    # tank placements returned by one placement request
+    ZONES_PATH = os.environ.get('ZONES_PATH', './data/available_zones.json')
+    ZONES_CHECK_INTERVAL = 1.0
+    PLACEMENT_MAX_PLACEMENTS = 50_000
+
+    # Result cache config (memory LRU in front of a SQLite file shared by workers)
+    RESULT_CACHE_ENABLED = True
+    RESULT_CACHE_MEMORY_ENTRIES = 1024
+    RESULT_CACHE_PATH = os.environ.get('RESULT_CACHE_PATH', './cache/results.sqlite')
+    RESULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 256 * 2**20))
+
+    # Background jobs (process pool per worker, records shared through SQLite)
+    JOB_STORE_PATH = os.environ.get('JOB_STORE_PATH', './cache/jobs.sqlite')
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+    JOB_MAX_ACTIVE = int(os.environ.get('JOB_MAX_ACTIVE', 16))  # queued + running per worker
+    # 'forkserver' (or 'spawn'): pool processes start clean and connect on their
+    # own. 'fork' starts faster but copies the worker's threads and connections
+    JOB_START_METHOD = os.environ.get('JOB_START_METHOD', 'forkserver')
+    JOB_RETENTION_SECONDS = 24 * 3600
+
+    # Warm-up before serving: 'off', 'sync' (in create_app) or 'background'
+    WARMUP_MODE = os.environ.get('WARMUP_MODE', 'off')
+    WARMUP_SCENARIOS_FILE = os.environ.get('WARMUP_SCENARIOS_FILE')  # JSON list; unset: defaults
 
 class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
     SQL_ECHO = True
+    DB_CREATE_TABLES = True
     LOG_LEVEL = logging.DEBUG
 
 class TestingConfig(Config):
@@ -50,7 +134,14 @@ class TestingConfig(Config):
     AIRCRAFT_DATABASE_URI = 'sqlite:///:memory:'
     GSE_DATABASE_URI = 'sqlite:///:memory:'
     SQL_ECHO = False
+    DB_CREATE_TABLES = True
     LOG_LEVEL = logging.DEBUG
+    LOG_ASYNC = False  # records are written before the test moves on
+    RESULT_CACHE_PATH = None  # memory tier only
+    DATABASE_VERSION_TTL = 0.0  # tests change the data between requests
+    # Each connection to an in-memory SQLite database sees a different,
+    # empty database, so pool threads could not read the test data
+    CONCURRENCY_ENABLED = False
 
 class ProductionConfig(Config):
     """Production configuration."""
@@ -65,6 +156,9 @@ class ProductionConfig(Config):
     
     # Production logging
     LOG_LEVEL = logging.WARNING
+    
+    # Response payloads come from trusted service code
+    VALIDATE_RESPONSES = False
 
 # Configuration dictionary
 config = {
@@ -77,10 +171,3 @@ config = {
 def get_config(config_name=os.environ.get('FLASK_ENV', 'default')):
     """Get configuration class by name."""
     return config.get(config_name, config['default'])
-
-def init_logging(app):
-    """Initialize logging configuration."""
-    logging.basicConfig(
-        level=app.config['LOG_LEVEL'],
-        format=app.config['LOG_FORMAT']
-    )
\ No newline at end of file
@@ -0,0 +1,45 @@
+# backend/gunicorn.conf.py
+"""
+Gunicorn configuration for production.
+
+Usage (from backend/):
+    gunicorn -c gunicorn.conf.py
+
+The app is preloaded in the master process, which also loads the reference
+datasets into read-only arrays (PRELOAD_REFERENCE_DATA). Workers are forked
+afterwards and share those pages copy-on-write instead of each building
+their own copy. The master also runs the warm-up (WARMUP_MODE=sync), so
+workers start with a warm result cache. Database connection pools are reset
+in every worker after the fork.
+"""
+import gc
+import multiprocessing
+import os
+
+# Must be set before the app (and its config) is imported by the master
+os.environ.setdefault('FLASK_ENV', 'production')
+os.environ.setdefault('PRELOAD_REFERENCE_DATA', '1')
+os.environ.setdefault('WARMUP_MODE', 'sync')
+
+wsgi_app = 'wsgi:app'
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+preload_app = True
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+
+
+def when_ready(server):
+    """Move everything allocated so far out of the GC's reach.
+
+    Collections in the workers would otherwise write to the headers of the
+    preloaded objects and unshare their pages.
+    """
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Give each worker its own database connections."""
+    from utils.database import dispose_engines
+
+    dispose_engines()
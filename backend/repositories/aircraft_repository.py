@@ -21,17 +21,14 @@ class AircraftRepository:
                 )
             )
 
-            # Log the SQL query
-            logger.debug(f"SQL Query: {query}")
-
             if limit:
                 query = query.limit(limit)
 
             results = query.all()
-            logger.debug(f"Found {len(results)} aircraft records")
+            logger.debug("Found %d aircraft records", len(results))
             
             return results
 
         except Exception as e:
-            logger.error(f"Error querying aircraft data: {str(e)}")
+            logger.error("Error querying aircraft data: %s", e)
             raise
\ No newline at end of file
@@ -6,7 +6,15 @@ def register_routes(app: Flask):
     from .hydrogen_demand import hydrogen_demand_bp
     from .storage import storage_bp
     from .economic import economic_bp
+    from .jobs import jobs_bp
+    from .zones import zones_bp
+    from .pipeline import pipeline_bp
+    from .solver import solver_bp
     
     app.register_blueprint(hydrogen_demand_bp, url_prefix='/api/hydrogen-demand')
     app.register_blueprint(storage_bp, url_prefix='/api/storage')
-    app.register_blueprint(economic_bp, url_prefix='/api/economic')
\ No newline at end of file
+    app.register_blueprint(economic_bp, url_prefix='/api/economic')
+    app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
+    app.register_blueprint(zones_bp, url_prefix='/api/zones')
+    app.register_blueprint(pipeline_bp, url_prefix='/api/pipeline')
+    app.register_blueprint(solver_bp, url_prefix='/api/solver')
\ No newline at end of file
@@ -1,30 +1,120 @@
 """API routes for economic impact calculations."""
-from flask import Blueprint, request, jsonify
-from services.economic_service import calculate_hydrogen_economic_impact
+from flask import Blueprint, current_app, jsonify, request
+from services.economic_service import (
+    calculate_hydrogen_economic_impact,
+    economic_impact_grid,
+    MODEL_VERSION,
+    ECONOMIC_PARAMETERS
+)
+from services.cashflow_service import SCENARIO_PARAMETERS, yearly_cash_flows
+from services.inventory_service import DEMAND_BUFFER_FACTOR
+from schemas.economic import CashFlowQuery, EconomicImpactQuery, EconomicImpactResult, EconomicSweepQuery
+from routes.storage import daily_demand, is_sweep_body, value_array
+from utils.admission import admission_slot
+from utils.negotiation import negotiated_response
+from utils.result_cache import cached
+from utils.validation import parse_request, validate_output, batch_columns
 
 economic_bp = Blueprint('economic', __name__)
 
+def economic_sweep_response():
+    """Evaluate the economic model over a grid of inputs (see economic_impact_grid)."""
+    query = parse_request(EconomicSweepQuery)
+    if isinstance(query, tuple):
+        return query
+
+    arrays = {name: value_array(getattr(query, name)) for name in ECONOMIC_PARAMETERS}
+    points = 1
+    for values in arrays.values():
+        points *= len(values)
+    limit = current_app.config.get('ECONOMIC_SWEEP_MAX_POINTS', 1_000_000)
+    if points > limit:
+        return jsonify({
+            "error": "Sweep too large",
+            "message": f"The sweep has {points} combinations; the limit is {limit}"
+        }), 400
+
+    with admission_slot('economic.sweep'):
+        result = economic_impact_grid(arrays)
+    return negotiated_response(result, tables=('results',), rows=False)
+
 @economic_bp.route('/impact', methods=['POST'])
 def economic_impact_endpoint():
     """
     API endpoint to calculate the economic impact of switching to hydrogen fuel.
-    Expects JSON data with economic parameters.
+    Expects JSON data with economic parameters, or a JSON array of parameter
+    sets which is evaluated as one batch. Parameters given as lists or
+    ranges ({"start", "stop", "step" or "num"}) are evaluated over every
+    combination, with the break-even points of the tax credit compensation.
     """
-    data = request.json
-    
-    fleet_percentage = data.get('fleet_percentage')
-    total_flights = data.get('total_flights')
-    atlanta_fraction = data.get('atlanta_fraction')
-    hydrogen_demand = data.get('hydrogen_demand')
-    turnaround_time = data.get('turnaround_time')
-    tax_credits = data.get('tax_credits')
-    
-    result = calculate_hydrogen_economic_impact(
-        fleet_percentage,
-        total_flights,
-        atlanta_fraction,
-        hydrogen_demand,
-        turnaround_time,
-        tax_credits
+    if is_sweep_body(request.get_data(cache=True)):
+        return economic_sweep_response()
+
+    validated_data = parse_request(EconomicImpactQuery, allow_batch=True)
+    if isinstance(validated_data, tuple):
+        return validated_data
+
+    if isinstance(validated_data, list):
+        result = calculate_hydrogen_economic_impact(**batch_columns(validated_data))
+        return negotiated_response({"results": result}, tables=('results',))
+
+    result = cached(
+        'economic.impact',
+        MODEL_VERSION,
+        validated_data.model_dump(),
+        calculate_hydrogen_economic_impact,
+        validated_data.fleet_percentage,
+        validated_data.total_flights,
+        validated_data.atlanta_fraction,
+        validated_data.hydrogen_demand,
+        validated_data.turnaround_time,
+        validated_data.tax_credits
+    )
+
+    validated_result = validate_output(EconomicImpactResult, result)
+    if isinstance(validated_result, tuple):
+        return validated_result
+
+    return negotiated_response(result)
+
+
+@economic_bp.route('/cashflow', methods=['POST'])
+def cash_flow_endpoint():
+    """
+    API endpoint to project the annual cash flows of adoption scenarios.
+    Expects JSON data with the daily demand of the first year
+    (h2_demand_cuft, or "demand" with the demand model inputs), the horizon
+    (start_year to end_year) and the scenarios. Returns per scenario the
+    NPV, IRR, totals and payback year, and with include_series the yearly
+    tax credits, revenue drop, storage capex and cash flow.
+    """
+    query = parse_request(CashFlowQuery)
+    if isinstance(query, tuple):
+        return query
+
+    years = range(query.start_year, query.end_year + 1)
+    if query.demand is None:
+        first = query.h2_demand_cuft
+    else:
+        # Without the demand model's fixed buffer; storage is sized per scenario
+        first = daily_demand(query.demand.slider_perc, query.demand.gse, query.start_year) / DEMAND_BUFFER_FACTOR
+    scenarios = {name: [getattr(s, name) for s in query.scenarios] for name in SCENARIO_PARAMETERS}
+    scenarios["fleet_percentage"] = [
+        s.fleet_percentage if s.fleet_percentage is not None else query.demand.slider_perc
+        for s in query.scenarios
+    ]
+    scenarios["tax_credit_years"] = [
+        s.tax_credit_years if s.tax_credit_years is not None else float('inf')
+        for s in query.scenarios
+    ]
+
+    result = yearly_cash_flows(years, first, scenarios, query.ullage, query.evaporation)
+    series = result.pop("series")
+    result["scenarios"] = dict(
+        result["scenarios"],
+        name=[s.name or f"scenario {i + 1}" for i, s in enumerate(query.scenarios)],
     )
-    return jsonify(result)
\ No newline at end of file
+    result["daily_demand_cuft"] = first
+    if query.include_series:
+        result["series"] = series
+    return negotiated_response(result, tables=('scenarios',))
@@ -1,21 +1,30 @@
 # backend/routes/hydrogen_demand.py
-from flask import Blueprint, request, jsonify, g, current_app
+from flask import Blueprint, jsonify, g, current_app
 from services.hydrogen_service import HydrogenService
 from repositories.aircraft_repository import AircraftRepository
 from repositories.gse_repository import GSERepository
 from utils.database import get_aircraft_db_session, get_gse_db_session
+from utils.reference_data import data_version, get_reference_data
 from schemas.hydrogen_demand import (
     AircraftDemandQuery, 
     AircraftDemandResult, 
     GSEDemandQuery, 
     TotalDemandQuery
 )
-from utils.validation import validate_input
+from utils.validation import parse_request, validate_output
+from utils.negotiation import negotiated_response
+from utils.singleflight import SingleFlight, SingleFlightTimeout
+from utils.result_cache import cached
+from utils.admission import AdmissionRejected, admitted, deferred_admission, rejection_response
+from utils.concurrency import run_concurrently
 import logging
 
 hydrogen_demand_bp = Blueprint('hydrogen_demand', __name__)
 logger = logging.getLogger(__name__)
 
+# Identical concurrent demand calculations share one execution
+demand_flight = SingleFlight()
+
 @hydrogen_demand_bp.before_request
 def before_request():
     """Establish database connections before each request."""
@@ -23,14 +32,14 @@ def before_request():
         g.aircraft_db = next(get_aircraft_db_session())
         g.gse_db = next(get_gse_db_session())
     except Exception as e:
-        logger.error(f"Database connection error: {str(e)}")
+        logger.error("Database connection error: %s", e)
         return jsonify({"error": "Database connection failed"}), 500
 
 @hydrogen_demand_bp.teardown_request
 def teardown_request(exception=None):
     """Close database connections after each request."""
     if exception:
-        logger.error(f"Request error: {str(exception)}")
+        logger.error("Request error: %s", exception)
     
     for db_name in ['aircraft_db', 'gse_db']:
         db = getattr(g, db_name, None)
@@ -38,102 +47,174 @@ def teardown_request(exception=None):
             try:
                 db.close()
             except Exception as e:
-                logger.error(f"Error closing {db_name}: {str(e)}")
+                logger.error("Error closing %s: %s", db_name, e)
 
 def create_hydrogen_service():
     """Create and return a HydrogenService instance with repositories."""
     return HydrogenService(
         AircraftRepository(g.aircraft_db),
-        GSERepository(g.gse_db)
+        GSERepository(g.gse_db),
+        reference_data=get_reference_data()
     )
 
+def thread_hydrogen_service():
+    """HydrogenService bound to the calling thread's own database sessions."""
+    return HydrogenService(
+        AircraftRepository(next(get_aircraft_db_session())),
+        GSERepository(next(get_gse_db_session())),
+        reference_data=get_reference_data()
+    )
+
+def aircraft_demand_task(slider_perc, end_year):
+    """Aircraft demand on a pool thread (see utils.concurrency)."""
+    return thread_hydrogen_service().calculate_aircraft_hydrogen_demand(slider_perc, end_year)
+
+def coalesced(key, fn, *args):
+    """Run fn(*args), sharing the execution with concurrent identical requests."""
+    if not current_app.config.get('SINGLE_FLIGHT_ENABLED', True):
+        return fn(*args)
+    return demand_flight.do(
+        key, fn, *args,
+        timeout=current_app.config.get('SINGLE_FLIGHT_TIMEOUT')
+    )
+
+def demand_result(key, fn, *args):
+    """
+    Return a demand result from the result cache, computing it on a miss.
+
+    Results are keyed by the data version (see utils.reference_data); if
+    the databases cannot be read nothing is cached. Only a calculation that
+    misses the cache with no identical call in flight takes an admission
+    slot (see utils/admission.py).
+
+    Args:
+        key: Result key; key[0] names the kind of demand.
+        fn, args: The calculation and its arguments.
+
+    Returns:
+        The demand result
+    """
+    return cached(f"demand.{key[0]}", data_version(), key, coalesced, key, admitted(fn), *args)
+
+def gse_key(gse_types):
+    """Order-insensitive key for a list of GSE types (the query ignores order)."""
+    return tuple(sorted(set(gse_types)))
+
+def compute_total_demand(hydrogen_service, slider_perc, gse_types, end_year):
+    """
+    Calculate aircraft, GSE and total hydrogen demand.
+
+    The aircraft and GSE parts read separate databases and are independent,
+    so they run concurrently; with preloaded reference data both are
+    in-memory and run sequentially.
+    """
+    aircraft_demand, gse_demand = run_concurrently(
+        (aircraft_demand_task, slider_perc, end_year),
+        (hydrogen_service.calculate_gse_hydrogen_demand, gse_types, end_year),
+        enabled=hydrogen_service.reference_data is None
+    )
+
+    return {
+        "aircraft_demand": aircraft_demand,
+        "gse_demand": gse_demand,
+        "total_demand": aircraft_demand + gse_demand["total_h2_demand_vol_gse"]
+    }
+
+def timeout_response():
+    """Response returned when a coalesced request gives up waiting."""
+    return jsonify({"error": "Calculation timed out"}), 504
+
 @hydrogen_demand_bp.route('/aircraft', methods=['POST'])
+@deferred_admission
 def h2_demand_ac_endpoint():
     """Calculate hydrogen demand for aircraft routes."""
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
-
-        validated_data = validate_input(AircraftDemandQuery, data)
+        validated_data = parse_request(AircraftDemandQuery)
         if isinstance(validated_data, tuple):
             return validated_data
 
         hydrogen_service = create_hydrogen_service()
-        result = hydrogen_service.calculate_aircraft_hydrogen_demand(
+        result = demand_result(
+            ('aircraft', validated_data.slider_perc, validated_data.end_year),
+            hydrogen_service.calculate_aircraft_hydrogen_demand,
             validated_data.slider_perc,
             validated_data.end_year
         )
 
-        validated_result = validate_input(
+        validated_result = validate_output(
             AircraftDemandResult,
             {"daily_hydrogen_demand_volume": result}
         )
         if isinstance(validated_result, tuple):
             return validated_result
 
-        return jsonify({"daily_hydrogen_demand_volume": result})
+        return negotiated_response(validated_result)
 
+    except SingleFlightTimeout:
+        return timeout_response()
+    except AdmissionRejected as rejected:
+        return rejection_response(rejected)
     except Exception as e:
-        logger.error(f"Error in aircraft demand calculation: {str(e)}")
+        logger.error("Error in aircraft demand calculation: %s", e)
         return jsonify({"error": "Internal server error"}), 500
 
 @hydrogen_demand_bp.route('/gse', methods=['POST'])
+@deferred_admission
 def h2_demand_gse_endpoint():
     """Calculate hydrogen demand for ground support equipment."""
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
-
-        validated_data = validate_input(GSEDemandQuery, data)
+        validated_data = parse_request(GSEDemandQuery)
         if isinstance(validated_data, tuple):
             return validated_data
 
         hydrogen_service = create_hydrogen_service()
-        result = hydrogen_service.calculate_gse_hydrogen_demand(
+        result = demand_result(
+            ('gse', gse_key(validated_data.gse), validated_data.end_year),
+            hydrogen_service.calculate_gse_hydrogen_demand,
             validated_data.gse,
             validated_data.end_year
         )
 
-        return jsonify(result)
+        return negotiated_response(result, tables=('gse_details',))
 
+    except SingleFlightTimeout:
+        return timeout_response()
+    except AdmissionRejected as rejected:
+        return rejection_response(rejected)
     except Exception as e:
-        logger.error(f"Error in GSE demand calculation: {str(e)}")
+        logger.error("Error in GSE demand calculation: %s", e)
         return jsonify({"error": "Internal server error"}), 500
 
 @hydrogen_demand_bp.route('/total', methods=['POST'])
+@deferred_admission
 def h2_demand_total_endpoint():
     """Calculate total hydrogen demand for both aircraft and GSE."""
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
-
-        validated_data = validate_input(TotalDemandQuery, data)
+        validated_data = parse_request(TotalDemandQuery)
         if isinstance(validated_data, tuple):
             return validated_data
 
         hydrogen_service = create_hydrogen_service()
-        
-        aircraft_demand = hydrogen_service.calculate_aircraft_hydrogen_demand(
+        result = demand_result(
+            (
+                'total',
+                validated_data.slider_perc,
+                gse_key(validated_data.gse),
+                validated_data.end_year
+            ),
+            compute_total_demand,
+            hydrogen_service,
             validated_data.slider_perc,
-            validated_data.end_year
-        )
-        
-        gse_demand = hydrogen_service.calculate_gse_hydrogen_demand(
             validated_data.gse,
             validated_data.end_year
         )
-
-        result = {
-            "aircraft_demand": aircraft_demand,
-            "gse_demand": gse_demand,
-            "total_demand": aircraft_demand + gse_demand["total_h2_demand_vol_gse"]
-        }
         
-        return jsonify(result)
+        return negotiated_response(result, tables=('gse_demand.gse_details',))
 
+    except SingleFlightTimeout:
+        return timeout_response()
+    except AdmissionRejected as rejected:
+        return rejection_response(rejected)
     except Exception as e:
-        logger.error(f"Error in total demand calculation: {str(e)}")
+        logger.error("Error in total demand calculation: %s", e)
         return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""API routes for background jobs."""
+import time
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context, url_for
+from pydantic import ValidationError
+from schemas.jobs import JobSubmission
+from utils.jobs import JOB_KINDS, JobQueueFull, estimate_eta
+from utils.json_provider import json_bytes
+from utils.negotiation import negotiated_response
+from utils.validation import parse_request, get_validator, validation_error_response
+import services.job_kinds  # noqa: F401 - registers the job kinds
+
+jobs_bp = Blueprint('jobs', __name__)
+
+_MISSING = object()
+
+# Event streams wait this long for new events before polling the job log
+# (events of jobs owned by another worker arrive only through polling)
+EVENTS_POLL_INTERVAL = 0.5
+EVENTS_HEARTBEAT_INTERVAL = 15.0  # seconds between keep-alive comments
+
+def job_manager():
+    return current_app.extensions['jobs']
+
+def job_response(job, status=200):
+    """JSON description of a job with links to its endpoints."""
+    links = {
+        "self": url_for('jobs.get_job', job_id=job['id']),
+        "cancel": url_for('jobs.cancel_job', job_id=job['id']),
+        "result": url_for('jobs.get_job_result', job_id=job['id']),
+        "events": url_for('jobs.job_events', job_id=job['id']),
+    }
+    body = {
+        name: job[name] for name in
+        ("id", "kind", "status", "progress", "partial", "error", "submitted_at", "started_at", "finished_at")
+    }
+    body["eta_s"] = estimate_eta(job['started_at'], job['progress']) if job['status'] == 'running' else None
+    body["links"] = links
+    return jsonify(body), status
+
+def not_found(job_id):
+    return jsonify({"error": f"No job {job_id}"}), 404
+
+@jobs_bp.route('', methods=['POST'])
+def submit_job():
+    """
+    Submit a background job.
+    Expects JSON data with the job kind and its parameters; responds with 202
+    and the job description.
+    """
+    submission = parse_request(JobSubmission)
+    if isinstance(submission, tuple):
+        return submission
+
+    kind = JOB_KINDS.get(submission.kind)
+    if kind is None:
+        return jsonify({"error": f"Unknown job kind: {submission.kind}", "kinds": sorted(JOB_KINDS)}), 400
+    try:
+        params = get_validator(kind.schema).validate_python(submission.params)
+    except ValidationError as e:
+        return validation_error_response(e)
+
+    try:
+        job = job_manager().submit(kind.name, params)
+    except JobQueueFull as e:
+        response = jsonify({"error": "Job queue is full", "message": str(e)})
+        return response, 503, {"Retry-After": "5"}
+
+    response, status = job_response(job, 202)
+    response.headers['Location'] = url_for('jobs.get_job', job_id=job['id'])
+    return response, status
+
+@jobs_bp.route('/kinds', methods=['GET'])
+def list_job_kinds():
+    """List the job kinds with the JSON schema of their parameters."""
+    return jsonify({
+        name: get_validator(kind.schema).json_schema()
+        for name, kind in sorted(JOB_KINDS.items())
+    })
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Poll the status and progress of a job."""
+    job = job_manager().get(job_id)
+    if job is None:
+        return not_found(job_id)
+    return job_response(job)
+
+@jobs_bp.route('/<job_id>', methods=['DELETE'])
+@jobs_bp.route('/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued or running job."""
+    job = job_manager().cancel(job_id)
+    if job is None:
+        return not_found(job_id)
+    if job['status'] in ('succeeded', 'failed'):
+        return jsonify({"error": f"Job already {job['status']}"}), 409
+    return job_response(job, 202)
+
+@jobs_bp.route('/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Result of a succeeded job, in any negotiated format."""
+    manager = job_manager()
+    job = manager.get(job_id)
+    if job is None:
+        return not_found(job_id)
+    if job['status'] != 'succeeded':
+        return jsonify({"error": f"Job is {job['status']}", "status": job['status']}), 409
+
+    result = manager.result(job_id, _MISSING)
+    if result is _MISSING:
+        return jsonify({"error": "Result is no longer available"}), 410
+    return negotiated_response(result, tables=JOB_KINDS[job['kind']].tables)
+
+def sse_message(event_type, data, event_id=None):
+    """Format one server-sent event (data is JSON text without newlines)."""
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event_type}", f"data: {data}"]
+    return "\n".join(lines) + "\n\n"
+
+@jobs_bp.route('/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """
+    Stream a job's progress as server-sent events.
+
+    Events: status (queued, running), progress (fraction, eta_s, partial),
+    rows (a columnar chunk of partial results, for kinds that stream them),
+    result (the final result of kinds that do not stream rows) and done
+    (final status). Reconnecting clients resume after Last-Event-ID.
+    """
+    manager = job_manager()
+    job = manager.get(job_id)
+    if job is None:
+        return not_found(job_id)
+    kind = JOB_KINDS[job['kind']]
+    try:
+        after = int(request.headers.get('Last-Event-ID') or request.args.get('after', 0))
+    except ValueError:
+        after = 0
+
+    def stream(after):
+        last_sent = time.monotonic()
+        while True:
+            events = manager.events(job_id, after)
+            for seq, event_type, data in events:
+                after = seq
+                yield sse_message(event_type, data, seq)
+                if event_type == 'done':
+                    result = manager.result(job_id, _MISSING) if not kind.streams_rows else _MISSING
+                    if result is not _MISSING:
+                        yield sse_message('result', json_bytes(result).decode('utf-8'))
+                    return
+            if events:
+                last_sent = time.monotonic()
+            else:
+                if time.monotonic() - last_sent >= EVENTS_HEARTBEAT_INTERVAL:
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+                    # Marks the job failed if its owning worker has exited
+                    manager.get(job_id)
+                manager.wait_for_events(EVENTS_POLL_INTERVAL)
+
+    return Response(
+        stream_with_context(stream(after)),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
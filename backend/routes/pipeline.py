@@ -0,0 +1,110 @@
+"""API route evaluating the dashboard's calculations as one pipeline."""
+import math
+from flask import Blueprint, current_app
+from constants.hydrogen_properties import TANK_SPECS
+from schemas.pipeline import PipelineQuery
+from services import economic_service, storage_service
+from services.economic_service import calculate_hydrogen_economic_impact
+from services.storage_service import calculate_h2_storage_cost
+from routes.hydrogen_demand import compute_total_demand, demand_result, gse_key, thread_hydrogen_service
+from utils.negotiation import negotiated_response
+from utils.pipeline import Pipeline, Stage
+from utils.reference_data import data_version
+from utils.validation import parse_request
+
+pipeline_bp = Blueprint('pipeline', __name__)
+
+CUFT_PER_GALLON = 0.1337  # as in the storage cost model
+# Part of the memo keys of the stages defined here: bump when they change
+PIPELINE_VERSION = 1
+
+def demand_stage(inputs):
+    """Hydrogen demand, as /api/hydrogen-demand/total (sharing its cache)."""
+    return demand_result(
+        ('total', inputs["slider_perc"], gse_key(inputs["gse"]), inputs["end_year"]),
+        compute_total_demand,
+        thread_hydrogen_service(),
+        inputs["slider_perc"],
+        inputs["gse"],
+        inputs["end_year"]
+    )
+
+def demand_version():
+    """Results depend on the data; without a version they are not memoized."""
+    return data_version()
+
+def storage_area_stage(inputs, demand):
+    """Tanks and area for the total demand, as the dashboard's storage area."""
+    usable = TANK_SPECS['WATER_CAPACITY'] * (1 - TANK_SPECS['ULLAGE']) * TANK_SPECS['EVAPORATION']
+    return {
+        "number_of_tanks": math.ceil(demand["total_demand"] / usable),
+        "storage_area": thread_hydrogen_service().calculate_storage_area(demand["total_demand"]),
+    }
+
+def storage_cost_stage(inputs, demand, storage_area):
+    """Storage cost of holding the total demand."""
+    return calculate_h2_storage_cost(
+        demand["total_demand"] / CUFT_PER_GALLON,
+        inputs["number_of_tanks"] or max(storage_area["number_of_tanks"], 1),
+        inputs["tank_diameter_ft"],
+        inputs["tank_length_ft"],
+        inputs["cost_per_sqft_construction"],
+        inputs["cost_per_cuft_insulation"]
+    )
+
+def economic_stage(inputs, demand):
+    """Economic impact of a year of the daily demand (aircraft plus GSE) [gal]."""
+    daily = demand["aircraft_demand"] + demand["gse_demand"]["daily_h2_demand_vol_gse"]
+    return calculate_hydrogen_economic_impact(
+        inputs["fleet_percentage"],
+        inputs["total_flights"],
+        inputs["atlanta_fraction"],
+        daily * 365 / CUFT_PER_GALLON,
+        inputs["turnaround_time"],
+        inputs["tax_credits"]
+    )
+
+scenario_pipeline = Pipeline([
+    Stage('demand', demand_stage, version=demand_version),
+    Stage('storage_area', storage_area_stage, depends=('demand',), version=PIPELINE_VERSION),
+    Stage('storage_cost', storage_cost_stage, depends=('demand', 'storage_area'),
+          version=(PIPELINE_VERSION, storage_service.MODEL_VERSION)),
+    Stage('economic', economic_stage, depends=('demand',),
+          version=(PIPELINE_VERSION, economic_service.MODEL_VERSION)),
+])
+
+def pipeline_memo():
+    """The app's result cache, or None when caching is off."""
+    if not current_app.config.get('RESULT_CACHE_ENABLED', True):
+        return None
+    return current_app.extensions.get('result_cache')
+
+@pipeline_bp.route('', methods=['POST'])
+def pipeline_endpoint():
+    """
+    API endpoint to evaluate demand, storage area, storage cost and economic
+    impact in one request.
+    Expects JSON data with the inputs of each stage ("demand", "storage",
+    "economic") and optionally the "targets" wanted. Each stage's result is
+    memoized by its inputs and upstream results, so a change to one stage's
+    inputs only recomputes that stage and the stages after it; "status"
+    reports which stages were computed and which were reused.
+    """
+    query = parse_request(PipelineQuery)
+    if isinstance(query, tuple):
+        return query
+
+    economic = query.economic.model_dump()
+    if economic["fleet_percentage"] is None:
+        economic["fleet_percentage"] = query.demand.slider_perc
+    inputs = {
+        "demand": query.demand.model_dump(),
+        "storage_cost": query.storage.model_dump(),
+        "economic": economic,
+    }
+    run = scenario_pipeline.run(inputs, query.targets, pipeline_memo())
+    return negotiated_response({
+        "results": run.results,
+        "status": run.status,
+        "timings_ms": run.timings_ms,
+    })
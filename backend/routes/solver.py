@@ -0,0 +1,152 @@
+"""API route inverting the outputs of the demand, storage and economic models."""
+from dataclasses import dataclass, field
+from typing import Callable, Tuple
+from flask import Blueprint, jsonify
+import numpy as np
+from services.economic_service import calculate_hydrogen_economic_impact, ECONOMIC_PARAMETERS
+from services.solver_service import solve_targets
+from services.storage_service import calculate_h2_storage_cost, STORAGE_PARAMETERS
+from schemas.economic import EconomicImpactQuery, EconomicImpactResult
+from schemas.hydrogen_demand import TotalDemandQuery
+from schemas.solver import SolveQuery
+from schemas.storage import StorageCostQuery, StorageCostResult
+from routes.hydrogen_demand import compute_total_demand, demand_result, gse_key, thread_hydrogen_service
+from utils.negotiation import negotiated_response
+from utils.validation import parse_request, validate_input
+
+solver_bp = Blueprint('solver', __name__)
+
+# Lower end of the default bracket of inputs that must be above zero
+MIN_FRACTION = 1e-6
+
+@dataclass(frozen=True)
+class SolverModel:
+    """
+    A model the solver can invert.
+
+    evaluate is called with the model's inputs, one of them an array of
+    values, and returns its outputs by name. Inputs with a domain may only
+    be searched within it, and it is their default bracket.
+    """
+    query: type
+    evaluate: Callable
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    integer: Tuple[str, ...] = ()
+    domains: dict = field(default_factory=dict)
+
+DEMAND_OUTPUTS = ("aircraft_demand", "gse_demand", "daily_demand", "total_demand", "storage_area")
+
+def evaluate_demand(inputs):
+    """
+    Demand outputs at each slider_perc/end_year pair, from the demand model
+    (one cached calculation per distinct pair). gse_demand and daily_demand
+    are daily volumes; total_demand and storage_area are as in the dashboard.
+    """
+    slider, year = np.broadcast_arrays(np.asarray(inputs["slider_perc"], dtype=np.float64),
+                                       np.asarray(inputs["end_year"]))
+    service = thread_hydrogen_service()
+    gse = inputs["gse"]
+    rows = {}
+    for pair in set(zip(slider.ravel().tolist(), year.ravel().astype(int).tolist())):
+        result = demand_result(('total', pair[0], gse_key(gse), pair[1]),
+                               compute_total_demand, service, pair[0], gse, pair[1])
+        gse_daily = result["gse_demand"]["daily_h2_demand_vol_gse"]
+        rows[pair] = (
+            result["aircraft_demand"],
+            gse_daily,
+            result["aircraft_demand"] + gse_daily,
+            result["total_demand"],
+            service.calculate_storage_area(result["total_demand"]),
+        )
+    values = np.array([rows[pair] for pair in zip(slider.ravel().tolist(), year.ravel().astype(int).tolist())])
+    return {name: values[:, i].reshape(slider.shape) for i, name in enumerate(DEMAND_OUTPUTS)}
+
+SOLVER_MODELS = {
+    'demand': SolverModel(
+        query=TotalDemandQuery,
+        evaluate=evaluate_demand,
+        inputs=("slider_perc", "end_year"),
+        outputs=DEMAND_OUTPUTS,
+        integer=("end_year",),
+        domains={"slider_perc": (0.0, 1.0), "end_year": (2023, 2050)},
+    ),
+    'storage': SolverModel(
+        query=StorageCostQuery,
+        evaluate=lambda inputs: calculate_h2_storage_cost(**inputs),
+        inputs=STORAGE_PARAMETERS,
+        outputs=tuple(StorageCostResult.model_fields),
+        integer=("number_of_tanks",),
+    ),
+    'economic': SolverModel(
+        query=EconomicImpactQuery,
+        evaluate=lambda inputs: calculate_hydrogen_economic_impact(**inputs),
+        inputs=ECONOMIC_PARAMETERS,
+        outputs=tuple(EconomicImpactResult.model_fields),
+        domains={"fleet_percentage": (0.0, 1.0), "atlanta_fraction": (MIN_FRACTION, 1.0)},
+    ),
+}
+
+def invalid_query(message):
+    return jsonify({"error": "Invalid solver query", "message": message}), 400
+
+@solver_bp.route('/solve', methods=['POST'])
+def solve_endpoint():
+    """
+    API endpoint to find the value of a model input at which an output
+    reaches each of the given targets, e.g. the tax credit at which
+    tax_credits_compensation is zero.
+    Expects JSON data with the model ("demand", "storage" or "economic"),
+    the output, the input to solve for, the targets, the other inputs and
+    optionally the bracket searched. Affine models are inverted in closed
+    form; others by bracketing, for all targets at once.
+    """
+    query = parse_request(SolveQuery)
+    if isinstance(query, tuple):
+        return query
+
+    model = SOLVER_MODELS[query.model]
+    if query.solve_for not in model.inputs:
+        return invalid_query(f"{query.model} can be solved for one of: {', '.join(model.inputs)}")
+    if query.output not in model.outputs:
+        return invalid_query(f"{query.model} outputs are: {', '.join(model.outputs)}")
+    if query.solve_for in query.inputs:
+        return invalid_query(f"{query.solve_for} is solved for and cannot be given in inputs")
+
+    domain = model.domains.get(query.solve_for)
+    bracket = query.bracket or domain
+    if bracket is None:
+        return invalid_query(f"Give a bracket for {query.solve_for}")
+    if domain is not None and not domain[0] <= bracket[0] < bracket[1] <= domain[1]:
+        return invalid_query(f"The bracket of {query.solve_for} must lie within {list(domain)}")
+    # Both ends must be valid inputs of the model, with the fixed inputs
+    for end in bracket:
+        validated = validate_input(model.query, dict(query.inputs, **{query.solve_for: end}))
+        if isinstance(validated, tuple):
+            return validated
+    fixed = validated.model_dump()
+    del fixed[query.solve_for]
+
+    def output(x):
+        return model.evaluate(dict(fixed, **{query.solve_for: x}))[query.output]
+
+    try:
+        result = solve_targets(output, query.targets, bracket[0], bracket[1],
+                               integer=query.solve_for in model.integer)
+    except ValueError as e:
+        return invalid_query(str(e))
+
+    return negotiated_response({
+        "model": query.model,
+        "output": query.output,
+        "solve_for": query.solve_for,
+        "bracket": list(bracket),
+        "method": result["method"],
+        "evaluations": result["evaluations"],
+        "results": {
+            "target": query.targets,
+            "value": result["value"],
+            "output": result["output"],
+            "solved": result["solved"],
+        },
+    }, tables=('results',))
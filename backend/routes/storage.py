@@ -1,29 +1,311 @@
 """API routes for hydrogen storage calculations."""
-from flask import Blueprint, request, jsonify
-from services.storage_service import calculate_h2_storage_cost
+import math
+from flask import Blueprint, current_app, jsonify, request
+import numpy as np
+from services.storage_service import (
+    calculate_h2_storage_cost,
+    range_values,
+    storage_cost_sweep,
+    sweep_size,
+    MODEL_VERSION,
+    STORAGE_PARAMETERS
+)
+from services.tank_optimizer import optimize_tanks
+from services.placement_service import capacity_bound, place_tanks
+from services.inventory_service import (
+    DAYS_PER_YEAR,
+    DEMAND_BUFFER_FACTOR,
+    demand_series,
+    required_capacity,
+    simulate_inventory
+)
+from schemas.storage import (
+    InventoryQuery,
+    StorageCostQuery,
+    StorageCostResult,
+    StorageSweepQuery,
+    TankOptimizationQuery,
+    ValueRange
+)
+from schemas.zones import PlacementQuery
+from routes.hydrogen_demand import compute_total_demand, demand_result, gse_key, thread_hydrogen_service
+from utils.admission import admission_slot
+from utils.negotiation import negotiated_response
+from utils.result_cache import cached
+from utils.validation import parse_request, validate_output, batch_columns
+from utils.zones import build_zone_index, get_zone_index
 
 storage_bp = Blueprint('storage', __name__)
 
+def is_sweep_body(body):
+    """
+    Whether a request body is a sweep (an object with list or range values).
+    
+    A single query is a flat object of numbers, so any nested array or
+    object marks a sweep; this avoids decoding the body twice.
+    """
+    body = body.strip()
+    return body[:1] == b'{' and (b'[' in body or body.count(b'{') > 1)
+
+def value_array(value):
+    """A scalar, list or ValueRange as a 1-D array of values."""
+    if isinstance(value, ValueRange):
+        return range_values(value.start, value.stop, value.step, value.num)
+    if isinstance(value, list):
+        return value
+    return [value]
+
+def sweep_arrays(query):
+    """Turn every parameter of a StorageSweepQuery into a 1-D array of values."""
+    return {name: value_array(getattr(query, name)) for name in STORAGE_PARAMETERS}
+
+def storage_sweep_response():
+    """Evaluate a storage cost sweep (see storage_cost_sweep)."""
+    query = parse_request(StorageSweepQuery)
+    if isinstance(query, tuple):
+        return query
+
+    arrays = sweep_arrays(query)
+    try:
+        points = sweep_size(arrays, query.mode)
+    except ValueError as e:
+        return jsonify({"error": "Invalid sweep", "message": str(e)}), 400
+    limit = current_app.config.get('STORAGE_SWEEP_MAX_POINTS', 1_000_000)
+    if points > limit:
+        return jsonify({
+            "error": "Sweep too large",
+            "message": f"The sweep has {points} combinations; the limit is {limit}"
+        }), 400
+
+    with admission_slot('storage.sweep'):
+        result = storage_cost_sweep(arrays, query.mode)
+    result["mode"] = query.mode
+    return negotiated_response(result, tables=('results',), rows=False)
+
+
 @storage_bp.route('/calculate', methods=['POST'])
 def storage_cost_endpoint():
     """
     API endpoint to calculate the storage cost for hydrogen.
-    Expects JSON data with storage parameters.
-    """
-    data = request.json
-    total_h2_volume_gal = data.get('total_h2_volume_gal')
-    number_of_tanks = data.get('number_of_tanks')
-    tank_diameter_ft = data.get('tank_diameter_ft')
-    tank_length_ft = data.get('tank_length_ft')
-    cost_per_sqft_construction = data.get('cost_per_sqft_construction')
-    cost_per_cuft_insulation = data.get('cost_per_cuft_insulation')
-    
-    result = calculate_h2_storage_cost(
-        total_h2_volume_gal,
-        number_of_tanks,
-        tank_diameter_ft,
-        tank_length_ft,
-        cost_per_sqft_construction,
-        cost_per_cuft_insulation
+    Expects JSON data with storage parameters, or a JSON array of parameter
+    sets which is evaluated as one batch. Parameters given as lists or
+    ranges ({"start", "stop", "step" or "num"}) are swept: every combination
+    ("mode": "grid", the default) or the i-th values together ("zip").
+    """
+    if is_sweep_body(request.get_data(cache=True)):
+        return storage_sweep_response()
+
+    validated_data = parse_request(StorageCostQuery, allow_batch=True)
+    if isinstance(validated_data, tuple):
+        return validated_data
+
+    if isinstance(validated_data, list):
+        result = calculate_h2_storage_cost(**batch_columns(validated_data))
+        return negotiated_response({"results": result}, tables=('results',))
+
+    result = cached(
+        'storage.cost',
+        MODEL_VERSION,
+        validated_data.model_dump(),
+        calculate_h2_storage_cost,
+        validated_data.total_h2_volume_gal,
+        validated_data.number_of_tanks,
+        validated_data.tank_diameter_ft,
+        validated_data.tank_length_ft,
+        validated_data.cost_per_sqft_construction,
+        validated_data.cost_per_cuft_insulation
+    )
+
+    validated_result = validate_output(StorageCostResult, result)
+    if isinstance(validated_result, tuple):
+        return validated_result
+
+    return negotiated_response(result)
+
+
+def daily_demand(slider_perc, gse, end_year):
+    """
+    Daily hydrogen demand [ft^3] from the demand model: aircraft plus GSE.
+
+    Shares cached results with /api/hydrogen-demand/total.
+    """
+    result = demand_result(
+        ('total', slider_perc, gse_key(gse), end_year),
+        compute_total_demand,
+        thread_hydrogen_service(),
+        slider_perc,
+        gse,
+        end_year
+    )
+    return result["aircraft_demand"] + result["gse_demand"]["daily_h2_demand_vol_gse"]
+
+
+@storage_bp.route('/optimize', methods=['POST'])
+def tank_optimization_endpoint():
+    """
+    API endpoint to size hydrogen storage tanks.
+    Expects JSON data with the daily demand (h2_demand_cuft, or "demand" with
+    the inputs of /api/hydrogen-demand/total), the days of storage and the
+    design constraints. Returns the minimum-cost and minimum-footprint
+    designs, the one selected by "objective" as "best", and the Pareto
+    front of cost versus footprint.
+    """
+    query = parse_request(TankOptimizationQuery)
+    if isinstance(query, tuple):
+        return query
+
+    if query.demand is None:
+        daily = query.h2_demand_cuft
+    else:
+        daily = daily_demand(query.demand.slider_perc, query.demand.gse, query.demand.end_year)
+    volume = daily * query.storage_days
+    result = optimize_tanks(
+        volume,
+        value_array(query.diameters_ft),
+        value_array(query.lengths_ft),
+        query.max_tanks,
+        query.max_footprint_sqft,
+        query.ullage,
+        query.evaporation,
+        query.cost_per_sqft_construction,
+        query.cost_per_cuft_insulation
+    )
+    result["h2_demand_cuft"] = daily
+    result["storage_volume_cuft"] = volume
+    if result["min_cost"] is None:
+        return jsonify({
+            "error": "No feasible design",
+            "message": f"No tank design stores {volume:.0f} ft^3 within the constraints"
+        }), 400
+    result["best"] = result["min_cost" if query.objective == 'cost' else "min_footprint"]
+    return negotiated_response(result, tables=('pareto_front',))
+
+
+@storage_bp.route('/placement', methods=['POST'])
+def tank_placement_endpoint():
+    """
+    API endpoint to place storage tanks in the available zones.
+    Expects JSON data with the tank footprint and setback, and optionally the
+    tanks to place (number_of_tanks, or h2_demand_cuft to store) and the
+    zones (default: the configured zones, see utils/zones.py). Returns per
+    zone the tanks that fit, the maximum storable volume, the utilization
+    and the placements.
+    """
+    query = parse_request(PlacementQuery)
+    if isinstance(query, tuple):
+        return query
+
+    if query.zones is not None:
+        try:
+            index = build_zone_index([zone.model_dump(exclude_none=True) for zone in query.zones])
+        except ValueError as e:
+            return jsonify({"error": "Invalid zone", "message": str(e)}), 400
+    else:
+        index = get_zone_index()
+    usable_per_tank = query.tank_capacity_cuft * (1 - query.ullage) * query.evaporation
+    required = query.number_of_tanks
+    if query.h2_demand_cuft is not None:
+        required = math.ceil(query.h2_demand_cuft / usable_per_tank)
+
+    limit = current_app.config.get('PLACEMENT_MAX_PLACEMENTS', 50_000)
+    if query.include_placements:
+        bound = int(capacity_bound(index, query.tank_width_ft, query.tank_length_ft, query.setback_ft).sum())
+        if required is not None:
+            bound = min(bound, required)
+        if bound > limit:
+            return jsonify({
+                "error": "Too many placements",
+                "message": f"Up to {bound} tanks could be placed; the limit is {limit}. "
+                           "Give number_of_tanks or set include_placements to false"
+            }), 400
+
+    result = place_tanks(
+        index,
+        query.tank_width_ft,
+        query.tank_length_ft,
+        query.setback_ft,
+        usable_per_tank,
+        required,
+        query.include_placements
+    )
+    return negotiated_response(result)
+
+
+def yearly_consumption(query, years):
+    """
+    Mean daily hydrogen use [ft^3] in each year.
+
+    The demand model's daily volumes carry its fixed 11-day buffer, which is
+    taken out here since the simulation sizes the buffer itself. Both demand
+    parts grow with the TAF operations, so later years are scaled from the
+    first by the model's growth factors.
+    """
+    if query.demand is None:
+        return [query.h2_demand_cuft] * len(years)
+    first = daily_demand(query.demand.slider_perc, query.demand.gse, years[0]) / DEMAND_BUFFER_FACTOR
+    service = thread_hydrogen_service()
+    base = 1 + service.growth_rate_computation(years[0])
+    return [first * (1 + service.growth_rate_computation(year)) / base for year in years]
+
+
+@storage_bp.route('/inventory', methods=['POST'])
+def inventory_simulation_endpoint():
+    """
+    API endpoint to simulate the daily LH2 inventory of storage scenarios.
+    Expects JSON data with the daily demand (h2_demand_cuft, or "demand" with
+    the demand model inputs), the horizon (start_year to end_year) and the
+    scenarios: storage capacity, delivery interval and demand variation.
+    Returns per scenario the stockout days, service level, unmet demand,
+    boil-off losses, and the smallest storage meeting target_service_level.
+    """
+    query = parse_request(InventoryQuery)
+    if isinstance(query, tuple):
+        return query
+
+    years = list(range(query.start_year, (query.end_year or query.start_year) + 1))
+    scenarios = query.scenarios
+    cells = len(scenarios) * len(years) * DAYS_PER_YEAR
+    limit = current_app.config.get('INVENTORY_MAX_CELLS', 2_000_000)
+    if cells > limit:
+        return jsonify({
+            "error": "Simulation too large",
+            "message": f"{len(scenarios)} scenarios x {len(years) * DAYS_PER_YEAR} days "
+                       f"is {cells} scenario-days; the limit is {limit}"
+        }), 400
+
+    yearly = yearly_consumption(query, years)
+    demand = demand_series(yearly, len(scenarios), [s.demand_cv for s in scenarios], query.seed)
+    usable = np.array([
+        s.capacity_cuft * (1 - query.ullage) if s.capacity_cuft is not None
+        else (11 if s.storage_days is None else s.storage_days) * yearly[0]
+        for s in scenarios
+    ])
+    intervals = np.array([s.delivery_interval_days for s in scenarios])
+    boil_off = 1 - query.evaporation
+
+    result = simulate_inventory(demand, usable, intervals, boil_off)
+    required = required_capacity(result.pop("requirement"), query.target_service_level)
+    inventory = result.pop("inventory")
+    mean_daily = yearly[0] if yearly[0] > 0 else np.nan
+    table = dict(
+        result,
+        name=[s.name or f"scenario {i + 1}" for i, s in enumerate(scenarios)],
+        delivery_interval_days=intervals,
+        usable_capacity_cuft=usable,
+        buffer_days=usable / mean_daily,
+        wasted_fraction=np.divide(result["boil_off_cuft"], result["delivered_cuft"],
+                                  out=np.zeros(len(scenarios)), where=result["delivered_cuft"] > 0),
+        required_capacity_cuft=required,
+        required_tank_capacity_cuft=required / (1 - query.ullage),
+        required_buffer_days=required / mean_daily,
     )
-    return jsonify(result)
\ No newline at end of file
+    response = {
+        "years": years,
+        "days": demand.shape[1],
+        "mean_daily_demand_cuft": yearly,
+        "target_service_level": query.target_service_level,
+        "scenarios": table,
+    }
+    if query.include_series:
+        response["inventory"] = inventory
+    return negotiated_response(response, tables=('scenarios',))
@@ -0,0 +1,87 @@
+"""API routes for the storage zones (see utils/zones.py)."""
+from flask import Blueprint
+from schemas.zones import ZoneAreaQuery, ZoneBBoxQuery, ZonePointsQuery
+from utils.geo import unproject
+from utils.negotiation import negotiated_response
+from utils.validation import parse_request
+from utils.zones import get_zone_index
+
+zones_bp = Blueprint('zones', __name__)
+
+def zone_summary(index, i):
+    """Name, type, area and latitude/longitude bounding box of a zone."""
+    box = index.boxes[i]
+    lat, lon = unproject(box[[0, 2]], box[[1, 3]], index.origin)
+    zone = index.zones[i]
+    return {
+        "name": zone["name"],
+        "type": zone["type"],
+        "area_sqft": float(index.areas[i]),
+        "bbox": [float(lat[0]), float(lon[0]), float(lat[1]), float(lon[1])],
+    }
+
+@zones_bp.route('', methods=['GET'])
+def list_zones():
+    """List the zones with their areas and bounding boxes."""
+    index = get_zone_index()
+    return negotiated_response({
+        "version": index.version,
+        "count": len(index.zones),
+        "total_area_sqft": float(index.areas.sum()),
+        "zones": [zone_summary(index, i) for i in range(len(index.zones))],
+    }, tables=('zones',))
+
+@zones_bp.route('/contains', methods=['POST'])
+def zones_containing_points():
+    """
+    Find the zones containing each point.
+    Expects JSON data with "points", a list of [lat, lon].
+    """
+    query = parse_request(ZonePointsQuery)
+    if isinstance(query, tuple):
+        return query
+
+    index = get_zone_index()
+    results = []
+    for lat, lon in query.points:
+        names = [index.zones[i]["name"] for i in index.containing(lat, lon)]
+        results.append({"lat": lat, "lon": lon, "zones": names, "available": bool(names)})
+    return negotiated_response({"version": index.version, "results": results}, tables=('results',))
+
+@zones_bp.route('/intersecting', methods=['POST'])
+def zones_intersecting_bbox():
+    """
+    Find the zones intersecting a box, with the area of each inside it.
+    Expects JSON data with "bbox": [min_lat, min_lon, max_lat, max_lon].
+    """
+    query = parse_request(ZoneBBoxQuery)
+    if isinstance(query, tuple):
+        return query
+
+    index = get_zone_index()
+    rect = index.rect(*query.bbox)
+    areas = index.area_within(rect)
+    zones = [dict(zone_summary(index, i), area_within_sqft=area) for i, area in areas.items()]
+    return negotiated_response({"version": index.version, "zones": zones}, tables=('zones',))
+
+@zones_bp.route('/area', methods=['POST'])
+def available_area():
+    """
+    Total area available for storage.
+    Expects JSON data with an optional "bbox" limiting the area counted.
+    """
+    query = parse_request(ZoneAreaQuery)
+    if isinstance(query, tuple):
+        return query
+
+    index = get_zone_index()
+    if query.bbox is None:
+        total, count = float(index.areas.sum()), len(index.zones)
+    else:
+        areas = index.area_within(index.rect(*query.bbox))
+        total, count = float(sum(areas.values())), len(areas)
+    return negotiated_response({
+        "version": index.version,
+        "total_area_sqft": total,
+        "zone_count": count,
+    })
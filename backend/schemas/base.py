@@ -0,0 +1,6 @@
+# backend/schemas/base.py
+from pydantic import BaseModel, ConfigDict
+
+class DeferredModel(BaseModel):
+    """Base schema whose validator is built on first use rather than at import."""
+    model_config = ConfigDict(defer_build=True)
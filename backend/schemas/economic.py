@@ -0,0 +1,76 @@
+# backend/schemas/economic.py
+from typing import Annotated, List, Optional
+from pydantic import Field, model_validator
+from schemas.base import DeferredModel
+from schemas.storage import DemandModelInputs, Sweep, check_sweep_ranges
+from constants.hydrogen_properties import TANK_SPECS
+
+class EconomicImpactQuery(DeferredModel):
+    fleet_percentage: float = Field(ge=0, le=1)  # Fraction of flights changed to hydrogen
+    total_flights: float = Field(ge=0)           # Total flights per year
+    atlanta_fraction: float = Field(gt=0, le=1)  # Ratio of ATL flights to total flights
+    hydrogen_demand: float = Field(ge=0)         # Hydrogen demand [gal]
+    turnaround_time: float = Field(ge=0)         # Extra turnaround time per flight [min]
+    tax_credits: float                           # Tax credit [$/gal], negative if paid
+
+class EconomicImpactResult(DeferredModel):
+    utilization_h2: float
+    baseline_revenue: float
+    new_h2_revenue: float
+    total_tax_credits: float
+    revenue_drop: float
+    percent_drop: float
+    income_tax: float
+    income_tax_credits: float
+    tax_credits_compensation: float
+
+class EconomicSweepQuery(DeferredModel):
+    """EconomicImpactQuery where every parameter may also be a list or a range (evaluated as a grid)."""
+    fleet_percentage: Sweep[Annotated[float, Field(ge=0, le=1)]]
+    total_flights: Sweep[Annotated[float, Field(ge=0)]]
+    atlanta_fraction: Sweep[Annotated[float, Field(gt=0, le=1)]]
+    hydrogen_demand: Sweep[Annotated[float, Field(ge=0)]]
+    turnaround_time: Sweep[Annotated[float, Field(ge=0)]]
+    tax_credits: Sweep[float]
+
+    @model_validator(mode='after')
+    def check_ranges(self):
+        return check_sweep_ranges(self, EconomicImpactQuery)
+
+class CashFlowScenario(DeferredModel):
+    name: Optional[str] = None
+    fleet_percentage: Optional[float] = Field(default=None, ge=0, le=1)  # default: demand.slider_perc
+    total_flights: float = Field(default=100000, ge=0)     # in the first year; grows with operations
+    atlanta_fraction: float = Field(default=0.4, gt=0, le=1)
+    turnaround_time: float = Field(default=30, ge=0)       # [min]
+    tax_credits: float = 0.1                               # [$/gal]
+    tax_credit_years: Optional[int] = Field(default=None, ge=0)  # default: every year
+    discount_rate: float = Field(default=0.07, gt=-1)
+    storage_days: float = Field(default=11, gt=0, le=365)  # of each year's mean daily use
+    tank_diameter_ft: float = Field(default=TANK_SPECS['WIDTH'], gt=0)
+    tank_length_ft: float = Field(default=TANK_SPECS['LENGTH'], gt=0)
+    cost_per_sqft_construction: float = Field(default=580, ge=0)  # [$/ft^2]
+    cost_per_cuft_insulation: float = Field(default=15, ge=0)     # [$/ft^3]
+
+class CashFlowQuery(DeferredModel):
+    """Multi-year cash flows: the demand, the horizon and the scenarios to evaluate."""
+    h2_demand_cuft: Optional[float] = Field(default=None, gt=0)  # Mean daily use in start_year [ft^3]
+    demand: Optional[DemandModelInputs] = None  # ...or from the demand model
+    start_year: int = Field(default=2023, ge=2023, le=2050)
+    end_year: int = Field(default=2050, ge=2023, le=2050)
+    scenarios: List[CashFlowScenario] = Field(
+        default_factory=lambda: [CashFlowScenario()], min_length=1, max_length=1000
+    )
+    ullage: float = Field(default=TANK_SPECS['ULLAGE'], ge=0, lt=1)
+    evaporation: float = Field(default=TANK_SPECS['EVAPORATION'], gt=0, le=1)  # retained
+    include_series: bool = False  # yearly cash flow terms of every scenario
+
+    @model_validator(mode='after')
+    def check_inputs(self):
+        if (self.h2_demand_cuft is None) == (self.demand is None):
+            raise ValueError("Give exactly one of h2_demand_cuft and demand")
+        if self.end_year < self.start_year:
+            raise ValueError("end_year must not be before start_year")
+        if self.demand is None and any(s.fleet_percentage is None for s in self.scenarios):
+            raise ValueError("Give fleet_percentage for every scenario with h2_demand_cuft")
+        return self
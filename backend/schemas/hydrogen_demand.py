@@ -1,19 +1,20 @@
 # backend/schemas/hydrogen_demand.py
-from pydantic import BaseModel
+from schemas.base import DeferredModel
+from pydantic import Field
 from typing import List
 
-class AircraftDemandQuery(BaseModel):
-   slider_perc: float
-   end_year: int
+class AircraftDemandQuery(DeferredModel):
+   slider_perc: float = Field(ge=0, le=1)  # Fraction of flights changed to hydrogen
+   end_year: int = Field(ge=2023, le=2050)  # Years with projected operations
 
-class AircraftDemandResult(BaseModel):
+class AircraftDemandResult(DeferredModel):
    daily_hydrogen_demand_volume: float
 
-class GSEDemandQuery(BaseModel):
+class GSEDemandQuery(DeferredModel):
    gse: List[str] #List of GSE types (strings)
-   end_year: int
+   end_year: int = Field(ge=2023, le=2050)
 
-class TotalDemandQuery(BaseModel):
-   slider_perc: float
+class TotalDemandQuery(DeferredModel):
+   slider_perc: float = Field(ge=0, le=1)
    gse: List[str]
-   end_year: int
\ No newline at end of file
+   end_year: int = Field(ge=2023, le=2050)
@@ -0,0 +1,32 @@
+# backend/schemas/jobs.py
+from typing import Annotated, Any, Dict, List, Optional
+from pydantic import Field, field_validator
+from schemas.base import DeferredModel
+from schemas.storage import StorageCostQuery
+
+ProjectionYear = Annotated[int, Field(ge=2023, le=2050)]  # Years with TAF projections
+
+class JobSubmission(DeferredModel):
+    kind: str                                        # Registered job kind
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+class DemandSweepParams(DeferredModel):
+    slider_values: List[float] = Field(min_length=1, max_length=1000)  # Fleet fractions
+    years: List[ProjectionYear] = Field(default_factory=lambda: list(range(2023, 2051)), min_length=1)
+    gse: List[str] = Field(default_factory=list)    # GSE types included in every point
+
+class StorageMonteCarloParams(StorageCostQuery):
+    # Relative standard deviation of each input (e.g. {"tank_diameter_ft": 0.05})
+    relative_std: Dict[str, float] = Field(default_factory=dict)
+    samples: int = Field(default=100_000, gt=0, le=1_000_000)
+    seed: Optional[int] = None  # results are only cached when seeded
+
+    @field_validator('relative_std')
+    @classmethod
+    def known_inputs(cls, value):
+        unknown = set(value) - set(StorageCostQuery.model_fields)
+        if unknown:
+            raise ValueError(f"Unknown inputs: {', '.join(sorted(unknown))}")
+        if any(std < 0 for std in value.values()):
+            raise ValueError("Standard deviations must be non-negative")
+        return value
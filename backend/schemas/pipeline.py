@@ -0,0 +1,34 @@
+# backend/schemas/pipeline.py
+from typing import List, Literal, Optional
+from pydantic import Field
+from schemas.base import DeferredModel
+from constants.hydrogen_properties import TANK_SPECS
+
+PipelineStage = Literal['demand', 'storage_area', 'storage_cost', 'economic']
+
+class PipelineDemandInputs(DeferredModel):
+    slider_perc: float = Field(ge=0, le=1)  # Fraction of flights changed to hydrogen
+    gse: List[str] = Field(default_factory=list)
+    end_year: int = Field(ge=2023, le=2050)
+
+class PipelineStorageInputs(DeferredModel):
+    # Default: the tanks of the storage area stage
+    number_of_tanks: Optional[int] = Field(default=None, gt=0)
+    tank_diameter_ft: float = Field(default=TANK_SPECS['WIDTH'], gt=0)
+    tank_length_ft: float = Field(default=TANK_SPECS['LENGTH'], gt=0)
+    cost_per_sqft_construction: float = Field(default=580, ge=0)  # [$/ft^2]
+    cost_per_cuft_insulation: float = Field(default=15, ge=0)     # [$/ft^3]
+
+class PipelineEconomicInputs(DeferredModel):
+    fleet_percentage: Optional[float] = Field(default=None, ge=0, le=1)  # default: slider_perc
+    total_flights: float = Field(default=100000, ge=0)
+    atlanta_fraction: float = Field(default=0.4, gt=0, le=1)
+    turnaround_time: float = Field(default=30, ge=0)  # [min]
+    tax_credits: float = 0.1                          # [$/gal]
+
+class PipelineQuery(DeferredModel):
+    """The dashboard chain: demand -> storage area -> storage cost, and demand -> economic impact."""
+    demand: PipelineDemandInputs
+    storage: PipelineStorageInputs = Field(default_factory=PipelineStorageInputs)
+    economic: PipelineEconomicInputs = Field(default_factory=PipelineEconomicInputs)
+    targets: Optional[List[PipelineStage]] = Field(default=None, min_length=1)  # default: every stage
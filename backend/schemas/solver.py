@@ -0,0 +1,22 @@
+# backend/schemas/solver.py
+from typing import Dict, List, Literal, Optional, Tuple, Union
+from pydantic import Field, model_validator
+from schemas.base import DeferredModel
+
+# Targets solved in one request
+MAX_SOLVER_TARGETS = 10_000
+
+class SolveQuery(DeferredModel):
+    """Find the value of one input of a model at which an output reaches each target."""
+    model: Literal['demand', 'storage', 'economic']
+    output: str     # Output of the model to invert
+    solve_for: str  # Input varied
+    targets: List[float] = Field(default_factory=lambda: [0.0], min_length=1, max_length=MAX_SOLVER_TARGETS)
+    inputs: Dict[str, Union[float, List[str]]] = Field(default_factory=dict)  # The other inputs, fixed
+    bracket: Optional[Tuple[float, float]] = None  # Range of the input searched (default: its domain)
+
+    @model_validator(mode='after')
+    def check_bracket(self):
+        if self.bracket is not None and not self.bracket[0] < self.bracket[1]:
+            raise ValueError("bracket must be [low, high] with low < high")
+        return self
@@ -0,0 +1,176 @@
+# backend/schemas/storage.py
+from typing import Annotated, List, Literal, Optional, TypeVar, Union
+from pydantic import Field, model_validator
+from schemas.base import DeferredModel
+from schemas.hydrogen_demand import TotalDemandQuery
+from constants.hydrogen_properties import TANK_SPECS
+
+T = TypeVar('T')
+
+# Values per swept parameter (a range or a list)
+MAX_SWEEP_VALUES = 100_000
+
+class StorageCostQuery(DeferredModel):
+    total_h2_volume_gal: float = Field(ge=0)  # Total hydrogen volume to store [gal]
+    number_of_tanks: int = Field(gt=0)
+    tank_diameter_ft: float = Field(gt=0)
+    tank_length_ft: float = Field(gt=0)
+    cost_per_sqft_construction: float = Field(ge=0)  # [$/ft^2]
+    cost_per_cuft_insulation: float = Field(ge=0)    # [$/ft^3]
+
+class StorageCostResult(DeferredModel):
+    insulation_volume_total: float
+    insulation_cost: float
+    footprint_total: float
+    construction_cost: float
+    total_infrastructure_cost: float
+
+class ValueRange(DeferredModel):
+    """Evenly spaced values from start to stop (inclusive), by step or in num values."""
+    start: float
+    stop: float
+    step: Optional[float] = Field(default=None, gt=0)
+    num: Optional[int] = Field(default=None, ge=1, le=MAX_SWEEP_VALUES)
+
+    @model_validator(mode='after')
+    def check_spacing(self):
+        if (self.step is None) == (self.num is None):
+            raise ValueError("Give exactly one of step and num")
+        if self.stop < self.start:
+            raise ValueError("stop must not be less than start")
+        if self.step is not None and (self.stop - self.start) / self.step + 1 > MAX_SWEEP_VALUES:
+            raise ValueError(f"Ranges are limited to {MAX_SWEEP_VALUES} values")
+        return self
+
+    @property
+    def size(self):
+        if self.num is not None:
+            return self.num
+        return int((self.stop - self.start) / self.step + 1e-9) + 1
+
+Sweep = Union[T, Annotated[List[T], Field(min_length=1, max_length=MAX_SWEEP_VALUES)], ValueRange]
+
+class StorageSweepQuery(DeferredModel):
+    """StorageCostQuery where every parameter may also be a list or a range."""
+    total_h2_volume_gal: Sweep[Annotated[float, Field(ge=0)]]
+    number_of_tanks: Sweep[Annotated[int, Field(gt=0)]]
+    tank_diameter_ft: Sweep[Annotated[float, Field(gt=0)]]
+    tank_length_ft: Sweep[Annotated[float, Field(gt=0)]]
+    cost_per_sqft_construction: Sweep[Annotated[float, Field(ge=0)]]
+    cost_per_cuft_insulation: Sweep[Annotated[float, Field(ge=0)]]
+    # grid: every combination of the values; zip: the i-th value of each list
+    # (parameters with a single value apply to all)
+    mode: Literal['grid', 'zip'] = 'grid'
+
+    @model_validator(mode='after')
+    def check_ranges(self):
+        return check_sweep_ranges(self, StorageCostQuery)
+
+def check_sweep_ranges(sweep, query_model):
+    """
+    Check the ranges of a sweep query against the bounds of the single query.
+
+    Lists and scalars are checked by their element types; a range is checked
+    here, by its start and stop, and whole numbers are required in the
+    ranges of integer fields.
+    """
+    for name, field in query_model.model_fields.items():
+        value = getattr(sweep, name)
+        if not isinstance(value, ValueRange):
+            continue
+        for bound in field.metadata:
+            if getattr(bound, 'gt', None) is not None and not value.start > bound.gt:
+                raise ValueError(f"{name}: range must start above {bound.gt}")
+            if getattr(bound, 'ge', None) is not None and not value.start >= bound.ge:
+                raise ValueError(f"{name}: range must start at {bound.ge} or above")
+            if getattr(bound, 'lt', None) is not None and not value.stop < bound.lt:
+                raise ValueError(f"{name}: range must stop below {bound.lt}")
+            if getattr(bound, 'le', None) is not None and not value.stop <= bound.le:
+                raise ValueError(f"{name}: range must stop at {bound.le} or below")
+        if field.annotation is int and not (
+                value.start.is_integer() and value.stop.is_integer()
+                and (value.step is None or value.step.is_integer())
+                and (value.num is None or value.num == 1
+                     or ((value.stop - value.start) / (value.num - 1)).is_integer())):
+            raise ValueError(f"{name}: range must contain whole numbers only")
+    return sweep
+
+# Allowed diameters or lengths of a tank optimization (a range or a list)
+MAX_TANK_DIMENSIONS = 100
+
+TankDimensions = Union[
+    Annotated[List[Annotated[float, Field(gt=0)]], Field(min_length=1, max_length=MAX_TANK_DIMENSIONS)],
+    ValueRange
+]
+
+class TankOptimizationQuery(DeferredModel):
+    """Tank sizing search: the demand to store and the design constraints."""
+    h2_demand_cuft: Optional[float] = Field(default=None, gt=0)  # Daily hydrogen demand [ft^3]
+    demand: Optional[TotalDemandQuery] = None  # ...or the demand model inputs
+    storage_days: float = Field(default=1, gt=0, le=365)
+    diameters_ft: TankDimensions = ValueRange(start=6, stop=16, step=1)
+    lengths_ft: TankDimensions = ValueRange(start=20, stop=80, step=5)
+    max_tanks: int = Field(default=100, gt=0, le=1000)
+    max_footprint_sqft: Optional[float] = Field(default=None, gt=0)
+    ullage: float = Field(default=TANK_SPECS['ULLAGE'], ge=0, lt=1)
+    evaporation: float = Field(default=TANK_SPECS['EVAPORATION'], gt=0, le=1)
+    cost_per_sqft_construction: float = Field(default=580, ge=0)  # [$/ft^2]
+    cost_per_cuft_insulation: float = Field(default=15, ge=0)     # [$/ft^3]
+    # The design returned as "best": minimum cost or minimum footprint
+    objective: Literal['cost', 'footprint'] = 'cost'
+
+    @model_validator(mode='after')
+    def check_inputs(self):
+        if (self.h2_demand_cuft is None) == (self.demand is None):
+            raise ValueError("Give exactly one of h2_demand_cuft and demand")
+        for name in ('diameters_ft', 'lengths_ft'):
+            value = getattr(self, name)
+            if isinstance(value, ValueRange):
+                if not value.start > 0:
+                    raise ValueError(f"{name}: range must start above 0")
+                if value.size > MAX_TANK_DIMENSIONS:
+                    raise ValueError(f"{name}: ranges are limited to {MAX_TANK_DIMENSIONS} values")
+        return self
+
+class DemandModelInputs(DeferredModel):
+    """Inputs of the demand model other than the year."""
+    slider_perc: float = Field(ge=0, le=1)
+    gse: List[str]
+
+class InventoryScenario(DeferredModel):
+    name: Optional[str] = None
+    # Usable capacity in days of the first year's mean demand, or the total
+    # tank capacity (default: the fixed 11-day buffer)
+    storage_days: Optional[float] = Field(default=None, gt=0, le=365)
+    capacity_cuft: Optional[float] = Field(default=None, gt=0)
+    delivery_interval_days: int = Field(default=1, ge=1, le=90)
+    demand_cv: float = Field(default=0, ge=0, le=2)  # day-to-day variation of demand
+
+    @model_validator(mode='after')
+    def check_capacity(self):
+        if self.storage_days is not None and self.capacity_cuft is not None:
+            raise ValueError("Give at most one of storage_days and capacity_cuft")
+        return self
+
+class InventoryQuery(DeferredModel):
+    """Inventory simulation: the demand, the horizon and the scenarios to simulate."""
+    h2_demand_cuft: Optional[float] = Field(default=None, gt=0)  # Constant daily demand [ft^3]
+    demand: Optional[DemandModelInputs] = None  # ...or from the demand model, year by year
+    start_year: int = Field(default=2023, ge=2023, le=2050)
+    end_year: Optional[int] = Field(default=None, ge=2023, le=2050)  # default: start_year
+    scenarios: List[InventoryScenario] = Field(
+        default_factory=lambda: [InventoryScenario()], min_length=1, max_length=1000
+    )
+    ullage: float = Field(default=TANK_SPECS['ULLAGE'], ge=0, lt=1)
+    evaporation: float = Field(default=TANK_SPECS['EVAPORATION'], gt=0, le=1)  # retained per day
+    target_service_level: float = Field(default=0.99, gt=0, le=1)
+    seed: Optional[int] = None  # for demand variation
+    include_series: bool = False  # daily inventory of every scenario
+
+    @model_validator(mode='after')
+    def check_inputs(self):
+        if (self.h2_demand_cuft is None) == (self.demand is None):
+            raise ValueError("Give exactly one of h2_demand_cuft and demand")
+        if self.end_year is not None and self.end_year < self.start_year:
+            raise ValueError("end_year must not be before start_year")
+        return self
@@ -0,0 +1,67 @@
+# backend/schemas/zones.py
+from typing import List, Literal, Optional, Tuple
+from pydantic import Field, model_validator
+from schemas.base import DeferredModel
+from constants.hydrogen_properties import TANK_SPECS
+
+LatLon = Tuple[float, float]  # [lat, lon] degrees
+
+class Zone(DeferredModel):
+    """A zone of data/available_zones.json: a polygon, or a circle (radius in meters)."""
+    name: str
+    type: Literal['polygon', 'circle']
+    coordinates: Optional[List[LatLon]] = Field(default=None, min_length=3)
+    center: Optional[LatLon] = None
+    radius: Optional[float] = Field(default=None, gt=0)
+
+    @model_validator(mode='after')
+    def check_geometry(self):
+        if self.type == 'polygon' and self.coordinates is None:
+            raise ValueError("A polygon zone needs coordinates")
+        if self.type == 'circle' and (self.center is None or self.radius is None):
+            raise ValueError("A circle zone needs a center and a radius")
+        return self
+
+class PlacementQuery(DeferredModel):
+    """Tank placement: the tank footprint and what to place (default: fill the zones)."""
+    zones: Optional[List[Zone]] = Field(default=None, min_length=1, max_length=5000)  # default: the configured zones
+    tank_width_ft: float = Field(default=TANK_SPECS['WIDTH'], gt=0)
+    tank_length_ft: float = Field(default=TANK_SPECS['LENGTH'], gt=0)
+    setback_ft: float = Field(default=5, ge=0)  # clearance around each tank
+    tank_capacity_cuft: float = Field(default=TANK_SPECS['WATER_CAPACITY'], gt=0)
+    ullage: float = Field(default=TANK_SPECS['ULLAGE'], ge=0, lt=1)
+    evaporation: float = Field(default=TANK_SPECS['EVAPORATION'], gt=0, le=1)
+    number_of_tanks: Optional[int] = Field(default=None, gt=0)
+    h2_demand_cuft: Optional[float] = Field(default=None, gt=0)  # ...or the volume to store [ft^3]
+    include_placements: bool = True
+
+    @model_validator(mode='after')
+    def check_requirement(self):
+        if self.number_of_tanks is not None and self.h2_demand_cuft is not None:
+            raise ValueError("Give at most one of number_of_tanks and h2_demand_cuft")
+        return self
+
+BBox = Tuple[float, float, float, float]  # [min_lat, min_lon, max_lat, max_lon]
+
+def check_bbox(bbox):
+    if bbox is not None and (bbox[0] > bbox[2] or bbox[1] > bbox[3]):
+        raise ValueError("bbox must be [min_lat, min_lon, max_lat, max_lon]")
+
+class ZonePointsQuery(DeferredModel):
+    points: List[LatLon] = Field(min_length=1, max_length=100_000)
+
+class ZoneBBoxQuery(DeferredModel):
+    bbox: BBox
+
+    @model_validator(mode='after')
+    def check_order(self):
+        check_bbox(self.bbox)
+        return self
+
+class ZoneAreaQuery(DeferredModel):
+    bbox: Optional[BBox] = None  # count only the area inside this box (default: everywhere)
+
+    @model_validator(mode='after')
+    def check_order(self):
+        check_bbox(self.bbox)
+        return self
@@ -0,0 +1,211 @@
+"""
+Service for multi-year cash flows of hydrogen adoption scenarios.
+
+Every scenario is evaluated for every year of the horizon at once, as
+(scenarios, years) arrays. For year y of a scenario:
+
+    - the hydrogen demand is the first year's daily use scaled by the TAF
+      growth of operations (the factors of growth_rate_computation, from
+      GR_DATA), as are the total flights of the economic model
+    - storage is built out as the demand grows: enough tanks for
+      storage_days of the year's use, never fewer than in the years before;
+      the capex of the year is the storage cost (calculate_h2_storage_cost)
+      of the tanks installed by then less that of the tanks installed before
+    - the tax credits are the year's demand [gal] times the credit rate,
+      while the credit is available (tax_credit_years from the first year)
+    - the revenue drop comes from calculate_hydrogen_economic_impact
+
+    cash flow = tax credits - revenue drop - storage capex   [$]
+
+The economic model reports its tax credits in millions of dollars; they are
+converted to dollars here so that all terms share a unit. Cash flows are
+discounted to the first year: NPV = sum of CF_t / (1 + r)^t. The IRR is
+found for all scenarios together, on a grid of rates refined by bisection.
+"""
+import numpy as np
+from constants.hydrogen_properties import CONVERSION_FACTORS, GR_DATA
+from services.economic_service import calculate_hydrogen_economic_impact
+from services.storage_service import calculate_h2_storage_cost
+
+DAYS_PER_YEAR = 365
+GALLONS_PER_CUFT = 1 / 0.1337  # the storage cost model's conversion
+
+# Rates searched for the IRR: a grid, refined by bisection
+IRR_RANGE = (-0.99, 10.0)
+IRR_GRID_POINTS = 200
+IRR_ITERATIONS = 60
+
+# Inputs varying by scenario (see yearly_cash_flows)
+SCENARIO_PARAMETERS = (
+    "fleet_percentage",
+    "total_flights",
+    "atlanta_fraction",
+    "turnaround_time",
+    "tax_credits",
+    "tax_credit_years",
+    "discount_rate",
+    "storage_days",
+    "tank_diameter_ft",
+    "tank_length_ft",
+    "cost_per_sqft_construction",
+    "cost_per_cuft_insulation",
+)
+
+
+def growth_factors(years):
+    """
+    Demand growth of each year relative to 2023: 1 + the growth rate of
+    HydrogenService.growth_rate_computation, for all years at once.
+    """
+    operations = np.asarray(GR_DATA["Projected Operations"], dtype=np.float64)
+    index = np.asarray(years) - GR_DATA["Year"][0]
+    growth = (operations[index] - operations[0]) / operations[0]
+    return 1 + growth * CONVERSION_FACTORS['DELTA_PART_DOMESTIC'] * CONVERSION_FACTORS['DELTA_PART_FLIGHTS']
+
+
+def storage_capex(volume_cuft, tank_diameter_ft, tank_length_ft, cost_per_sqft_construction,
+                  cost_per_cuft_insulation, ullage, evaporation):
+    """
+    Yearly capex [$] of building storage out to the required volumes.
+
+    Args:
+        volume_cuft: (scenarios, years) storage needed in each year [ft^3]
+        Others: Per scenario, as (scenarios, 1) arrays
+
+    Returns:
+        tuple: (capex, installed tanks), both (scenarios, years)
+    """
+    usable_per_tank = np.pi / 4 * tank_diameter_ft ** 2 * tank_length_ft * (1 - ullage) * evaporation
+    tanks = np.maximum.accumulate(np.ceil(volume_cuft / usable_per_tank - 1e-9), axis=1)
+    costs = calculate_h2_storage_cost(
+        tanks * usable_per_tank * GALLONS_PER_CUFT,
+        np.maximum(tanks, 1),
+        tank_diameter_ft,
+        tank_length_ft,
+        cost_per_sqft_construction,
+        cost_per_cuft_insulation
+    )
+    installed = np.where(tanks > 0, costs["total_infrastructure_cost"], 0.0)
+    return np.diff(installed, axis=1, prepend=0.0), tanks.astype(np.int64)
+
+
+def irr_search_rates(low=IRR_RANGE[0], high=IRR_RANGE[1], points=IRR_GRID_POINTS):
+    """Rates the IRR search starts from: evenly spaced in log(1 + rate)."""
+    return np.expm1(np.linspace(np.log1p(low), np.log1p(high), points))
+
+
+def net_present_value(cash_flows, rate):
+    """NPV at the start of the first year of (scenarios, years) cash flows, per scenario."""
+    rate = np.asarray(rate, dtype=np.float64).reshape(-1, 1)
+    t = np.arange(cash_flows.shape[1])
+    return (cash_flows / (1 + rate) ** t).sum(axis=1)
+
+
+def internal_rate_of_return(cash_flows, rates=None, iterations=IRR_ITERATIONS):
+    """
+    Rate at which the NPV is zero, per scenario (NaN if there is none in the
+    searched range, e.g. when no cash flow is positive).
+
+    The NPV of every scenario is evaluated on a grid of rates; where it
+    changes sign more than once (cash flows changing sign several times),
+    the crossing closest to a zero rate is kept. All scenarios are then
+    bisected together within their grid intervals.
+    """
+    if rates is None:
+        rates = irr_search_rates()
+    count = len(cash_flows)
+    t = np.arange(cash_flows.shape[1])
+    npv = cash_flows @ ((1 + rates)[None, :] ** -t[:, None])  # (scenarios, rates)
+    crossing = np.sign(npv[:, :-1]) != np.sign(npv[:, 1:])
+    distance = np.where(crossing, np.abs(rates[:-1] + rates[1:]), np.inf)
+    interval = np.argmin(distance, axis=1)
+    found = crossing[np.arange(count), interval]
+
+    low, high = rates[interval], rates[interval + 1]
+    npv_low = npv[np.arange(count), interval]
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        npv_middle = net_present_value(cash_flows, middle)
+        same = np.sign(npv_middle) == np.sign(npv_low)
+        low = np.where(same, middle, low)
+        npv_low = np.where(same, npv_middle, npv_low)
+        high = np.where(same, high, middle)
+    return np.where(found, (low + high) / 2, np.nan)
+
+
+def payback_years(cumulative, years):
+    """First year from which the cumulative cash flow stays non-negative (None if it ends negative)."""
+    negative = cumulative < 0
+    last_negative = np.where(negative.any(axis=1),
+                             negative.shape[1] - 1 - np.argmax(negative[:, ::-1], axis=1), -1)
+    return [years[i + 1] if i + 1 < len(years) else None for i in last_negative]
+
+
+def yearly_cash_flows(
+    years,                  # Years of the horizon, consecutive
+    daily_demand_cuft,      # Mean daily hydrogen use in the first year [ft^3]
+    scenarios,              # Arrays of SCENARIO_PARAMETERS, one value per scenario
+    ullage=0.05,            # Fraction of a tank taken by gaseous hydrogen
+    evaporation=0.9925      # Fraction of the liquid retained
+):
+    """
+    Annual cash flows, NPV and IRR of every scenario.
+
+    tax_credit_years may be inf for credits over the whole horizon.
+
+    Returns:
+        dict: Per-year values common to all scenarios ("years", "growth",
+        "demand_gal"), per-scenario totals ("scenarios"), and the
+        (scenarios, years) arrays of each cash flow term ("series")
+    """
+    years = list(years)
+    p = {name: np.asarray(scenarios[name], dtype=np.float64).reshape(-1, 1) for name in SCENARIO_PARAMETERS}
+    growth = growth_factors(years)
+    scale = growth / growth[0]
+    daily = daily_demand_cuft * scale
+    demand_gal = daily * DAYS_PER_YEAR * GALLONS_PER_CUFT
+    t = np.arange(len(years))
+
+    capex, tanks = storage_capex(
+        p["storage_days"] * daily, p["tank_diameter_ft"], p["tank_length_ft"],
+        p["cost_per_sqft_construction"], p["cost_per_cuft_insulation"], ullage, evaporation
+    )
+    credit_rate = np.where(t < p["tax_credit_years"], p["tax_credits"], 0.0)
+    impact = calculate_hydrogen_economic_impact(
+        p["fleet_percentage"],
+        p["total_flights"] * scale,
+        p["atlanta_fraction"],
+        demand_gal,
+        p["turnaround_time"],
+        credit_rate
+    )
+    tax_credits = impact["total_tax_credits"] * 1_000_000  # [$M] -> [$]
+    revenue_drop = np.broadcast_to(impact["revenue_drop"], capex.shape)
+    cash_flow = tax_credits - revenue_drop - capex
+    cumulative = np.cumsum(cash_flow, axis=1)
+    discounted = cash_flow / (1 + p["discount_rate"]) ** t
+
+    return {
+        "years": years,
+        "growth": growth,
+        "demand_gal": demand_gal,
+        "scenarios": {
+            "npv": discounted.sum(axis=1),
+            "irr": internal_rate_of_return(cash_flow),
+            "total_cash_flow": cumulative[:, -1],
+            "total_tax_credits": tax_credits.sum(axis=1),
+            "total_revenue_drop": revenue_drop.sum(axis=1),
+            "total_capex": capex.sum(axis=1),
+            "final_tanks": tanks[:, -1],
+            "payback_year": payback_years(cumulative, years),
+        },
+        "series": {
+            "cash_flow": cash_flow,
+            "discounted_cash_flow": discounted,
+            "cumulative_cash_flow": cumulative,
+            "tax_credits": tax_credits,
+            "revenue_drop": revenue_drop,
+            "capex": capex,
+            "tanks": tanks,
+        },
+    }
@@ -2,7 +2,18 @@
 Service for economic impact calculations.
 Contains the business logic for calculating economic impacts of hydrogen adoption.
 """
-import pandas as pd
+import numpy as np
+
+# Part of the result cache key: bump when the calculation changes
+MODEL_VERSION = 1
+
+def percent_of(part, whole):
+    """100 * part / whole, and 0 where whole is 0 (scalars or arrays)."""
+    if np.ndim(part) == 0 and np.ndim(whole) == 0:
+        return 100 * (part / whole) if whole else 0.0
+    whole = np.asarray(whole, dtype=np.float64)
+    nonzero = whole != 0
+    return np.where(nonzero, 100 * (part / np.where(nonzero, whole, 1.0)), 0.0)
 
 def calculate_hydrogen_economic_impact(
     fleet_percentage,     # Fraction of flights changed to hydrogen
@@ -47,8 +58,8 @@ def calculate_hydrogen_economic_impact(
     # Revenue drop = (baseline - new)
     revenue_drop = (baseline_revenue - new_h2_revenue) 
 
-    # Percentage drop in revenue
-    pct_drop = 100 * (revenue_drop / baseline_revenue)
+    # Percentage drop in revenue (none without baseline revenue, e.g. a 0% fleet)
+    pct_drop = percent_of(revenue_drop, baseline_revenue)
     
     # Income tax calculations
     income_tax_portion = (fleet_percentage * income_tax) / 1_000_000
@@ -58,13 +69,113 @@ def calculate_hydrogen_economic_impact(
     tax_credits_compensation = total_tax_crd - revenue_drop
 
     return {
-        "utilization_h2": float(utilization_h2),
-        "baseline_revenue": float(baseline_revenue),
-        "new_h2_revenue": float(new_h2_revenue),
-        "total_tax_credits": float(total_tax_crd),
-        "revenue_drop": float(revenue_drop),
-        "percent_drop": float(pct_drop),
-        "income_tax": float(income_tax_portion),
-        "income_tax_credits": float(income_tax_credits),
-        "tax_credits_compensation": float(tax_credits_compensation)
-    }
\ No newline at end of file
+        "utilization_h2": utilization_h2,
+        "baseline_revenue": baseline_revenue,
+        "new_h2_revenue": new_h2_revenue,
+        "total_tax_credits": total_tax_crd,
+        "revenue_drop": revenue_drop,
+        "percent_drop": pct_drop,
+        "income_tax": income_tax_portion,
+        "income_tax_credits": income_tax_credits,
+        "tax_credits_compensation": tax_credits_compensation
+    }
+
+# Inputs of calculate_hydrogen_economic_impact, in order
+ECONOMIC_PARAMETERS = (
+    "fleet_percentage",
+    "total_flights",
+    "atlanta_fraction",
+    "hydrogen_demand",
+    "turnaround_time",
+    "tax_credits",
+)
+
+def economic_impact_grid(parameters):
+    """
+    Evaluate the economic model over every combination of the inputs.
+    
+    Each parameter varies along its own axis and broadcasting evaluates the
+    whole grid in one call. Outputs are flattened in C order over the axes
+    (the last parameter varies fastest), so the inputs of a point follow
+    from its index and the axes and are not repeated.
+    
+    Args:
+        parameters: 1-D arrays of values keyed by ECONOMIC_PARAMETERS
+        
+    Returns:
+        dict: "shape", "points", "axes" (the values of each parameter),
+        "results" (one flat array per output), "break_even" (see
+        break_even_points) and "break_even_tax_credits"
+    
+    The revenue drop does not depend on the tax credit and the credits are
+    linear in it, so the tax credit [$/gal] that exactly compensates the
+    drop is also given in closed form, flattened over the grid without the
+    tax_credits axis (NaN where there is no hydrogen demand).
+    """
+    axes = {name: np.asarray(parameters[name], dtype=np.float64).ravel() for name in ECONOMIC_PARAMETERS}
+    ndim = len(axes)
+    inputs = {
+        name: values.reshape([-1 if axis == i else 1 for axis in range(ndim)])
+        for i, (name, values) in enumerate(axes.items())
+    }
+    outputs = calculate_hydrogen_economic_impact(**inputs)
+
+    shape = tuple(len(values) for values in axes.values())
+    results = {name: np.broadcast_to(values, shape) for name, values in outputs.items()}
+    drop = np.broadcast_to(outputs["revenue_drop"], shape)[..., 0]
+    demand = np.broadcast_to(inputs["hydrogen_demand"][..., 0], drop.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        break_even_credit = np.where(demand > 0, 1_000_000 * drop / demand, np.nan)
+    return {
+        "shape": list(shape),
+        "points": int(np.prod(shape, dtype=np.int64)),
+        "axes": axes,
+        "results": {name: values.ravel() for name, values in results.items()},
+        "break_even": break_even_points(axes, results["tax_credits_compensation"]),
+        "break_even_tax_credits": break_even_credit.ravel(),
+    }
+
+def break_even_points(axes, compensation):
+    """
+    Points where tax credits exactly compensate the revenue drop.
+    
+    Along every grid edge (neighbouring points on one axis) whose ends have
+    opposite signs of compensation, the crossing is interpolated linearly;
+    these are the vertices of the break-even contour (surface) through the
+    grid. Grid points where the compensation is exactly zero are included.
+    
+    Returns:
+        dict: One array per parameter (the crossing coordinates) and "axis"
+        (the parameter the crossing was interpolated along, or None for grid
+        points)
+    """
+    names = list(axes)
+    grids = np.meshgrid(*axes.values(), indexing='ij', sparse=True)
+    columns = {name: [] for name in names}
+    along = []
+
+    zero = np.nonzero(compensation == 0)
+    for name, grid in zip(names, grids):
+        columns[name].append(np.broadcast_to(grid, compensation.shape)[zero])
+    along.extend([None] * len(zero[0]))
+
+    for axis, name in enumerate(names):
+        if compensation.shape[axis] < 2:
+            continue
+        low = [slice(None)] * compensation.ndim
+        high = [slice(None)] * compensation.ndim
+        low[axis], high[axis] = slice(None, -1), slice(1, None)
+        c0, c1 = compensation[tuple(low)], compensation[tuple(high)]
+        crossing = np.nonzero(c0 * c1 < 0)
+        t = c0[crossing] / (c0[crossing] - c1[crossing])
+        for other, grid in zip(names, grids):
+            if other == name:
+                values = axes[name]
+                columns[other].append(values[crossing[axis]] + t * np.diff(values)[crossing[axis]])
+            else:
+                columns[other].append(np.broadcast_to(grid, compensation.shape)[tuple(low)][crossing])
+        along.extend([name] * len(t))
+
+    points = {name: np.concatenate(values) if values else np.empty(0) for name, values in columns.items()}
+    points["axis"] = along
+    return points
@@ -1,17 +1,28 @@
 # backend/services/hydrogen_service.py
-import pandas as pd
-import numpy as np
 import logging
+import numpy as np
 from repositories.aircraft_repository import AircraftRepository
 from repositories.gse_repository import GSERepository
 from constants.hydrogen_properties import GR_DATA, CONVERSION_FACTORS, TANK_SPECS
 
 logger = logging.getLogger(__name__)
 
+# Projected operations keyed by year
+PROJECTED_OPERATIONS = dict(zip(GR_DATA["Year"], GR_DATA["Projected Operations"]))
+
 class HydrogenService:
-    def __init__(self, aircraft_repo: AircraftRepository, gse_repo: GSERepository):
+    def __init__(self, aircraft_repo: AircraftRepository, gse_repo: GSERepository,
+                 reference_data=None):
+        """
+        Args:
+            aircraft_repo: Aircraft data repository
+            gse_repo: GSE data repository
+            reference_data: Optional preloaded ReferenceData; when given, the
+                datasets are read from its arrays instead of the repositories
+        """
         self.aircraft_repo = aircraft_repo
         self.gse_repo = gse_repo
+        self.reference_data = reference_data
 
     def growth_rate_computation(self, end_year):
         """
@@ -22,11 +33,9 @@ class HydrogenService:
         2. Calculate growth from 2023 to target year
         3. Apply Delta and domestic flight factors
         """
-        growth_rate = pd.DataFrame(GR_DATA)
-        
         # Get operations for start and end year
-        ops_start = growth_rate.loc[growth_rate["Year"] == 2023, "Projected Operations"].values[0]
-        ops_projected = growth_rate.loc[growth_rate["Year"] == end_year, "Projected Operations"].values[0]
+        ops_start = PROJECTED_OPERATIONS[2023]
+        ops_projected = PROJECTED_OPERATIONS[end_year]
         
         # Calculate growth and apply factors
         growth = (ops_projected - ops_start) / ops_start
@@ -36,6 +45,57 @@ class HydrogenService:
         
         return growth_delta_atl
 
+    def total_fuel_weight(self, slider_perc, end_year):
+        """
+        Total fuel weight [lbs] of the July domestic aircraft records.
+        
+        Returns:
+            float: Fuel weight, or None if there are no records
+        """
+        if self.reference_data is not None:
+            aircraft = self.reference_data.aircraft
+            if len(aircraft.fuel_consumption) == 0:
+                return None
+            return float(aircraft.fuel_consumption @ aircraft.air_time) / 60
+
+        aircraft_data = self.aircraft_repo.get_aircraft_data(end_year, slider_perc)
+        logger.debug("Retrieved %d aircraft records", len(aircraft_data))
+        
+        if not aircraft_data:
+            return None
+        
+        return sum(
+            aircraft.fuel_consumption * aircraft.air_time / 60
+            for aircraft in aircraft_data
+        )
+
+    def gse_records(self, gse_types):
+        """
+        Return (type, fuel_used, usable_fuel_consumption_ft3_min,
+        operating_time_departure, operating_time_arrival) for the selected GSE.
+        """
+        if self.reference_data is not None:
+            gse = self.reference_data.gse
+            selected = np.flatnonzero(np.isin(gse.names, list(gse_types)))
+            return list(zip(
+                gse.names[selected].tolist(),
+                gse.fuel_used[selected].tolist(),
+                gse.usable_fuel_consumption_ft3_min[selected].tolist(),
+                gse.operating_time_departure[selected].tolist(),
+                gse.operating_time_arrival[selected].tolist()
+            ))
+
+        return [
+            (
+                gse.ground_support_equipment,
+                gse.fuel_used,
+                gse.usable_fuel_consumption_ft3_min,
+                gse.operating_time_departure,
+                gse.operating_time_arrival
+            )
+            for gse in self.gse_repo.get_gse_by_equipment_type(gse_types)
+        ]
+
     def calculate_aircraft_hydrogen_demand(self, slider_perc, end_year):
         """
         Calculate hydrogen demand for aircraft.
@@ -47,44 +107,37 @@ class HydrogenService:
         4. Convert to hydrogen weight and volume
         5. Add buffer storage
         """
-        # Get aircraft data
-        aircraft_data = self.aircraft_repo.get_aircraft_data(end_year, slider_perc)
-        logger.debug(f"Retrieved {len(aircraft_data)} aircraft records")
+        # Get aircraft data and calculate total fuel weight
+        fuel_weight = self.total_fuel_weight(slider_perc, end_year)
         
-        if not aircraft_data:
+        if fuel_weight is None:
             logger.warning("No aircraft data found")
             return 0.0
-        
-        # Calculate total fuel weight
-        fuel_weight = sum(
-            aircraft.fuel_consumption * aircraft.air_time / 60
-            for aircraft in aircraft_data
-        )
-        logger.debug(f"Total fuel weight: {fuel_weight}")
+        logger.debug("Total fuel weight: %s", fuel_weight)
         
         # Apply slider percentage and growth
         fuel_weight_user = slider_perc * fuel_weight
-        logger.debug(f"User fuel weight (after slider): {fuel_weight_user}")
+        logger.debug("User fuel weight (after slider): %s", fuel_weight_user)
         
         growth = self.growth_rate_computation(end_year)
-        logger.debug(f"Growth rate: {growth}")
+        logger.debug("Growth rate: %s", growth)
         
         fuel_weight_projected = fuel_weight_user * (1 + growth)
-        logger.debug(f"Projected fuel weight: {fuel_weight_projected}")
+        logger.debug("Projected fuel weight: %s", fuel_weight_projected)
         
         # Convert to hydrogen
         h2_weight = fuel_weight_projected / CONVERSION_FACTORS['JETA_TO_H2']
-        logger.debug(f"H2 weight: {h2_weight}")
+        logger.debug("H2 weight: %s", h2_weight)
         
         h2_vol = h2_weight / CONVERSION_FACTORS['H2_DENSITY']
-        logger.debug(f"H2 volume: {h2_vol}")
+        logger.debug("H2 volume: %s", h2_vol)
         
         # Add buffer
         daily_buffer = h2_vol / 31
         h2_demand_vol = h2_vol + (daily_buffer * 11)  # 11 days buffer
         h2_demand_vol_day = h2_demand_vol / 31
         
-        logger.debug(f"Daily H2 demand volume: {h2_demand_vol_day}")
+        logger.debug("Daily H2 demand volume: %s", h2_demand_vol_day)
         return h2_demand_vol_day
 
     def calculate_gse_hydrogen_demand(self, gse_types, end_year):
@@ -97,22 +150,22 @@ class HydrogenService:
         3. Apply growth factor
         4. Add buffer storage
         """
-        gse_data = self.gse_repo.get_gse_by_equipment_type(gse_types)
+        gse_data = self.gse_records(gse_types)
         
         hydrogen_tot_per_cycle = 0
         gse_details = []
         
-        for gse in gse_data:
+        for gse_type, fuel_used, fuel_consumption, time_departure, time_arrival in gse_data:
             # Calculate fuel volume per vehicle
             fuel_vol_per_vehicle = (
-                gse.usable_fuel_consumption_ft3_min * 
-                (gse.operating_time_departure + gse.operating_time_arrival)
+                fuel_consumption * 
+                (time_departure + time_arrival)
             )
             
             # Convert to hydrogen based on fuel type
-            if gse.fuel_used == "Diesel":
+            if fuel_used == "Diesel":
                 hydrogen_volume = fuel_vol_per_vehicle / CONVERSION_FACTORS['DIESEL_TO_H2']
-            elif gse.fuel_used == "Gasoline":
+            elif fuel_used == "Gasoline":
                 hydrogen_volume = fuel_vol_per_vehicle / CONVERSION_FACTORS['GASOLINE_TO_H2']
             else:
                 hydrogen_volume = 0
@@ -120,9 +173,9 @@ class HydrogenService:
             hydrogen_tot_per_cycle += hydrogen_volume
             
             gse_details.append({
-                "type": gse.ground_support_equipment,
-                "fuel_used": gse.fuel_used,
-                "hydrogen_volume": float(hydrogen_volume)
+                "type": gse_type,
+                "fuel_used": fuel_used,
+                "hydrogen_volume": hydrogen_volume
             })
         
         # Apply growth and calculate total demand
@@ -137,8 +190,8 @@ class HydrogenService:
         daily_h2_demand_vol_gse = h2_demand_vol_gse / 31
         
         return {
-            "daily_h2_demand_vol_gse": float(daily_h2_demand_vol_gse),
-            "total_h2_demand_vol_gse": float(h2_demand_vol_gse),
+            "daily_h2_demand_vol_gse": daily_h2_demand_vol_gse,
+            "total_h2_demand_vol_gse": h2_demand_vol_gse,
             "gse_details": gse_details
         }
 
@@ -158,4 +211,4 @@ class HydrogenService:
         area_tank = TANK_SPECS['WIDTH'] * TANK_SPECS['LENGTH']
         area_tot = area_tank * nbr_tanks
         
-        return float(area_tot)
\ No newline at end of file
+        return area_tot
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+Service for simulating liquid hydrogen inventory day by day.
+
+Each scenario has a usable storage capacity, which is the tank capacity less
+the ullage. A tanker delivery every delivery_interval_days tops the
+inventory up to capacity, before that day's demand. Each day:
+
+    1. on delivery days, the inventory is topped up to capacity
+    2. the day's demand is served from the inventory (what is missing is
+       unmet, and the day is a stockout day)
+    3. overnight the boil-off fraction of what is left evaporates
+
+Deliveries reset the inventory, so every delivery cycle can be solved on
+its own. Starting a cycle with capacity C, day j of the cycle (j = 0 on the
+delivery day) is fully served exactly when C >= P_j, where
+
+    P_j = sum over i <= j of d_i / (1 - b)^i
+
+for demand d_i and boil-off b. The inventory on hand before serving day j
+is max(0, (1 - b)^j (C - P_(j-1))). Every day of every scenario is
+therefore computed at once from cumulative sums, with no loop over days.
+The stockout days at capacity C are the days with P_j > C. The smallest
+capacity that meets a service level is an order statistic of P (np.partition).
+"""
+import numpy as np
+
+DAYS_PER_YEAR = 365
+# The demand service's daily volumes include an 11-day buffer on a 31-day
+# month; dividing by this gives the hydrogen actually used per day
+DEMAND_BUFFER_FACTOR = (31 + 11) / 31
+
+
+def demand_series(yearly_demand, scenarios, cv=0.0, seed=None):
+    """
+    Daily demand [ft^3] of each scenario: each year's mean daily demand
+    repeated over the year, with lognormal day-to-day noise of the given
+    coefficient of variation (per scenario).
+
+    Returns:
+        (scenarios, days) array
+    """
+    days = np.repeat(np.asarray(yearly_demand, dtype=np.float64), DAYS_PER_YEAR)
+    demand = np.broadcast_to(days, (scenarios, len(days)))
+    cv = np.broadcast_to(np.asarray(cv, dtype=np.float64), (scenarios,))
+    if not np.any(cv > 0):
+        return demand
+    sigma = np.sqrt(np.log1p(cv ** 2))[:, None]
+    noise = np.random.default_rng(seed).standard_normal(demand.shape)
+    return demand * np.exp(sigma * noise - sigma ** 2 / 2)  # mean-preserving
+
+
+def cycle_positions(days, delivery_interval_days):
+    """Day within the delivery cycle of every day, as a (scenarios, days) array."""
+    interval = np.asarray(delivery_interval_days, dtype=np.int64)[:, None]
+    return np.arange(days)[None, :] % interval
+
+
+def cycle_requirements(demand, delivery_interval_days, boil_off):
+    """
+    P_j for every day: the capacity needed at the cycle start to serve the
+    cycle up to and including that day.
+    """
+    position = cycle_positions(demand.shape[1], delivery_interval_days)
+    weighted = demand / (1 - boil_off) ** position
+    total = np.cumsum(weighted, axis=1)
+    # Totals before each cycle's first day, carried over the cycle (they never decrease)
+    before = np.maximum.accumulate(np.where(position == 0, total - weighted, 0.0), axis=1)
+    return total - before, position
+
+
+def simulate_inventory(demand, capacity, delivery_interval_days, boil_off):
+    """
+    Simulate the inventory of every scenario over the horizon.
+
+    Args:
+        demand: (scenarios, days) daily demand [ft^3].
+        capacity: Usable capacity per scenario [ft^3].
+        delivery_interval_days: Days between deliveries per scenario.
+        boil_off: Fraction of the inventory lost per day.
+
+    Returns:
+        dict: Per-scenario totals and the (scenarios, days) inventory left
+        at the end of each day, and the cycle requirements P
+    """
+    capacity = np.asarray(capacity, dtype=np.float64)[:, None]
+    requirement, position = cycle_requirements(demand, delivery_interval_days, boil_off)
+    previous = np.where(position == 0, 0.0, np.roll(requirement, 1, axis=1))
+    retained = (1 - boil_off) ** position
+
+    on_hand = np.maximum(retained * (capacity - previous), 0.0)  # before serving
+    served = np.minimum(on_hand, demand)
+    left = on_hand - served
+    lost = left * boil_off
+    # Deliveries top up whatever is left from the previous night
+    carried = np.concatenate((np.zeros((len(demand), 1)), (left - lost)[:, :-1]), axis=1)
+    delivered = np.where(position == 0, capacity - carried, 0.0)
+
+    shortfall = demand - served
+    stockout = shortfall > 1e-9 * np.maximum(demand, 1.0)
+    days = demand.shape[1]
+    total_demand = demand.sum(axis=1)
+    return {
+        "stockout_days": stockout.sum(axis=1),
+        "service_level": 1 - stockout.sum(axis=1) / days,
+        "fill_rate": np.divide(served.sum(axis=1), total_demand,
+                               out=np.ones(len(demand)), where=total_demand > 0),
+        "demand_cuft": total_demand,
+        "unmet_cuft": shortfall.sum(axis=1),
+        "boil_off_cuft": lost.sum(axis=1),
+        "delivered_cuft": delivered.sum(axis=1),
+        "deliveries": (position == 0).sum(axis=1),
+        "mean_inventory_cuft": left.mean(axis=1),
+        "min_inventory_cuft": left.min(axis=1),
+        "final_inventory_cuft": left[:, -1] - lost[:, -1],
+        "inventory": left - lost,
+        "requirement": requirement,
+    }
+
+
+def required_capacity(requirement, service_level):
+    """
+    Smallest usable capacity per scenario with a day service level of at
+    least service_level (stockout days / days <= 1 - service_level).
+    """
+    days = requirement.shape[1]
+    allowed = int(np.floor((1 - service_level) * days + 1e-9))
+    if allowed >= days:
+        return np.zeros(len(requirement))
+    return -np.partition(-requirement, allowed, axis=1)[:, allowed]
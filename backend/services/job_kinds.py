@@ -0,0 +1,142 @@
+# backend/services/job_kinds.py
+"""
+Job kinds run by the background job queue (see utils/jobs.py).
+
+Each kind takes its validated parameters and a JobContext, reports progress
+as it goes and checks for cancellation between units of work.
+"""
+import logging
+
+import numpy as np
+
+from repositories.aircraft_repository import AircraftRepository
+from repositories.gse_repository import GSERepository
+from schemas.jobs import DemandSweepParams, StorageMonteCarloParams
+from services.hydrogen_service import HydrogenService
+from services.storage_service import calculate_h2_storage_cost, MODEL_VERSION as STORAGE_MODEL_VERSION
+from utils.database import get_aircraft_db_session, get_gse_db_session
+from utils.jobs import job_kind
+from utils.reference_data import data_version, get_reference_data
+
+logger = logging.getLogger(__name__)
+
+# Monte Carlo samples evaluated between progress reports
+MONTE_CARLO_CHUNK = 50_000
+MONTE_CARLO_PERCENTILES = (5, 50, 95)
+
+
+def reference_data_version(params):
+    return data_version()
+
+
+@job_kind('demand_sweep', DemandSweepParams, version=reference_data_version, tables=('results',),
+          streams_rows=True)
+def demand_sweep(params, context):
+    """
+    Total hydrogen demand for every (fleet fraction, year) combination.
+
+    All fleet fractions of a year are evaluated as one array, and each year's
+    rows are streamed to subscribers as soon as they are computed.
+    """
+    aircraft_sessions = get_aircraft_db_session()
+    gse_sessions = get_gse_db_session()
+    try:
+        service = HydrogenService(
+            AircraftRepository(next(aircraft_sessions)),
+            GSERepository(next(gse_sessions)),
+            reference_data=get_reference_data()
+        )
+        sliders = np.asarray(params.slider_values, dtype=np.float64)
+        columns = {name: [] for name in ("slider_perc", "end_year", "aircraft_demand", "gse_demand")}
+        peak = 0.0
+        for i, year in enumerate(params.years):
+            context.check_cancelled()
+            aircraft = np.broadcast_to(
+                service.calculate_aircraft_hydrogen_demand(sliders, year), sliders.shape
+            )
+            gse = service.calculate_gse_hydrogen_demand(params.gse, year)["total_h2_demand_vol_gse"]
+            rows = {
+                "slider_perc": sliders,
+                "end_year": np.full(len(sliders), year, dtype=np.int32),
+                "aircraft_demand": aircraft,
+                "gse_demand": np.full(len(sliders), gse, dtype=np.float64),
+            }
+            for name, values in rows.items():
+                columns[name].append(values)
+            context.rows(dict(rows, total_demand=aircraft + gse))
+            peak = max(peak, float((aircraft + gse).max()))
+            context.progress((i + 1) / len(params.years), {"years_done": i + 1, "peak_total_demand": peak})
+    finally:
+        aircraft_sessions.close()
+        gse_sessions.close()
+
+    results = {name: np.concatenate(parts) for name, parts in columns.items()}
+    results["total_demand"] = results["aircraft_demand"] + results["gse_demand"]
+    return {"points": len(results["total_demand"]), "results": results}
+
+
+def storage_monte_carlo_version(params):
+    # Unseeded runs are not reproducible, so their results are never reused
+    return STORAGE_MODEL_VERSION if params.seed is not None else None
+
+
+@job_kind('storage_monte_carlo', StorageMonteCarloParams, version=storage_monte_carlo_version,
+          tables=('summary',))
+def storage_monte_carlo(params, context):
+    """
+    Distribution of storage costs under uncertain inputs.
+
+    Each input listed in relative_std is drawn from a normal distribution
+    around its nominal value (clipped to stay positive; tank counts are
+    rounded); the others stay fixed. Samples are evaluated in chunks with
+    the vectorized cost model.
+    """
+    rng = np.random.default_rng(params.seed)
+    nominal = {name: getattr(params, name) for name in
+               ("total_h2_volume_gal", "number_of_tanks", "tank_diameter_ft", "tank_length_ft",
+                "cost_per_sqft_construction", "cost_per_cuft_insulation")}
+
+    outputs = {}
+    done = 0
+    total_sum = total_sq_sum = 0.0
+    while done < params.samples:
+        context.check_cancelled()
+        n = min(MONTE_CARLO_CHUNK, params.samples - done)
+        inputs = {}
+        for name, value in nominal.items():
+            std = params.relative_std.get(name, 0.0)
+            if std == 0:
+                inputs[name] = np.full(n, float(value))
+                continue
+            draws = rng.normal(value, abs(value) * std, n)
+            if name == "number_of_tanks":
+                draws = np.maximum(np.rint(draws), 1.0)
+            elif name in ("tank_diameter_ft", "tank_length_ft"):
+                draws = np.maximum(draws, 1e-6)
+            else:
+                draws = np.maximum(draws, 0.0)
+            inputs[name] = draws
+        for name, values in calculate_h2_storage_cost(**inputs).items():
+            outputs.setdefault(name, []).append(values)
+        done += n
+
+        total = outputs["total_infrastructure_cost"][-1]
+        total_sum += float(total.sum())
+        total_sq_sum += float(np.square(total).sum())
+        mean = total_sum / done
+        context.progress(done / params.samples, {
+            "samples_done": done,
+            "total_cost_mean": mean,
+            "total_cost_std": max(total_sq_sum / done - mean ** 2, 0.0) ** 0.5,
+        })
+
+    summary = {"output": [], "mean": [], "std": []}
+    summary.update({f"p{q}": [] for q in MONTE_CARLO_PERCENTILES})
+    for name, parts in outputs.items():
+        values = np.concatenate(parts)
+        summary["output"].append(name)
+        summary["mean"].append(float(values.mean()))
+        summary["std"].append(float(values.std()))
+        for q, value in zip(MONTE_CARLO_PERCENTILES, np.percentile(values, MONTE_CARLO_PERCENTILES)):
+            summary[f"p{q}"].append(float(value))
+    return {"samples": params.samples, "seed": params.seed, "summary": summary}
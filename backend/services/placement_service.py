@@ -0,0 +1,247 @@
+"""
+Service for placing storage tanks in the available airport zones.
+
+Each zone is projected to a planar frame in feet (see utils/geo.py) and
+packed with rectangular tank footprints, each kept a setback away from the
+zone boundary and from the other tanks. The packer is a shelf heuristic:
+rows of tanks (long side along the row) are laid in bands across the zone,
+and every band holds as many tanks as fit in the parts of it lying wholly
+inside the zone. A few orientations (the axes and the zone's longest edges)
+and two row phases are tried, keeping the one that fits the most tanks.
+
+For convex zones (and circles) the inside of a band is found for all bands
+at once from the edge crossings; other polygons are handled band by band.
+"""
+import math
+
+import numpy as np
+
+from utils.geo import is_convex, rotate, unproject
+
+# Zone edges whose directions are tried as row orientations (besides the axes)
+ORIENTATION_EDGES = 2
+
+
+def _edge_crossings(polygon, y):
+    """x of the edges crossing each line y, as a (lines, edges) array (NaN: no crossing)."""
+    p, q = polygon, np.roll(polygon, -1, axis=0)
+    y = np.asarray(y, dtype=np.float64)[:, None]
+    y1, y2 = p[:, 1], q[:, 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = (y - y1) / (y2 - y1)
+    hit = (t >= 0) & (t <= 1)
+    return np.where(hit, p[:, 0] + t * (q[:, 0] - p[:, 0]), np.nan)
+
+
+def _convex_bands(polygon, y_low, y_high):
+    """Inside interval of every band of a convex polygon: (band, a, b) arrays."""
+    extents = []
+    for y in (y_low, y_high):
+        x = _edge_crossings(polygon, y)
+        missing = np.isnan(x)
+        extents.append((np.where(missing, np.inf, x).min(axis=1), np.where(missing, -np.inf, x).max(axis=1)))
+    a = np.maximum(extents[0][0], extents[1][0])
+    b = np.minimum(extents[0][1], extents[1][1])
+    band = np.nonzero(a < b)[0]
+    return band, a[band], b[band]
+
+
+def _line_intervals(polygon, y):
+    """Inside intervals of a polygon along the line y (even-odd rule)."""
+    p, q = polygon, np.roll(polygon, -1, axis=0)
+    y1, y2 = p[:, 1], q[:, 1]
+    crossing = (y1 <= y) != (y2 <= y)
+    x = np.sort(p[crossing, 0] + (y - y1[crossing]) / (y2[crossing] - y1[crossing])
+                * (q[crossing, 0] - p[crossing, 0]))
+    return list(zip(x[::2], x[1::2]))
+
+
+def _intersect(intervals, others):
+    result, i, j = [], 0, 0
+    while i < len(intervals) and j < len(others):
+        a = max(intervals[i][0], others[j][0])
+        b = min(intervals[i][1], others[j][1])
+        if a < b:
+            result.append((a, b))
+        if intervals[i][1] < others[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def _general_bands(polygon, y_low, y_high):
+    """Inside intervals of every band of any simple polygon: (band, a, b) arrays."""
+    eps = 1e-9 * (np.ptp(polygon[:, 1]) + 1)
+    vertex_y = np.sort(polygon[:, 1])
+    bands, starts, stops = [], [], []
+    for k, (low, high) in enumerate(zip(y_low, y_high)):
+        # The boundary is linear between these lines, so being inside on all
+        # of them means being inside across the whole band
+        inner = vertex_y[(vertex_y > low) & (vertex_y < high)]
+        lines = [low + eps, high - eps]
+        lines.extend(inner - eps)
+        lines.extend(inner + eps)
+        intervals = _line_intervals(polygon, lines[0])
+        for y in lines[1:]:
+            if not intervals:
+                break
+            intervals = _intersect(intervals, _line_intervals(polygon, y))
+        for a, b in intervals:
+            bands.append(k)
+            starts.append(a)
+            stops.append(b)
+    return np.array(bands, dtype=np.int64), np.array(starts), np.array(stops)
+
+
+def pack_polygon(polygon, width, length, setback, convex=None, phase=0.5):
+    """
+    Pack width x length footprints (length along x) into a polygon in rows.
+
+    Args:
+        polygon: Counter-clockwise (n, 2) vertex array [ft].
+        width, length: Tank footprint [ft].
+        setback: Clearance to the boundary and between tanks [ft].
+        convex: Whether the polygon is convex (computed if None).
+        phase: Where the rows sit in the vertical slack (0 bottom, 0.5 centered).
+
+    Returns:
+        (k, 2) array of footprint centers
+    """
+    if convex is None:
+        convex = is_convex(polygon)
+    y_min, y_max = polygon[:, 1].min(), polygon[:, 1].max()
+    pitch = width + setback
+    rows = math.floor((y_max - y_min - width - 2 * setback) / pitch + 1e-9) + 1
+    if rows <= 0:
+        return np.empty((0, 2))
+    slack = y_max - y_min - (rows * pitch + setback)
+    y_low = y_min + phase * slack + np.arange(rows) * pitch
+    y_high = y_low + width + 2 * setback
+
+    band, a, b = (_convex_bands if convex else _general_bands)(polygon, y_low, y_high)
+    free = b - a - setback
+    counts = np.maximum(np.floor(free / (length + setback) + 1e-9), 0).astype(np.int64)
+    start = a + setback + (free - counts * (length + setback)) / 2 + length / 2
+    run = np.repeat(np.arange(len(counts)), counts)
+    position = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.column_stack((
+        start[run] + position * (length + setback),
+        y_low[band[run]] + setback + width / 2,
+    ))
+
+
+def orientations(polygon):
+    """Row directions to try (radians in [0, pi)): the axes and the longest edges."""
+    edges = np.roll(polygon, -1, axis=0) - polygon
+    longest = np.argsort(-np.hypot(edges[:, 0], edges[:, 1]))[:ORIENTATION_EDGES]
+    angles = [0.0, np.pi / 2]
+    for i in longest:
+        angle = math.atan2(edges[i, 1], edges[i, 0]) % np.pi
+        angles.extend((angle, (angle + np.pi / 2) % np.pi))
+    unique = []
+    for angle in angles:
+        if all(min(abs(angle - u), np.pi - abs(angle - u)) > 1e-6 for u in unique):
+            unique.append(angle)
+    return unique
+
+
+def pack_zone(polygon, width, length, setback, convex=None):
+    """
+    Best packing of a zone over the orientations and row phases tried.
+
+    Returns:
+        tuple: ((k, 2) footprint centers in the zone frame, row angle in radians)
+    """
+    if convex is None:
+        convex = is_convex(polygon)
+    best, best_angle = np.empty((0, 2)), 0.0
+    for angle in orientations(polygon):
+        rotated = rotate(polygon, -angle)
+        for phase in (0.0, 0.5):
+            centers = pack_polygon(rotated, width, length, setback, convex, phase)
+            if len(centers) > len(best):
+                best, best_angle = rotate(centers, angle), angle
+    return best, best_angle
+
+
+def capacity_bound(index, width, length, setback):
+    """
+    Upper bound on the tanks each zone can hold, without packing it.
+
+    Tanks sit a setback apart and a setback inside the boundary, so each
+    owns a disjoint (width + setback) x (length + setback) cell inside its
+    zone.
+
+    Returns:
+        (zones,) int64 array of tank counts
+    """
+    cell = (width + setback) * (length + setback)
+    return np.floor(index.areas / cell + 1e-9).astype(np.int64)
+
+
+def place_tanks(
+    index,                  # ZoneIndex of the zones (see utils/zones.py)
+    tank_width_ft,          # Footprint of one tank [ft]
+    tank_length_ft,
+    setback_ft,             # Clearance around each tank [ft]
+    tank_capacity_cuft,     # Usable hydrogen volume of one tank [ft^3]
+    required_tanks=None,    # Tanks to place (None: fill every zone)
+    include_placements=True
+):
+    """
+    Pack tanks into every zone and assign the required tanks to them.
+
+    Required tanks go to the zones holding the most tanks first. Placements
+    are footprint centers, in the planar frame and in latitude/longitude,
+    with the rotation of the tanks' long side from east (degrees).
+
+    Returns:
+        dict: Per-zone capacity, assignment, utilization and placements,
+        and the totals
+    """
+    footprint = tank_width_ft * tank_length_ft
+    packed = [
+        pack_zone(polygon, tank_width_ft, tank_length_ft, setback_ft, convex)
+        for polygon, convex in zip(index.polygons, index.convex)
+    ]
+
+    capacities = np.array([len(centers) for centers, _ in packed], dtype=np.int64)
+    if required_tanks is None:
+        assigned = capacities
+    else:
+        assigned = np.zeros(len(packed), dtype=np.int64)
+        order = np.argsort(-capacities, kind='stable')
+        taken = np.minimum(np.cumsum(capacities[order]), required_tanks)
+        assigned[order] = np.diff(taken, prepend=0)
+
+    results = []
+    for zone, area, (centers, angle), capacity, count in zip(index.zones, index.areas, packed, capacities, assigned):
+        result = {
+            "name": zone.get("name"),
+            "type": zone["type"],
+            "area_sqft": float(area),
+            "capacity_tanks": int(capacity),
+            "max_storable_volume_cuft": int(capacity) * tank_capacity_cuft,
+            "assigned_tanks": int(count),
+            "utilization": int(count) * footprint / area,
+            "max_utilization": int(capacity) * footprint / area,
+            "rotation_deg": math.degrees(angle),
+        }
+        if include_placements:
+            x, y = centers[:count, 0], centers[:count, 1]
+            lat, lon = unproject(x, y, index.origin)
+            result["placements"] = {"x_ft": x, "y_ft": y, "lat": lat, "lon": lon}
+        results.append(result)
+
+    placed = int(assigned.sum())
+    return {
+        "origin": list(index.origin),
+        "zones": results,
+        "total_area_sqft": float(index.areas.sum()),
+        "capacity_tanks": int(capacities.sum()),
+        "max_storable_volume_cuft": int(capacities.sum()) * tank_capacity_cuft,
+        "required_tanks": required_tanks,
+        "placed_tanks": placed,
+        "fits": required_tanks is None or placed >= required_tanks,
+    }
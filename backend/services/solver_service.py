@@ -0,0 +1,158 @@
+"""
+Service for inverting model outputs: the input value at which an output
+reaches each of many targets.
+
+A model is given as fn(x) -> output, vectorized over an array of input
+values x (all other inputs fixed). Every target is solved at once:
+
+    - affine models (checked on a few probes across the bracket) are
+      inverted in closed form, with no further evaluations
+    - integer inputs are evaluated at every integer in the bracket, and the
+      first integer at which the output reaches the target is returned
+    - other models are scanned on a grid across the bracket for the first
+      interval where output - target changes sign, which is then narrowed
+      by bisection, one vectorized evaluation per step for all targets
+
+When the output reaches a target more than once in the bracket, the
+smallest input is returned. Targets not reached in the bracket are NaN.
+"""
+import math
+
+import numpy as np
+
+# Probes across the bracket for the affine check, and its tolerance
+AFFINE_PROBES = 5
+AFFINE_RTOL = 1e-9
+# Grid of the initial scan, and bisection steps within a grid interval
+SCAN_POINTS = 65
+BISECTION_STEPS = 60
+# Most integers evaluated for an integer input
+MAX_INTEGER_GRID = 100_000
+# (targets x grid points) compared at a time by first_crossing
+CROSSING_CELLS = 1_000_000
+
+
+class CountingModel:
+    """fn(x) as a float array of x's shape, counting the points evaluated."""
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.evaluations = 0
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        self.evaluations += x.size
+        return np.broadcast_to(np.asarray(self.fn(x), dtype=np.float64), x.shape)
+
+
+def affine_fit(x, values):
+    """(intercept, slope) if values are affine in x within AFFINE_RTOL, else None."""
+    slope = (values[-1] - values[0]) / (x[-1] - x[0])
+    line = values[0] + slope * (x - x[0])
+    scale = np.max(np.abs(values))
+    if not np.all(np.isfinite(values)) or slope == 0 or np.max(np.abs(values - line)) > AFFINE_RTOL * scale:
+        return None
+    return values[0] - slope * x[0], slope
+
+
+def first_crossing(values, targets):
+    """
+    Index i of the first grid interval [i, i + 1] over which values reach
+    each target (-1 where they never do).
+    """
+    index = np.full(len(targets), -1, dtype=np.int64)
+    chunk = max(1, CROSSING_CELLS // len(values))
+    for start in range(0, len(targets), chunk):
+        sign = np.sign(values[None, :] - targets[start:start + chunk, None])
+        hit = sign[:, :-1] * sign[:, 1:] <= 0  # a sign change, or a target met exactly
+        index[start:start + chunk] = np.where(hit.any(axis=1), np.argmax(hit, axis=1), -1)
+    return index
+
+
+def _solve_integer(model, targets, low, high):
+    grid = np.arange(math.ceil(low), math.floor(high) + 1, dtype=np.float64)
+    values = model(grid)
+    if len(grid) == 1:
+        found = values[0] == targets
+        return np.where(found, grid[0], np.nan), np.where(found, values[0], np.nan)
+    index = first_crossing(values, targets)
+    found = index >= 0
+    index = np.maximum(index, 0)
+    exact = values[index] == targets
+    chosen = np.where(exact, index, index + 1)
+    return np.where(found, grid[chosen], np.nan), np.where(found, values[chosen], np.nan)
+
+
+def _solve_bracketing(model, targets, low, high):
+    grid = np.linspace(low, high, SCAN_POINTS)
+    values = model(grid)
+    index = first_crossing(values, targets)
+    found = index >= 0
+    index = np.maximum(index, 0)
+    a, b = grid[index], grid[index + 1]
+    residual_a = values[index] - targets
+    for _ in range(BISECTION_STEPS):
+        if not np.any(found & (b - a > 0)):
+            break
+        middle = (a + b) / 2
+        residual = model(middle) - targets
+        # Keep the half whose ends still bracket the target
+        right = np.sign(residual) == np.sign(residual_a)
+        a = np.where(right, middle, a)
+        residual_a = np.where(right, residual, residual_a)
+        b = np.where(right, b, middle)
+    x = np.where(residual_a == 0, a, (a + b) / 2)
+    x = np.where(found, x, np.nan)
+    output = np.full(len(targets), np.nan)
+    if np.any(found):
+        output[found] = model(x[found])
+    return x, output
+
+
+def solve_targets(fn, targets, low, high, integer=False):
+    """
+    Input values in [low, high] at which fn reaches each target.
+
+    Args:
+        fn: Model output as a function of an array of input values
+        targets: Output values to reach
+        low, high: Bracket of the input
+        integer: Whether the input only takes whole values
+
+    Returns:
+        dict: "value" (input per target, NaN if not reached), "output" (the
+        model output there), "solved" flags, the "method" used and the
+        model points evaluated ("evaluations")
+
+    Raises:
+        ValueError: If an integer bracket holds more than MAX_INTEGER_GRID values
+    """
+    targets = np.asarray(targets, dtype=np.float64)
+    model = CountingModel(fn)
+    if integer:
+        if math.floor(high) - math.ceil(low) + 1 > MAX_INTEGER_GRID:
+            raise ValueError(f"Integer brackets are limited to {MAX_INTEGER_GRID} values")
+        if math.floor(high) < math.ceil(low):
+            raise ValueError("The bracket holds no whole value")
+        method = "integer"
+        value, output = _solve_integer(model, targets, low, high)
+    else:
+        probes = np.linspace(low, high, AFFINE_PROBES)
+        fit = affine_fit(probes, model(probes))
+        if fit is not None:
+            method = "affine"
+            intercept, slope = fit
+            value = (targets - intercept) / slope
+            span = 1e-12 * (high - low)
+            value = np.where((value >= low - span) & (value <= high + span), np.clip(value, low, high), np.nan)
+            output = np.where(np.isnan(value), np.nan, targets)
+        else:
+            method = "bracketing"
+            value, output = _solve_bracketing(model, targets, low, high)
+    return {
+        "value": value,
+        "output": output,
+        "solved": ~np.isnan(value),
+        "method": method,
+        "evaluations": model.evaluations,
+    }
@@ -4,6 +4,9 @@ Contains the business logic for calculating storage costs and requirements.
 """
 import numpy as np
 
+# Part of the result cache key: bump when the calculation changes
+MODEL_VERSION = 1
+
 def calculate_h2_storage_cost(
     total_h2_volume_gal,        # Total hydrogen volume to store [gallons]
     number_of_tanks,            # Number of tanks
@@ -53,9 +56,89 @@ def calculate_h2_storage_cost(
     total_infrastructure_cost = insulation_cost + construction_cost
 
     return {
-        "insulation_volume_total": float(insulation_volume_total),
-        "insulation_cost": float(insulation_cost),
-        "footprint_total": float(footprint_total),
-        "construction_cost": float(construction_cost),
-        "total_infrastructure_cost": float(total_infrastructure_cost)
-    }
\ No newline at end of file
+        "insulation_volume_total": insulation_volume_total,
+        "insulation_cost": insulation_cost,
+        "footprint_total": footprint_total,
+        "construction_cost": construction_cost,
+        "total_infrastructure_cost": total_infrastructure_cost
+    }
+
+# Inputs of calculate_h2_storage_cost, in order
+STORAGE_PARAMETERS = (
+    "total_h2_volume_gal",
+    "number_of_tanks",
+    "tank_diameter_ft",
+    "tank_length_ft",
+    "cost_per_sqft_construction",
+    "cost_per_cuft_insulation",
+)
+
+def range_values(start, stop, step=None, num=None):
+    """
+    Evenly spaced values from start to stop (inclusive).
+    
+    Args:
+        start, stop: First and last value
+        step: Spacing (stop is included when it falls on the grid)
+        num: Number of values, instead of step
+    """
+    if num is not None:
+        return np.linspace(start, stop, num)
+    count = int((stop - start) / step + 1e-9) + 1
+    return start + step * np.arange(count)
+
+def sweep_size(parameters, mode='grid'):
+    """
+    Number of combinations a sweep evaluates.
+    
+    Raises:
+        ValueError: In zip mode, if the lists have different lengths
+    """
+    lengths = [len(parameters[name]) for name in STORAGE_PARAMETERS]
+    if mode == 'grid':
+        return int(np.prod(lengths, dtype=np.int64))
+    swept = {name: length for name, length in zip(STORAGE_PARAMETERS, lengths) if length > 1}
+    if len(set(swept.values())) > 1:
+        counts = ', '.join(f"{name}: {length}" for name, length in swept.items())
+        raise ValueError(f"Zipped parameters must have the same number of values (or one); got {counts}")
+    return max(lengths)
+
+def storage_cost_sweep(parameters, mode='grid'):
+    """
+    Evaluate the storage cost model over many input combinations at once.
+    
+    In grid mode every parameter varies along its own axis and broadcasting
+    evaluates the whole cartesian product in one call; intermediate terms
+    are only as large as the parameters they depend on. In zip mode the
+    i-th values of all parameters form one combination.
+    
+    Args:
+        parameters: 1-D arrays of values keyed by STORAGE_PARAMETERS
+        mode: 'grid' or 'zip'
+        
+    Returns:
+        dict: "points" (number of combinations), "results" (one array per
+        input and output, one entry per combination) and "min_cost" (the
+        combination with the lowest total infrastructure cost)
+    """
+    arrays = [np.asarray(parameters[name], dtype=np.float64).ravel() for name in STORAGE_PARAMETERS]
+    if mode == 'grid':
+        ndim = len(arrays)
+        arrays = [values.reshape([-1 if axis == i else 1 for axis in range(ndim)])
+                  for i, values in enumerate(arrays)]
+    else:
+        sweep_size(parameters, mode)
+    inputs = dict(zip(STORAGE_PARAMETERS, arrays))
+    outputs = calculate_h2_storage_cost(**inputs)
+
+    shape = np.broadcast_shapes(*(values.shape for values in arrays))
+    results = {name: np.broadcast_to(values, shape).ravel() for name, values in inputs.items()}
+    results["number_of_tanks"] = results["number_of_tanks"].astype(np.int64)
+    results.update({name: np.broadcast_to(values, shape).ravel() for name, values in outputs.items()})
+
+    best = int(np.argmin(results["total_infrastructure_cost"]))
+    return {
+        "points": len(results["total_infrastructure_cost"]),
+        "results": results,
+        "min_cost": {name: values[best].item() for name, values in results.items()},
+    }
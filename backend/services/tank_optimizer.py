@@ -0,0 +1,172 @@
+"""
+Service for sizing hydrogen storage: tank count and geometry for a demand.
+
+Tanks are cylinders of diameter d and length L holding pi/4 d^2 L of liquid
+less the ullage, of which the evaporation fraction is retained. A design
+needs n >= n_min tanks to hold the demand. Its cost comes from the storage
+cost model (calculate_h2_storage_cost) and splits into an insulation term
+that falls as A/n and a construction term that grows as B*n. Per geometry:
+
+    - the smallest footprint is at n_min
+    - the lowest cost is at n_opt, one of the integers next to sqrt(A/B),
+      clipped to the feasible range
+    - only n in [n_min, n_opt] can be Pareto-optimal (beyond n_opt both
+      cost and footprint grow)
+
+Geometries are evaluated together as arrays. Candidates that the global
+minimum-cost and minimum-footprint designs already dominate are pruned
+before the (ragged) n ranges are expanded for the Pareto front.
+"""
+import numpy as np
+from services.storage_service import calculate_h2_storage_cost
+
+GALLONS_PER_CUFT = 1 / 0.1337  # the storage cost model's conversion
+
+# Candidate designs expanded at a time for the Pareto front
+CANDIDATE_CHUNK = 1_000_000
+
+# Columns of the designs returned
+DESIGN_COLUMNS = (
+    "tank_diameter_ft",
+    "tank_length_ft",
+    "number_of_tanks",
+    "usable_volume_cuft",
+    "footprint_total",
+    "insulation_cost",
+    "construction_cost",
+    "total_infrastructure_cost",
+)
+
+
+def _costs(volume_gal, n, d, length, cost_per_sqft_construction, cost_per_cuft_insulation):
+    return calculate_h2_storage_cost(
+        volume_gal, n, d, length, cost_per_sqft_construction, cost_per_cuft_insulation
+    )
+
+
+def _designs(volume_gal, n, d, length, usable_per_tank, costs_args):
+    costs = _costs(volume_gal, n, d, length, *costs_args)
+    return {
+        "tank_diameter_ft": d,
+        "tank_length_ft": length,
+        "number_of_tanks": n.astype(np.int64),
+        "usable_volume_cuft": usable_per_tank * n,
+        "footprint_total": costs["footprint_total"],
+        "insulation_cost": costs["insulation_cost"],
+        "construction_cost": costs["construction_cost"],
+        "total_infrastructure_cost": costs["total_infrastructure_cost"],
+    }
+
+
+def _row(designs, index):
+    return {name: designs[name][index].item() for name in DESIGN_COLUMNS}
+
+
+def pareto_mask(footprint, cost):
+    """Mask of the designs no other design beats on both footprint and cost."""
+    order = np.lexsort((cost, footprint))
+    sorted_cost = cost[order]
+    best_before = np.minimum.accumulate(np.concatenate(([np.inf], sorted_cost[:-1])))
+    mask = np.zeros(len(cost), dtype=bool)
+    mask[order] = sorted_cost < best_before
+    return mask
+
+
+def optimize_tanks(
+    volume_cuft,                # Hydrogen volume to store [ft^3]
+    diameters_ft,               # Allowed tank diameters [ft]
+    lengths_ft,                 # Allowed tank lengths [ft]
+    max_tanks,                  # Most tanks allowed
+    max_footprint_sqft,         # Largest total footprint [ft^2], or None
+    ullage,                     # Fraction of a tank taken by gaseous H2
+    evaporation,                # Fraction of LH2 retained
+    cost_per_sqft_construction, # Construction cost [$/ft^2]
+    cost_per_cuft_insulation    # Insulation cost [$/ft^3]
+):
+    """
+    Find the minimum-cost and minimum-footprint tank designs and the Pareto
+    front of cost versus footprint.
+
+    Returns:
+        dict: "min_cost" and "min_footprint" designs (None if nothing is
+        feasible), "pareto_front" (columnar, by increasing footprint) and
+        search statistics
+    """
+    d, length = (a.ravel() for a in np.meshgrid(
+        np.asarray(diameters_ft, dtype=np.float64), np.asarray(lengths_ft, dtype=np.float64), indexing='ij'
+    ))
+    geometries = len(d)
+    usable_per_tank = np.pi / 4 * d ** 2 * length * (1 - ullage) * evaporation
+    volume_gal = volume_cuft * GALLONS_PER_CUFT
+    costs_args = (cost_per_sqft_construction, cost_per_cuft_insulation)
+
+    # Feasible tank counts per geometry: [n_min, n_max]
+    n_min = np.maximum(np.ceil(volume_cuft / usable_per_tank - 1e-9), 1)
+    n_max = np.full(geometries, float(max_tanks))
+    if max_footprint_sqft is not None:
+        n_max = np.minimum(n_max, np.floor(max_footprint_sqft / (d * length) + 1e-9))
+    feasible = n_min <= n_max
+    stats = {"geometries": geometries, "feasible_geometries": int(feasible.sum())}
+    if not feasible.any():
+        return dict(stats, candidates_evaluated=0, min_cost=None, min_footprint=None,
+                    pareto_front={name: [] for name in DESIGN_COLUMNS})
+    d, length, usable_per_tank, n_min, n_max = (
+        a[feasible] for a in (d, length, usable_per_tank, n_min, n_max)
+    )
+
+    # Cost-optimal n per geometry from cost(n) = A/n + B*n
+    per_tank = _costs(volume_gal, 1.0, d, length, *costs_args)
+    a, b = per_tank["insulation_cost"], per_tank["construction_cost"]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n_star = np.where(a <= 0, n_min, np.where(b > 0, np.sqrt(a / b), n_max))
+    n_low = np.clip(np.floor(n_star), n_min, n_max)
+    n_high = np.clip(np.ceil(n_star), n_min, n_max)
+    cost_low = _costs(volume_gal, n_low, d, length, *costs_args)["total_infrastructure_cost"]
+    cost_high = _costs(volume_gal, n_high, d, length, *costs_args)["total_infrastructure_cost"]
+    n_opt = np.where(cost_high < cost_low, n_high, n_low)
+    cost_opt = np.minimum(cost_low, cost_high)
+
+    best = _designs(volume_gal, n_opt, d, length, usable_per_tank, costs_args)
+    smallest = _designs(volume_gal, n_min, d, length, usable_per_tank, costs_args)
+    i_cost = int(np.lexsort((best["footprint_total"], cost_opt))[0])
+    i_footprint = int(np.lexsort((smallest["total_infrastructure_cost"], smallest["footprint_total"]))[0])
+    min_cost, min_footprint = _row(best, i_cost), _row(smallest, i_footprint)
+
+    # Pruning: designs with a larger footprint than the minimum-cost design, or
+    # a higher cost than the minimum-footprint design, are dominated by them
+    footprint_cap = min_cost["footprint_total"]
+    cost_cap = min_footprint["total_infrastructure_cost"]
+    n_top = np.minimum(n_opt, np.floor(footprint_cap / (d * length) + 1e-9))
+    keep = (n_top >= n_min) & (cost_opt <= cost_cap)
+    d, length, usable_per_tank, n_min, n_top = (a[keep] for a in (d, length, usable_per_tank, n_min, n_top))
+
+    # Expand the remaining [n_min, n_top] ranges into one candidate per design,
+    # a bounded number at a time; the front of the union of the chunks' fronts
+    # is the overall front
+    counts = (n_top - n_min + 1).astype(np.int64)
+    ends = np.cumsum(counts)
+    fronts = []
+    start = 0
+    while start < len(counts):
+        base = ends[start] - counts[start]
+        stop = max(int(np.searchsorted(ends, base + CANDIDATE_CHUNK, side='right')), start + 1)
+        chunk = counts[start:stop]
+        geometry = start + np.repeat(np.arange(len(chunk)), chunk)
+        offsets = np.arange(chunk.sum()) - np.repeat(np.cumsum(chunk) - chunk, chunk)
+        candidates = _designs(volume_gal, n_min[geometry] + offsets, d[geometry], length[geometry],
+                              usable_per_tank[geometry], costs_args)
+        on_front = pareto_mask(candidates["footprint_total"], candidates["total_infrastructure_cost"])
+        fronts.append({name: values[on_front] for name, values in candidates.items()})
+        start = stop
+
+    front = {name: np.concatenate([f[name] for f in fronts]) for name in DESIGN_COLUMNS}
+    on_front = pareto_mask(front["footprint_total"], front["total_infrastructure_cost"])
+    order = np.argsort(front["footprint_total"][on_front], kind='stable')
+
+    return dict(
+        stats,
+        candidates_evaluated=int(counts.sum()),
+        min_cost=min_cost,
+        min_footprint=min_footprint,
+        pareto_front={name: front[name][on_front][order] for name in DESIGN_COLUMNS},
+    )
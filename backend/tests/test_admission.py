@@ -0,0 +1,164 @@
+# tests/test_admission.py
+import threading
+import time
+
+import pytest
+
+from app import create_app
+from config import Config
+from benchmarks.common import make_benchmark_app
+from utils.admission import AdmissionController, AdmissionRejected, Limiter
+from utils.reference_data import set_reference_data
+
+STORAGE_INPUTS = {
+    "total_h2_volume_gal": 5000000, "number_of_tanks": 20, "tank_diameter_ft": 10,
+    "tank_length_ft": 40, "cost_per_sqft_construction": 580, "cost_per_cuft_insulation": 15
+}
+
+
+def test_limiter_rejects_when_queue_full():
+    limiter = Limiter('heavy', concurrency=1, queue=0)
+    assert limiter.acquire() == pytest.approx(0, abs=0.01)
+    with pytest.raises(AdmissionRejected) as rejected:
+        limiter.acquire()
+    assert rejected.value.status == 429
+    assert rejected.value.retry_after >= 1
+    limiter.release(0.01)
+    limiter.acquire()
+    assert limiter.stats()["rejected_queue_full"] == 1
+
+
+def test_limiter_queued_request_times_out():
+    limiter = Limiter('heavy', concurrency=1, queue=1, timeout=0.1)
+    limiter.acquire()
+    with pytest.raises(AdmissionRejected) as rejected:
+        limiter.acquire()
+    assert rejected.value.status == 503
+    stats = limiter.stats()
+    assert stats["rejected_timeout"] == 1
+    assert stats["waiting"] == 0
+
+
+def test_limiter_queued_request_admitted_on_release():
+    limiter = Limiter('heavy', concurrency=1, queue=1, timeout=5)
+    limiter.acquire()
+    waits = []
+    waiter = threading.Thread(target=lambda: waits.append(limiter.acquire()))
+    waiter.start()
+    time.sleep(0.1)
+    assert limiter.stats()["waiting"] == 1
+    limiter.release(0.1)
+    waiter.join()
+
+    assert waits[0] >= 0.05
+    stats = limiter.stats()
+    assert stats["admitted"] == 2
+    assert stats["active"] == 1
+    assert stats["wait_max_ms"] >= 50
+
+
+def test_endpoint_limits_take_precedence_over_blueprint():
+    controller = AdmissionController({
+        'storage': {'concurrency': 4},
+        'storage.storage_cost_endpoint': {'concurrency': 1},
+    })
+    assert controller.limiter_for('storage.storage_cost_endpoint', 'storage').concurrency == 1
+    assert controller.limiter_for('storage.other', 'storage').concurrency == 4
+    assert controller.limiter_for('health_check', None) is None
+
+
+def test_saturated_blueprint_rejected_while_others_served():
+    app = create_app('testing', {
+        'ADMISSION_LIMITS': {'storage': {'concurrency': 1, 'queue': 0}},
+    })
+    client = app.test_client()
+    limiter = app.extensions['admission'].limiters['storage']
+
+    limiter.acquire()  # a heavy request in flight
+    try:
+        response = client.post('/api/storage/calculate', json=STORAGE_INPUTS)
+        assert response.status_code == 429
+        assert int(response.headers['Retry-After']) >= 1
+        assert client.get('/health').status_code == 200
+    finally:
+        limiter.release(0.01)
+
+    response = client.post('/api/storage/calculate', json=STORAGE_INPUTS)
+    assert response.status_code == 200
+
+    metrics = client.get('/metrics').get_json()["admission"]["storage"]
+    assert metrics["admitted"] == 2
+    assert metrics["rejected_queue_full"] == 1
+    assert metrics["active"] == 0
+    assert metrics["wait_p50_ms"] is not None
+
+
+def test_admission_disabled():
+    app = create_app('testing', {
+        'ADMISSION_ENABLED': False,
+        'ADMISSION_LIMITS': {'storage': {'concurrency': 1}},
+    })
+    app.extensions['admission'].limiters['storage'].acquire()
+    response = app.test_client().post('/api/storage/calculate', json=STORAGE_INPUTS)
+    assert response.status_code == 200
+
+
+def test_shared_limits():
+    controller = AdmissionController({
+        'heavy': {'concurrency': 2},
+        'storage.tank_optimization_endpoint': 'heavy',
+        'economic.sweep': 'heavy',
+    })
+    assert controller.limiters['economic.sweep'] is controller.limiters['heavy']
+    assert controller.limiter_for('storage.tank_optimization_endpoint', 'storage') is controller.limiters['heavy']
+    assert list(controller.stats()) == ['heavy']
+    with pytest.raises(ValueError):
+        AdmissionController({'storage': 'missing'})
+
+
+def test_default_limits_sweeps_but_not_single_queries():
+    limits = dict(Config.ADMISSION_LIMITS, heavy={'concurrency': 1, 'queue': 0})
+    app = create_app('testing', {'ADMISSION_LIMITS': limits})
+    client = app.test_client()
+    heavy = app.extensions['admission'].limiters['heavy']
+    for _ in range(heavy.concurrency):
+        heavy.acquire()
+    try:
+        sweep = dict(STORAGE_INPUTS, number_of_tanks=[10, 20])
+        assert client.post('/api/storage/calculate', json=sweep).status_code == 429
+        assert client.post('/api/storage/calculate', json=STORAGE_INPUTS).status_code == 200
+        grid = {"fleet_percentage": [0.1, 0.2], "total_flights": 1000, "atlanta_fraction": 0.4,
+                "hydrogen_demand": 1000, "turnaround_time": 30, "tax_credits": 1}
+        assert client.post('/api/economic/impact', json=grid).status_code == 429
+        assert client.post('/api/storage/optimize', json={"h2_demand_cuft": 1000}).status_code == 429
+        assert client.post('/api/storage/placement', json={"number_of_tanks": 10}).status_code == 429
+        assert client.post('/api/zones/contains', json={"points": [[33.64, -84.43]]}).status_code == 429
+    finally:
+        for _ in range(heavy.concurrency):
+            heavy.release(0.01)
+    assert client.post('/api/storage/calculate', json=sweep).status_code == 200
+
+
+def test_cached_demand_requests_are_not_rejected():
+    set_reference_data(None)
+    app, tmpdir = make_benchmark_app('testing', {
+        'PRELOAD_REFERENCE_DATA': True,
+        'ADMISSION_LIMITS': {'hydrogen_demand': {'concurrency': 1, 'queue': 0}},
+    })
+    try:
+        client = app.test_client()
+        body = {"slider_perc": 0.5, "gse": ["F250"], "end_year": 2035}
+        assert client.post('/api/hydrogen-demand/total', json=body).status_code == 200
+
+        limiter = app.extensions['admission'].limiters['hydrogen_demand']
+        limiter.acquire()  # an uncached calculation in flight
+        try:
+            # Served from the cache without a slot; a new calculation needs one
+            assert client.post('/api/hydrogen-demand/total', json=body).status_code == 200
+            response = client.post('/api/hydrogen-demand/total', json=dict(body, end_year=2040))
+            assert response.status_code == 429
+        finally:
+            limiter.release(0.01)
+    finally:
+        set_reference_data(None)
+        tmpdir.cleanup()
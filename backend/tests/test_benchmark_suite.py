@@ -0,0 +1,53 @@
+# tests/test_benchmark_suite.py
+import sqlite3
+
+from benchmarks.common import read_aircraft_rows, read_gse_rows
+from benchmarks.suite import compare
+from benchmarks.synthetic import build_databases, gse_rows
+
+
+def test_synthetic_databases_scale_and_jitter(tmp_path):
+    aircraft_uri, gse_uri = build_databases(3, 40, seed=1, data_dir=str(tmp_path))
+    bundled = read_aircraft_rows()
+
+    conn = sqlite3.connect(aircraft_uri[len('sqlite:///'):])
+    try:
+        assert conn.execute('SELECT COUNT(*) FROM aircraft_data').fetchone()[0] == 3 * len(bundled)
+        distances = [row[0] for row in conn.execute(
+            'SELECT distance FROM aircraft_data WHERE id IN (1, ?, ?)', (len(bundled) + 1, 2 * len(bundled) + 1)
+        )]
+    finally:
+        conn.close()
+    assert distances[0] == bundled[0]['distance']
+    assert len(set(distances)) == 3  # the copies are jittered
+
+    conn = sqlite3.connect(gse_uri[len('sqlite:///'):])
+    try:
+        assert conn.execute('SELECT COUNT(*) FROM gse_data').fetchone()[0] == 40
+    finally:
+        conn.close()
+
+    # Reused on the next call
+    assert build_databases(3, 40, seed=1, data_dir=str(tmp_path)) == (aircraft_uri, gse_uri)
+
+
+def test_synthetic_gse_catalog_starts_with_bundled_types():
+    bundled = read_gse_rows()
+    rows = gse_rows(len(bundled) + 5)
+    assert rows[:len(bundled)] == bundled
+    assert rows[-1]['ground_support_equipment'] == "Synthetic GSE 00004"
+    assert len({row['ground_support_equipment'] for row in rows}) == len(rows)
+
+
+def test_compare_flags_regressions_above_thresholds():
+    baseline = {"results": {
+        "a": {"p50_ms": 10.0, "p95_ms": 12.0, "peak_memory_kib": 100},
+        "b": {"p50_ms": 0.1, "p95_ms": 0.2, "peak_memory_kib": 100},
+    }}
+    current = {"results": {
+        "a": {"p50_ms": 14.0, "p95_ms": 12.5, "peak_memory_kib": 400},
+        "b": {"p50_ms": 0.3, "p95_ms": 0.4, "peak_memory_kib": 120},  # below the noise floors
+        "c": {"p50_ms": 99.0, "p95_ms": 99.0, "peak_memory_kib": 1},  # not in the baseline
+    }}
+    regressions = compare(baseline, current, max_regression=0.25, min_delta_ms=0.5)
+    assert {(r["case"], r["metric"]) for r in regressions} == {("a", "p50_ms"), ("a", "peak_memory_kib")}
@@ -0,0 +1,119 @@
+# tests/test_cashflow.py
+import numpy as np
+import pytest
+
+from app import create_app
+from benchmarks.common import make_benchmark_app
+from services.cashflow_service import (
+    growth_factors,
+    internal_rate_of_return,
+    net_present_value,
+    yearly_cash_flows
+)
+from services.economic_service import calculate_hydrogen_economic_impact
+from services.hydrogen_service import HydrogenService
+
+SCENARIO = {
+    "fleet_percentage": 0.3, "total_flights": 100000, "atlanta_fraction": 0.4, "turnaround_time": 30,
+    "tax_credits": 1.0, "tax_credit_years": np.inf, "discount_rate": 0.07, "storage_days": 11,
+    "tank_diameter_ft": 10, "tank_length_ft": 50, "cost_per_sqft_construction": 580, "cost_per_cuft_insulation": 15,
+}
+YEARS = range(2023, 2051)
+
+
+@pytest.fixture
+def client():
+    return create_app('testing').test_client()
+
+
+def scenarios(**varied):
+    count = max([len(values) for values in varied.values()] or [1])
+    columns = {name: [value] * count for name, value in SCENARIO.items()}
+    columns.update(varied)
+    return columns
+
+
+def test_growth_factors_match_demand_model():
+    service = HydrogenService(None, None)
+    expected = [1 + service.growth_rate_computation(year) for year in YEARS]
+    assert growth_factors(list(YEARS)) == pytest.approx(expected)
+
+
+def test_irr_zeroes_the_npv():
+    cash_flows = np.array([[-100.0, 30, 40, 50, 10], [-100.0, 0, 0, 0, 0], [50.0, 20, -120, 0, 0]])
+    irr = internal_rate_of_return(cash_flows)
+    assert np.isnan(irr[1])
+    assert abs(net_present_value(cash_flows[[0]], irr[0])[0]) < 1e-6
+    assert abs(net_present_value(cash_flows[[2]], irr[2])[0]) < 1e-6
+
+
+def test_cash_flows_follow_the_yearly_models():
+    result = yearly_cash_flows(YEARS, 40000, scenarios(tax_credit_years=[np.inf, 10]))
+    series = result["series"]
+    assert series["cash_flow"].shape == (2, 28)
+
+    year = 12
+    scale = result["growth"][year] / result["growth"][0]
+    demand_gal = 40000 * scale * 365 / 0.1337
+    assert result["demand_gal"][year] == pytest.approx(demand_gal)
+    impact = calculate_hydrogen_economic_impact(0.3, 100000 * scale, 0.4, demand_gal, 30, 1.0)
+    assert series["tax_credits"][0, year] == pytest.approx(impact["total_tax_credits"] * 1e6)
+    assert series["revenue_drop"][0, year] == pytest.approx(impact["revenue_drop"])
+    # Credits end after tax_credit_years
+    assert series["tax_credits"][1, 9] > 0 and series["tax_credits"][1, 10] == 0
+
+    # Storage grows with demand; capex is spent as tanks are added
+    tanks = series["tanks"][0]
+    assert np.all(np.diff(tanks) >= 0) and tanks[-1] > tanks[0]
+    assert np.all((series["capex"][0][1:] > 0) == (np.diff(tanks) > 0))
+
+    expected_npv = sum(cf / 1.07 ** t for t, cf in enumerate(series["cash_flow"][0]))
+    assert result["scenarios"]["npv"][0] == pytest.approx(expected_npv)
+
+
+def test_payback_year():
+    result = yearly_cash_flows(YEARS, 40000, scenarios(tax_credits=[0.0, 1.0, 100.0]))
+    assert result["scenarios"]["payback_year"][0] is None  # never positive
+    cumulative = result["series"]["cumulative_cash_flow"]
+    for s in (1, 2):
+        year = result["scenarios"]["payback_year"][s]
+        if year is not None:
+            assert np.all(cumulative[s, year - 2023:] >= 0)
+            assert year == 2023 or cumulative[s, year - 2024] < 0
+
+
+def test_endpoint_with_demand_model():
+    app, tmpdir = make_benchmark_app('testing')
+    try:
+        response = app.test_client().post('/api/economic/cashflow', json={
+            "demand": {"slider_perc": 0.4, "gse": ["F250"]},
+            "scenarios": [{"tax_credits": 3, "name": "high credit"}, {"tax_credits": 0.5, "tax_credit_years": 10}],
+            "include_series": True,
+        })
+    finally:
+        tmpdir.cleanup()
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["years"][0] == 2023 and data["years"][-1] == 2050
+    assert [row["name"] for row in data["scenarios"]] == ["high credit", "scenario 2"]
+    assert len(data["series"]["cash_flow"][1]) == 28
+    assert data["scenarios"][0]["npv"] > data["scenarios"][1]["npv"]
+
+
+def test_endpoint_needs_fleet_percentage_with_direct_demand(client):
+    response = client.post('/api/economic/cashflow', json={"h2_demand_cuft": 40000})
+    assert response.status_code == 400
+    response = client.post('/api/economic/cashflow', json={
+        "h2_demand_cuft": 40000, "start_year": 2030, "end_year": 2040, "scenarios": [{"fleet_percentage": 0.3}]
+    })
+    assert response.status_code == 200
+    assert response.get_json()["years"] == list(range(2030, 2041))
+
+
+def test_many_scenarios_in_one_pass():
+    count = 500
+    rng = np.random.default_rng(0)
+    result = yearly_cash_flows(YEARS, 40000, scenarios(
+        tax_credits=rng.uniform(0, 3, count), discount_rate=rng.uniform(0.02, 0.12, count)))
+    assert result["series"]["cash_flow"].shape == (count, 28)
+    assert len(result["scenarios"]["irr"]) == count
@@ -0,0 +1,113 @@
+# tests/test_concurrency.py
+import threading
+import time
+
+import pytest
+from flask import Flask, current_app
+
+from benchmarks.common import make_benchmark_app
+from utils import concurrency
+from utils.concurrency import run_concurrently
+from utils.reference_data import set_reference_data
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update(CONCURRENCY_ENABLED=True, CONCURRENCY_WORKERS=2)
+    with app.app_context():
+        yield app
+
+
+def sleep_and_return(value, seconds=0.2):
+    time.sleep(seconds)
+    return value
+
+
+def test_results_in_call_order_and_overlapped(app):
+    start = time.perf_counter()
+    results = run_concurrently(
+        (sleep_and_return, "a"),
+        (sleep_and_return, "b"),
+        (sleep_and_return, "c"),
+    )
+    elapsed = time.perf_counter() - start
+
+    assert results == ["a", "b", "c"]
+    assert elapsed < 0.5  # sequential would take 0.6s
+
+
+def test_pool_threads_get_an_app_context(app):
+    def app_name():
+        return threading.current_thread().name, current_app.name
+
+    (pool_thread, pool_app), (request_thread, request_app) = run_concurrently((app_name,), (app_name,))
+    assert pool_thread.startswith('subtask')
+    assert request_thread == threading.current_thread().name
+    assert pool_app == request_app == app.name
+
+
+def test_first_error_is_raised_after_all_calls_finish(app):
+    finished = []
+
+    def fail():
+        raise ValueError("boom")
+
+    def slow():
+        time.sleep(0.1)
+        finished.append(True)
+
+    with pytest.raises(ValueError, match="boom"):
+        run_concurrently((fail,), (slow,))
+    assert finished == [True]
+
+
+def test_runs_sequentially_when_disabled(app):
+    def thread_name():
+        return threading.current_thread().name
+
+    current = threading.current_thread().name
+    assert run_concurrently((thread_name,), (thread_name,), enabled=False) == [current, current]
+    app.config['CONCURRENCY_ENABLED'] = False
+    assert run_concurrently((thread_name,), (thread_name,)) == [current, current]
+
+
+def test_nested_calls_run_inline(app):
+    def inner():
+        return run_concurrently((threading.current_thread,), (threading.current_thread,))
+
+    outer, _ = run_concurrently((inner,), (lambda: None,))
+    assert outer[0] is outer[1]
+
+
+def test_saturated_pool_runs_inline(app):
+    concurrency.get_executor(2)
+    taken = 0
+    while concurrency._slots.acquire(blocking=False):
+        taken += 1
+    try:
+        current = threading.current_thread()
+        assert run_concurrently((threading.current_thread,), (threading.current_thread,)) == [current, current]
+    finally:
+        for _ in range(taken):
+            concurrency._slots.release()
+
+
+def test_total_endpoint_matches_sequential():
+    payload = {"slider_perc": 0.4, "gse": ["F250", "TLD 1410"], "end_year": 2040}
+    responses = []
+    for enabled in (False, True):
+        app, tmpdir = make_benchmark_app('testing', {
+            'CONCURRENCY_ENABLED': enabled,
+            'RESULT_CACHE_ENABLED': False,
+        })
+        try:
+            set_reference_data(None)
+            response = app.test_client().post('/api/hydrogen-demand/total', json=payload)
+            assert response.status_code == 200
+            responses.append(response.get_json())
+        finally:
+            tmpdir.cleanup()
+
+    assert responses[0] == responses[1]
+    assert responses[1]["total_demand"] > 0
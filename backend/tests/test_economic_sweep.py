@@ -0,0 +1,98 @@
+# tests/test_economic_sweep.py
+import numpy as np
+import pytest
+
+from app import create_app
+from services.economic_service import (
+    ECONOMIC_PARAMETERS,
+    calculate_hydrogen_economic_impact,
+    economic_impact_grid
+)
+
+BASE = {
+    "fleet_percentage": 0.2, "total_flights": 100, "atlanta_fraction": 0.6,
+    "hydrogen_demand": 100_000_000_000, "turnaround_time": 30, "tax_credits": 1.0
+}
+
+
+@pytest.fixture
+def client():
+    return create_app('testing').test_client()
+
+
+def grid(**swept):
+    parameters = {name: [value] for name, value in BASE.items()}
+    parameters.update(swept)
+    return economic_impact_grid(parameters)
+
+
+def test_grid_matches_scalar_model():
+    result = grid(fleet_percentage=[0.1, 0.5, 1.0], turnaround_time=[0, 15, 30, 60], tax_credits=[-1, 0, 2])
+    assert result["shape"] == [3, 1, 1, 1, 4, 3]
+    assert result["points"] == 36
+    assert "fleet_percentage" not in result["results"]  # inputs follow from the axes
+
+    inputs = np.meshgrid(*result["axes"].values(), indexing='ij')
+    for i in (0, 17, 35):
+        point = {name: values.ravel()[i] for name, values in zip(ECONOMIC_PARAMETERS, inputs)}
+        for name, value in calculate_hydrogen_economic_impact(**point).items():
+            assert result["results"][name][i] == pytest.approx(value)
+
+
+def test_break_even_points_lie_on_the_contour():
+    result = grid(fleet_percentage=np.linspace(0.1, 1, 10), turnaround_time=np.linspace(0, 60, 13),
+                  tax_credits=np.linspace(0, 5, 11))
+    points = result["break_even"]
+    assert np.count_nonzero(np.array(points["axis"]) == "tax_credits") > 10
+    compensation = calculate_hydrogen_economic_impact(
+        **{name: points[name] for name in ECONOMIC_PARAMETERS})["tax_credits_compensation"]
+    # The model is linear in the tax credit, so crossings along it are exact
+    along_tax = np.array(points["axis"]) == "tax_credits"
+    assert np.abs(compensation[along_tax]).max() < 1e-6
+
+    # Closed form: the credit that exactly compensates the revenue drop
+    credit = result["break_even_tax_credits"]
+    assert len(credit) == 10 * 13
+    drop = calculate_hydrogen_economic_impact(**dict(BASE, fleet_percentage=0.5, turnaround_time=30))["revenue_drop"]
+    assert credit[4 * 13 + 6] == pytest.approx(1e6 * drop / BASE["hydrogen_demand"])
+
+
+def test_zero_fleet_share_has_no_revenue_drop(client):
+    response = client.post('/api/economic/impact', json=dict(BASE, fleet_percentage=0))
+    assert response.status_code == 200
+    assert response.get_json()["percent_drop"] == 0
+
+    result = grid(fleet_percentage=[0, 0.5])
+    assert result["results"]["percent_drop"][0] == 0
+    assert result["results"]["percent_drop"][1] == pytest.approx(
+        calculate_hydrogen_economic_impact(**dict(BASE, fleet_percentage=0.5))["percent_drop"])
+
+
+def test_endpoint_sweep_with_ranges(client):
+    body = dict(BASE,
+                fleet_percentage={"start": 0.05, "stop": 1, "step": 0.05},
+                turnaround_time={"start": 0, "stop": 60, "num": 13},
+                tax_credits=[0, 0.5, 1, 2, 3])
+    response = client.post('/api/economic/impact', json=body)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["points"] == 20 * 13 * 5
+    assert len(data["results"]["revenue_drop"]) == data["points"]
+    assert len(data["axes"]["fleet_percentage"]) == 20
+
+    columnar = client.post('/api/economic/impact?format=columnar', json=body).get_json(force=True)
+    assert columnar["results"] == data["results"]  # plain JSON keeps the columns too
+
+
+def test_endpoint_checks_range_bounds(client):
+    body = dict(BASE, fleet_percentage={"start": 0.5, "stop": 1.5, "step": 0.5})
+    response = client.post('/api/economic/impact', json=body)
+    assert response.status_code == 400
+
+
+def test_endpoint_limits_sweep_size():
+    app = create_app('testing', {'ECONOMIC_SWEEP_MAX_POINTS': 100})
+    body = dict(BASE, turnaround_time={"start": 0, "stop": 60, "num": 11}, tax_credits={"start": 0, "stop": 5, "num": 11})
+    response = app.test_client().post('/api/economic/impact', json=body)
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Sweep too large"
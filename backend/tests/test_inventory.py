@@ -0,0 +1,115 @@
+# tests/test_inventory.py
+import numpy as np
+import pytest
+
+from app import create_app
+from benchmarks.common import make_benchmark_app
+from services.inventory_service import demand_series, required_capacity, simulate_inventory
+
+BOIL_OFF = 1 - 0.9925
+
+
+@pytest.fixture
+def client():
+    return create_app('testing').test_client()
+
+
+def simulate_day_by_day(demand, capacity, interval, boil_off):
+    """Reference implementation: one scenario, one day at a time."""
+    inventory = stockouts = lost = delivered = 0.0
+    for day, need in enumerate(demand):
+        if day % interval == 0:
+            delivered += capacity - inventory
+            inventory = capacity
+        served = min(inventory, need)
+        stockouts += served < need - 1e-9
+        inventory -= served
+        lost += inventory * boil_off
+        inventory *= 1 - boil_off
+    return stockouts, lost, delivered, inventory
+
+
+def test_matches_day_by_day_simulation():
+    demand = demand_series([100, 130], 3, cv=[0, 0.3, 0.8], seed=1)
+    capacity = np.array([450.0, 300.0, 900.0])
+    intervals = np.array([4, 3, 7])
+    result = simulate_inventory(demand, capacity, intervals, BOIL_OFF)
+    for s in range(3):
+        stockouts, lost, delivered, final = simulate_day_by_day(demand[s], capacity[s], intervals[s], BOIL_OFF)
+        assert result["stockout_days"][s] == stockouts
+        assert result["boil_off_cuft"][s] == pytest.approx(lost)
+        assert result["delivered_cuft"][s] == pytest.approx(delivered)
+        assert result["final_inventory_cuft"][s] == pytest.approx(final)
+    # Mass balance: deliveries = served + boil-off + what is left
+    served = result["demand_cuft"] - result["unmet_cuft"]
+    assert np.allclose(result["delivered_cuft"], served + result["boil_off_cuft"] + result["final_inventory_cuft"])
+
+
+def test_required_capacity_is_smallest_meeting_target():
+    demand = demand_series([100, 120, 140], 4, cv=0.4, seed=2)
+    intervals = np.array([1, 3, 5, 10])
+    probe = simulate_inventory(demand, np.full(4, 1e9), intervals, BOIL_OFF)
+    required = required_capacity(probe["requirement"], 0.98)
+
+    at = simulate_inventory(demand, required, intervals, BOIL_OFF)
+    below = simulate_inventory(demand, required * (1 - 1e-6), intervals, BOIL_OFF)
+    assert np.all(at["service_level"] >= 0.98)
+    assert np.all(below["service_level"] < 0.98)
+    assert np.all(np.diff(required) > 0)  # longer delivery cycles need more storage
+
+
+def test_constant_demand_daily_deliveries():
+    result = simulate_inventory(demand_series([100], 1), [100.0], [1], 0.0)
+    assert result["stockout_days"][0] == 0
+    assert result["delivered_cuft"][0] == pytest.approx(365 * 100)
+    assert required_capacity(result["requirement"], 1.0)[0] == pytest.approx(100)
+
+
+def test_endpoint_scenarios(client):
+    body = {
+        "h2_demand_cuft": 1000, "end_year": 2024, "seed": 3, "target_service_level": 0.95,
+        "scenarios": [
+            {"name": "daily", "storage_days": 2},
+            {"name": "weekly", "storage_days": 5, "delivery_interval_days": 7, "demand_cv": 0.2},
+            {"capacity_cuft": 20_000, "delivery_interval_days": 14},
+        ],
+    }
+    response = client.post('/api/storage/inventory', json=body, headers={'Accept': 'application/vnd.hydrogen.columnar+json'})
+    assert response.status_code == 200
+    data = response.get_json(force=True)
+    assert data["days"] == 730
+    table = data["scenarios"]
+    assert table["name"] == ["daily", "weekly", "scenario 3"]
+    assert table["stockout_days"][0] == 0
+    assert table["stockout_days"][1] > 0  # 5 days of storage for 7-day cycles
+    assert table["usable_capacity_cuft"][2] == pytest.approx(20_000 * 0.95)
+    assert table["required_buffer_days"][1] > 6
+    assert "inventory" not in data
+
+
+def test_endpoint_demand_model_horizon():
+    app, tmpdir = make_benchmark_app('testing')
+    try:
+        response = app.test_client().post('/api/storage/inventory', json={
+            "demand": {"slider_perc": 0.4, "gse": ["F250"]}, "start_year": 2023, "end_year": 2050,
+            "scenarios": [{"delivery_interval_days": 2}], "include_series": True,
+        })
+    finally:
+        tmpdir.cleanup()
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["days"] == 28 * 365
+    assert len(data["inventory"][0]) == data["days"]
+    demand = data["mean_daily_demand_cuft"]
+    assert demand[-1] > demand[0] > 0  # grows with the TAF projections
+    assert data["scenarios"][0]["stockout_days"] == 0  # 11 days of storage for 2-day cycles
+
+
+@pytest.mark.parametrize("body", [
+    {"scenarios": [{}]},                                          # no demand
+    {"h2_demand_cuft": 1000, "start_year": 2030, "end_year": 2025},
+    {"h2_demand_cuft": 1000, "scenarios": [{"storage_days": 3, "capacity_cuft": 100}]},
+    {"h2_demand_cuft": 1000, "end_year": 2050, "scenarios": [{}] * 300},  # too many scenario-days
+])
+def test_endpoint_rejects(client, body):
+    assert client.post('/api/storage/inventory', json=body).status_code == 400
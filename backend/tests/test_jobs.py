@@ -0,0 +1,235 @@
+# tests/test_jobs.py
+import json
+import os
+import time
+
+import pytest
+import sqlalchemy
+from pydantic import Field
+
+from benchmarks.common import make_benchmark_app
+from schemas.base import DeferredModel
+from utils.database import get_aircraft_db_session
+from utils.jobs import JobStore, job_kind
+from utils.reference_data import get_reference_data, set_reference_data
+
+
+class WaitParams(DeferredModel):
+    steps: int = Field(default=1000, gt=0)
+
+
+@job_kind('test_wait', WaitParams, version=lambda params: None)
+def wait_until_cancelled(params, context):
+    for step in range(params.steps):
+        context.check_cancelled()
+        context.progress(step / params.steps, {"step": step})
+        time.sleep(0.01)
+    return {"steps": params.steps}
+
+
+@job_kind('test_pool_process', WaitParams, version=lambda params: None)
+def describe_pool_process(params, context):
+    sessions = get_aircraft_db_session()
+    try:
+        rows = next(sessions).execute(sqlalchemy.text("SELECT COUNT(*) FROM aircraft_data")).scalar()
+    finally:
+        sessions.close()
+    reference_data = get_reference_data()
+    return {
+        "pid": os.getpid(),
+        "aircraft_rows": rows,
+        "reference_data": reference_data.version if reference_data is not None else None,
+    }
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    path = tmp_path_factory.mktemp('jobs')
+    app, tmpdir = make_benchmark_app('testing', {
+        'JOB_STORE_PATH': str(path / 'jobs.sqlite'),
+        'JOB_WORKERS': 1,
+        'JOB_MAX_ACTIVE': 2,
+    })
+    yield app
+    app.extensions['jobs'].shutdown(wait=True)
+    tmpdir.cleanup()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def wait_for(client, job_id, statuses=('succeeded', 'failed', 'cancelled'), timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = client.get(f'/api/jobs/{job_id}').get_json()
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} still {job['status']}")
+
+
+def test_demand_sweep_job(client):
+    response = client.post('/api/jobs', json={
+        "kind": "demand_sweep",
+        "params": {"slider_values": [0.25, 0.5], "years": [2030, 2040], "gse": ["F250"]}
+    })
+    assert response.status_code == 202
+    job_id = response.get_json()["id"]
+    assert response.headers["Location"].endswith(job_id)
+
+    job = wait_for(client, job_id)
+    assert job["status"] == "succeeded", job["error"]
+    assert job["progress"] == 1.0
+
+    result = client.get(f'/api/jobs/{job_id}/result').get_json()
+    assert result["points"] == 4
+    rows = result["results"]
+    assert [row["end_year"] for row in rows] == [2030, 2030, 2040, 2040]
+
+    expected = client.post('/api/hydrogen-demand/total', json={
+        "slider_perc": 0.5, "gse": ["F250"], "end_year": 2040
+    }).get_json()["total_demand"]
+    assert rows[3]["total_demand"] == pytest.approx(expected)
+
+
+def test_storage_monte_carlo_job(client):
+    params = {
+        "total_h2_volume_gal": 5000000, "number_of_tanks": 20, "tank_diameter_ft": 10,
+        "tank_length_ft": 40, "cost_per_sqft_construction": 580, "cost_per_cuft_insulation": 15,
+        "relative_std": {"tank_diameter_ft": 0.05, "cost_per_sqft_construction": 0.1},
+        "samples": 120000, "seed": 7
+    }
+    job_id = client.post('/api/jobs', json={"kind": "storage_monte_carlo", "params": params}).get_json()["id"]
+    job = wait_for(client, job_id)
+    assert job["status"] == "succeeded", job["error"]
+    assert job["partial"]["samples_done"] == 120000
+    summary = client.get(f'/api/jobs/{job_id}/result?format=columnar').get_json()["summary"]
+    index = summary["output"].index("total_infrastructure_cost")
+    assert summary["p5"][index] < summary["p50"][index] < summary["p95"][index]
+
+    # A seeded run is a cache hit the second time
+    again = client.post('/api/jobs', json={"kind": "storage_monte_carlo", "params": params}).get_json()
+    assert again["status"] == "succeeded"
+
+
+def test_cancel_running_job(client):
+    job_id = client.post('/api/jobs', json={"kind": "test_wait", "params": {}}).get_json()["id"]
+    wait_for(client, job_id, statuses=('running',))
+    assert client.post(f'/api/jobs/{job_id}/cancel').status_code == 202
+    job = wait_for(client, job_id)
+    assert job["status"] == "cancelled"
+    assert client.get(f'/api/jobs/{job_id}/result').status_code == 409
+
+
+def test_cancel_requested_by_another_worker(app, client):
+    job_id = client.post('/api/jobs', json={"kind": "test_wait", "params": {}}).get_json()["id"]
+    wait_for(client, job_id, statuses=('running',))
+    # Another worker only has the shared job table
+    JobStore(app.config['JOB_STORE_PATH']).request_cancel(job_id)
+    assert wait_for(client, job_id)["status"] == "cancelled"
+
+
+def test_queue_is_bounded(client):
+    ids = [client.post('/api/jobs', json={"kind": "test_wait", "params": {}}).get_json()["id"]
+           for _ in range(2)]
+    response = client.post('/api/jobs', json={"kind": "test_wait", "params": {}})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"]
+    for job_id in ids:
+        client.delete(f'/api/jobs/{job_id}')
+    for job_id in ids:
+        assert wait_for(client, job_id)["status"] == "cancelled"
+
+
+def test_submission_errors(client):
+    assert client.post('/api/jobs', json={"kind": "nope"}).status_code == 400
+    response = client.post('/api/jobs', json={"kind": "demand_sweep", "params": {"slider_values": [],
+                                                                                  "years": [1999]}})
+    assert response.status_code == 400
+    assert client.get('/api/jobs/missing').status_code == 404
+    assert "demand_sweep" in client.get('/api/jobs/kinds').get_json()
+
+
+def read_events(response):
+    events = []
+    for block in response.get_data(as_text=True).split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append((fields["event"], json.loads(fields["data"]), fields.get("id")))
+    return events
+
+
+def test_event_stream_of_sweep(client):
+    job_id = client.post('/api/jobs', json={
+        "kind": "demand_sweep",
+        "params": {"slider_values": [0.1, 0.9], "years": [2030, 2035, 2040], "gse": ["F250"]}
+    }).get_json()["id"]
+    response = client.get(f'/api/jobs/{job_id}/events')
+    assert response.mimetype == 'text/event-stream'
+    events = read_events(response)
+    types = [event_type for event_type, _, _ in events]
+    assert types[0] == 'status' and types[-1] == 'done'
+    assert types.count('rows') == 3
+    assert events[-1][1]["status"] == "succeeded"
+    rows = [data for event_type, data, _ in events if event_type == 'rows']
+    assert [chunk["end_year"] for chunk in rows] == [[2030, 2030], [2035, 2035], [2040, 2040]]
+    fractions = [data["fraction"] for event_type, data, _ in events if event_type == 'progress']
+    assert fractions == sorted(fractions) and fractions[-1] == 1.0
+
+    # Resuming after the last rows event replays only what followed it
+    last_rows_id = [event_id for event_type, _, event_id in events if event_type == 'rows'][-1]
+    resumed = read_events(client.get(f'/api/jobs/{job_id}/events',
+                                     headers={"Last-Event-ID": last_rows_id}))
+    assert 'rows' not in [event_type for event_type, _, _ in resumed]
+    assert resumed[-1][0] == 'done'
+
+
+def test_event_stream_ends_with_result(client):
+    job_id = client.post('/api/jobs', json={"kind": "test_wait", "params": {"steps": 3}}).get_json()["id"]
+    events = read_events(client.get(f'/api/jobs/{job_id}/events'))
+    assert [event_type for event_type, _, _ in events][-2:] == ['done', 'result']
+    assert events[-1][1] == {"steps": 3}
+    progress = [data for event_type, data, _ in events if event_type == 'progress']
+    assert progress[-1]["partial"] == {"step": 2}
+
+
+@pytest.mark.parametrize("start_method", ["forkserver", "fork"])
+def test_pool_processes_connect_on_their_own(tmp_path, start_method):
+    app, tmpdir = make_benchmark_app('testing', {
+        'JOB_STORE_PATH': str(tmp_path / 'jobs.sqlite'),
+        'JOB_WORKERS': 1,
+        'JOB_START_METHOD': start_method,
+        'PRELOAD_REFERENCE_DATA': True,
+    })
+    try:
+        client = app.test_client()
+        job_id = client.post('/api/jobs', json={"kind": "test_pool_process", "params": {}}).get_json()["id"]
+        assert wait_for(client, job_id)["status"] == "succeeded"
+        result = client.get(f'/api/jobs/{job_id}/result').get_json()
+        assert result["pid"] != os.getpid()
+        assert result["aircraft_rows"] > 0
+        assert result["reference_data"] == get_reference_data().version
+    finally:
+        app.extensions['jobs'].shutdown(wait=True)
+        set_reference_data(None)
+        tmpdir.cleanup()
+
+
+def test_result_too_large_to_store_fails_the_job(tmp_path):
+    app, tmpdir = make_benchmark_app('testing', {
+        'JOB_STORE_PATH': str(tmp_path / 'jobs.sqlite'),
+        'JOB_WORKERS': 1,
+        'RESULT_CACHE_PATH': str(tmp_path / 'results.sqlite'),
+        'RESULT_CACHE_MAX_BYTES': 16,
+    })
+    try:
+        client = app.test_client()
+        job_id = client.post('/api/jobs', json={"kind": "test_wait", "params": {"steps": 2}}).get_json()["id"]
+        job = wait_for(client, job_id)
+        assert job["status"] == "failed"
+        assert "RESULT_CACHE_MAX_BYTES" in job["error"]
+    finally:
+        app.extensions['jobs'].shutdown(wait=True)
+        tmpdir.cleanup()
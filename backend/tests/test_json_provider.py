@@ -0,0 +1,56 @@
+# tests/test_json_provider.py
+import json
+
+import numpy as np
+import pytest
+from flask import Flask, jsonify
+
+from utils.json_provider import NumpyJSONProvider, init_json_provider
+
+
+@pytest.fixture
+def app():
+    test_app = Flask(__name__)
+    test_app.config['JSON_PROVIDER'] = 'numpy'
+    init_json_provider(test_app)
+    return test_app
+
+
+def test_provider_is_installed(app):
+    assert isinstance(app.json, NumpyJSONProvider)
+
+
+def test_numpy_scalars_and_arrays(app):
+    payload = {
+        "float": np.float64(1.5),
+        "int": np.int64(7),
+        "bool": np.bool_(True),
+        "array": np.arange(4, dtype=np.float64),
+        "matrix": np.arange(6, dtype=np.int32).reshape(2, 3),
+        "strided": np.arange(10)[::3],
+        "names": np.array(["F250", "Belt Loader"]),
+    }
+    decoded = json.loads(app.json.dumps(payload))
+
+    assert decoded == {
+        "float": 1.5,
+        "int": 7,
+        "bool": True,
+        "array": [0.0, 1.0, 2.0, 3.0],
+        "matrix": [[0, 1, 2], [3, 4, 5]],
+        "strided": [0, 3, 6, 9],
+        "names": ["F250", "Belt Loader"],
+    }
+
+
+def test_jsonify_response(app):
+    with app.app_context():
+        response = jsonify({"total_demand": np.float64(12.25), "series": np.array([1.0, 2.0])})
+
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.get_data()) == {"total_demand": 12.25, "series": [1.0, 2.0]}
+
+
+def test_unserializable_object_raises(app):
+    with pytest.raises(TypeError):
+        app.json.dumps({"value": object()})
@@ -0,0 +1,37 @@
+# tests/test_loadtest.py
+import random
+
+import pytest
+
+from benchmarks.loadtest import DEFAULT_MIX, Dashboard, parse_mix, read_routes
+from schemas.economic import EconomicImpactQuery
+from schemas.hydrogen_demand import TotalDemandQuery
+from schemas.storage import StorageCostQuery
+
+
+def test_routes_read_from_frontend():
+    routes = read_routes()
+    assert routes["HYDROGEN_DEMAND.TOTAL"] == "/api/hydrogen-demand/total"
+    assert routes["STORAGE.CALCULATE"] == "/api/storage/calculate"
+    assert set(routes) == set(DEFAULT_MIX)
+
+
+def test_generated_payloads_are_valid():
+    dashboard = Dashboard(["F250", "TLD 1410", "FMC Commander 15"], random.Random(0))
+    schemas = {
+        "HYDROGEN_DEMAND.TOTAL": TotalDemandQuery,
+        "STORAGE.CALCULATE": StorageCostQuery,
+        "ECONOMIC.IMPACT": EconomicImpactQuery,
+    }
+    for _ in range(200):
+        for route, schema in schemas.items():
+            schema.model_validate(dashboard.payload(route))
+
+
+def test_parse_mix():
+    routes = read_routes()
+    assert parse_mix(["total=3", "STORAGE.CALCULATE=1", "impact=0"], routes) == {
+        "HYDROGEN_DEMAND.TOTAL": 3.0, "STORAGE.CALCULATE": 1.0
+    }
+    with pytest.raises(SystemExit):
+        parse_mix(["nowhere=1"], routes)
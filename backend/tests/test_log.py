@@ -0,0 +1,90 @@
+# tests/test_log.py
+import io
+import json
+import logging
+
+from app import create_app
+from utils import log
+from utils.log import JsonFormatter, RequestIdFilter, SamplingFilter
+
+
+def make_record(name='services.hydrogen_service', level=logging.DEBUG, msg='value %s', args=(1,), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_sampling_filter_rates():
+    sampling = SamplingFilter({'sqlalchemy': 0.0, 'services': 0.5, 'services.storage_service': 1.0})
+    assert sampling.rate_for('sqlalchemy.engine.Engine') == 0.0
+    assert sampling.rate_for('services.hydrogen_service') == 0.5
+    assert sampling.rate_for('services.storage_service') == 1.0
+    assert sampling.rate_for('routes.storage') == 1.0
+
+    assert not sampling.filter(make_record('sqlalchemy.engine', logging.INFO))
+    assert sampling.filter(make_record('sqlalchemy.engine', logging.WARNING))
+    kept = sum(sampling.filter(make_record()) for _ in range(2000))
+    assert 800 < kept < 1200
+
+
+def test_json_formatter_includes_request_id_and_extras():
+    record = make_record(level=logging.INFO, request_id='abc', end_year=2040)
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "value 1"
+    assert entry["level"] == "INFO"
+    assert entry["request_id"] == "abc"
+    assert entry["end_year"] == 2040
+
+
+def test_request_id_echoed_and_attached_to_records():
+    app = create_app('testing')
+    records = []
+
+    @app.route('/log-test')
+    def log_test():
+        record = make_record()
+        RequestIdFilter().filter(record)
+        records.append(record)
+        return 'ok'
+
+    client = app.test_client()
+    response = client.get('/log-test', headers={'X-Request-ID': 'req-1'})
+    assert response.headers['X-Request-ID'] == 'req-1'
+    assert records[-1].request_id == 'req-1'
+
+    generated = client.get('/log-test').headers['X-Request-ID']
+    assert len(generated) == 32
+    assert records[-1].request_id == generated
+
+    record = make_record()
+    RequestIdFilter().filter(record)
+    assert record.request_id == '-'
+
+
+def test_async_handler_writes_from_listener():
+    stream = io.StringIO()
+    create_app('testing', {'LOG_ASYNC': True, 'LOG_JSON': True, 'LOG_LEVEL': logging.INFO})
+    try:
+        log._listener.handlers[0].setStream(stream)
+        logger = logging.getLogger('tests.async')
+        logger.debug("dropped %s", 1)
+        values = [1, 2]
+        logger.info("kept %s", values)
+        values.append(3)  # the message is captured when logged
+        log.stop_logging()  # flushes the queue
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [line["message"] for line in lines if line["logger"] == 'tests.async'] == ["kept [1, 2]"]
+    finally:
+        create_app('testing')
+
+
+def test_log_level_env_override(monkeypatch):
+    monkeypatch.setenv('LOG_LEVEL', 'error')
+    try:
+        create_app('testing')
+        assert logging.getLogger().level == logging.ERROR
+    finally:
+        monkeypatch.delenv('LOG_LEVEL')
+        create_app('testing')
+    assert logging.getLogger().level == logging.DEBUG
@@ -0,0 +1,108 @@
+# tests/test_negotiation.py
+import gzip
+import json
+
+import numpy as np
+import pytest
+
+from app import create_app
+from utils.negotiation import COLUMNAR_MIMETYPE, MSGPACK_MIMETYPE, ARROW_MIMETYPE, negotiated_response
+
+BREAKDOWN = {
+    "total": 3.0,
+    "details": [
+        {"type": "F250", "hydrogen_volume": 1.0},
+        {"type": "Belt Loader", "hydrogen_volume": 2.0},
+    ]
+}
+
+
+@pytest.fixture(scope="module")
+def app():
+    test_app = create_app('testing', {'COMPRESS_MIN_SIZE': 200})
+
+    @test_app.route('/breakdown')
+    def breakdown():
+        return negotiated_response(BREAKDOWN, tables=('details',))
+
+    @test_app.route('/series')
+    def series():
+        return negotiated_response(
+            {"series": {"year": np.arange(2023, 2051), "demand": np.linspace(0, 1, 28)}},
+            tables=('series',)
+        )
+
+    return test_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def test_default_is_row_wise_json(client):
+    response = client.get('/breakdown')
+    assert response.mimetype == 'application/json'
+    assert response.get_json() == BREAKDOWN
+    assert 'Accept' in response.headers['Vary']
+
+
+def test_columnar_json(client):
+    response = client.get('/breakdown', headers={'Accept': COLUMNAR_MIMETYPE})
+    assert response.mimetype == COLUMNAR_MIMETYPE
+    assert json.loads(response.get_data()) == {
+        "total": 3.0,
+        "details": {"type": ["F250", "Belt Loader"], "hydrogen_volume": [1.0, 2.0]}
+    }
+
+
+def test_columnar_source_rendered_as_rows(client):
+    rows = client.get('/series', headers={'Accept-Encoding': 'identity'}).get_json()["series"]
+    assert len(rows) == 28
+    assert rows[0] == {"year": 2023, "demand": 0.0}
+
+
+def test_msgpack(client):
+    msgpack = pytest.importorskip('msgpack')
+    response = client.get('/breakdown?format=msgpack')
+    assert response.mimetype == MSGPACK_MIMETYPE
+    decoded = msgpack.unpackb(response.get_data())
+    assert decoded["details"]["hydrogen_volume"] == [1.0, 2.0]
+
+
+def test_arrow_stream(client):
+    pyarrow = pytest.importorskip('pyarrow')
+    response = client.get('/breakdown', headers={'Accept': ARROW_MIMETYPE})
+    assert response.mimetype == ARROW_MIMETYPE
+    table = pyarrow.ipc.open_stream(response.get_data()).read_all()
+    assert table.column('type').to_pylist() == ["F250", "Belt Loader"]
+    assert json.loads(table.schema.metadata[b'result'])["total"] == 3.0
+
+
+def test_unknown_format_is_not_acceptable(client):
+    assert client.get('/breakdown?format=xml').status_code == 406
+    assert client.get('/breakdown', headers={'Accept': 'text/html'}).status_code == 406
+
+
+def test_large_responses_are_compressed(client):
+    response = client.get('/series', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert len(json.loads(gzip.decompress(response.get_data()))["series"]) == 28
+
+    small = client.get('/breakdown', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+
+
+def test_storage_endpoint_negotiates(client):
+    msgpack = pytest.importorskip('msgpack')
+    payload = {
+        "total_h2_volume_gal": 5000000,
+        "number_of_tanks": 20,
+        "tank_diameter_ft": 10,
+        "tank_length_ft": 40,
+        "cost_per_sqft_construction": 580,
+        "cost_per_cuft_insulation": 15
+    }
+    response = client.post('/api/storage/calculate?format=msgpack', json=payload)
+    assert response.status_code == 200
+    assert msgpack.unpackb(response.get_data())["footprint_total"] == 8000
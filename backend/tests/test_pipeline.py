@@ -0,0 +1,112 @@
+# tests/test_pipeline.py
+import pytest
+
+from benchmarks.common import make_benchmark_app
+from utils.pipeline import Pipeline, Stage
+from utils.reference_data import set_reference_data
+from utils.result_cache import MemoryCache
+
+BODY = {
+    "demand": {"slider_perc": 0.4, "gse": ["F250", "TLD 1410"], "end_year": 2035},
+    "economic": {"tax_credits": 0.1},
+}
+
+
+def counting_pipeline(calls):
+    def stage(name, value):
+        def fn(inputs, **upstream):
+            calls.append(name)
+            return value(inputs, upstream)
+        return fn
+
+    return Pipeline([
+        Stage('total', stage('total', lambda i, u: u['a'] + u['b']), depends=('a', 'b')),
+        Stage('a', stage('a', lambda i, u: i)),
+        Stage('b', stage('b', lambda i, u: u['a'] * 2 + i), depends=('a',)),
+        Stage('side', stage('side', lambda i, u: -u['a']), depends=('a',)),
+    ])
+
+
+def test_stages_run_in_dependency_order_and_targets_prune():
+    calls = []
+    run = counting_pipeline(calls).run({"a": 1, "b": 10}, targets=['total'])
+    assert calls == ['a', 'b', 'total']
+    assert run.results == {"a": 1, "b": 12, "total": 13}
+
+
+def test_only_changed_stages_recompute():
+    calls, memo = [], MemoryCache()
+    pipeline = counting_pipeline(calls)
+    pipeline.run({"a": 1, "b": 10}, memo=memo)
+    calls.clear()
+
+    run = pipeline.run({"a": 1, "b": 11}, memo=memo)
+    assert calls == ['b', 'total']
+    assert run.status == {"a": "cached", "b": "computed", "side": "cached", "total": "computed"}
+    assert run.results["total"] == 14
+
+
+def test_unversioned_stage_recomputes_but_downstream_is_reused():
+    calls, memo = [], MemoryCache()
+    pipeline = Pipeline([
+        Stage('a', lambda inputs: calls.append('a') or 5, version=None),
+        Stage('b', lambda inputs, a: calls.append('b') or a + 1, depends=('a',)),
+    ])
+    pipeline.run({}, memo=memo)
+    run = pipeline.run({}, memo=memo)
+    assert calls == ['a', 'b', 'a']
+    assert run.status == {"a": "computed", "b": "cached"}
+
+
+@pytest.mark.parametrize("stages", [
+    [Stage('a', None, depends=('b',)), Stage('b', None, depends=('a',))],
+    [Stage('a', None, depends=('missing',))],
+    [Stage('a', None), Stage('a', None)],
+])
+def test_invalid_graphs(stages):
+    with pytest.raises(ValueError):
+        Pipeline(stages)
+
+
+@pytest.fixture
+def client():
+    set_reference_data(None)
+    app, tmpdir = make_benchmark_app('testing', {'PRELOAD_REFERENCE_DATA': True})
+    yield app.test_client()
+    set_reference_data(None)
+    tmpdir.cleanup()
+
+
+def test_endpoint_matches_separate_endpoints(client):
+    data = client.post('/api/pipeline', json=BODY).get_json()
+    assert set(data["status"].values()) == {"computed"}
+
+    demand = client.post('/api/hydrogen-demand/total', json=BODY["demand"]).get_json()
+    assert data["results"]["demand"]["total_demand"] == pytest.approx(demand["total_demand"])
+    storage = data["results"]["storage_cost"]
+    expected = client.post('/api/storage/calculate', json={
+        "total_h2_volume_gal": demand["total_demand"] / 0.1337,
+        "number_of_tanks": data["results"]["storage_area"]["number_of_tanks"],
+        "tank_diameter_ft": 10.1667, "tank_length_ft": 56.5,
+        "cost_per_sqft_construction": 580, "cost_per_cuft_insulation": 15,
+    }).get_json()
+    assert storage["total_infrastructure_cost"] == pytest.approx(expected["total_infrastructure_cost"])
+    assert data["results"]["economic"]["baseline_revenue"] == pytest.approx(0.4 * 0.4 * 1e9)
+
+
+def test_changing_tax_credit_reuses_demand_and_storage(client):
+    client.post('/api/pipeline', json=BODY)
+    changed = dict(BODY, economic={"tax_credits": 0.5})
+    data = client.post('/api/pipeline', json=changed).get_json()
+    assert data["status"] == {
+        "demand": "cached", "storage_area": "cached", "storage_cost": "cached", "economic": "computed",
+    }
+
+    changed = dict(BODY, storage={"cost_per_cuft_insulation": 20})
+    assert client.post('/api/pipeline', json=changed).get_json()["status"]["storage_cost"] == "computed"
+
+
+def test_targets(client):
+    data = client.post('/api/pipeline', json=dict(BODY, targets=["storage_area"])).get_json()
+    assert set(data["results"]) == {"demand", "storage_area"}
+    assert client.post('/api/pipeline', json=dict(BODY, targets=["nope"])).status_code == 400
@@ -0,0 +1,160 @@
+# tests/test_placement.py
+import math
+
+import numpy as np
+import pytest
+
+from app import create_app
+from services.placement_service import capacity_bound, pack_polygon, pack_zone, place_tanks
+from utils.geo import is_convex, project, rotate, unproject
+from utils.zones import build_zone_index, load_zones
+
+WIDTH, LENGTH, SETBACK = 10.0, 40.0, 5.0
+
+
+@pytest.fixture
+def client():
+    return create_app('testing').test_client()
+
+
+def inside(polygon, points):
+    """Even-odd point-in-polygon test for (n, 2) points."""
+    x, y = points[:, 0:1], points[:, 1:2]
+    p, q = polygon, np.roll(polygon, -1, axis=0)
+    crossing = (p[:, 1] > y) != (q[:, 1] > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        xs = p[:, 0] + (y - p[:, 1]) / (q[:, 1] - p[:, 1]) * (q[:, 0] - p[:, 0])
+    return ((crossing & (x < xs)).sum(axis=1) % 2).astype(bool)
+
+
+def check_packing(polygon, centers, angle):
+    """Footprints plus setback lie inside the polygon and keep apart."""
+    local = rotate(centers, -angle)
+    half = np.array([LENGTH / 2 + SETBACK - 1e-6, WIDTH / 2 + SETBACK - 1e-6])
+    for sx, sy in ((-1, -1), (-1, 1), (1, -1), (1, 1)):
+        assert inside(polygon, rotate(local + half * [sx, sy], angle)).all()
+    gap = np.abs(local[:, None, :] - local[None, :, :])
+    apart = (gap[..., 0] >= LENGTH + SETBACK - 1e-6) | (gap[..., 1] >= WIDTH + SETBACK - 1e-6)
+    np.fill_diagonal(apart, True)
+    assert apart.all()
+
+
+def test_projection_round_trip():
+    origin = (33.62, -84.42)
+    x, y = project([33.63, 33.60], [-84.45, -84.40], origin)
+    lat, lon = unproject(x, y, origin)
+    assert lat == pytest.approx([33.63, 33.60])
+    assert lon == pytest.approx([-84.45, -84.40])
+    assert y[0] - y[1] == pytest.approx(0.03 * 364_800, rel=1e-3)  # ~364,800 ft per degree of latitude
+
+
+def test_rectangle_packs_exactly():
+    rectangle = np.array([[0, 0], [100, 0], [100, 100], [0, 100]], dtype=float)
+    centers = pack_polygon(rectangle, WIDTH, LENGTH, SETBACK, phase=0.0)
+    # 6 rows of 15 ft, 2 tanks of 45 ft per row
+    assert len(centers) == 12
+    check_packing(rectangle, centers, 0.0)
+
+
+def test_convex_and_general_band_paths_agree():
+    index = build_zone_index(load_zones('data/available_zones.json'))
+    for polygon in index.polygons:
+        assert is_convex(polygon)
+        convex = pack_polygon(polygon, WIDTH, LENGTH, SETBACK, convex=True)
+        general = pack_polygon(polygon, WIDTH, LENGTH, SETBACK, convex=False)
+        assert np.allclose(convex, general)
+
+
+@pytest.mark.parametrize("polygon", [
+    np.array([[0, 0], [200, 0], [200, 60], [60, 60], [60, 200], [0, 200]], dtype=float),  # L shape
+    rotate(np.array([[0, 0], [300, 0], [300, 80], [0, 80]], dtype=float), 0.4),        # rotated strip
+    np.array([[0, 0], [120, 0], [120, 120], [60, 40], [0, 120]], dtype=float),          # notch
+])
+def test_packings_are_valid(polygon):
+    centers, angle = pack_zone(polygon, WIDTH, LENGTH, SETBACK)
+    assert len(centers) > 0
+    check_packing(polygon, centers, angle)
+
+
+def test_rotated_strip_follows_its_edges():
+    strip = rotate(np.array([[0, 0], [300, 0], [300, 80], [0, 80]], dtype=float), 0.4)
+    centers, angle = pack_zone(strip, WIDTH, LENGTH, SETBACK)
+    assert angle == pytest.approx(0.4)
+    assert len(centers) == len(pack_polygon(rotate(strip, -0.4), WIDTH, LENGTH, SETBACK))
+
+
+def test_required_tanks_go_to_largest_zones_first():
+    index = build_zone_index(load_zones('data/available_zones.json'))
+    result = place_tanks(index, 10.1667, 56.5, 5, 2000, required_tanks=2000)
+    by_name = {zone["name"]: zone for zone in result["zones"]}
+    assert result["placed_tanks"] == 2000 and result["fits"]
+    assert by_name["Available Polygon Area 1"]["assigned_tanks"] == 2000
+    assert by_name["Potential Circular Area"]["assigned_tanks"] == 0
+    assert len(by_name["Available Polygon Area 1"]["placements"]["lat"]) == 2000
+
+    circle = by_name["Potential Circular Area"]
+    assert circle["area_sqft"] == pytest.approx(math.pi * (200 * 3.28084) ** 2, rel=0.01)
+    assert 0 < circle["max_utilization"] < 1
+
+
+def test_capacity_bound_holds_every_packing():
+    index = build_zone_index(load_zones('data/available_zones.json'))
+    result = place_tanks(index, 10.1667, 56.5, 5, 2000, include_placements=False)
+    bound = capacity_bound(index, 10.1667, 56.5, 5)
+    capacities = [zone["capacity_tanks"] for zone in result["zones"]]
+    assert all(capacity <= limit for capacity, limit in zip(capacities, bound))
+
+
+def test_many_zones_within_interactive_latency():
+    import time
+    rng = np.random.default_rng(0)
+    zones = []
+    for i in range(300):
+        lat, lon = 33.6 + rng.uniform(0, 0.05), -84.45 + rng.uniform(0, 0.05)
+        size = rng.uniform(0.0005, 0.002)
+        zones.append({"name": f"Parcel {i}", "type": "polygon",
+                      "coordinates": [[lat, lon], [lat + size, lon], [lat + size, lon + size], [lat, lon + size / 2]]})
+    start = time.perf_counter()
+    result = place_tanks(build_zone_index(zones), 10.1667, 56.5, 5, 2000, required_tanks=5000)
+    assert time.perf_counter() - start < 2.0
+    assert result["fits"]
+
+
+def test_placement_endpoint(client):
+    response = client.post('/api/storage/placement', json={"h2_demand_cuft": 100_000})
+    assert response.status_code == 200
+    data = response.get_json()
+    usable = 18014 / 7.48052 * 0.95 * 0.9925
+    assert data["required_tanks"] == math.ceil(100_000 / usable)
+    assert data["fits"]
+    assert sum(len(zone["placements"]["x_ft"]) for zone in data["zones"]) == data["required_tanks"]
+
+
+def test_placement_endpoint_with_zones(client):
+    zones = [{"name": "Apron", "type": "circle", "center": [33.64, -84.43], "radius": 30}]
+    data = client.post('/api/storage/placement', json={"zones": zones, "number_of_tanks": 50}).get_json()
+    assert not data["fits"]
+    assert 0 < data["placed_tanks"] == data["capacity_tanks"] < 50
+
+
+@pytest.mark.parametrize("body", [
+    {},                                                           # every zone filled: too many placements
+    {"zones": [{"name": "A", "type": "circle", "center": [33.6, -84.4]}]},
+    {"zones": [{"name": "A", "type": "polygon", "coordinates": [[33.6, -84.4], [33.6, -84.4], [33.6, -84.4]]}],
+     "include_placements": False},
+    {"number_of_tanks": 10, "h2_demand_cuft": 1000},
+])
+def test_placement_endpoint_rejects(client, body):
+    assert client.post('/api/storage/placement', json=body).status_code == 400
+
+
+def test_placement_limit_checked_before_packing(client, monkeypatch):
+    import routes.storage
+
+    def place_tanks(*args, **kwargs):
+        raise AssertionError("packed a request over the placement limit")
+    monkeypatch.setattr(routes.storage, 'place_tanks', place_tanks)
+    client.application.config['PLACEMENT_MAX_PLACEMENTS'] = 10
+    response = client.post('/api/storage/placement', json={"number_of_tanks": 11})
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Too many placements"
@@ -0,0 +1,94 @@
+# tests/test_reference_data.py
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from benchmarks.common import make_benchmark_app
+from models.gse import GroundSupportEquipment
+from repositories.aircraft_repository import AircraftRepository
+from repositories.gse_repository import GSERepository
+from services.hydrogen_service import HydrogenService
+from utils import database
+from utils.reference_data import build_reference_data, data_version, get_reference_data
+
+AIRCRAFT = [(5000.0, 20.0, 100.0, "JFK"), (6000.0, 40.0, 200.0, "LAX"), (4850.0, 14.0, 67.0, "JFK")]
+GSE = [
+    ("Tractor", "Diesel", 0.1, 10, 5),
+    ("Belt Loader", "Gasoline", 0.2, 15, 10),
+    ("Cart", "Electric", 0.3, 5, 5),
+]
+
+
+@pytest.fixture
+def repo_service():
+    aircraft_repo = MagicMock(spec=AircraftRepository)
+    aircraft_repo.get_aircraft_data.return_value = [
+        MagicMock(fuel_consumption=fuel, air_time=air_time) for fuel, air_time, _, _ in AIRCRAFT
+    ]
+    gse_repo = MagicMock(spec=GSERepository)
+    gse_repo.get_gse_by_equipment_type.side_effect = lambda types: [
+        MagicMock(ground_support_equipment=name, fuel_used=fuel, usable_fuel_consumption_ft3_min=rate,
+                  operating_time_departure=dep, operating_time_arrival=arr)
+        for name, fuel, rate, dep, arr in GSE if name in types
+    ]
+    return HydrogenService(aircraft_repo, gse_repo)
+
+
+@pytest.fixture
+def reference_service():
+    reference = build_reference_data(AIRCRAFT, GSE)
+    return HydrogenService(MagicMock(spec=AircraftRepository), MagicMock(spec=GSERepository), reference)
+
+
+def test_arrays_are_read_only_and_versioned():
+    reference = build_reference_data(AIRCRAFT, GSE)
+    assert reference.aircraft.dest_names == ("JFK", "LAX")
+    assert list(reference.aircraft.dest_codes) == [0, 1, 0]
+    with pytest.raises(ValueError):
+        reference.aircraft.fuel_consumption[0] = 1.0
+    assert reference.version == build_reference_data(AIRCRAFT, GSE).version
+    assert reference.version != build_reference_data(AIRCRAFT[:2], GSE).version
+
+
+def test_reference_data_matches_repositories(repo_service, reference_service):
+    for end_year in (2023, 2035, 2050):
+        assert reference_service.calculate_aircraft_hydrogen_demand(0.5, end_year) == pytest.approx(
+            repo_service.calculate_aircraft_hydrogen_demand(0.5, end_year))
+
+    types = ["Belt Loader", "Tractor", "Cart"]
+    expected = repo_service.calculate_gse_hydrogen_demand(types, 2030)
+    actual = reference_service.calculate_gse_hydrogen_demand(types, 2030)
+    assert actual["total_h2_demand_vol_gse"] == pytest.approx(expected["total_h2_demand_vol_gse"])
+    assert actual["gse_details"] == expected["gse_details"]
+    reference_service.aircraft_repo.get_aircraft_data.assert_not_called()
+    reference_service.gse_repo.get_gse_by_equipment_type.assert_not_called()
+
+
+def test_empty_reference_data(reference_service):
+    empty = HydrogenService(None, None, build_reference_data([], []))
+    assert empty.calculate_aircraft_hydrogen_demand(0.5, 2030) == 0.0
+    assert empty.calculate_gse_hydrogen_demand(["Tractor"], 2030)["gse_details"] == []
+    assert isinstance(reference_service.reference_data.growth.operations, np.ndarray)
+
+
+def test_demand_results_are_cached_without_reference_data():
+    app, tmpdir = make_benchmark_app('testing')
+    try:
+        assert get_reference_data() is None
+        client = app.test_client()
+        query = {"slider_perc": 0.5, "gse": ["F250"], "end_year": 2035}
+        with app.app_context():
+            version = data_version()
+        assert version is not None
+        first = client.post('/api/hydrogen-demand/total', json=query).get_json()
+        assert client.post('/api/hydrogen-demand/total', json=query).get_json() == first
+        assert app.extensions['result_cache'].stats()["memory_hits"] == 1
+
+        # Re-ingesting the data changes the version
+        with database.gse_engine.begin() as conn:
+            conn.execute(GroundSupportEquipment.__table__.insert(), {"ground_support_equipment": "New"})
+        with app.app_context():
+            assert data_version() != version
+    finally:
+        tmpdir.cleanup()
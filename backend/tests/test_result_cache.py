@@ -0,0 +1,156 @@
+# tests/test_result_cache.py
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pytest
+
+from app import create_app
+from utils.result_cache import DiskCache, MemoryCache, ResultCache, cache_key
+
+
+@pytest.fixture
+def disk(tmp_path):
+    return DiskCache(str(tmp_path / 'cache' / 'results.sqlite'), max_bytes=64 * 1024)
+
+
+def test_memory_cache_is_lru():
+    cache = MemoryCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+
+def test_disk_cache_survives_reopen(disk):
+    value = {"results": {"total_cost": np.array([1.0, 2.0])}, "count": 2}
+    disk.put('key', value)
+    reopened = DiskCache(disk.path)
+    restored = reopened.get('key')
+    np.testing.assert_array_equal(restored["results"]["total_cost"], [1.0, 2.0])
+    assert restored["count"] == 2
+    assert reopened.get('missing', 'default') == 'default'
+
+
+def test_disk_cache_evicts_least_recently_used(disk):
+    blob = b'x' * 10_000
+    for i in range(6):
+        disk.put(f'k{i}', blob)
+    disk.get('k0')  # refresh
+    for i in range(6, 9):
+        disk.put(f'k{i}', blob)
+    stats = disk.stats()
+    assert stats["bytes"] <= disk.max_bytes
+    assert disk.get('k0') == blob
+    assert disk.get('k1') is None
+
+
+def test_disk_cache_writes_access_times_in_batches(disk):
+    disk.TOUCH_BATCH = 3
+    for i, key in enumerate('abc'):
+        disk.put(key, i)
+
+    def accessed():
+        with sqlite3.connect(disk.path) as conn:
+            return dict(conn.execute('SELECT key, accessed FROM entries'))
+
+    written = accessed()
+    assert disk.get('a') == 0 and disk.get('b') == 1 and disk.get('a') == 0
+    assert accessed() == written
+    assert disk.get('c') == 2
+    touched = accessed()
+    assert all(touched[key] > written[key] for key in 'abc')
+
+    # A put writes the pending ones before evicting
+    assert disk.get('b') == 1
+    disk.put('d', 3)
+    assert accessed()['b'] > touched['b']
+
+
+@pytest.mark.parametrize("blob", [
+    b"cnot_a_module\nThing\n.",  # ModuleNotFoundError
+    b"cos\nnot_a_function\n.",    # AttributeError
+    b"\x80\x05",                   # truncated
+])
+def test_disk_cache_entry_that_no_longer_loads_is_a_miss(disk, blob):
+    disk.put('stale', 1)
+    with sqlite3.connect(disk.path) as conn:
+        conn.execute('UPDATE entries SET value = ? WHERE key = ?', (blob, 'stale'))
+    assert disk.get('stale', 'miss') == 'miss'
+    assert disk.stats()["entries"] == 0
+
+
+def test_disk_cache_shared_between_processes(disk):
+    pids = []
+    for worker in range(4):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                for i in range(20):
+                    disk.put(f'w{worker}-{i}', i)
+            finally:
+                os._exit(0)
+        pids.append(pid)
+    for pid in pids:
+        _, status = os.waitpid(pid, 0)
+        assert status == 0
+    assert all(disk.get(f'w{w}-{i}') == i for w in range(4) for i in range(20))
+
+
+def test_result_cache_tiers_and_versions(disk):
+    calls = []
+
+    def compute(x):
+        calls.append(x)
+        return x * 2
+
+    cache = ResultCache(MemoryCache(), disk)
+    assert cache.get_or_compute('ns', 'v1', (1,), compute, 1) == 2
+    assert cache.get_or_compute('ns', 'v1', (1,), compute, 1) == 2
+    assert calls == [1]
+
+    # A fresh process starts with an empty memory tier but a warm disk tier
+    restarted = ResultCache(MemoryCache(), DiskCache(disk.path))
+    assert restarted.get_or_compute('ns', 'v1', (1,), compute, 1) == 2
+    assert restarted.stats()["disk_hits"] == 1
+
+    # A new dataset version is a different key
+    restarted.get_or_compute('ns', 'v2', (1,), compute, 1)
+    # No version: always computed, never stored
+    restarted.get_or_compute('ns', None, (1,), compute, 1)
+    assert calls == [1, 1, 1]
+    assert cache_key('ns', 'v1', (1,)) != cache_key('ns', 'v2', (1,))
+
+
+def test_storage_route_uses_disk_cache(tmp_path):
+    payload = {
+        "total_h2_volume_gal": 5000000, "number_of_tanks": 20, "tank_diameter_ft": 10,
+        "tank_length_ft": 40, "cost_per_sqft_construction": 580, "cost_per_cuft_insulation": 15
+    }
+    overrides = {'RESULT_CACHE_PATH': str(tmp_path / 'results.sqlite')}
+    first = create_app('testing', overrides)
+    expected = first.test_client().post('/api/storage/calculate', json=payload).get_json()
+    assert first.extensions['result_cache'].stats()["misses"] == 1
+
+    second = create_app('testing', overrides)
+    assert second.test_client().post('/api/storage/calculate', json=payload).get_json() == expected
+    assert second.extensions['result_cache'].stats()["disk_hits"] == 1
+
+
+def test_result_cache_counts_hits_from_many_threads():
+    cache = ResultCache(MemoryCache())
+    cache.put('key', 1)
+
+    def hit():
+        for _ in range(2000):
+            cache.get('key')
+
+    threads = [threading.Thread(target=hit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.stats()["memory_hits"] == 16000
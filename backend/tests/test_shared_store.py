@@ -0,0 +1,91 @@
+# tests/test_shared_store.py
+import os
+import uuid
+
+import numpy as np
+import pytest
+
+from utils import reference_data as reference_module
+from utils.reference_data import build_reference_data, publish_reference_data, use_shared_store
+from utils.shared_store import SharedArrayStore, StoreNotPublished, StoreReader
+
+from tests.test_reference_data import AIRCRAFT, GSE
+
+
+@pytest.fixture
+def store():
+    store = SharedArrayStore(f"h2test_{uuid.uuid4().hex[:8]}")
+    yield store
+    store.destroy()
+
+
+def test_attach_before_publish(store):
+    with pytest.raises(StoreNotPublished):
+        store.attach()
+    assert store.current_version() == 0
+
+
+def test_publish_and_attach_zero_copy(store):
+    data = {"a": np.arange(10, dtype=np.float64), "b": np.array([[1, 2], [3, 4]], dtype=np.int32),
+            "names": np.array(["x", "yz"])}
+    version = store.publish(data, {"source": "test"})
+    snapshot = store.attach()
+    assert snapshot.version == version == store.current_version()
+    assert snapshot.metadata == {"source": "test"}
+    for name, array in data.items():
+        np.testing.assert_array_equal(snapshot.arrays[name], array)
+        assert snapshot.arrays[name].dtype == array.dtype
+    with pytest.raises(ValueError):
+        snapshot.arrays["a"][0] = 1.0
+    del array
+    store.release(snapshot)
+    snapshot.arrays = None
+    assert snapshot.close()
+
+
+def test_reader_swaps_and_old_versions_are_reclaimed(store):
+    reader = StoreReader(store)
+    first = store.publish({"a": np.zeros(4)})
+    assert reader.current().version == first
+    held = reader.current().arrays["a"]
+
+    second = store.publish({"a": np.ones(4)})
+    # The first version is still attached by this process
+    assert store.live_versions() == [first, second]
+    snapshot = reader.current()
+    assert snapshot.version == second
+    assert snapshot.arrays["a"][0] == 1.0
+    # Released on swap, so only the current version remains
+    assert store.live_versions() == [second]
+    # Views taken before the swap stay valid until dropped
+    assert held[0] == 0.0
+    del held
+    reader.close()
+
+
+def test_dead_reader_is_reclaimed(store):
+    first = store.publish({"a": np.zeros(4)})
+    pid = os.fork()
+    if pid == 0:
+        store._control = store._tables = None
+        store.attach()
+        os._exit(0)
+    os.waitpid(pid, 0)
+    store.publish({"a": np.ones(4)})
+    assert first not in store.live_versions()
+
+
+def test_reference_data_from_shared_store(store):
+    reference = build_reference_data(AIRCRAFT, GSE)
+    publish_reference_data(store, reference)
+    use_shared_store(store.name)
+    try:
+        shared = reference_module.get_reference_data()
+        assert shared.version == reference.version
+        assert shared.aircraft.dest_names == reference.aircraft.dest_names
+        for (name, expected), (_, actual) in zip(reference.arrays(), shared.arrays()):
+            np.testing.assert_array_equal(actual, expected, err_msg=name)
+        assert reference_module.get_reference_data() is shared
+        del shared, actual
+    finally:
+        use_shared_store(None)
@@ -0,0 +1,87 @@
+# tests/test_singleflight.py
+import threading
+import time
+
+import pytest
+
+from utils.singleflight import SingleFlight, SingleFlightTimeout
+
+
+def run_concurrently(n, target):
+    """Start n threads on target behind a barrier and collect their outcomes."""
+    barrier = threading.Barrier(n)
+    outcomes = [None] * n
+
+    def worker(i):
+        barrier.wait()
+        try:
+            outcomes[i] = ("ok", target())
+        except Exception as e:
+            outcomes[i] = ("error", e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return outcomes
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"total_demand": 42.0}
+
+    outcomes = run_concurrently(8, lambda: flight.do("total", compute))
+
+    assert len(calls) == 1
+    assert all(outcome == ("ok", {"total_demand": 42.0}) for outcome in outcomes)
+    stats = flight.stats()
+    assert stats["executions"] == 1
+    assert stats["coalesced"] == 7
+    assert stats["in_flight"] == 0
+
+
+def test_distinct_keys_execute_separately():
+    flight = SingleFlight()
+    assert flight.do(("a", 1), lambda: 1) == 1
+    assert flight.do(("a", 2), lambda: 2) == 2
+    assert flight.stats()["executions"] == 2
+
+
+def test_errors_propagate_to_all_waiters():
+    flight = SingleFlight()
+
+    def compute():
+        time.sleep(0.2)
+        raise ValueError("bad input")
+
+    outcomes = run_concurrently(4, lambda: flight.do("key", compute))
+
+    assert all(kind == "error" and isinstance(e, ValueError) for kind, e in outcomes)
+    # The failed flight is not remembered
+    assert flight.do("key", lambda: "retry") == "retry"
+
+
+def test_waiter_timeout():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.5)
+        return "done"
+
+    leader = threading.Thread(target=flight.do, args=("slow", slow))
+    leader.start()
+    started.wait()
+
+    with pytest.raises(SingleFlightTimeout):
+        flight.do("slow", slow, timeout=0.05)
+
+    leader.join()
+    assert flight.stats()["timeouts"] == 1
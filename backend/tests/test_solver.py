@@ -0,0 +1,118 @@
+# tests/test_solver.py
+import numpy as np
+import pytest
+
+from app import create_app
+from benchmarks.common import make_benchmark_app
+from services.economic_service import calculate_hydrogen_economic_impact
+from services.solver_service import first_crossing, solve_targets
+from services.storage_service import calculate_h2_storage_cost
+
+ECONOMIC = {
+    "fleet_percentage": 0.3, "total_flights": 100000, "atlanta_fraction": 0.4,
+    "hydrogen_demand": 5_000_000_000, "turnaround_time": 30, "tax_credits": 1.0
+}
+STORAGE = {
+    "total_h2_volume_gal": 5000000, "number_of_tanks": 20, "tank_diameter_ft": 10,
+    "tank_length_ft": 40, "cost_per_sqft_construction": 580, "cost_per_cuft_insulation": 15
+}
+
+
+@pytest.fixture
+def client():
+    return create_app('testing').test_client()
+
+
+def solve(client, **body):
+    response = client.post('/api/solver/solve', json=body)
+    return response.status_code, response.get_json()
+
+
+def test_affine_model_is_inverted_in_closed_form():
+    result = solve_targets(lambda x: 3 * x - 6, [0, 3, 100], -10, 10)
+    assert result["method"] == "affine"
+    assert result["evaluations"] == 5
+    assert result["value"][:2] == pytest.approx([2, 3])
+    assert np.isnan(result["value"][2]) and not result["solved"][2]
+
+
+def test_bracketing_finds_the_smallest_root():
+    targets = np.linspace(0.5, 8, 1000)
+    result = solve_targets(lambda x: (x - 1) ** 2, targets, -2, 4)
+    assert result["method"] == "bracketing"
+    # (x - 1)^2 = t at x = 1 - sqrt(t) while that is within the bracket
+    expected = np.where(1 - np.sqrt(targets) >= -2, 1 - np.sqrt(targets), 1 + np.sqrt(targets))
+    assert result["value"] == pytest.approx(expected, abs=1e-9)
+    assert result["output"] == pytest.approx(targets)
+
+
+def test_integer_input_returns_first_integer_reaching_target():
+    result = solve_targets(lambda x: x ** 2, [4, 9.5, 200], 0, 10, integer=True)
+    assert result["method"] == "integer"
+    assert result["value"][:2].tolist() == [2, 4]
+    assert result["output"][:2].tolist() == [4, 16]
+    assert np.isnan(result["value"][2])
+
+
+def test_first_crossing():
+    values = np.array([0.0, 2, 1, 3])
+    assert first_crossing(values, np.array([1.0, 2.5, 0.0, 5.0])).tolist() == [0, 2, 0, -1]
+
+
+def test_tax_credit_break_even(client):
+    inputs = {name: value for name, value in ECONOMIC.items() if name != "tax_credits"}
+    status, data = solve(client, model="economic", output="tax_credits_compensation", solve_for="tax_credits",
+                         bracket=[-10000, 10000], inputs=inputs)
+    assert status == 200
+    assert data["method"] == "affine"
+    credit = data["results"][0]["value"]
+    impact = calculate_hydrogen_economic_impact(**dict(ECONOMIC, tax_credits=credit))
+    assert impact["tax_credits_compensation"] == pytest.approx(0, abs=1e-6)
+
+
+def test_nonlinear_output_many_targets(client):
+    inputs = {name: value for name, value in ECONOMIC.items() if name != "fleet_percentage"}
+    targets = np.linspace(1e5, 1e7, 200).tolist()
+    status, data = solve(client, model="economic", output="revenue_drop", solve_for="fleet_percentage",
+                         targets=targets, inputs=inputs)
+    assert status == 200
+    assert data["method"] == "bracketing"
+    values = [row["value"] for row in data["results"]]
+    drops = calculate_hydrogen_economic_impact(**dict(ECONOMIC, fleet_percentage=np.array(values)))["revenue_drop"]
+    assert drops == pytest.approx(targets)
+
+
+def test_storage_tanks_for_a_budget(client):
+    inputs = {name: value for name, value in STORAGE.items() if name != "number_of_tanks"}
+    budget = calculate_h2_storage_cost(**dict(STORAGE, number_of_tanks=37))["total_infrastructure_cost"]
+    status, data = solve(client, model="storage", output="total_infrastructure_cost", solve_for="number_of_tanks",
+                         bracket=[1, 1000], targets=[budget], inputs=inputs)
+    assert status == 200
+    assert data["results"][0]["value"] == 37
+
+
+def test_fleet_share_fitting_storage_area():
+    app, tmpdir = make_benchmark_app('testing')
+    try:
+        client = app.test_client()
+        status, data = solve(client, model="demand", output="storage_area", solve_for="slider_perc",
+                             targets=[20000, 40000], inputs={"gse": ["F250"], "end_year": 2035})
+        assert status == 200
+        assert data["method"] == "affine"
+        share = data["results"][1]["value"]
+        status, check = solve(client, model="demand", output="storage_area", solve_for="end_year",
+                              targets=[40000 * (1 - 1e-9)], inputs={"gse": ["F250"], "slider_perc": share})
+    finally:
+        tmpdir.cleanup()
+    assert 0 < share < 1
+    # At that share, the area is reached in 2035 (and not before, as demand grows)
+    assert check["results"][0]["value"] == 2035
+
+
+def test_invalid_queries(client):
+    inputs = {name: value for name, value in ECONOMIC.items() if name != "tax_credits"}
+    base = dict(model="economic", output="tax_credits_compensation", solve_for="tax_credits", inputs=inputs)
+    assert solve(client, **base)[0] == 400  # no default bracket
+    assert solve(client, **dict(base, output="nope", bracket=[0, 1]))[0] == 400
+    assert solve(client, **dict(base, solve_for="fleet_percentage", bracket=[0.5, 2]))[0] == 400
+    assert solve(client, **dict(base, inputs={}, bracket=[0, 1]))[0] == 400
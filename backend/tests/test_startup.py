@@ -0,0 +1,60 @@
+# tests/test_startup.py
+import os
+import subprocess
+import sys
+
+from sqlalchemy import inspect
+
+from app import create_app
+from utils import database
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_heavy_modules_not_loaded_at_startup():
+    """Creating the app must not import pandas or the optional pyarrow."""
+    script = (
+        "import sys, app\n"
+        "app.create_app('testing')\n"
+        "loaded = [m for m in ('pandas', 'pyarrow') if m in sys.modules]\n"
+        "print(','.join(loaded))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', script], cwd=BACKEND_DIR,
+        check=True, capture_output=True, text=True
+    ).stdout
+    assert output.strip() == ""
+
+
+def test_deferred_module_is_complete_on_first_concurrent_access():
+    script = (
+        "import sys, threading\n"
+        "from utils.lazy import lazy_import\n"
+        "assert lazy_import('not_an_installed_module') is None\n"
+        "tomllib = lazy_import('tomllib')\n"
+        "assert 'tomllib' not in sys.modules\n"
+        "seen = []\n"
+        "threads = [threading.Thread(target=lambda: seen.append(tomllib.loads('a = 1')))\n"
+        "           for _ in range(8)]\n"
+        "for t in threads: t.start()\n"
+        "for t in threads: t.join()\n"
+        "print(len(seen))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', script], cwd=BACKEND_DIR,
+        check=True, capture_output=True, text=True
+    ).stdout
+    assert output.strip() == "8"
+
+
+def test_production_startup_does_not_create_tables(tmp_path):
+    app = create_app('production', {
+        'AIRCRAFT_DATABASE_URI': f"sqlite:///{tmp_path / 'aircraft.db'}",
+        'GSE_DATABASE_URI': f"sqlite:///{tmp_path / 'gse.db'}",
+    })
+    assert inspect(database.aircraft_engine).get_table_names() == []
+
+    result = app.test_cli_runner().invoke(args=['init-db'])
+    assert result.exit_code == 0
+    assert inspect(database.aircraft_engine).get_table_names() == ['aircraft_data']
+    assert inspect(database.gse_engine).get_table_names() == ['gse_data']
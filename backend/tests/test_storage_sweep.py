@@ -0,0 +1,90 @@
+# tests/test_storage_sweep.py
+import numpy as np
+import pytest
+
+from app import create_app
+from services.storage_service import calculate_h2_storage_cost, range_values, storage_cost_sweep
+
+BASE = {
+    "total_h2_volume_gal": 5000000, "number_of_tanks": 20, "tank_diameter_ft": 10,
+    "tank_length_ft": 40, "cost_per_sqft_construction": 580, "cost_per_cuft_insulation": 15
+}
+
+
+@pytest.fixture
+def client():
+    return create_app('testing').test_client()
+
+
+def test_range_values_include_stop():
+    assert range_values(1, 5, step=1).tolist() == [1, 2, 3, 4, 5]
+    assert range_values(0, 1, step=0.1)[-1] == pytest.approx(1.0)
+    assert range_values(6, 16, num=3).tolist() == [6, 11, 16]
+
+
+def test_grid_sweep_matches_scalar_model():
+    parameters = {name: [value] for name, value in BASE.items()}
+    parameters.update(number_of_tanks=[5, 10, 20], tank_diameter_ft=[8, 10], tank_length_ft=[30, 40, 50, 60])
+    sweep = storage_cost_sweep(parameters)
+
+    assert sweep["points"] == 24
+    results = sweep["results"]
+    for i in (0, 7, 23):
+        scalar = calculate_h2_storage_cost(**{name: results[name][i] for name in BASE})
+        for name, value in scalar.items():
+            assert results[name][i] == pytest.approx(value)
+    best = int(np.argmin(results["total_infrastructure_cost"]))
+    assert sweep["min_cost"]["total_infrastructure_cost"] == results["total_infrastructure_cost"][best]
+    assert isinstance(sweep["min_cost"]["number_of_tanks"], int)
+
+
+def test_endpoint_grid_sweep_with_ranges(client):
+    body = dict(BASE,
+                number_of_tanks={"start": 1, "stop": 40, "step": 1},
+                tank_diameter_ft={"start": 6, "stop": 16, "step": 0.5},
+                tank_length_ft={"start": 20, "stop": 80, "num": 25},
+                cost_per_sqft_construction=[500, 580])
+    response = client.post('/api/storage/calculate', json=body, headers={'Accept': 'application/vnd.hydrogen.columnar+json'})
+    assert response.status_code == 200
+    data = response.get_json(force=True)
+    assert data["points"] == 40 * 21 * 25 * 2
+    assert data["mode"] == "grid"
+    assert len(data["results"]["total_infrastructure_cost"]) == data["points"]
+    assert data["min_cost"]["total_infrastructure_cost"] == min(data["results"]["total_infrastructure_cost"])
+
+
+def test_endpoint_zip_sweep(client):
+    body = dict(BASE, number_of_tanks=[10, 20], tank_diameter_ft=[10, 12], mode="zip")
+    data = client.post('/api/storage/calculate', json=body).get_json()
+    assert data["points"] == 2
+    assert data["results"]["tank_diameter_ft"] == [10, 12]  # columnar even in plain JSON
+
+    body["tank_length_ft"] = [30, 40, 50]
+    response = client.post('/api/storage/calculate', json=body)
+    assert response.status_code == 400
+    assert "tank_length_ft" in response.get_json()["message"]
+
+
+def test_scalar_requests_unchanged(client):
+    data = client.post('/api/storage/calculate', json=BASE).get_json()
+    assert "points" not in data
+    assert data["total_infrastructure_cost"] > 0
+
+
+@pytest.mark.parametrize("value", [
+    [0, 1],                                  # out of bounds
+    {"start": 1, "stop": 4, "step": 0.5},    # fractional tank counts
+    {"start": 4, "stop": 1, "step": 1},      # descending
+    {"start": 1, "stop": 4},                 # no spacing
+])
+def test_invalid_tank_count_sweeps(client, value):
+    response = client.post('/api/storage/calculate', json=dict(BASE, number_of_tanks=value))
+    assert response.status_code == 400
+
+
+def test_sweep_size_limit():
+    app = create_app('testing', {'STORAGE_SWEEP_MAX_POINTS': 100})
+    body = dict(BASE, number_of_tanks={"start": 1, "stop": 20, "step": 1}, tank_length_ft=[30, 40, 50, 60, 70, 80])
+    response = app.test_client().post('/api/storage/calculate', json=body)
+    assert response.status_code == 400
+    assert "120" in response.get_json()["message"]
@@ -0,0 +1,109 @@
+# tests/test_tank_optimizer.py
+import numpy as np
+import pytest
+
+from app import create_app
+from benchmarks.common import make_benchmark_app
+from services.storage_service import calculate_h2_storage_cost
+from services.tank_optimizer import optimize_tanks, pareto_mask
+
+SEARCH = {
+    "diameters_ft": np.arange(6, 17), "lengths_ft": np.arange(20, 81, 5), "max_tanks": 100,
+    "max_footprint_sqft": None, "ullage": 0.05, "evaporation": 0.9925,
+    "cost_per_sqft_construction": 580, "cost_per_cuft_insulation": 15,
+}
+
+
+@pytest.fixture
+def client():
+    return create_app('testing').test_client()
+
+
+def brute_force(volume, diameters_ft, lengths_ft, max_tanks, max_footprint_sqft, ullage, evaporation,
+                cost_per_sqft_construction, cost_per_cuft_insulation):
+    d, length, n = (a.ravel().astype(float) for a in np.meshgrid(
+        diameters_ft, lengths_ft, np.arange(1, max_tanks + 1), indexing='ij'))
+    usable = np.pi / 4 * d ** 2 * length * (1 - ullage) * evaporation * n
+    costs = calculate_h2_storage_cost(volume / 0.1337, n, d, length,
+                                      cost_per_sqft_construction, cost_per_cuft_insulation)
+    feasible = usable >= volume * (1 - 1e-12)
+    if max_footprint_sqft is not None:
+        feasible &= costs["footprint_total"] <= max_footprint_sqft
+    footprint = costs["footprint_total"][feasible]
+    cost = costs["total_infrastructure_cost"][feasible]
+    front = pareto_mask(footprint, cost)
+    return cost.min(), footprint.min(), sorted(zip(footprint[front], cost[front]))
+
+
+@pytest.mark.parametrize("volume, overrides", [
+    (50_000, {}),
+    (200_000, {"max_footprint_sqft": 40_000}),
+    (5_000, {"cost_per_sqft_construction": 0}),
+    (80_000, {"cost_per_cuft_insulation": 0, "max_tanks": 30}),
+])
+def test_matches_exhaustive_search(volume, overrides):
+    search = dict(SEARCH, **overrides)
+    result = optimize_tanks(volume, **search)
+    min_cost, min_footprint, front = brute_force(volume, **search)
+
+    assert result["min_cost"]["total_infrastructure_cost"] == pytest.approx(min_cost)
+    assert result["min_footprint"]["footprint_total"] == pytest.approx(min_footprint)
+    pareto = result["pareto_front"]
+    assert list(zip(pareto["footprint_total"], pareto["total_infrastructure_cost"])) == pytest.approx(front)
+    assert np.all(pareto["usable_volume_cuft"] >= volume * (1 - 1e-12))
+    assert result["candidates_evaluated"] < len(search["diameters_ft"]) * len(search["lengths_ft"]) * search["max_tanks"]
+
+
+def test_infeasible_constraints():
+    result = optimize_tanks(1e7, **dict(SEARCH, max_footprint_sqft=100))
+    assert result["feasible_geometries"] == 0
+    assert result["min_cost"] is None
+
+
+def test_pareto_mask_drops_dominated_and_duplicate_designs():
+    footprint = np.array([10.0, 10.0, 20.0, 30.0, 30.0])
+    cost = np.array([5.0, 6.0, 5.0, 1.0, 1.0])
+    assert pareto_mask(footprint, cost).tolist() == [True, False, False, True, False]
+
+
+def test_endpoint_with_demand_volume(client):
+    body = {"h2_demand_cuft": 25_000, "storage_days": 2, "diameters_ft": [8, 10, 12],
+            "lengths_ft": {"start": 30, "stop": 60, "step": 10}, "objective": "cost"}
+    response = client.post('/api/storage/optimize', json=body)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["storage_volume_cuft"] == 50_000
+    assert data["best"] == data["min_cost"]
+    assert data["min_cost"]["tank_diameter_ft"] in (8, 10, 12)
+    front = data["pareto_front"]
+    assert front[0]["footprint_total"] == data["min_footprint"]["footprint_total"]
+    assert front[-1]["total_infrastructure_cost"] == pytest.approx(data["min_cost"]["total_infrastructure_cost"])
+    assert isinstance(front[0]["number_of_tanks"], int)
+
+
+def test_endpoint_from_demand_model():
+    demand = {"slider_perc": 0.4, "gse": ["F250", "TLD 1410"], "end_year": 2040}
+    app, tmpdir = make_benchmark_app('testing')
+    try:
+        client = app.test_client()
+        total = client.post('/api/hydrogen-demand/total', json=demand).get_json()
+        response = client.post('/api/storage/optimize', json={"demand": demand, "storage_days": 3})
+    finally:
+        tmpdir.cleanup()
+
+    assert response.status_code == 200
+    data = response.get_json()
+    daily = total["aircraft_demand"] + total["gse_demand"]["daily_h2_demand_vol_gse"]
+    assert data["h2_demand_cuft"] == pytest.approx(daily)
+    assert data["min_cost"]["usable_volume_cuft"] >= data["storage_volume_cuft"] == pytest.approx(3 * daily)
+
+
+@pytest.mark.parametrize("body", [
+    {},                                                              # no demand
+    {"h2_demand_cuft": 1000, "demand": {"slider_perc": 0.5, "gse": [], "end_year": 2035}},
+    {"h2_demand_cuft": 1000, "diameters_ft": {"start": 0, "stop": 10, "step": 1}},
+    {"h2_demand_cuft": 1000, "lengths_ft": {"start": 1, "stop": 1000, "step": 1}},
+    {"h2_demand_cuft": 1e9, "max_footprint_sqft": 100},              # infeasible
+])
+def test_endpoint_rejects_invalid_requests(client, body):
+    assert client.post('/api/storage/optimize', json=body).status_code == 400
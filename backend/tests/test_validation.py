@@ -0,0 +1,117 @@
+# tests/test_validation.py
+import pytest
+
+from app import create_app
+from schemas.storage import StorageCostQuery
+from utils.validation import get_validator, validate_output
+
+STORAGE_PAYLOAD = {
+    "total_h2_volume_gal": 5000000,
+    "number_of_tanks": 20,
+    "tank_diameter_ft": 10,
+    "tank_length_ft": 40,
+    "cost_per_sqft_construction": 580,
+    "cost_per_cuft_insulation": 15
+}
+
+ECONOMIC_PAYLOAD = {
+    "fleet_percentage": 0.3,
+    "total_flights": 100000,
+    "atlanta_fraction": 0.4,
+    "hydrogen_demand": 5000000,
+    "turnaround_time": 30,
+    "tax_credits": 0.1
+}
+
+
+@pytest.fixture(scope="module")
+def app():
+    return create_app('testing')
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def test_validator_compiled_once():
+    assert get_validator(StorageCostQuery) is get_validator(StorageCostQuery)
+
+
+def test_storage_single(client):
+    response = client.post('/api/storage/calculate', json=STORAGE_PAYLOAD)
+    assert response.status_code == 200
+    assert response.get_json()["footprint_total"] == 8000
+
+
+def test_storage_batch_matches_single(client):
+    single = client.post('/api/storage/calculate', json=STORAGE_PAYLOAD).get_json()
+    batch = [STORAGE_PAYLOAD, dict(STORAGE_PAYLOAD, number_of_tanks=10)]
+    response = client.post('/api/storage/calculate', json=batch)
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert len(results) == 2
+    assert results[0] == pytest.approx(single)
+    assert results[1]["footprint_total"] == 4000
+
+
+@pytest.mark.parametrize("payload", [
+    {key: value for key, value in STORAGE_PAYLOAD.items() if key != "tank_diameter_ft"},
+    dict(STORAGE_PAYLOAD, tank_diameter_ft=0),
+    dict(STORAGE_PAYLOAD, number_of_tanks="many"),
+    [STORAGE_PAYLOAD, dict(STORAGE_PAYLOAD, tank_length_ft=-1)],
+])
+def test_storage_invalid_input(client, payload):
+    response = client.post('/api/storage/calculate', json=payload)
+    assert response.status_code == 400
+    assert response.get_json()["errors"]
+
+
+def test_missing_and_malformed_body(client):
+    assert client.post('/api/storage/calculate').status_code == 400
+    assert client.post('/api/storage/calculate', json=[]).status_code == 400
+    response = client.post('/api/economic/impact', data=b'{"fleet', content_type='application/json')
+    assert response.status_code == 400
+
+
+def test_economic_validation(client):
+    assert client.post('/api/economic/impact', json=ECONOMIC_PAYLOAD).status_code == 200
+    assert client.post('/api/economic/impact', json=dict(ECONOMIC_PAYLOAD, fleet_percentage=0)).status_code == 200
+    response = client.post('/api/economic/impact', json=dict(ECONOMIC_PAYLOAD, fleet_percentage=-0.1))
+    assert response.status_code == 400
+
+
+def test_demand_endpoint_rejects_invalid_input(client):
+    response = client.post('/api/hydrogen-demand/aircraft', json={"slider_perc": "half", "end_year": 2030})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("payload", [
+    {"slider_perc": 0.5, "gse": ["F250"], "end_year": 2100},
+    {"slider_perc": 0.5, "gse": ["F250"], "end_year": 1990},
+    {"slider_perc": 1.5, "gse": ["F250"], "end_year": 2030},
+])
+def test_demand_endpoint_rejects_out_of_range_input(client, payload):
+    response = client.post('/api/hydrogen-demand/total', json=payload)
+    assert response.status_code == 400
+    response = client.post('/api/hydrogen-demand/gse', json={"gse": ["F250"], "end_year": 2051})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("path", ['/api/hydrogen-demand/total', '/api/hydrogen-demand/aircraft'])
+def test_demand_endpoint_accepts_zero_fleet_share(client, path):
+    # 0 is the dashboard's initial slider value
+    response = client.post(path, json={"slider_perc": 0, "gse": ["F250"], "end_year": 2035})
+    assert response.status_code == 200
+
+
+def test_output_validation_skipped_in_production():
+    app = create_app('production', {
+        'AIRCRAFT_DATABASE_URI': 'sqlite:///:memory:',
+        'GSE_DATABASE_URI': 'sqlite:///:memory:',
+    })
+    with app.app_context():
+        assert validate_output(StorageCostQuery, {"bad": "payload"}) == {"bad": "payload"}
+    with create_app('testing').app_context():
+        assert validate_output(StorageCostQuery, {"bad": "payload"})[1] == 500
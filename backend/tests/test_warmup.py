@@ -0,0 +1,90 @@
+# tests/test_warmup.py
+import json
+
+import pytest
+
+from app import create_app
+from benchmarks.common import make_benchmark_app, read_gse_rows
+from utils.reference_data import set_reference_data
+from utils.warmup import default_scenarios, load_scenarios, resolve_gse_bundles, run_warmup
+
+
+def test_ready_without_warmup():
+    app = create_app('testing')
+    response = app.test_client().get('/ready')
+    assert response.status_code == 200
+    report = response.get_json()
+    assert report["status"] == "ready"
+    assert report["warmup"]["total"] == 0
+    assert set(report["datasets"]) == {"reference_data", "shared_store", "storage_model", "economic_model"}
+
+
+def test_not_ready_until_warmup_finishes():
+    app = create_app('testing')
+    app.extensions['warmup'].status = 'pending'
+    assert app.test_client().get('/ready').status_code == 503
+
+
+def test_default_scenarios_cover_all_years():
+    scenarios = default_scenarios()
+    years = {s["json"]["end_year"] for s in scenarios if s["path"].endswith("/total")}
+    assert years == set(range(2023, 2051))
+
+
+def test_gse_bundles_use_stored_names():
+    names = ["F250", "FMC Commander 15 ", "TLD 1410"]
+    bundles = [["F250", "FMC Commander 15"], ["TLD 1410"], ["F250", "Unknown"]]
+    assert resolve_gse_bundles(bundles, names) == [["F250", "FMC Commander 15 "], ["TLD 1410"]]
+
+
+@pytest.mark.parametrize("preload", [False, True])
+def test_default_scenarios_match_gse_data(preload):
+    # As loaded by the original ingestion, which kept the CSV's trailing spaces
+    gse_rows = read_gse_rows()
+    for row in gse_rows:
+        if row["ground_support_equipment"] == "FMC Commander 15":
+            row["ground_support_equipment"] += " "
+    app, tmpdir = make_benchmark_app('testing', {'PRELOAD_REFERENCE_DATA': preload}, gse_rows=gse_rows)
+    try:
+        scenarios = load_scenarios(app)
+        bundles = {tuple(s["json"]["gse"]) for s in scenarios if s["path"].endswith("/total")}
+        assert ("F250", "FMC Commander 15 ") in bundles
+        state = run_warmup(app, scenarios)
+        assert state.failed == 0
+    finally:
+        set_reference_data(None)
+        tmpdir.cleanup()
+
+
+def test_sync_warmup_fills_cache(tmp_path):
+    scenarios = [
+        {"method": "POST", "path": "/api/hydrogen-demand/total",
+         "json": {"slider_perc": 0.5, "gse": ["F250"], "end_year": year}}
+        for year in (2030, 2040)
+    ] + [{"method": "POST", "path": "/api/storage/calculate", "json": {"bad": 1}}]
+    scenarios_file = tmp_path / 'scenarios.json'
+    scenarios_file.write_text(json.dumps(scenarios))
+
+    app, tmpdir = make_benchmark_app('testing', {
+        'PRELOAD_REFERENCE_DATA': True,
+        'WARMUP_MODE': 'sync',
+        'WARMUP_SCENARIOS_FILE': str(scenarios_file),
+    })
+    try:
+        report = app.test_client().get('/ready').get_json()
+        assert report["status"] == "ready"
+        assert report["warmup"]["completed"] == 3
+        assert report["warmup"]["failed"] == 1
+        assert report["datasets"]["reference_data"] is not None
+        assert report["cache"]["misses"] == 2
+
+        run_warmup(app, scenarios[:2])
+        assert app.extensions['result_cache'].stats()["memory_hits"] == 2
+    finally:
+        set_reference_data(None)
+        tmpdir.cleanup()
+
+
+def test_invalid_warmup_mode():
+    with pytest.raises(ValueError):
+        create_app('testing', {'WARMUP_MODE': 'eager'})
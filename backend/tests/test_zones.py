@@ -0,0 +1,129 @@
+# tests/test_zones.py
+import json
+import os
+import time
+
+import numpy as np
+import pytest
+
+from app import create_app
+from utils.rtree import build_rtree, query
+from utils.zones import ZoneStore, build_zone_index, clip_to_rect, polygon_intersects_rect
+
+SQUARE = np.array([[0, 0], [10, 0], [10, 10], [0, 10]], dtype=float)
+
+
+def parcels(count, seed=0):
+    rng = np.random.default_rng(seed)
+    zones = []
+    for i in range(count):
+        lat, lon = 33.55 + rng.uniform(0, 0.1), -84.5 + rng.uniform(0, 0.1)
+        size = rng.uniform(0.0002, 0.001)
+        if i % 5 == 0:
+            zones.append({"name": f"Parcel {i}", "type": "circle", "center": [lat, lon], "radius": size * 50_000})
+        else:
+            zones.append({"name": f"Parcel {i}", "type": "polygon",
+                          "coordinates": [[lat, lon], [lat + size, lon], [lat + size, lon + size], [lat, lon + size]]})
+    return zones
+
+
+@pytest.fixture
+def client():
+    return create_app('testing').test_client()
+
+
+def test_rtree_matches_brute_force():
+    rng = np.random.default_rng(1)
+    low = rng.uniform(0, 1000, size=(5000, 2))
+    boxes = np.hstack((low, low + rng.uniform(0, 20, size=(5000, 2))))
+    tree = build_rtree(boxes)
+    assert len(tree.levels) == 4  # 5000 -> 313 -> 20 -> 2 -> 1 nodes
+    for box in ([100, 100, 150, 180], [500, 500, 500, 500], [-10, -10, -5, -5], [0, 0, 1000, 1000]):
+        expected = np.nonzero((boxes[:, 0] <= box[2]) & (boxes[:, 2] >= box[0])
+                              & (boxes[:, 1] <= box[3]) & (boxes[:, 3] >= box[1]))[0]
+        assert query(tree, np.array(box, dtype=float)).tolist() == expected.tolist()
+
+
+def test_empty_rtree():
+    assert query(build_rtree(np.empty((0, 4))), np.array([0, 0, 1, 1.0])).tolist() == []
+
+
+@pytest.mark.parametrize("rect, intersects, area", [
+    ([2, 2, 4, 4], True, 4),       # inside the polygon
+    ([-5, -5, 15, 15], True, 100),  # contains the polygon
+    ([5, -5, 6, 15], True, 10),     # crosses it
+    ([10, 10, 12, 12], True, 0),    # touches a corner
+    ([11, 0, 12, 10], False, 0),
+])
+def test_rect_intersection_and_clipping(rect, intersects, area):
+    rect = np.array(rect, dtype=float)
+    assert polygon_intersects_rect(SQUARE, rect) == intersects
+    clipped = clip_to_rect(SQUARE, rect)
+    clipped_area = 0.5 * abs(np.dot(clipped[:, 0], np.roll(clipped[:, 1], -1))
+                             - np.dot(np.roll(clipped[:, 0], -1), clipped[:, 1])) if len(clipped) >= 3 else 0
+    assert clipped_area == pytest.approx(area)
+
+
+def test_index_queries_match_brute_force():
+    index = build_zone_index(parcels(3000))
+    rect = index.rect(33.58, -84.47, 33.60, -84.45)
+    expected = [i for i, polygon in enumerate(index.polygons) if polygon_intersects_rect(polygon, rect)]
+    assert index.intersecting(rect) == expected
+    assert 0 < len(expected) < 3000
+
+    zone = index.zones[1]
+    lat, lon = np.mean(zone["coordinates"], axis=0)
+    assert 1 in index.containing(lat, lon)
+    assert index.containing(0.0, 0.0) == []
+
+    start = time.perf_counter()
+    for _ in range(100):
+        index.containing(lat, lon)
+    assert (time.perf_counter() - start) / 100 < 0.01
+
+
+def test_store_reloads_on_change(tmp_path):
+    path = tmp_path / "zones.json"
+    path.write_text(json.dumps(parcels(3)))
+    store = ZoneStore(str(path), check_interval=0)
+    first = store.get()
+    assert len(first.zones) == 3
+    assert store.get() is first  # unchanged file: same index
+
+    path.write_text(json.dumps(parcels(5)))
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert len(store.get().zones) == 5
+    assert store.reloads == 2
+
+    # A broken file keeps the last good index
+    path.write_text("[{")
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 2 * 10**9))
+    assert len(store.get().zones) == 5
+
+
+def test_list_and_area_endpoints(client):
+    data = client.get('/api/zones').get_json()
+    assert data["count"] == 3
+    assert data["total_area_sqft"] == pytest.approx(sum(zone["area_sqft"] for zone in data["zones"]))
+
+    area = client.post('/api/zones/area', json={}).get_json()
+    assert area["total_area_sqft"] == pytest.approx(data["total_area_sqft"])
+    # The northern half of "Available Polygon Area 1" and all of the circle inside it
+    half = client.post('/api/zones/area', json={"bbox": [33.615, -84.45, 33.63, -84.4]}).get_json()
+    areas = {zone["name"]: zone["area_sqft"] for zone in data["zones"]}
+    assert half["zone_count"] == 2
+    assert half["total_area_sqft"] == pytest.approx(
+        areas["Available Polygon Area 1"] / 2 + areas["Potential Circular Area"], rel=1e-3)
+
+
+def test_point_and_bbox_endpoints(client):
+    data = client.post('/api/zones/contains', json={"points": [[33.62, -84.42], [33.7, -84.3]]}).get_json()
+    assert set(data["results"][0]["zones"]) == {"Available Polygon Area 1", "Potential Circular Area"}
+    assert data["results"][1]["available"] is False
+
+    data = client.post('/api/zones/intersecting', json={"bbox": [33.638, -84.45, 33.65, -84.42]}).get_json()
+    assert [zone["name"] for zone in data["zones"]] == ["Another Polygon"]
+    assert 0 < data["zones"][0]["area_within_sqft"] <= data["zones"][0]["area_sqft"]
+
+    response = client.post('/api/zones/intersecting', json={"bbox": [33.7, -84.4, 33.6, -84.3]})
+    assert response.status_code == 400
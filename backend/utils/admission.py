@@ -0,0 +1,265 @@
+# backend/utils/admission.py
+"""
+Admission control: per-endpoint concurrency limits with bounded queues.
+
+ADMISSION_LIMITS maps an endpoint ("blueprint.view") or a blueprint name to
+a limit:
+
+    concurrency  requests of that endpoint executing at once
+    queue        requests allowed to wait for a slot (default 0)
+    timeout      seconds a queued request waits before giving up (default 5)
+
+An entry may instead be the name of another entry, whose limiter it then
+shares, so several heavy endpoints can draw on one pool of slots. Names
+that are neither endpoints nor blueprints are limiters for parts of an
+endpoint, taken with admission_slot(name) (e.g. only the sweeps of
+/api/storage/calculate, not its cached single queries).
+
+Endpoint entries take precedence over blueprint entries; endpoints without
+an entry (/health, /ready, cheap lookups) are never limited, so a burst of
+heavy calculations cannot occupy every server thread and starve them.
+
+Limited endpoints normally take their slot before the view runs. Views
+marked with @deferred_admission take it with admission_slot() only when
+they actually compute, after the result cache and in-flight lookups have
+missed, so cached and coalesced requests are never rejected.
+
+A request that finds the queue full is rejected at once with 429; one that
+waits longer than its timeout gets 503. Both carry a Retry-After estimated
+from the limiter's recent service times. Wait times and rejection counts
+are reported by /metrics.
+"""
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context, jsonify, request
+
+logger = logging.getLogger(__name__)
+
+# Queue wait samples kept per limiter for percentiles
+WAIT_SAMPLES = 1024
+# Weight of the latest request in the service time moving average
+SERVICE_TIME_ALPHA = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not admitted."""
+
+    def __init__(self, status, reason, retry_after):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def _percentile(ordered, p):
+    index = min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Limiter:
+    """A counting semaphore with a bounded, timed wait queue and statistics."""
+
+    def __init__(self, name, concurrency, queue=0, timeout=5.0):
+        if concurrency < 1:
+            raise ValueError(f"Admission limit {name!r}: concurrency must be at least 1")
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self._service_time = None
+        self._counts = {"admitted": 0, "rejected_queue_full": 0, "rejected_timeout": 0}
+
+    def retry_after(self):
+        """Seconds until a slot is likely to be free (at least 1)."""
+        service_time = self._service_time or 1.0
+        return max(1, math.ceil(service_time * (self.waiting + 1) / self.concurrency))
+
+    def acquire(self):
+        """
+        Take a slot, waiting in the queue if allowed.
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            AdmissionRejected: 429 if the queue is full, 503 on timeout
+        """
+        start = time.monotonic()
+        with self._cond:
+            # Newcomers queue behind waiting requests instead of overtaking them
+            if self.active >= self.concurrency or self.waiting:
+                if self.waiting >= self.queue:
+                    self._counts["rejected_queue_full"] += 1
+                    raise AdmissionRejected(429, "Too many concurrent requests", self.retry_after())
+                self.waiting += 1
+                try:
+                    deadline = start + self.timeout
+                    while self.active >= self.concurrency:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._counts["rejected_timeout"] += 1
+                            raise AdmissionRejected(503, "Timed out waiting for capacity", self.retry_after())
+                        self._cond.wait(remaining)
+                finally:
+                    self.waiting -= 1
+            self.active += 1
+            self._counts["admitted"] += 1
+            waited = time.monotonic() - start
+            self._waits.append(waited)
+            return waited
+
+    def release(self, service_time):
+        """Free a slot and record how long the request held it."""
+        with self._cond:
+            self.active -= 1
+            if self._service_time is None:
+                self._service_time = service_time
+            else:
+                self._service_time += SERVICE_TIME_ALPHA * (service_time - self._service_time)
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            waits = sorted(self._waits)
+            stats = dict(
+                self._counts,
+                concurrency=self.concurrency,
+                queue=self.queue,
+                active=self.active,
+                waiting=self.waiting,
+                service_time_ms=self._service_time * 1000 if self._service_time is not None else None,
+            )
+        for p in (50, 95, 99):
+            stats[f"wait_p{p}_ms"] = _percentile(waits, p) * 1000 if waits else None
+        stats["wait_max_ms"] = waits[-1] * 1000 if waits else None
+        return stats
+
+
+class AdmissionController:
+    """Limiters for the configured endpoints and blueprints."""
+
+    def __init__(self, limits, enabled=True):
+        self.enabled = enabled
+        self.limiters = {
+            name: Limiter(name, limit['concurrency'], limit.get('queue', 0), limit.get('timeout', 5.0))
+            for name, limit in limits.items() if not isinstance(limit, str)
+        }
+        for name, shared in limits.items():
+            if isinstance(shared, str):
+                if shared not in self.limiters:
+                    raise ValueError(f"Admission limit {name!r} refers to unknown limit {shared!r}")
+                self.limiters[name] = self.limiters[shared]
+
+    def limiter_for(self, endpoint, blueprint):
+        """Return the limiter for a request, or None if it is not limited."""
+        limiter = self.limiters.get(endpoint)
+        if limiter is None and blueprint:
+            limiter = self.limiters.get(blueprint)
+        return limiter
+
+    def stats(self):
+        # Shared limiters are reported once, under their own name
+        return {limiter.name: limiter.stats() for limiter in self.limiters.values()}
+
+
+def deferred_admission(view):
+    """Mark a view that takes its slot with admission_slot() instead of before it runs."""
+    view.deferred_admission = True
+    return view
+
+
+@contextmanager
+def admission_slot(name=None):
+    """
+    Hold an admission slot of the current request while computing.
+
+    Args:
+        name: Limiter to take a slot of (default: the limiter of the
+            request's endpoint or blueprint)
+
+    Does nothing outside a request, if the request already holds a slot,
+    if admission is off or if there is no such limiter.
+
+    Raises:
+        AdmissionRejected: If no slot is available
+    """
+    controller = current_app.extensions.get('admission') if has_request_context() else None
+    limiter = None
+    if controller is not None and controller.enabled and g.get('admission') is None:
+        if name is None:
+            limiter = controller.limiter_for(request.endpoint, request.blueprint)
+        else:
+            limiter = controller.limiters.get(name)
+    if limiter is None:
+        yield
+        return
+    limiter.acquire()
+    start = time.monotonic()
+    g.admission = (limiter, start)
+    try:
+        yield
+    finally:
+        g.pop('admission', None)
+        limiter.release(time.monotonic() - start)
+
+
+def admitted(fn):
+    """fn run inside admission_slot() (for the computation behind a cache lookup)."""
+    def run(*args, **kwargs):
+        with admission_slot():
+            return fn(*args, **kwargs)
+    return run
+
+
+def rejection_response(rejected):
+    """JSON error response for a rejected request."""
+    response = jsonify({"error": "Service busy", "message": rejected.reason})
+    return response, rejected.status, {"Retry-After": str(rejected.retry_after)}
+
+
+def init_admission(app):
+    """Install admission control according to ADMISSION_ENABLED and ADMISSION_LIMITS."""
+    controller = AdmissionController(app.config.get('ADMISSION_LIMITS') or {},
+                                     app.config.get('ADMISSION_ENABLED', True))
+    app.extensions['admission'] = controller
+    if not controller.enabled or not controller.limiters:
+        return controller
+
+    @app.errorhandler(AdmissionRejected)
+    def rejected(rejected):
+        logger.warning("Rejected %s: %s", request.path, rejected.reason)
+        return rejection_response(rejected)
+
+    @app.before_request
+    def admit():
+        limiter = controller.limiter_for(request.endpoint, request.blueprint)
+        if limiter is None:
+            return None
+        view = app.view_functions.get(request.endpoint)
+        if getattr(view, 'deferred_admission', False):
+            return None
+        try:
+            limiter.acquire()
+        except AdmissionRejected as rejected:
+            logger.warning("Rejected %s (%s): %s", request.path, limiter.name, rejected.reason)
+            return rejection_response(rejected)
+        g.admission = (limiter, time.monotonic())
+        return None
+
+    @app.teardown_request
+    def release(exception=None):
+        admitted = g.pop('admission', None)
+        if admitted is not None:
+            limiter, start = admitted
+            limiter.release(time.monotonic() - start)
+
+    return controller
@@ -0,0 +1,80 @@
+# backend/utils/compression.py
+"""
+Response compression for large payloads.
+
+Responses at or above COMPRESS_MIN_SIZE bytes are compressed with brotli (if
+the optional brotli package is installed and the client accepts it) or gzip.
+"""
+import gzip
+import logging
+
+from flask import Flask, request
+
+from utils.lazy import lazy_import
+
+brotli = lazy_import('brotli')  # optional
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/vnd.hydrogen.columnar+json',
+    'application/x-msgpack',
+    'application/vnd.apache.arrow.stream',
+    'text/plain',
+    'text/csv',
+}
+
+
+def choose_encoding():
+    """Pick the best supported Content-Encoding accepted by the client."""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_response(response, min_size, level):
+    """Compress the response body in place when worthwhile."""
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or 'Content-Encoding' in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+
+    if encoding == 'br':
+        compressed = brotli.compress(body, quality=min(level, 11))
+    else:
+        compressed = gzip.compress(body, compresslevel=min(level, 9))
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_compression(app: Flask):
+    """Register the after-request hook that compresses large responses."""
+    if not app.config.get('COMPRESS_ENABLED', True):
+        return
+
+    min_size = app.config.get('COMPRESS_MIN_SIZE', 1024)
+    level = app.config.get('COMPRESS_LEVEL', 5)
+
+    @app.after_request
+    def compress(response):
+        return compress_response(response, min_size, level)
@@ -0,0 +1,110 @@
+# backend/utils/concurrency.py
+"""
+Concurrent evaluation of independent sub-computations within one request.
+
+Composite endpoints (e.g. total demand = aircraft demand + GSE demand, which
+read two separate databases) hand their independent parts to
+run_concurrently(), which runs them on a bounded thread pool shared by the
+whole process and joins the results, so latency approaches the slowest part
+instead of the sum of all parts.
+
+Each part runs in its own app context on a pool thread. The scoped sessions
+from utils.database are thread-local, so every part gets its own sessions,
+and the app context teardown removes them when the part finishes. The pool
+is bounded: when all of its threads are busy, parts run inline in the
+request thread instead of queueing behind other requests.
+
+Only parts that wait on I/O (database queries) overlap: pure Python and
+small NumPy work holds the GIL, and handing it to another thread only adds
+overhead. Callers pass enabled=False when their parts are in-memory.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_pid = None
+_slots = None
+_create_lock = threading.Lock()
+_in_pool = threading.local()
+
+
+def get_executor(max_workers):
+    """Return the process-wide pool (created on first use, again after a fork)."""
+    global _executor, _executor_pid, _slots
+    if _executor_pid != os.getpid():
+        with _create_lock:
+            if _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='subtask')
+                _slots = threading.BoundedSemaphore(max_workers)
+                _executor_pid = os.getpid()
+    return _executor
+
+
+def _run_in_app_context(app, fn, args):
+    _in_pool.active = True
+    try:
+        with app.app_context():
+            return fn(*args)
+    finally:
+        _in_pool.active = False
+        _slots.release()
+
+
+def run_concurrently(*calls, enabled=True):
+    """
+    Run independent calls concurrently and return their results in order.
+
+    Args:
+        *calls: (fn, *args) tuples. fn must not depend on the request
+            context; it gets a fresh app context and its own DB sessions.
+        enabled: Set to False to run the calls sequentially (e.g. when they
+            do no I/O)
+
+    Returns:
+        list: fn(*args) for each call
+
+    Raises:
+        The first exception raised by a call, after all calls have finished
+    """
+    config = current_app.config
+    if (not enabled or len(calls) < 2 or not config.get('CONCURRENCY_ENABLED', True)
+            or getattr(_in_pool, 'active', False)):
+        # Nothing to overlap, disabled, or already on a pool thread (waiting on
+        # the pool from inside it could deadlock)
+        return [call[0](*call[1:]) for call in calls]
+
+    app = current_app._get_current_object()
+    executor = get_executor(config.get('CONCURRENCY_WORKERS', 8))
+    results = [None] * len(calls)
+    errors = []
+
+    def run_inline(index, fn, args):
+        try:
+            results[index] = fn(*args)
+        except Exception as e:
+            errors.append(e)
+
+    # The last call runs in the request thread while the others are on the pool
+    pending = []
+    for index, (fn, *args) in enumerate(calls[:-1]):
+        if _slots.acquire(blocking=False):
+            pending.append((index, executor.submit(_run_in_app_context, app, fn, args)))
+        else:
+            run_inline(index, fn, args)  # pool saturated
+    fn, *args = calls[-1]
+    run_inline(len(calls) - 1, fn, args)
+
+    for index, future in pending:
+        try:
+            results[index] = future.result()
+        except Exception as e:
+            errors.append(e)
+    if errors:
+        raise errors[0]
+    return results
@@ -8,26 +8,50 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-# Global session factories
+# Global engines and session factories
+aircraft_engine = None
+gse_engine = None
 aircraft_session_factory = None
 gse_session_factory = None
 
 def init_db(app):
-    """Initialize database connections and create all tables."""
-    global aircraft_session_factory, gse_session_factory
-    
+    """
+    Initialize database connections.
+
+    Tables are only created here when DB_CREATE_TABLES is set (development and
+    testing). Elsewhere schema creation is a deployment step, run once with
+    `flask --app wsgi init-db`, so it stays off the worker startup path.
+    """
     logger.debug("Initializing database connections")
     
-    # Create engines
-    aircraft_engine = create_engine(
-        app.config['AIRCRAFT_DATABASE_URI'],
-        echo=True  # Enable SQL logging
-    )
-    gse_engine = create_engine(
-        app.config['GSE_DATABASE_URI'],
-        echo=True
+    # SQL logging per environment. Set through the logger level rather than
+    # echo=True, which would add SQLAlchemy's own synchronous stdout handler
+    # next to the app's queued one (see utils/log.py)
+    logging.getLogger('sqlalchemy.engine').setLevel(
+        logging.INFO if app.config.get('SQL_ECHO', False) else logging.WARNING
     )
 
+    init_engines(app.config['AIRCRAFT_DATABASE_URI'], app.config['GSE_DATABASE_URI'])
+
+    if app.config.get('DB_CREATE_TABLES', False):
+        create_tables()
+
+    logger.debug("Database initialization complete")
+    return aircraft_engine, gse_engine
+
+def init_engines(aircraft_uri, gse_uri):
+    """
+    Create this process's engines and session factories.
+
+    Also used by job pool processes, which connect on their own rather than
+    through anything inherited from the worker that started them.
+    """
+    global aircraft_engine, gse_engine, aircraft_session_factory, gse_session_factory
+
+    # Create engines
+    aircraft_engine = create_engine(aircraft_uri)
+    gse_engine = create_engine(gse_uri)
+
     # Create session factories
     aircraft_session_factory = scoped_session(
         sessionmaker(
@@ -45,12 +69,21 @@ def init_db(app):
         )
     )
 
-    # Create tables
+def create_tables():
+    """Create all tables on both databases."""
+    if aircraft_engine is None or gse_engine is None:
+        raise RuntimeError("Database not initialized")
+
     AircraftBase.metadata.create_all(aircraft_engine)
     GSEBase.metadata.create_all(gse_engine)
+    logger.info("Database tables created")
 
-    logger.debug("Database initialization complete")
-    return aircraft_engine, gse_engine
+def register_db_commands(app):
+    """Register database CLI commands."""
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create the database tables."""
+        create_tables()
 
 def get_aircraft_db_session():
     """Get a session for the aircraft database."""
@@ -74,6 +107,18 @@ def get_gse_db_session():
     finally:
         session.close()
 
+def dispose_engines():
+    """
+    Drop pooled connections inherited from a parent process.
+
+    Called in each worker after a pre-fork server forks, so workers never
+    share the master's database connections. The parent's connections are
+    left open for the parent (close=False).
+    """
+    for engine in (aircraft_engine, gse_engine):
+        if engine is not None:
+            engine.dispose(close=False)
+
 def teardown_db():
     """Cleanup database connections."""
     if aircraft_session_factory:
@@ -0,0 +1,97 @@
+# backend/utils/geo.py
+"""
+Planar geometry for the storage zones of data/available_zones.json.
+
+Zones are given in latitude/longitude: polygons as [lat, lon] vertices and
+circles as a [lat, lon] center and a radius in meters (as Leaflet draws them
+in HydrogenMap.vue). Over the extent of an airport an equirectangular
+projection about a local origin is accurate to well under a foot, so zones
+are projected to a planar frame in feet (x east, y north) and all areas and
+placements are computed there.
+"""
+import math
+
+import numpy as np
+
+EARTH_RADIUS_FT = 20_902_231  # mean radius
+FT_PER_M = 3.28084
+# Vertices of the polygon standing in for a circle (inscribed, so
+# conservative: every point of it lies inside the circle)
+CIRCLE_SEGMENTS = 64
+
+
+def zone_points(zone):
+    """The [lat, lon] points that locate a zone (vertices or center)."""
+    if zone["type"] == "circle":
+        return [zone["center"]]
+    return zone["coordinates"]
+
+
+def projection_origin(zones):
+    """(lat, lon) about which to project: the mean of the zones' points."""
+    points = np.array([point for zone in zones for point in zone_points(zone)], dtype=np.float64)
+    if not len(points):
+        return (0.0, 0.0)
+    lat, lon = points.mean(axis=0)
+    return (float(lat), float(lon))
+
+
+def project(lat, lon, origin):
+    """Latitude/longitude (degrees) to x, y feet about origin."""
+    lat0, lon0 = origin
+    x = np.radians(np.asarray(lon, dtype=np.float64) - lon0) * EARTH_RADIUS_FT * math.cos(math.radians(lat0))
+    y = np.radians(np.asarray(lat, dtype=np.float64) - lat0) * EARTH_RADIUS_FT
+    return x, y
+
+
+def unproject(x, y, origin):
+    """Inverse of project."""
+    lat0, lon0 = origin
+    lat = lat0 + np.degrees(np.asarray(y, dtype=np.float64) / EARTH_RADIUS_FT)
+    lon = lon0 + np.degrees(np.asarray(x, dtype=np.float64) / (EARTH_RADIUS_FT * math.cos(math.radians(lat0))))
+    return lat, lon
+
+
+def polygon_area(polygon):
+    """Signed area of an (n, 2) vertex array (positive when counter-clockwise)."""
+    x, y = polygon[:, 0], polygon[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def zone_polygon(zone, origin):
+    """
+    A zone as a counter-clockwise (n, 2) vertex array in feet.
+
+    Raises:
+        ValueError: If the zone type is unknown or its geometry is degenerate
+    """
+    if zone["type"] == "circle":
+        cx, cy = project(zone["center"][0], zone["center"][1], origin)
+        radius = zone["radius"] * FT_PER_M
+        angles = np.linspace(0, 2 * np.pi, CIRCLE_SEGMENTS, endpoint=False)
+        polygon = np.column_stack((cx + radius * np.cos(angles), cy + radius * np.sin(angles)))
+    elif zone["type"] == "polygon":
+        coordinates = np.asarray(zone["coordinates"], dtype=np.float64)
+        if coordinates.ndim != 2 or len(coordinates) < 3:
+            raise ValueError(f"Zone {zone.get('name')!r} needs at least 3 vertices")
+        polygon = np.column_stack(project(coordinates[:, 0], coordinates[:, 1], origin))
+    else:
+        raise ValueError(f"Zone {zone.get('name')!r} has unknown type {zone['type']!r}")
+
+    area = polygon_area(polygon)
+    if area == 0:
+        raise ValueError(f"Zone {zone.get('name')!r} has no area")
+    return polygon if area > 0 else polygon[::-1]
+
+
+def is_convex(polygon):
+    """Whether a counter-clockwise polygon is convex."""
+    edges = np.roll(polygon, -1, axis=0) - polygon
+    turns = edges[:, 0] * np.roll(edges[:, 1], -1) - edges[:, 1] * np.roll(edges[:, 0], -1)
+    return bool(np.all(turns >= -1e-9 * np.abs(turns).max()))
+
+
+def rotate(points, angle):
+    """Rotate (n, 2) points counter-clockwise by angle (radians) about the origin."""
+    c, s = math.cos(angle), math.sin(angle)
+    return points @ np.array([[c, s], [-s, c]])
@@ -0,0 +1,589 @@
+# backend/utils/jobs.py
+"""
+Background jobs for computations that are too slow for a request.
+
+A job is submitted with a registered kind and validated parameters and runs
+on a bounded process pool, so CPU-heavy NumPy work never occupies request
+threads. Job functions receive their parameters and a JobContext through
+which they report progress and check for cancellation:
+
+    @job_kind('demand_sweep', DemandSweepParams)
+    def demand_sweep(params, context):
+        for i, year in enumerate(params.years):
+            context.check_cancelled()
+            ...
+            context.progress((i + 1) / len(params.years))
+        return result
+
+Job records live in a SQLite file (see utils.sqlite) so a poll or a cancel
+can be answered by any worker process. The worker that accepted a job owns
+its execution: a monitor thread in that worker applies progress reported by
+the pool processes and cancellations requested through other workers.
+Results are stored in the result cache under the key recorded on the job.
+
+Every state change, progress report and chunk of partial rows is also
+appended to a per-job event log in the same file. The SSE endpoint replays
+that log from any worker, so clients see progress as it happens and partial
+sweep results stream out without the whole result being held in memory.
+"""
+import atexit
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Callable
+
+from utils.json_provider import json_bytes
+from utils.result_cache import cache_key
+from utils.sqlite import LocalConnections
+
+logger = logging.getLogger(__name__)
+
+# Registered job kinds by name
+JOB_KINDS = {}
+
+ACTIVE_STATUSES = ('queued', 'running')
+FINISHED_STATUSES = ('succeeded', 'failed', 'cancelled')
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class JobKind:
+    name: str
+    fn: Callable        # fn(params, context) -> result
+    schema: type        # Pydantic model of the parameters
+    version: Callable   # params -> version for the result cache key (None: no reuse)
+    tables: tuple = ()  # Tabular parts of the result, for content negotiation
+    streams_rows: bool = False  # Emits its result rows as it goes (context.rows)
+
+
+def job_kind(name, schema, version=lambda params: 1, tables=(), streams_rows=False):
+    """Register a function as a job kind."""
+    def register(fn):
+        JOB_KINDS[name] = JobKind(name, fn, schema, version, tables, streams_rows)
+        return fn
+    return register
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been cancelled."""
+
+
+class JobQueueFull(Exception):
+    """Raised when a worker already has JOB_MAX_ACTIVE queued or running jobs."""
+
+
+# -- pool process side -------------------------------------------------
+
+# Set in each pool process by _init_pool_process
+_cancel_flags = None
+_events = None
+
+
+def _init_pool_process(cancel_flags, events, worker_state):
+    """
+    Set up a pool process from the state of the worker that started it.
+
+    Pool processes open their own database connections and attach to the
+    shared-memory store themselves; under the default forkserver (or spawn)
+    start method nothing of the worker is inherited, and under fork the
+    worker's pooled connections must not be reused.
+    """
+    global _cancel_flags, _events
+    _cancel_flags, _events = cancel_flags, events
+    from utils.database import dispose_engines, init_engines
+    from utils.reference_data import set_reference_data, use_shared_store
+    dispose_engines()
+    if worker_state['database_uris'] is not None:
+        init_engines(*worker_state['database_uris'])
+    set_reference_data(worker_state['reference_data'])
+    use_shared_store(worker_state['shared_store_name'])
+
+
+class JobContext:
+    """Passed to job functions: progress reporting and cancellation checks."""
+
+    def __init__(self, job_id, slot):
+        self.job_id = job_id
+        self.slot = slot
+
+    def cancelled(self):
+        """Return True once cancellation of this job has been requested."""
+        return bool(_cancel_flags[self.slot])
+
+    def check_cancelled(self):
+        """Raise JobCancelled if cancellation has been requested."""
+        if self.cancelled():
+            raise JobCancelled(self.job_id)
+
+    def progress(self, fraction, partial=None):
+        """
+        Report progress.
+
+        Args:
+            fraction: Fraction of the work done, 0 to 1
+            partial: Optional JSON-serializable partial result
+        """
+        _events.put(('progress', self.job_id, float(fraction), partial))
+
+    def rows(self, columns):
+        """
+        Stream a chunk of partial results to subscribers.
+
+        Args:
+            columns: Dict of equal-length arrays or lists (one per field)
+        """
+        _events.put(('rows', self.job_id, columns))
+
+
+def _run_job(fn, params, job_id, slot):
+    """Entry point of a job in a pool process."""
+    _events.put(('started', job_id, time.time()))
+    try:
+        return fn(params, JobContext(job_id, slot))
+    finally:
+        # Sent after every other event of the job (the queue keeps order)
+        _events.put(('ended', job_id))
+
+
+def estimate_eta(started_at, fraction, now=None):
+    """Seconds left, extrapolating the elapsed time (None before any progress)."""
+    if not started_at or not fraction or fraction <= 0:
+        return None
+    elapsed = (now or time.time()) - started_at
+    return max(elapsed * (1.0 - fraction) / fraction, 0.0)
+
+
+# -- job records -------------------------------------------------------
+
+class JobStore:
+    """SQLite table of job records shared by every worker on the host."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            params TEXT NOT NULL,
+            status TEXT NOT NULL,
+            progress REAL NOT NULL DEFAULT 0,
+            partial TEXT,
+            error TEXT,
+            result_key TEXT NOT NULL,
+            owner_pid INTEGER NOT NULL,
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            submitted_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner_pid, status);
+        CREATE TABLE IF NOT EXISTS job_events (
+            job_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            type TEXT NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (job_id, seq)
+        );
+    """
+
+    def __init__(self, path, busy_timeout=5.0):
+        self.path = path
+        self._connections = LocalConnections(path, self.SCHEMA, busy_timeout)
+
+    def _execute(self, sql, args=()):
+        return self._connections.get().execute(sql, args)
+
+    def insert(self, job_id, kind, params, status, result_key, **fields):
+        record = dict(
+            id=job_id, kind=kind, params=json.dumps(params), status=status,
+            result_key=result_key, owner_pid=os.getpid(), submitted_at=time.time(), **fields
+        )
+        columns = ', '.join(record)
+        self._execute(
+            f'INSERT INTO jobs ({columns}) VALUES ({", ".join("?" * len(record))})',
+            tuple(record.values())
+        )
+
+    def update(self, job_id, only_if_status=None, **fields):
+        """Update fields of a job (only while it has one of only_if_status)."""
+        if 'partial' in fields:
+            fields['partial'] = json_bytes(fields['partial']).decode('utf-8')
+        assignments = ', '.join(f'{name} = ?' for name in fields)
+        sql = f'UPDATE jobs SET {assignments} WHERE id = ?'
+        args = (*fields.values(), job_id)
+        if only_if_status:
+            sql += f' AND status IN ({", ".join("?" * len(only_if_status))})'
+            args += tuple(only_if_status)
+        return self._execute(sql, args).rowcount
+
+    def get(self, job_id):
+        cursor = self._execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        record = dict(zip((column[0] for column in cursor.description), row))
+        record['params'] = json.loads(record['params'])
+        record['partial'] = json.loads(record['partial']) if record['partial'] else None
+        return record
+
+    def request_cancel(self, job_id):
+        self._execute('UPDATE jobs SET cancel_requested = 1 WHERE id = ?', (job_id,))
+
+    def cancel_requests(self, owner_pid):
+        """Return ids of active jobs owned by owner_pid with a pending cancellation."""
+        rows = self._execute(
+            "SELECT id FROM jobs WHERE owner_pid = ? AND cancel_requested = 1 "
+            "AND status IN ('queued', 'running')", (owner_pid,)
+        )
+        return [job_id for job_id, in rows]
+
+    def add_event(self, job_id, event_type, data):
+        """Append an event to the job's log (data is serialized to JSON)."""
+        self._execute(
+            "INSERT INTO job_events (job_id, seq, type, data) "
+            "SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ? FROM job_events WHERE job_id = ?",
+            (job_id, event_type, json_bytes(data).decode('utf-8'), job_id)
+        )
+
+    def events(self, job_id, after=0):
+        """Return (seq, type, JSON data) of the job's events after seq `after`."""
+        return self._execute(
+            "SELECT seq, type, data FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+            (job_id, after)
+        ).fetchall()
+
+    def prune(self, older_than):
+        """Delete finished jobs (and their events) that finished before older_than."""
+        self._execute(
+            "DELETE FROM job_events WHERE job_id IN (SELECT id FROM jobs WHERE "
+            "status IN ('succeeded', 'failed', 'cancelled') AND finished_at < ?)", (older_than,)
+        )
+        self._execute(
+            "DELETE FROM jobs WHERE status IN ('succeeded', 'failed', 'cancelled') "
+            "AND finished_at < ?", (older_than,)
+        )
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# -- manager -----------------------------------------------------------
+
+class JobManager:
+    """Submits jobs to this worker's process pool and tracks them."""
+
+    # Seconds a finished job waits for its last events to be applied (a
+    # crashed pool process never sends 'ended')
+    ENDED_TIMEOUT = 2.0
+
+    def __init__(self, store, result_cache, max_workers=2, max_active=16,
+                 start_method='forkserver', retention=24 * 3600,
+                 database_uris=None, shared_store_name=None):
+        """
+        Args:
+            store: JobStore holding the job records
+            result_cache: ResultCache receiving job results
+            max_workers: Pool processes per worker
+            max_active: Queued plus running jobs per worker
+            start_method: multiprocessing start method of the pool
+            retention: Seconds finished job records are kept
+            database_uris: (aircraft, GSE) database URIs pool processes connect to
+            shared_store_name: Shared-memory store of the reference data, if any
+        """
+        self.store = store
+        self.result_cache = result_cache
+        self.max_workers = max_workers
+        self.max_active = max_active
+        self.start_method = start_method
+        self.retention = retention
+        self.database_uris = database_uris
+        self.shared_store_name = shared_store_name
+        self._pid = None
+        self._pool = None
+        self._lock = threading.Lock()
+        self._running = {}    # job id -> (future, slot, result key)
+        self._ended = set()   # ids of running jobs whose events are all applied
+        self._started = {}    # job id -> start time, for ETAs
+        self._finishing = {}  # job id -> deadline of its 'ended' event (monitor thread only)
+        self._new_events = threading.Condition()
+
+    def _start(self):
+        """Create the pool and monitor thread (lazily, once per process)."""
+        if self._pid == os.getpid():
+            return
+        context = multiprocessing.get_context(self.start_method)
+        self._cancel_flags = context.Array('b', self.max_active, lock=False)
+        self._events = context.Queue()
+        self._free_slots = list(range(self.max_active))
+        self._running, self._ended, self._started, self._finishing = {}, set(), {}, {}
+        self._pool = self._new_pool()
+        self._stopping = threading.Event()
+        self._monitor = threading.Thread(target=self._monitor_loop, name='job-monitor', daemon=True)
+        self._monitor.start()
+        self._pid = os.getpid()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_init_pool_process,
+            initargs=(self._cancel_flags, self._events, self._worker_state())
+        )
+
+    def _worker_state(self):
+        """What pool processes need to set themselves up (see _init_pool_process)."""
+        from utils.reference_data import get_reference_data
+        return {
+            "database_uris": self.database_uris,
+            # A shared-memory store is attached to by name rather than copied
+            "reference_data": None if self.shared_store_name else get_reference_data(),
+            "shared_store_name": self.shared_store_name,
+        }
+
+    def submit(self, kind_name, params):
+        """
+        Submit a job.
+
+        Args:
+            kind_name: Registered job kind
+            params: Validated parameter model of the kind
+
+        Returns:
+            dict: The job record
+
+        Raises:
+            JobQueueFull: If this worker has max_active unfinished jobs
+        """
+        kind = JOB_KINDS[kind_name]
+        job_id = uuid.uuid4().hex
+        inputs = params.model_dump(mode='json')
+        version = kind.version(params)
+        if version is None:
+            result_key = f"jobs.{kind.name}:{job_id}"
+        else:
+            result_key = cache_key(f"jobs.{kind.name}", version, inputs)
+            if self.result_cache.get(result_key, _MISSING) is not _MISSING:
+                now = time.time()
+                self.store.insert(job_id, kind.name, inputs, 'succeeded', result_key,
+                                  progress=1.0, started_at=now, finished_at=now)
+                self._add_event(job_id, 'done', {"status": "succeeded", "error": None})
+                return self.get(job_id)
+
+        with self._lock:
+            self._start()
+            self.store.prune(time.time() - self.retention)
+            if not self._free_slots:
+                raise JobQueueFull(f"{self.max_active} jobs already queued or running")
+            slot = self._free_slots.pop()
+            self._cancel_flags[slot] = 0
+            self.store.insert(job_id, kind.name, inputs, 'queued', result_key)
+            self._add_event(job_id, 'status', {"status": "queued"})
+            try:
+                future = self._pool.submit(_run_job, kind.fn, params, job_id, slot)
+            except BrokenProcessPool:
+                logger.warning("Job pool broken, starting a new one")
+                self._pool = self._new_pool()
+                future = self._pool.submit(_run_job, kind.fn, params, job_id, slot)
+            self._running[job_id] = (future, slot, result_key)
+        # Only wakes the monitor: the pool's management thread must not block
+        future.add_done_callback(lambda f: self._events.put(('finished', job_id)))
+        logger.info("Submitted job %s (%s)", job_id, kind.name)
+        return self.get(job_id)
+
+    def _finish_jobs(self):
+        """Record the outcome of finished jobs once their last events are applied."""
+        now = time.monotonic()
+        for job_id, deadline in list(self._finishing.items()):
+            future = self._running[job_id][0]
+            if future.cancelled() or job_id in self._ended or now >= deadline:
+                del self._finishing[job_id]
+                self._finished(job_id)
+
+    def _finished(self, job_id):
+        """Record the outcome of a job (runs on the monitor thread)."""
+        with self._lock:
+            future, slot, result_key = self._running[job_id]
+        error = None
+        try:
+            if future.cancelled() or isinstance(future.exception(), JobCancelled):
+                status = 'cancelled'
+            elif future.exception() is not None:
+                status = 'failed'
+                error = f"{type(future.exception()).__name__}: {future.exception()}"
+                logger.error("Job %s failed: %s", job_id, error)
+            elif not self.result_cache.put(result_key, future.result()):
+                # Nothing could serve the result, so the job cannot succeed
+                status = 'failed'
+                error = ("Result could not be stored: larger than RESULT_CACHE_MAX_BYTES, "
+                         "or the result cache is unavailable")
+                logger.error("Job %s failed: %s", job_id, error)
+            else:
+                status = 'succeeded'
+            fields = {"progress": 1.0} if status == 'succeeded' else {}
+            self.store.update(job_id, status=status, error=error, finished_at=time.time(), **fields)
+            self._add_event(job_id, 'done', {"status": status, "error": error})
+        except sqlite3.Error as e:
+            logger.error("Could not record outcome of job %s: %s", job_id, e)
+        finally:
+            with self._lock:
+                self._running.pop(job_id, None)
+                self._ended.discard(job_id)
+                self._started.pop(job_id, None)
+                self._free_slots.append(slot)
+
+    def _add_event(self, job_id, event_type, data):
+        """Append to the job's event log and wake local subscribers."""
+        self.store.add_event(job_id, event_type, data)
+        with self._new_events:
+            self._new_events.notify_all()
+
+    def _monitor_loop(self):
+        """Apply events from pool processes and cancellations from other workers."""
+        next_cancel_check = 0.0
+        while not self._stopping.is_set():
+            try:
+                event = self._events.get(timeout=0.25)
+            except queue.Empty:
+                event = None
+            except (EOFError, OSError):
+                return
+            try:
+                if event is not None:
+                    self._handle_event(event)
+                self._finish_jobs()
+                if time.monotonic() >= next_cancel_check:
+                    next_cancel_check = time.monotonic() + 0.5
+                    for job_id in self.store.cancel_requests(os.getpid()):
+                        self._cancel_local(job_id)
+            except sqlite3.Error as e:
+                logger.warning("Job monitor: %s", e)
+
+    def _handle_event(self, event):
+        job_id = event[1]
+        if event[0] == 'started':
+            started_at = event[2]
+            self._started[job_id] = started_at
+            if self.store.update(job_id, ('queued',), status='running', started_at=started_at):
+                self._add_event(job_id, 'status', {"status": "running"})
+        elif event[0] == 'progress':
+            _, _, fraction, partial = event
+            fraction = min(max(fraction, 0.0), 1.0)
+            fields = {"progress": fraction}
+            if partial is not None:
+                fields["partial"] = partial
+            if self.store.update(job_id, ('running',), **fields):
+                self._add_event(job_id, 'progress', {
+                    "fraction": fraction,
+                    "eta_s": estimate_eta(self._started.get(job_id), fraction),
+                    "partial": partial,
+                })
+        elif event[0] == 'rows':
+            self._add_event(job_id, 'rows', event[2])
+        elif event[0] == 'ended':
+            if job_id in self._running:
+                self._ended.add(job_id)
+        elif event[0] == 'finished':
+            self._finishing[job_id] = time.monotonic() + self.ENDED_TIMEOUT
+
+    def _cancel_local(self, job_id):
+        """Cancel a job running in this worker's pool."""
+        with self._lock:
+            entry = self._running.get(job_id)
+        if entry is None:
+            return
+        future, slot, _ = entry
+        if not future.cancel():
+            # Already running: the job sees the flag at its next check
+            self._cancel_flags[slot] = 1
+
+    def get(self, job_id):
+        """Return the job record, or None if there is no such job."""
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        if job['status'] in ACTIVE_STATUSES and not _pid_alive(job['owner_pid']):
+            # The worker that owned the job exited before it finished
+            error = "Worker exited before the job finished"
+            if self.store.update(job_id, ACTIVE_STATUSES, status='failed', error=error,
+                                 finished_at=time.time()):
+                self._add_event(job_id, 'done', {"status": "failed", "error": error})
+            job = self.store.get(job_id)
+        return job
+
+    def events(self, job_id, after=0):
+        """Return (seq, type, JSON data) of the job's events after seq `after`."""
+        return self.store.events(job_id, after)
+
+    def wait_for_events(self, timeout):
+        """
+        Block until this worker logs a new event or timeout elapses.
+
+        Events of jobs owned by other workers do not wake this up, so
+        subscribers also poll at the timeout.
+        """
+        with self._new_events:
+            self._new_events.wait(timeout)
+
+    def cancel(self, job_id):
+        """
+        Request cancellation of a job.
+
+        Returns:
+            dict: The job record (None if there is no such job)
+        """
+        job = self.get(job_id)
+        if job is None or job['status'] in FINISHED_STATUSES:
+            return job
+        self.store.request_cancel(job_id)
+        if job['owner_pid'] == os.getpid():
+            self._cancel_local(job_id)
+        return self.get(job_id)
+
+    def result(self, job_id, default=None):
+        """Return the result of a succeeded job (default if it is no longer cached)."""
+        job = self.store.get(job_id)
+        if job is None:
+            return default
+        return self.result_cache.get(job['result_key'], default)
+
+    def shutdown(self, wait=False):
+        """Stop the monitor and the pool, cancelling queued jobs."""
+        if self._pid != os.getpid():
+            return
+        self._stopping.set()
+        for future, slot, _ in list(self._running.values()):
+            self._cancel_flags[slot] = 1
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+        self._pid = None
+
+
+def init_jobs(app):
+    """Create the app's JobManager (its pool starts with the first job)."""
+    manager = JobManager(
+        JobStore(app.config['JOB_STORE_PATH']),
+        app.extensions['result_cache'],
+        max_workers=app.config['JOB_WORKERS'],
+        max_active=app.config['JOB_MAX_ACTIVE'],
+        start_method=app.config['JOB_START_METHOD'],
+        retention=app.config['JOB_RETENTION_SECONDS'],
+        database_uris=(app.config['AIRCRAFT_DATABASE_URI'], app.config['GSE_DATABASE_URI']),
+        shared_store_name=app.config.get('SHARED_STORE_NAME'),
+    )
+    app.extensions['jobs'] = manager
+    atexit.register(manager.shutdown)
+    return manager
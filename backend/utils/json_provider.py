@@ -0,0 +1,96 @@
+# backend/utils/json_provider.py
+"""
+JSON providers for the Flask app.
+
+The default provider is backed by orjson, which serializes NumPy scalars and
+arrays natively (no intermediate Python lists) and writes response bodies as
+bytes. When orjson is not installed, the stdlib json module is used with a
+fallback converter for NumPy types.
+
+The provider is selected with the JSON_PROVIDER config value.
+"""
+import json
+import logging
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+from flask.json.provider import JSONProvider, DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default(obj):
+    """Convert values the fast path cannot serialize directly."""
+    if isinstance(obj, np.ndarray):
+        # orjson only handles C-contiguous arrays of native numeric dtypes;
+        # copy strided views once and fall back to lists for anything else
+        if orjson is not None and not obj.flags.c_contiguous and obj.dtype.isnative:
+            return np.ascontiguousarray(obj)
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTION = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def json_bytes(obj):
+        """Serialize obj (which may contain NumPy values) to UTF-8 encoded JSON bytes."""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTION)
+else:
+    def json_bytes(obj):
+        """Serialize obj (which may contain NumPy values) to UTF-8 encoded JSON bytes."""
+        return json.dumps(obj, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+class NumpyJSONProvider(JSONProvider):
+    """JSON provider with native NumPy support."""
+
+    mimetype = 'application/json'
+
+    def dumps_bytes(self, obj, **kwargs):
+        """Serialize obj to UTF-8 encoded JSON bytes."""
+        return json_bytes(obj)
+
+    if orjson is not None:
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+    else:
+        def loads(self, s, **kwargs):
+            return json.loads(s, **kwargs)
+
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj, **kwargs).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        """Serialize the given arguments to a JSON response without a str round trip."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+
+JSON_PROVIDERS = {
+    'numpy': NumpyJSONProvider,
+    'default': DefaultJSONProvider,
+}
+
+
+def init_json_provider(app):
+    """Install the JSON provider named by JSON_PROVIDER (or a provider class)."""
+    provider = app.config.get('JSON_PROVIDER', 'numpy')
+    provider_class = JSON_PROVIDERS[provider] if isinstance(provider, str) else provider
+    app.json = provider_class(app)
+    logger.debug("Using JSON provider %s (orjson available: %s)",
+                 provider_class.__name__, orjson is not None)
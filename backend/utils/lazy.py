@@ -0,0 +1,50 @@
+# backend/utils/lazy.py
+"""
+Deferred imports of optional modules.
+
+Optional dependencies (msgpack, pyarrow, brotli) are bound at import time
+but only imported on first attribute access, so they cost nothing at worker
+startup unless a request actually uses them. numpy is imported normally:
+nearly every calculation needs it, and it must be complete before any
+thread (e.g. the job pool's result reader) unpickles arrays.
+
+The first access goes through importlib.import_module, whose per-module
+import lock makes concurrent first accesses wait for the fully executed
+module. importlib's LazyLoader gives no such guarantee before Python 3.12.
+"""
+import importlib
+import importlib.util
+
+
+class _DeferredModule:
+    """Stands in for a module until an attribute of it is first used."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        # Only reached for attributes of the module itself
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = 'imported' if self._module is not None else 'deferred'
+        return f"<module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    """
+    Return module `name`, deferring its import until first attribute access.
+
+    Returns:
+        The module (or a stand-in until it is used), or None if it is not installed
+    """
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None:
+        return None
+    return _DeferredModule(name)
@@ -0,0 +1,204 @@
+# backend/utils/log.py
+"""
+Logging setup: non-blocking handlers, sampling and request correlation.
+
+init_logging() installs a single QueueHandler on the root logger. Records
+are put on an in-memory queue by the calling thread and formatted and
+written by a QueueListener thread, so a request never waits on the stream.
+Each record gets the id of the request it was logged from (taken from the
+X-Request-ID header or generated, and echoed in the response), and records
+below WARNING can be sampled per logger.
+
+Configuration (see config.py):
+    LOG_LEVEL     root level; the LOG_LEVEL environment variable overrides it
+    LOG_FORMAT    format string for text output
+    LOG_JSON      write one JSON object per record instead of text
+    LOG_ASYNC     write through the queue (off: write in the calling thread)
+    LOG_SAMPLING  {logger name: fraction of DEBUG/INFO records kept}; a
+                  name also covers its children ("sqlalchemy" covers
+                  "sqlalchemy.engine")
+
+Use lazy %-formatting (logger.debug("Found %d records", n)) rather than
+f-strings, so messages that are filtered out are never formatted.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import time
+import uuid
+
+from flask import g, has_request_context, request
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+# LogRecord attributes that are not structured fields
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request_id'}
+
+_listener = None
+_handler = None
+
+
+def current_request_id():
+    """Return the id of the current request, or '-' outside a request."""
+    if has_request_context():
+        return g.get('request_id', '-')
+    return '-'
+
+
+class RequestIdFilter(logging.Filter):
+    """Add request_id to every record."""
+
+    def filter(self, record):
+        record.request_id = current_request_id()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fraction of the DEBUG and INFO records of selected loggers.
+
+    Warnings and errors always pass. The most specific configured logger
+    name applies.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = dict(rates)
+        self._cache = {}
+
+    def rate_for(self, name):
+        rate = self._cache.get(name)
+        if rate is None:
+            rate = 1.0
+            prefix = name
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition('.')[0]
+            self._cache[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON, including any extra fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, 'request_id', '-'),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a listener in the same process.
+
+    The stock prepare() formats the whole record in the calling thread so it
+    can be pickled; here only the message is merged (so later changes to
+    mutable arguments do not show up), and formatting happens on the
+    listener thread.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _restart_listener():
+    """Start a fresh listener in a forked child (threads do not survive fork)."""
+    if _listener is None:
+        return
+    _listener.queue = _handler.queue = queue.SimpleQueue()
+    _listener._thread = None
+    _listener.start()
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def init_request_ids(app):
+    """Assign every request an id and return it in the response headers."""
+
+    @app.before_request
+    def assign_request_id():
+        g.request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+
+    @app.after_request
+    def echo_request_id(response):
+        response.headers.setdefault(REQUEST_ID_HEADER, current_request_id())
+        return response
+
+
+def init_logging(app):
+    """Configure the root logger from the app's configuration."""
+    global _listener, _handler
+    level = os.environ.get('LOG_LEVEL') or app.config['LOG_LEVEL']
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+
+    if app.config.get('LOG_JSON'):
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(app.config['LOG_FORMAT'])
+    stream = logging.StreamHandler()
+    stream.setFormatter(formatter)
+
+    filters = [RequestIdFilter()]
+    if app.config.get('LOG_SAMPLING'):
+        filters.append(SamplingFilter(app.config['LOG_SAMPLING']))
+
+    stop_logging()
+    if app.config.get('LOG_ASYNC', True):
+        records = queue.SimpleQueue()
+        handler = LocalQueueHandler(records)
+        _listener = logging.handlers.QueueListener(records, stream, respect_handler_level=True)
+        _listener.start()
+    else:
+        handler = stream
+    # Filters run in the calling thread, where the request context is
+    for log_filter in filters:
+        handler.addFilter(log_filter)
+
+    # Replace the handler from a previous call (one per app created), but
+    # leave handlers installed by others (e.g. test log capture) alone
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)
+        _handler.close()
+    _handler = handler
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    init_request_ids(app)
+
+
+os.register_at_fork(after_in_child=_restart_listener)
+atexit.register(stop_logging)
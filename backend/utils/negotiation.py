@@ -0,0 +1,211 @@
+# backend/utils/negotiation.py
+"""
+Content negotiation for calculation results.
+
+Results are plain dicts whose tabular parts ("tables") are either row-wise
+lists of dicts or columnar dicts of arrays. Clients choose the representation
+with the Accept header or a ?format= query parameter:
+
+    json      application/json                        row-wise JSON (default)
+    columnar  application/vnd.hydrogen.columnar+json  one array per field
+    msgpack   application/x-msgpack                   MessagePack, columnar
+    arrow     application/vnd.apache.arrow.stream     Arrow IPC stream
+
+MessagePack and Arrow need the optional msgpack and pyarrow packages.
+Large tables (sweeps) can stay columnar in plain JSON too (rows=False),
+since a dict per row costs far more than the arrays themselves.
+"""
+import logging
+
+import numpy as np
+from flask import current_app, jsonify, request
+
+from utils.lazy import lazy_import
+
+msgpack = lazy_import('msgpack')  # optional
+pyarrow = lazy_import('pyarrow')  # optional
+
+logger = logging.getLogger(__name__)
+
+JSON_MIMETYPE = 'application/json'
+COLUMNAR_MIMETYPE = 'application/vnd.hydrogen.columnar+json'
+MSGPACK_MIMETYPE = 'application/x-msgpack'
+ARROW_MIMETYPE = 'application/vnd.apache.arrow.stream'
+
+FORMATS = {
+    'json': JSON_MIMETYPE,
+    'columnar': COLUMNAR_MIMETYPE,
+    'msgpack': MSGPACK_MIMETYPE,
+    'arrow': ARROW_MIMETYPE,
+}
+
+# Accept header values -> format name
+MIMETYPE_FORMATS = {
+    JSON_MIMETYPE: 'json',
+    COLUMNAR_MIMETYPE: 'columnar',
+    MSGPACK_MIMETYPE: 'msgpack',
+    'application/msgpack': 'msgpack',
+    'application/vnd.msgpack': 'msgpack',
+    ARROW_MIMETYPE: 'arrow',
+}
+
+
+def available_formats():
+    """Return the format names whose dependencies are installed."""
+    formats = ['json', 'columnar']
+    if msgpack is not None:
+        formats.append('msgpack')
+    if pyarrow is not None:
+        formats.append('arrow')
+    return formats
+
+
+def requested_format():
+    """
+    Determine the response format for the current request.
+
+    Returns:
+        str: Format name, or None if nothing acceptable can be produced
+    """
+    formats = available_formats()
+    explicit = request.args.get('format')
+    if explicit:
+        return explicit if explicit in formats else None
+
+    offered = [mimetype for mimetype, name in MIMETYPE_FORMATS.items() if name in formats]
+    if not request.accept_mimetypes:
+        return 'json'
+    best = request.accept_mimetypes.best_match(offered)
+    return MIMETYPE_FORMATS[best] if best else None
+
+
+def _get_path(result, path):
+    node = result
+    for part in path.split('.'):
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return node
+
+
+def _with_path(result, path, value):
+    """Return a shallow copy of result with the table at path replaced."""
+    head, _, rest = path.partition('.')
+    updated = dict(result)
+    updated[head] = _with_path(result[head], rest, value) if rest else value
+    return updated
+
+
+def to_columns(table):
+    """Convert a row-wise table (list of dicts) to a dict of columns."""
+    if isinstance(table, dict):
+        return table
+    if not table:
+        return {}
+    return {field: [row.get(field) for row in table] for field in table[0]}
+
+
+def to_rows(table):
+    """Convert a columnar table (dict of arrays) to a list of dicts."""
+    if not isinstance(table, dict):
+        return table
+    columns = [
+        column.tolist() if isinstance(column, np.ndarray) else list(column)
+        for column in table.values()
+    ]
+    return [dict(zip(table.keys(), values)) for values in zip(*columns)]
+
+
+def _reshape(result, tables, convert):
+    for path in tables:
+        table = _get_path(result, path)
+        if table is not None:
+            result = _with_path(result, path, convert(table))
+    return result
+
+
+def _msgpack_default(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not MessagePack serializable")
+
+
+def _arrow_stream(result, tables):
+    """
+    Encode the first table as an Arrow IPC stream.
+
+    The remaining (non-table) fields travel as JSON in the schema metadata.
+    Results without tables are sent as a single-row batch of their scalars.
+    """
+    primary = next((path for path in tables if _get_path(result, path) is not None), None)
+    if primary is not None:
+        columns = to_columns(_get_path(result, primary))
+        metadata = _with_path(result, primary, None)
+    else:
+        columns = {
+            key: [value] for key, value in result.items()
+            if not isinstance(value, (dict, list, np.ndarray))
+        }
+        metadata = {key: value for key, value in result.items() if key not in columns}
+
+    batch = pyarrow.RecordBatch.from_pydict({
+        key: np.asarray(column) if isinstance(column, np.ndarray) else column
+        for key, column in columns.items()
+    })
+    schema = batch.schema.with_metadata({
+        'table': primary or '',
+        'result': current_app.json.dumps(metadata),
+    })
+    from pyarrow import ipc
+
+    sink = pyarrow.BufferOutputStream()
+    with ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(batch.replace_schema_metadata(schema.metadata))
+    return sink.getvalue().to_pybytes()
+
+
+def negotiated_response(result, tables=(), status=200, rows=True):
+    """
+    Build the response for a calculation result in the requested format.
+
+    Args:
+        result: Result dict
+        tables: Dotted paths of the tabular parts of result
+        status: HTTP status code
+        rows: Whether plain JSON gives the tables row-wise (False: columnar)
+
+    Returns:
+        Response: Flask response (406 if no acceptable format is available)
+    """
+    fmt = requested_format()
+    if fmt is None:
+        response = jsonify({
+            "error": "Not Acceptable",
+            "message": f"Supported formats: {', '.join(available_formats())}"
+        })
+        response.status_code = 406
+        return response
+
+    if fmt == 'json':
+        response = jsonify(_reshape(result, tables, to_rows if rows else to_columns))
+    elif fmt == 'columnar':
+        response = current_app.response_class(
+            current_app.json.dumps(_reshape(result, tables, to_columns)),
+            mimetype=COLUMNAR_MIMETYPE
+        )
+    elif fmt == 'msgpack':
+        response = current_app.response_class(
+            msgpack.packb(_reshape(result, tables, to_columns), default=_msgpack_default),
+            mimetype=MSGPACK_MIMETYPE
+        )
+    else:
+        response = current_app.response_class(
+            _arrow_stream(result, tables),
+            mimetype=ARROW_MIMETYPE
+        )
+
+    response.status_code = status
+    response.vary.add('Accept')
+    return response
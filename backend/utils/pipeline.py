@@ -0,0 +1,139 @@
+# backend/utils/pipeline.py
+"""
+Dependency graphs of calculation stages with per-stage memoization.
+
+A Pipeline is a set of Stages, each a function of its own inputs and of the
+results of the stages it depends on. Running a pipeline evaluates the
+stages needed for the requested targets in dependency order. Each stage's
+result is memoized under a key made of:
+
+    - the stage name and version
+    - the stage's own inputs
+    - a digest of each upstream result
+
+So a change to one stage's inputs recomputes that stage and the stages
+downstream of it, and only those. Keying on upstream results rather than
+upstream inputs means a downstream stage is also reused when an upstream
+stage is recomputed but produces the same result.
+
+The memo is any object with get(key, default) and put(key, value), e.g.
+the app's ResultCache.
+"""
+import hashlib
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Tuple
+
+from utils.result_cache import cache_key
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One calculation of a pipeline.
+
+    fn is called as fn(inputs, **upstream) with the stage's inputs and the
+    results of depends by name. version is part of the memo key; a callable
+    version is evaluated on every run, and a version of None disables
+    memoization of the stage.
+    """
+    name: str
+    fn: Callable
+    depends: Tuple[str, ...] = ()
+    version: Any = 1
+
+
+def result_digest(result):
+    """Digest of a stage result (its repr, which is stable for plain data)."""
+    return hashlib.sha256(repr(result).encode('utf-8')).hexdigest()
+
+
+@dataclass
+class PipelineRun:
+    """Results of a run, with how and how fast each stage was produced."""
+    results: dict = field(default_factory=dict)
+    status: dict = field(default_factory=dict)  # stage -> "computed" or "cached"
+    timings_ms: dict = field(default_factory=dict)
+
+
+class Pipeline:
+    """Stages in dependency order."""
+
+    def __init__(self, stages):
+        by_name = {stage.name: stage for stage in stages}
+        if len(by_name) != len(stages):
+            raise ValueError("Stage names must be unique")
+        self.stages = {}
+        visiting = set()
+
+        def visit(name, path):
+            if name in self.stages:
+                return
+            if name not in by_name:
+                raise ValueError(f"Stage {path[-1]!r} depends on unknown stage {name!r}")
+            if name in visiting:
+                raise ValueError(f"Stages depend on each other: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dependency in by_name[name].depends:
+                visit(dependency, path + [name])
+            self.stages[name] = by_name[name]  # after its dependencies
+
+        for stage in stages:
+            visit(stage.name, [])
+
+    def plan(self, targets=None):
+        """The stages needed for targets (default: all), in dependency order."""
+        if targets is None:
+            return list(self.stages.values())
+        needed = set()
+
+        def need(name):
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage {name!r}")
+            if name not in needed:
+                needed.add(name)
+                for dependency in self.stages[name].depends:
+                    need(dependency)
+
+        for target in targets:
+            need(target)
+        return [stage for name, stage in self.stages.items() if name in needed]
+
+    def run(self, inputs, targets=None, memo=None):
+        """
+        Evaluate the stages needed for targets.
+
+        Args:
+            inputs: Stage name -> that stage's inputs (repr-stable plain data)
+            targets: Stages wanted (default: all)
+            memo: Store of earlier stage results, or None
+
+        Returns:
+            PipelineRun
+        """
+        run = PipelineRun()
+        digests = {}
+        for stage in self.plan(targets):
+            start = time.perf_counter()
+            version = stage.version() if callable(stage.version) else stage.version
+            stage_inputs = inputs.get(stage.name)
+            key = None
+            if memo is not None and version is not None:
+                key = cache_key(
+                    f"pipeline.{stage.name}", version,
+                    (stage_inputs, tuple(digests[name] for name in stage.depends))
+                )
+            result = memo.get(key, _MISSING) if key is not None else _MISSING
+            if result is _MISSING:
+                result = stage.fn(stage_inputs, **{name: run.results[name] for name in stage.depends})
+                if key is not None:
+                    memo.put(key, result)
+                run.status[stage.name] = "computed"
+            else:
+                run.status[stage.name] = "cached"
+            run.results[stage.name] = result
+            digests[stage.name] = result_digest(result)
+            run.timings_ms[stage.name] = (time.perf_counter() - start) * 1000
+        return run
@@ -0,0 +1,323 @@
+# backend/utils/reference_data.py
+"""
+Immutable, columnar copies of the reference datasets.
+
+The aircraft, GSE and growth datasets only change when they are re-ingested,
+so they can be loaded once into read-only NumPy arrays. Under a pre-fork
+server the master process loads them before forking and every worker shares
+the same memory pages copy-on-write; since the arrays are never written, the
+pages stay shared.
+
+With SHARED_STORE_NAME set, the arrays are instead read zero-copy from a
+shared-memory store (utils.shared_store) that `flask publish-data` fills, and
+workers follow new versions as they are published without reloading.
+"""
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from flask import current_app, has_app_context
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from constants.hydrogen_properties import GR_DATA
+from models.aircraft import Aircraft
+from models.gse import GroundSupportEquipment
+from utils.shared_store import SharedArrayStore, StoreReader, StoreNotPublished
+
+logger = logging.getLogger(__name__)
+
+# Currently active dataset (None: services query the databases directly)
+_reference_data = None
+# Shared-memory source that takes precedence once something is published
+_shared_source = None
+# Last fingerprint of the databases: (aircraft engine, GSE engine, checked at, version)
+_database_version = (None, None, 0.0, None)
+
+
+@dataclass(frozen=True)
+class AircraftArrays:
+    """July domestic ("DU") aircraft records used by the demand model."""
+    fuel_consumption: object  # lbs/hr
+    air_time: object          # minutes
+    distance: object          # miles
+    dest_codes: object        # index into dest_names
+    dest_names: tuple
+
+
+@dataclass(frozen=True)
+class GSEArrays:
+    """Ground support equipment catalog."""
+    names: object
+    fuel_used: object
+    usable_fuel_consumption_ft3_min: object
+    operating_time_departure: object
+    operating_time_arrival: object
+
+
+@dataclass(frozen=True)
+class GrowthArrays:
+    """TAF projected operations."""
+    years: object
+    operations: object
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    version: str
+    aircraft: AircraftArrays
+    gse: GSEArrays
+    growth: GrowthArrays
+
+    def arrays(self):
+        """Yield (qualified name, array) for every array in the dataset."""
+        for group in ('aircraft', 'gse', 'growth'):
+            for name, value in vars(getattr(self, group)).items():
+                if isinstance(value, np.ndarray):
+                    yield f"{group}.{name}", value
+
+    def nbytes(self):
+        """Total size of the array buffers in bytes."""
+        return sum(array.nbytes for _, array in self.arrays())
+
+
+def reference_data_from_arrays(arrays, version, dest_names):
+    """Rebuild a ReferenceData around existing arrays (no copies)."""
+    def group(prefix):
+        return {
+            name.split('.', 1)[1]: array
+            for name, array in arrays.items() if name.startswith(prefix + '.')
+        }
+    return ReferenceData(
+        version,
+        AircraftArrays(dest_names=tuple(dest_names), **group('aircraft')),
+        GSEArrays(**group('gse')),
+        GrowthArrays(**group('growth')),
+    )
+
+
+def _frozen(values, dtype):
+    array = np.asarray(values, dtype=dtype)
+    array.setflags(write=False)
+    return array
+
+
+def _strings(values):
+    array = np.asarray([value or '' for value in values], dtype=str)
+    array.setflags(write=False)
+    return array
+
+
+def build_reference_data(aircraft_rows, gse_rows, growth=GR_DATA):
+    """
+    Build a ReferenceData from row tuples.
+
+    Args:
+        aircraft_rows: (fuel_consumption, air_time, distance, dest) tuples
+        gse_rows: (name, fuel_used, usable_fuel_consumption_ft3_min,
+            operating_time_departure, operating_time_arrival) tuples
+        growth: Dict with "Year" and "Projected Operations" lists
+    """
+    aircraft_columns = list(zip(*aircraft_rows)) or [()] * 4
+    gse_columns = list(zip(*gse_rows)) or [()] * 5
+
+    dest_names, dest_codes = np.unique(_strings(aircraft_columns[3]), return_inverse=True)
+    aircraft = AircraftArrays(
+        fuel_consumption=_frozen(aircraft_columns[0], np.float64),
+        air_time=_frozen(aircraft_columns[1], np.float64),
+        distance=_frozen(aircraft_columns[2], np.float64),
+        dest_codes=_frozen(dest_codes, np.int32),
+        dest_names=tuple(dest_names.tolist()),
+    )
+    gse = GSEArrays(
+        names=_strings(gse_columns[0]),
+        fuel_used=_strings(gse_columns[1]),
+        usable_fuel_consumption_ft3_min=_frozen(gse_columns[2], np.float64),
+        operating_time_departure=_frozen(gse_columns[3], np.float64),
+        operating_time_arrival=_frozen(gse_columns[4], np.float64),
+    )
+    growth = GrowthArrays(
+        years=_frozen(growth["Year"], np.int32),
+        operations=_frozen(growth["Projected Operations"], np.float64),
+    )
+
+    digest = hashlib.sha1()
+    for group in (aircraft, gse, growth):
+        for value in vars(group).values():
+            digest.update(value.tobytes() if isinstance(value, np.ndarray) else repr(value).encode())
+    return ReferenceData(digest.hexdigest()[:12], aircraft, gse, growth)
+
+
+def load_reference_data(aircraft_session, gse_session):
+    """Load the reference datasets from the databases."""
+    aircraft_rows = aircraft_session.execute(
+        select(Aircraft.fuel_consumption, Aircraft.air_time, Aircraft.distance, Aircraft.dest)
+        .where(Aircraft.month == 7, Aircraft.data_source == "DU")
+        .order_by(Aircraft.id)
+    ).all()
+    gse_rows = gse_session.execute(
+        select(
+            GroundSupportEquipment.ground_support_equipment,
+            GroundSupportEquipment.fuel_used,
+            GroundSupportEquipment.usable_fuel_consumption_ft3_min,
+            GroundSupportEquipment.operating_time_departure,
+            GroundSupportEquipment.operating_time_arrival,
+        ).order_by(GroundSupportEquipment.id)
+    ).all()
+    return build_reference_data(aircraft_rows, gse_rows)
+
+
+class SharedReferenceSource:
+    """ReferenceData backed by the current version of a shared-memory store."""
+
+    def __init__(self, store):
+        self.reader = StoreReader(store)
+        self._cached = (None, None)
+
+    def current(self):
+        """Return the ReferenceData of the current version, or None if nothing is published."""
+        try:
+            snapshot = self.reader.current()
+        except StoreNotPublished:
+            return None
+        version, reference_data = self._cached
+        if version != snapshot.version:
+            reference_data = reference_data_from_arrays(
+                snapshot.arrays,
+                snapshot.metadata["version"],
+                snapshot.metadata["dest_names"]
+            )
+            self._cached = (snapshot.version, reference_data)
+        return reference_data
+
+    @property
+    def version(self):
+        """Store version of the dataset last returned (None before the first)."""
+        return self._cached[0]
+
+    def close(self):
+        """Drop the cached views, then release the attached version."""
+        self._cached = (None, None)
+        self.reader.close()
+
+
+def publish_reference_data(store, reference_data):
+    """Publish a ReferenceData to a shared-memory store as its new version."""
+    return store.publish(dict(reference_data.arrays()), {
+        "version": reference_data.version,
+        "dest_names": list(reference_data.aircraft.dest_names),
+    })
+
+
+def use_shared_store(name):
+    """Read reference data from the named shared-memory store (None disables)."""
+    global _shared_source
+    if _shared_source is not None:
+        _shared_source.close()
+    _shared_source = SharedReferenceSource(SharedArrayStore(name)) if name else None
+
+
+def get_reference_data():
+    """Return the active ReferenceData, or None if none is loaded."""
+    if _shared_source is not None:
+        reference_data = _shared_source.current()
+        if reference_data is not None:
+            return reference_data
+    return _reference_data
+
+
+def database_version(aircraft_session, gse_session):
+    """
+    Fingerprint of the reference tables: their row counts and largest ids.
+
+    Re-ingesting a dataset changes it; rows edited in place do not.
+    """
+    state = [
+        session.execute(select(func.count(), func.max(model.id))).one()
+        for session, model in ((aircraft_session, Aircraft), (gse_session, GroundSupportEquipment))
+    ]
+    return "db-" + hashlib.sha1(repr([tuple(row) for row in state]).encode()).hexdigest()[:12]
+
+
+def data_version():
+    """
+    Version of the data demand results are computed from, for cache keys.
+
+    The active ReferenceData's version, or without one a fingerprint of the
+    databases (see database_version), re-read at most every
+    DATABASE_VERSION_TTL seconds. None if the databases cannot be read.
+    """
+    global _database_version
+    reference_data = get_reference_data()
+    if reference_data is not None:
+        return reference_data.version
+
+    from utils import database
+
+    ttl = current_app.config.get('DATABASE_VERSION_TTL', 0.0) if has_app_context() else 0.0
+    engines = (database.aircraft_engine, database.gse_engine)
+    aircraft_engine, gse_engine, checked_at, version = _database_version
+    if (aircraft_engine, gse_engine) == engines and time.monotonic() - checked_at < ttl:
+        return version
+
+    aircraft_sessions = database.get_aircraft_db_session()
+    gse_sessions = database.get_gse_db_session()
+    try:
+        version = database_version(next(aircraft_sessions), next(gse_sessions))
+    except SQLAlchemyError as e:
+        logger.warning("Could not fingerprint the databases: %s", e)
+        return None
+    finally:
+        aircraft_sessions.close()
+        gse_sessions.close()
+    _database_version = (*engines, time.monotonic(), version)
+    return version
+
+
+def shared_store_version():
+    """Return the shared-memory store version this process reads, or None."""
+    return _shared_source.version if _shared_source is not None else None
+
+
+def set_reference_data(reference_data):
+    """Activate a ReferenceData (None reverts to querying the databases)."""
+    global _reference_data
+    _reference_data = reference_data
+
+
+def read_reference_data():
+    """Load the reference datasets through the app's database sessions."""
+    from utils.database import get_aircraft_db_session, get_gse_db_session
+
+    aircraft_sessions = get_aircraft_db_session()
+    gse_sessions = get_gse_db_session()
+    try:
+        return load_reference_data(next(aircraft_sessions), next(gse_sessions))
+    finally:
+        aircraft_sessions.close()
+        gse_sessions.close()
+
+
+def preload_reference_data():
+    """Load the reference datasets from the databases and activate them."""
+    reference_data = read_reference_data()
+    set_reference_data(reference_data)
+    logger.info("Preloaded reference data %s (%d aircraft records, %d GSE types, %d bytes)",
+                reference_data.version, len(reference_data.aircraft.fuel_consumption),
+                len(reference_data.gse.names), reference_data.nbytes())
+    return reference_data
+
+
+def register_reference_data_commands(app):
+    """Register reference data CLI commands."""
+    @app.cli.command('publish-data')
+    def publish_data_command():
+        """Load the reference datasets and publish them to the shared-memory store."""
+        name = app.config.get('SHARED_STORE_NAME')
+        if not name:
+            raise RuntimeError("SHARED_STORE_NAME is not configured")
+        reference_data = read_reference_data()
+        version = publish_reference_data(SharedArrayStore(name), reference_data)
+        print(f"Published reference data {reference_data.version} as {name} version {version}")
@@ -0,0 +1,320 @@
+# backend/utils/result_cache.py
+"""
+Two-tier cache for calculation results.
+
+    MemoryCache  per-process LRU of the most recently used results
+    DiskCache    SQLite file shared by every worker on the host, which
+                 survives restarts and deploys
+
+Keys combine a namespace, the dataset version the result was computed from
+and a hash of the inputs, so re-ingesting the reference data (a new version)
+never serves stale results; old entries simply age out. The disk tier is
+bounded in bytes and evicts least recently used entries; see utils.sqlite
+for how the file is shared between processes. Access times of disk hits are
+buffered and written in batches, so a hit is a single read.
+"""
+import hashlib
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+from utils.sqlite import LocalConnections
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def cache_key(namespace, version, inputs):
+    """
+    Build a cache key.
+
+    Args:
+        namespace: Kind of result (e.g. "demand.total")
+        version: Dataset or model version the result depends on
+        inputs: Hashable, repr-stable description of the inputs
+    """
+    digest = hashlib.sha256(repr(inputs).encode('utf-8')).hexdigest()
+    return f"{namespace}:{version}:{digest}"
+
+
+class MemoryCache:
+    """Thread-safe LRU cache bounded by entry count."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache:
+    """
+    SQLite-backed cache bounded by total value size.
+
+    Values are pickled. Errors from the database (a locked or corrupt file,
+    a full disk) are logged and treated as misses so a broken cache never
+    fails a request.
+
+    Hits do not write: their access times are kept in memory and written in
+    one transaction once TOUCH_BATCH are pending or TOUCH_INTERVAL seconds
+    have passed, and by every put before it evicts. Eviction order is
+    therefore only as fresh as the last batch of this and other processes.
+    """
+
+    TOUCH_BATCH = 64
+    TOUCH_INTERVAL = 30.0
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            accessed REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+    """
+
+    def __init__(self, path, max_bytes=256 * 2**20, busy_timeout=5.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._connections = LocalConnections(path, self.SCHEMA, busy_timeout)
+        self._touched = {}  # key -> access time not yet written
+        self._touched_since = time.monotonic()
+        self._touch_lock = threading.Lock()
+
+    def _connection(self):
+        return self._connections.get()
+
+    def get(self, key, default=None):
+        try:
+            conn = self._connection()
+            row = conn.execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Result cache read failed: %s", e)
+            return default
+        if row is None:
+            return default
+        try:
+            value = pickle.loads(row[0])
+        except Exception as e:
+            # Truncated, or written by code that has since changed
+            logger.warning("Dropping result cache entry %s that no longer loads: %s", key, e)
+            self.delete(key)
+            return default
+        self._touch(key)
+        return value
+
+    def delete(self, key):
+        try:
+            self._connection().execute('DELETE FROM entries WHERE key = ?', (key,))
+        except sqlite3.Error as e:
+            logger.warning("Result cache delete failed: %s", e)
+
+    def _touch(self, key):
+        """Record a hit, writing the pending access times once a batch is due."""
+        with self._touch_lock:
+            self._touched[key] = time.time()
+            due = (len(self._touched) >= self.TOUCH_BATCH
+                   or time.monotonic() - self._touched_since >= self.TOUCH_INTERVAL)
+        if due:
+            self.flush_access_times()
+
+    def _take_touched(self):
+        with self._touch_lock:
+            touched, self._touched = self._touched, {}
+            self._touched_since = time.monotonic()
+        return [(accessed, key) for key, accessed in touched.items()]
+
+    def _write_touched(self, conn, touched):
+        # Never move an entry back in time (it may have been rewritten since)
+        conn.executemany('UPDATE entries SET accessed = MAX(accessed, ?) WHERE key = ?', touched)
+
+    def flush_access_times(self):
+        """Write the buffered access times of hits."""
+        touched = self._take_touched()
+        if not touched:
+            return
+        try:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._write_touched(conn, touched)
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            logger.warning("Result cache access time update failed: %s", e)
+
+    def put(self, key, value):
+        """Store value; return False if it is larger than max_bytes or could not be written."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            logger.warning("Result of %d bytes is too large for the result cache", len(blob))
+            return False
+        try:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)',
+                    (key, blob, len(blob), time.time())
+                )
+                self._write_touched(conn, self._take_touched())
+                self._evict(conn)
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            logger.warning("Result cache write failed: %s", e)
+            return False
+        return True
+
+    def _evict(self, conn):
+        """Delete least recently used entries until the cache fits its budget."""
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Evict down to 90% so a full cache does not evict on every write
+        excess = total - int(self.max_bytes * 0.9)
+        freed = 0
+        victims = []
+        for key, size in conn.execute('SELECT key, size FROM entries ORDER BY accessed'):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany('DELETE FROM entries WHERE key = ?', victims)
+        logger.debug("Evicted %d result cache entries (%d bytes)", len(victims), freed)
+
+    def stats(self):
+        """Return entry count and total size in bytes."""
+        try:
+            count, size = self._connection().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries'
+            ).fetchone()
+        except sqlite3.Error:
+            count, size = 0, 0
+        return {"entries": count, "bytes": size, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        self._take_touched()
+        try:
+            self._connection().execute('DELETE FROM entries')
+        except sqlite3.Error as e:
+            logger.warning("Result cache clear failed: %s", e)
+
+
+class ResultCache:
+    """A MemoryCache in front of an optional DiskCache."""
+
+    def __init__(self, memory, disk=None):
+        self.memory = memory
+        self.disk = disk
+        self._counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._counts_lock = threading.Lock()
+
+    def _count(self, name):
+        with self._counts_lock:
+            self._counts[name] += 1
+
+    def get_or_compute(self, namespace, version, inputs, fn, *args, **kwargs):
+        """
+        Return the cached result for inputs, computing and storing it on a miss.
+
+        A version of None means the result cannot be keyed reliably, so fn is
+        always called and nothing is cached.
+        """
+        if version is None:
+            return fn(*args, **kwargs)
+
+        key = cache_key(namespace, version, inputs)
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        self._count("misses")
+        value = fn(*args, **kwargs)
+        self.put(key, value)
+        return value
+
+    def get(self, key, default=None):
+        """Look key up in memory, then on disk (promoting disk hits to memory)."""
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count("memory_hits")
+            return value
+        if self.disk is not None:
+            value = self.disk.get(key, _MISSING)
+            if value is not _MISSING:
+                self._count("disk_hits")
+                self.memory.put(key, value)
+                return value
+        return default
+
+    def put(self, key, value):
+        """Store value in both tiers; return False if the disk tier did not take it."""
+        self.memory.put(key, value)
+        if self.disk is not None:
+            return self.disk.put(key, value)
+        return True
+
+    def stats(self):
+        with self._counts_lock:
+            stats = dict(self._counts, memory_entries=len(self.memory))
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+
+def init_result_cache(app):
+    """Create the app's ResultCache from its configuration."""
+    disk = None
+    if app.config.get('RESULT_CACHE_PATH'):
+        disk = DiskCache(app.config['RESULT_CACHE_PATH'], app.config['RESULT_CACHE_MAX_BYTES'])
+    cache = ResultCache(MemoryCache(app.config['RESULT_CACHE_MEMORY_ENTRIES']), disk)
+    app.extensions['result_cache'] = cache
+    return cache
+
+
+def cached(namespace, version, inputs, fn, *args, **kwargs):
+    """get_or_compute() on the current app's cache (pass-through when disabled)."""
+    if not current_app.config.get('RESULT_CACHE_ENABLED', True):
+        return fn(*args, **kwargs)
+    cache = current_app.extensions.get('result_cache')
+    if cache is None:
+        return fn(*args, **kwargs)
+    return cache.get_or_compute(namespace, version, inputs, fn, *args, **kwargs)
@@ -0,0 +1,88 @@
+# backend/utils/rtree.py
+"""
+Static R-tree over axis-aligned boxes, bulk-loaded with Sort-Tile-Recursive.
+
+STR sorts the boxes into vertical slices by x center and each slice by y
+center, then fills nodes of NODE_CAPACITY consecutive entries; the nodes are
+grouped the same way, level by level, up to a single root. Because every
+node's children are consecutive, each level is just arrays of node boxes
+and child ranges, and a query walks the tree one level at a time with
+vectorized box tests over the whole frontier.
+
+Boxes are (n, 4) arrays of [min_x, min_y, max_x, max_y].
+"""
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+NODE_CAPACITY = 16
+
+
+@dataclass(frozen=True)
+class RTree:
+    """Levels from the root down: (boxes, child starts, child stops) arrays."""
+    levels: tuple
+    order: object  # item index of each leaf entry
+    boxes: object  # item boxes
+
+
+def str_order(boxes, capacity=NODE_CAPACITY):
+    """Sort-Tile-Recursive order of boxes."""
+    n = len(boxes)
+    slices = math.ceil(math.sqrt(math.ceil(n / capacity)))
+    by_x = np.argsort((boxes[:, 0] + boxes[:, 2]), kind='stable')
+    slice_of = np.arange(n) // (slices * capacity)
+    return by_x[np.lexsort(((boxes[by_x, 1] + boxes[by_x, 3]), slice_of))]
+
+
+def _group(boxes, capacity):
+    starts = np.arange(0, len(boxes), capacity)
+    stops = np.minimum(starts + capacity, len(boxes))
+    grouped = np.column_stack((
+        np.minimum.reduceat(boxes[:, 0], starts),
+        np.minimum.reduceat(boxes[:, 1], starts),
+        np.maximum.reduceat(boxes[:, 2], starts),
+        np.maximum.reduceat(boxes[:, 3], starts),
+    ))
+    return grouped, starts, stops
+
+
+def build_rtree(boxes, capacity=NODE_CAPACITY):
+    """Bulk-load an RTree over (n, 4) boxes."""
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    if not len(boxes):
+        return RTree(levels=(), order=np.empty(0, dtype=np.int64), boxes=boxes)
+    order = str_order(boxes, capacity)
+    levels = []
+    entries = boxes[order]
+    while True:
+        nodes, starts, stops = _group(entries, capacity)
+        if len(nodes) > 1:
+            # Tile the nodes too, keeping each node's children consecutive
+            tiled = str_order(nodes, capacity)
+            nodes, starts, stops = nodes[tiled], starts[tiled], stops[tiled]
+        levels.append((nodes, starts, stops))
+        if len(nodes) == 1:
+            break
+        entries = nodes
+    return RTree(levels=tuple(reversed(levels)), order=order, boxes=boxes)
+
+
+def _overlaps(boxes, box):
+    return ((boxes[:, 0] <= box[2]) & (boxes[:, 2] >= box[0])
+            & (boxes[:, 1] <= box[3]) & (boxes[:, 3] >= box[1]))
+
+
+def query(tree, box):
+    """Sorted indices of the items whose boxes intersect box (edges touching count)."""
+    if not tree.levels:
+        return np.empty(0, dtype=np.int64)
+    nodes = np.zeros(1, dtype=np.int64)
+    for boxes, starts, stops in tree.levels:
+        nodes = nodes[_overlaps(boxes[nodes], box)]
+        counts = stops[nodes] - starts[nodes]
+        nodes = (np.repeat(starts[nodes], counts)
+                 + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+    items = tree.order[nodes]
+    return np.sort(items[_overlaps(tree.boxes[items], box)])
@@ -0,0 +1,368 @@
+# backend/utils/shared_store.py
+"""
+Cross-process shared-memory store for read-only NumPy arrays.
+
+An ingest step publishes a set of named arrays as one versioned POSIX
+shared-memory segment. Worker processes attach to the current version
+zero-copy (the arrays are views into the segment) and swap to a newer one as
+soon as it is published. Versions that are no longer current are unlinked
+once no live process is attached to them.
+
+Segments for a store named "h2" (the names live in /dev/shm on Linux):
+    h2_ctl     control block: current version and reader registrations
+    h2_v<N>    data segment for version N: header, JSON manifest, array data
+
+All changes to the control block happen under an exclusive flock on a lock
+file in the system temp directory, so publishers and readers in
+different processes never race. Reading the current version number is a
+single aligned 8-byte load and needs no lock.
+"""
+import fcntl
+import json
+import logging
+import math
+import os
+import struct
+import tempfile
+import threading
+from multiprocessing import shared_memory
+
+import _posixshmem
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CONTROL_MAGIC = b'H2CTL001'
+SEGMENT_MAGIC = b'H2SEG001'
+MAX_READERS = 1024   # simultaneous (process, version) registrations
+MAX_VERSIONS = 64    # versions that may exist at once
+ALIGNMENT = 64
+
+# Control block: magic, current version, next version, reserved, then the
+# reader table (pid, version) and the version table (version, in use).
+_CONTROL_HEADER = 32
+_CONTROL_SIZE = _CONTROL_HEADER + 16 * MAX_READERS + 16 * MAX_VERSIONS
+# Data segment header: magic, version, manifest length, data offset
+_SEGMENT_HEADER = struct.Struct('<8sQQQ')
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _untrack(shm):
+    """Keep the resource tracker from unlinking segments when this process exits."""
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    except Exception:  # pragma: no cover - tracker internals vary by version
+        pass
+
+
+def _open_segment(name, create=False, size=0):
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+    _untrack(shm)
+    return shm
+
+
+def _unlink_segment(name):
+    """Remove a segment name; mappings that still exist stay valid until unmapped."""
+    try:
+        _posixshmem.shm_unlink('/' + name)
+    except FileNotFoundError:
+        pass
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class StoreNotPublished(LookupError):
+    """Raised when attaching to a store that has no published version."""
+
+
+class Snapshot:
+    """One attached version: read-only array views plus manifest metadata."""
+
+    def __init__(self, version, shm, arrays, metadata):
+        self.version = version
+        self.arrays = arrays
+        self.metadata = metadata
+        self._shm = shm
+
+    def close(self):
+        """
+        Unmap the segment.
+
+        Returns:
+            bool: False if array views are still referenced (try again later)
+        """
+        try:
+            self._shm.close()
+        except BufferError:
+            return False
+        return True
+
+
+class SharedArrayStore:
+    """Publisher and attachment point for one named store."""
+
+    def __init__(self, name):
+        self.name = name
+        self._lock_path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self._control = None
+        self._tables = None
+        self._thread_lock = threading.Lock()
+
+    # -- control block -------------------------------------------------
+
+    def _segment_name(self, version):
+        return f"{self.name}_v{version}"
+
+    def _open_control(self):
+        """Open (or create) the control block. Must hold the file lock."""
+        if self._control is not None:
+            return
+        try:
+            control = _open_segment(f"{self.name}_ctl")
+        except FileNotFoundError:
+            control = _open_segment(f"{self.name}_ctl", create=True, size=_CONTROL_SIZE)
+            control.buf[:_CONTROL_SIZE] = bytes(_CONTROL_SIZE)
+            control.buf[:8] = CONTROL_MAGIC
+        if bytes(control.buf[:8]) != CONTROL_MAGIC:
+            raise ValueError(f"Shared memory segment {self.name}_ctl is not a store control block")
+        self._control = control
+        header = np.ndarray((4,), dtype=np.int64, buffer=control.buf)
+        readers = np.ndarray((MAX_READERS, 2), dtype=np.int64, buffer=control.buf,
+                             offset=_CONTROL_HEADER)
+        versions = np.ndarray((MAX_VERSIONS, 2), dtype=np.int64, buffer=control.buf,
+                              offset=_CONTROL_HEADER + 16 * MAX_READERS)
+        self._tables = (header, readers, versions)
+
+    class _Locked:
+        def __init__(self, store):
+            self.store = store
+
+        def __enter__(self):
+            self.store._thread_lock.acquire()
+            self.fd = os.open(self.store._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            self.store._open_control()
+            return self.store._tables
+
+        def __exit__(self, *exc):
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.store._thread_lock.release()
+
+    def _locked(self):
+        return self._Locked(self)
+
+    def current_version(self):
+        """Return the current version number (0 if nothing is published)."""
+        if self._control is None:
+            with self._locked():
+                pass
+        return int(self._tables[0][1])
+
+    # -- publishing ----------------------------------------------------
+
+    def publish(self, arrays, metadata=None):
+        """
+        Publish arrays as the new current version.
+
+        Args:
+            arrays: Mapping of name -> NumPy array
+            metadata: JSON-serializable dict stored with the version
+
+        Returns:
+            int: The new version number
+        """
+        arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+        entries = []
+        offset = 0
+        for name, array in arrays.items():
+            entries.append({
+                "name": name,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offset,
+            })
+            offset = _align(offset + array.nbytes)
+        manifest = json.dumps({"arrays": entries, "metadata": metadata or {}}).encode('utf-8')
+        data_offset = _align(_SEGMENT_HEADER.size + len(manifest))
+
+        with self._locked() as (header, readers, versions):
+            free = np.flatnonzero(versions[:, 1] == 0)
+            if len(free) == 0:
+                self._reclaim(header, readers, versions)
+                free = np.flatnonzero(versions[:, 1] == 0)
+                if len(free) == 0:
+                    raise RuntimeError(f"Too many live versions in store {self.name}")
+
+            version = int(max(header[2], header[1])) + 1
+            shm = _open_segment(self._segment_name(version), create=True,
+                                size=max(data_offset + offset, 1))
+            _SEGMENT_HEADER.pack_into(shm.buf, 0, SEGMENT_MAGIC, version, len(manifest), data_offset)
+            shm.buf[_SEGMENT_HEADER.size:_SEGMENT_HEADER.size + len(manifest)] = manifest
+            for entry, array in zip(entries, arrays.values()):
+                start = data_offset + entry["offset"]
+                shm.buf[start:start + array.nbytes] = array.reshape(-1).view(np.uint8)
+            shm.close()
+
+            versions[free[0]] = (version, 1)
+            header[2] = version
+            header[1] = version  # readers switch from here on
+            self._reclaim(header, readers, versions)
+
+        logger.info("Published %s version %d (%d arrays, %d bytes)",
+                    self.name, version, len(entries), data_offset + offset)
+        return version
+
+    # -- attaching -----------------------------------------------------
+
+    def attach(self):
+        """
+        Attach to the current version and register this process as its reader.
+
+        Returns:
+            Snapshot: Read-only views of the published arrays
+        """
+        pid = os.getpid()
+        with self._locked() as (header, readers, versions):
+            version = int(header[1])
+            if version == 0:
+                raise StoreNotPublished(f"Nothing published in store {self.name}")
+            free = np.flatnonzero(readers[:, 0] == 0)
+            if len(free) == 0:
+                self._reclaim(header, readers, versions)
+                free = np.flatnonzero(readers[:, 0] == 0)
+                if len(free) == 0:
+                    raise RuntimeError(f"Too many readers attached to store {self.name}")
+            readers[free[0]] = (pid, version)
+            shm = _open_segment(self._segment_name(version))
+
+        _, _, manifest_len, data_offset = _SEGMENT_HEADER.unpack_from(shm.buf, 0)
+        manifest = json.loads(bytes(shm.buf[_SEGMENT_HEADER.size:_SEGMENT_HEADER.size + manifest_len]))
+        arrays = {}
+        for entry in manifest["arrays"]:
+            # frombuffer keeps an export on the mapping for as long as the view
+            # lives, so the segment cannot be unmapped underneath it
+            shape = tuple(entry["shape"])
+            array = np.frombuffer(shm.buf, dtype=np.dtype(entry["dtype"]),
+                                  count=math.prod(shape),
+                                  offset=data_offset + entry["offset"]).reshape(shape)
+            array.setflags(write=False)
+            arrays[entry["name"]] = array
+        return Snapshot(version, shm, arrays, manifest["metadata"])
+
+    def release(self, snapshot, pid=None):
+        """Unregister a reader of snapshot's version and reclaim unused versions."""
+        pid = os.getpid() if pid is None else pid
+        with self._locked() as (header, readers, versions):
+            matches = np.flatnonzero((readers[:, 0] == pid) & (readers[:, 1] == snapshot.version))
+            if len(matches):
+                readers[matches[0]] = (0, 0)
+            self._reclaim(header, readers, versions)
+
+    # -- reclamation ---------------------------------------------------
+
+    def _reclaim(self, header, readers, versions):
+        """Unlink versions that are not current and have no live reader. Must hold the lock."""
+        for slot in np.flatnonzero(readers[:, 0] != 0):
+            if not _pid_alive(int(readers[slot, 0])):
+                readers[slot] = (0, 0)
+
+        current = int(header[1])
+        for slot in np.flatnonzero(versions[:, 1] != 0):
+            version = int(versions[slot, 0])
+            if version == current or np.any(readers[:, 1] == version):
+                continue
+            _unlink_segment(self._segment_name(version))
+            versions[slot] = (0, 0)
+            logger.debug("Reclaimed %s version %d", self.name, version)
+
+    def reclaim(self):
+        """Unlink versions no live process references."""
+        with self._locked() as tables:
+            self._reclaim(*tables)
+
+    def live_versions(self):
+        """Return the version numbers whose segments still exist."""
+        with self._locked() as (_, _, versions):
+            return sorted(int(v) for v in versions[versions[:, 1] != 0, 0])
+
+    def destroy(self):
+        """Unlink every segment of the store (for tests and teardown)."""
+        with self._locked() as (_, _, versions):
+            for version in versions[versions[:, 1] != 0, 0]:
+                _unlink_segment(self._segment_name(int(version)))
+            self._tables = None
+            self._control.close()
+            _unlink_segment(f"{self.name}_ctl")
+            self._control = None
+
+
+class StoreReader:
+    """
+    Per-process view of a store that follows the current version.
+
+    current() is cheap when nothing changed (one integer compare); after a
+    publish it attaches to the new version, swaps it in with a single
+    assignment and releases the old one.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._snapshot = None
+        self._pid = None
+        self._retired = []
+        self._lock = threading.Lock()
+
+    def current(self):
+        """
+        Return the Snapshot of the current version.
+
+        Raises:
+            StoreNotPublished: If nothing has been published yet
+        """
+        snapshot = self._snapshot
+        if (snapshot is not None and self._pid == os.getpid()
+                and snapshot.version == self.store.current_version()):
+            return snapshot
+
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked since attaching: the parent's registration is not ours,
+                # so keep its mapping (to unmap later) without releasing it
+                if self._snapshot is not None:
+                    self._retired.append(self._snapshot)
+                self._snapshot, self._pid = None, os.getpid()
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != self.store.current_version():
+                fresh = self.store.attach()
+                self._snapshot = fresh
+                if snapshot is not None:
+                    self.store.release(snapshot)
+                    self._retired.append(snapshot)
+                    logger.info("Swapped %s from version %d to %d",
+                                self.store.name, snapshot.version, fresh.version)
+            # Unmap retired versions once no request holds their arrays
+            self._retired = [old for old in self._retired if not old.close()]
+            return self._snapshot
+
+    def close(self):
+        """Release the current snapshot."""
+        with self._lock:
+            snapshot, self._snapshot = self._snapshot, None
+            if snapshot is not None:
+                if self._pid == os.getpid():
+                    self.store.release(snapshot)
+                self._retired.append(snapshot)
+            self._retired = [old for old in self._retired if not old.close()]
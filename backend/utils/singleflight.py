@@ -0,0 +1,104 @@
+# backend/utils/singleflight.py
+"""
+Single-flight coalescing of identical concurrent calls.
+
+When several threads ask for the same computation at the same time, only the
+first one (the leader) executes it. The others wait for the leader and receive
+the same result, or the same exception if the computation failed.
+"""
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlightTimeout(TimeoutError):
+    """Raised when a waiter gives up on an in-flight call."""
+
+
+class _Call:
+    """State of one in-flight computation shared by its leader and waiters."""
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Group of in-flight calls keyed by a hashable key.
+
+    Results are shared between all callers of the same flight, so they must be
+    treated as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def do(self, key, fn, *args, timeout=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) once for all concurrent callers using key.
+
+        Args:
+            key: Hashable identity of the computation
+            fn: Callable to execute if no identical call is in flight
+            timeout: Seconds a waiter blocks before raising SingleFlightTimeout
+                (None waits indefinitely). The leader is never interrupted.
+
+        Returns:
+            The result of the shared execution
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if leader:
+            try:
+                call.result = fn(*args, **kwargs)
+                return call.result
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+
+        if not call.done.wait(timeout):
+            with self._lock:
+                self.timeouts += 1
+            logger.warning("Timed out after %ss waiting for in-flight call %r", timeout, key)
+            raise SingleFlightTimeout(f"Timed out waiting for in-flight call {key!r}")
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self):
+        """Return the number of distinct computations currently running."""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self):
+        """Return execution counters for monitoring and benchmarks."""
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "timeouts": self.timeouts,
+                "in_flight": len(self._calls)
+            }
@@ -0,0 +1,43 @@
+# backend/utils/sqlite.py
+"""
+SQLite files shared by every worker process on a host.
+
+Connections are opened per process and thread (a connection must not cross
+a fork) in autocommit mode with WAL journaling, so readers never block the
+writer and several processes can use the same file.
+"""
+import os
+import sqlite3
+import threading
+
+
+class LocalConnections:
+    """Hands out one connection per (process, thread) for a database file."""
+
+    def __init__(self, path, schema, busy_timeout=5.0):
+        """
+        Args:
+            path: Database file (its directory is created on first use)
+            schema: SQL script run on every new connection (use IF NOT EXISTS)
+            busy_timeout: Seconds to wait for another writer's lock
+        """
+        self.path = path
+        self.schema = schema
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+
+    def get(self):
+        """Return this thread's connection (reopened after a fork)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout,
+                               isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(self.schema)
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
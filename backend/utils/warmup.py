@@ -0,0 +1,230 @@
+# backend/utils/warmup.py
+"""
+Warm-up before serving, and the readiness report behind /ready.
+
+Warm-up replays a list of scenarios (requests the dashboard commonly makes)
+through the app itself, so every layer gets warm at once: lazy imports,
+compiled validators, reference data and the result cache. Scenarios are
+dicts with "method", "path" and "json" keys; the defaults cover the
+dashboard's initial form values, every selectable year and common GSE
+bundles, and WARMUP_SCENARIOS_FILE may point to a JSON list instead. The
+bundles' names are matched to the GSE data ignoring surrounding whitespace,
+so warm-up requests carry the names exactly as stored (and as the dashboard
+sends them), e.g. "FMC Commander 15 " with its trailing space.
+
+WARMUP_MODE selects when it runs:
+    off         not at all (ready immediately)
+    sync        inside create_app; with gunicorn's preload_app this happens in
+                the master, so forked workers start warm
+    background  in a thread after create_app (development server)
+"""
+import json
+import logging
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from models.gse import GroundSupportEquipment
+from services.economic_service import MODEL_VERSION as ECONOMIC_MODEL_VERSION
+from services.storage_service import MODEL_VERSION as STORAGE_MODEL_VERSION
+from utils.database import get_gse_db_session
+from utils.reference_data import get_reference_data, shared_store_version
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MODES = ('off', 'sync', 'background')
+
+# Dashboard year selector range
+YEARS = range(2023, 2051)
+# GSE selections that the dashboard sends most often (names as displayed)
+COMMON_GSE_BUNDLES = [
+    [],
+    ["F250"],
+    ["F250", "FMC Commander 15"],
+    ["Hi-Way / TUG 660", "TLD 1410", "Wollard TLS-770 / F350"],
+]
+# Initial values of the storage and economic forms
+DEFAULT_STORAGE_INPUTS = {
+    "total_h2_volume_gal": 5000000, "number_of_tanks": 20, "tank_diameter_ft": 10,
+    "tank_length_ft": 40, "cost_per_sqft_construction": 580, "cost_per_cuft_insulation": 15
+}
+DEFAULT_ECONOMIC_INPUTS = {
+    "fleet_percentage": 0.3, "total_flights": 100000, "atlanta_fraction": 0.4,
+    "hydrogen_demand": 5000000, "turnaround_time": 30, "tax_credits": 0.1
+}
+
+
+def gse_names():
+    """Return the GSE names as stored (None if they cannot be read)."""
+    reference_data = get_reference_data()
+    if reference_data is not None:
+        return reference_data.gse.names.tolist()
+    sessions = get_gse_db_session()
+    try:
+        return list(next(sessions).scalars(select(GroundSupportEquipment.ground_support_equipment)))
+    except (RuntimeError, SQLAlchemyError) as e:
+        logger.warning("Could not read the GSE names for warm-up: %s", e)
+        return None
+    finally:
+        sessions.close()
+
+
+def resolve_gse_bundles(bundles, names):
+    """
+    Replace the names of each bundle with the stored names they match
+    (ignoring surrounding whitespace). Bundles naming equipment that is not
+    in the data are left out.
+    """
+    stored = {name.strip(): name for name in names if name}
+    resolved = []
+    for bundle in bundles:
+        missing = [name for name in bundle if name.strip() not in stored]
+        if missing:
+            logger.warning("Warm-up skips GSE bundle %s: not in the data: %s", bundle, missing)
+            continue
+        resolved.append([stored[name.strip()] for name in bundle])
+    return resolved
+
+
+def default_scenarios(names=None):
+    """
+    Return the built-in warm-up scenarios.
+
+    Args:
+        names: Stored GSE names the bundles are resolved against (None: use
+            the bundles as written)
+    """
+    bundles = COMMON_GSE_BUNDLES if names is None else resolve_gse_bundles(COMMON_GSE_BUNDLES, names)
+    scenarios = [
+        {"method": "POST", "path": "/api/hydrogen-demand/total",
+         "json": {"slider_perc": 0.5, "gse": gse, "end_year": year}}
+        for gse in bundles
+        for year in YEARS
+    ]
+    scenarios.append({"method": "POST", "path": "/api/storage/calculate", "json": DEFAULT_STORAGE_INPUTS})
+    scenarios.append({"method": "POST", "path": "/api/economic/impact", "json": DEFAULT_ECONOMIC_INPUTS})
+    return scenarios
+
+
+def load_scenarios(app):
+    """Return the configured warm-up scenarios."""
+    path = app.config.get('WARMUP_SCENARIOS_FILE')
+    if path:
+        with open(path) as f:
+            return json.load(f)
+    return default_scenarios(gse_names())
+
+
+class WarmupState:
+    """Progress of the warm-up, shared by the warm-up thread and /ready."""
+
+    def __init__(self):
+        self.status = 'pending'  # pending, running, ready
+        self.total = 0
+        self.completed = 0
+        self.failed = 0
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def start(self, total):
+        with self._lock:
+            self.status, self.total = 'running', total
+            self.completed = self.failed = 0
+            self.started_at, self.finished_at = time.time(), None
+
+    def advance(self, ok):
+        with self._lock:
+            self.completed += 1
+            if not ok:
+                self.failed += 1
+
+    def finish(self):
+        with self._lock:
+            self.status, self.finished_at = 'ready', time.time()
+
+    @property
+    def ready(self):
+        return self.status == 'ready'
+
+    def to_dict(self):
+        with self._lock:
+            end = self.finished_at or time.time()
+            return {
+                "status": self.status,
+                "completed": self.completed,
+                "total": self.total,
+                "failed": self.failed,
+                "elapsed_s": round(end - self.started_at, 3) if self.started_at else None,
+            }
+
+
+def run_warmup(app, scenarios=None):
+    """
+    Replay the warm-up scenarios through the app.
+
+    Failed scenarios are logged and counted but do not stop the warm-up: a
+    cold request later is better than a worker that never becomes ready.
+    """
+    state = app.extensions['warmup']
+    scenarios = load_scenarios(app) if scenarios is None else scenarios
+    state.start(len(scenarios))
+    client = app.test_client()
+    for scenario in scenarios:
+        try:
+            response = client.open(
+                scenario["path"],
+                method=scenario.get("method", "POST"),
+                json=scenario.get("json")
+            )
+            ok = response.status_code < 400
+            if not ok:
+                logger.warning("Warm-up %s %s returned %d",
+                               scenario.get("method", "POST"), scenario["path"], response.status_code)
+        except Exception as e:
+            logger.warning("Warm-up %s failed: %s", scenario.get("path"), e)
+            ok = False
+        state.advance(ok)
+    state.finish()
+    summary = state.to_dict()
+    logger.info("Warm-up finished: %d scenarios (%d failed) in %.2fs",
+                summary["completed"], summary["failed"], summary["elapsed_s"])
+    return state
+
+
+def init_warmup(app):
+    """Set up the warm-up state and run or schedule it according to WARMUP_MODE."""
+    mode = app.config.get('WARMUP_MODE', 'off')
+    if mode not in WARMUP_MODES:
+        raise ValueError(f"Unknown WARMUP_MODE {mode!r}; expected one of {WARMUP_MODES}")
+
+    state = WarmupState()
+    app.extensions['warmup'] = state
+    if mode == 'off':
+        state.finish()
+    elif mode == 'sync':
+        run_warmup(app)
+    else:
+        threading.Thread(target=run_warmup, args=(app,), name='warmup', daemon=True).start()
+    return state
+
+
+def readiness_report(app):
+    """Return (report, ready) for the /ready endpoint."""
+    state = app.extensions['warmup']
+    reference_data = get_reference_data()
+    cache = app.extensions.get('result_cache')
+    report = {
+        "status": state.status,
+        "warmup": state.to_dict(),
+        "datasets": {
+            "reference_data": reference_data.version if reference_data is not None else None,
+            "shared_store": shared_store_version(),
+            "storage_model": STORAGE_MODEL_VERSION,
+            "economic_model": ECONOMIC_MODEL_VERSION,
+        },
+        "cache": cache.stats() if cache is not None else None,
+    }
+    return report, state.ready
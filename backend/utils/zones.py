@@ -0,0 +1,213 @@
+# backend/utils/zones.py
+"""
+The storage zones, loaded once and indexed for spatial queries.
+
+The zones file (ZONES_PATH, data/available_zones.json by default) is read
+into a ZoneIndex. Each zone is projected to the planar frame of utils/geo.py
+when the index is built, and the index keeps the zone polygons, their areas
+and bounding boxes, and an R-tree over the boxes (utils/rtree.py). Queries
+only reach the exact geometry of the zones whose boxes pass the R-tree.
+
+The ZoneStore in app.extensions['zones'] checks the file's modification time
+(at most every ZONES_CHECK_INTERVAL seconds) and swaps in a new index when
+it changes. An index is never modified once built, so requests that already
+hold one are unaffected by a reload.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from flask import current_app
+from pydantic import ValidationError
+
+from schemas.zones import Zone
+from utils.geo import is_convex, polygon_area, project, projection_origin, zone_polygon
+from utils.rtree import build_rtree, query
+
+logger = logging.getLogger(__name__)
+
+
+def load_zones(path):
+    """Read and validate zone definitions (data/available_zones.json format)."""
+    with open(path) as f:
+        zones = json.load(f)
+    return [Zone.model_validate(zone).model_dump(exclude_none=True) for zone in zones]
+
+
+@dataclass(frozen=True)
+class ZoneIndex:
+    """Zones with their projected geometry and an R-tree over their bounding boxes."""
+    zones: tuple
+    origin: tuple
+    polygons: tuple  # (n, 2) counter-clockwise vertex arrays [ft]
+    areas: object    # [ft^2]
+    boxes: object    # [min_x, min_y, max_x, max_y] per zone [ft]
+    convex: object
+    tree: object
+    version: str
+
+    def rect(self, min_lat, min_lon, max_lat, max_lon):
+        """A latitude/longitude box in the planar frame (the projection keeps it a box)."""
+        x, y = project([min_lat, max_lat], [min_lon, max_lon], self.origin)
+        return np.array([x.min(), y.min(), x.max(), y.max()])
+
+    def containing(self, lat, lon):
+        """Indices of the zones containing a point."""
+        x, y = project(lat, lon, self.origin)
+        candidates = query(self.tree, np.array([x, y, x, y]))
+        return [int(i) for i in candidates if point_in_polygon(self.polygons[i], x, y)]
+
+    def intersecting(self, rect):
+        """Indices of the zones that intersect a planar box."""
+        candidates = query(self.tree, rect)
+        return [int(i) for i in candidates if polygon_intersects_rect(self.polygons[i], rect)]
+
+    def area_within(self, rect, indices=None):
+        """Area of each zone inside a planar box [ft^2], for the zones given (default: all intersecting)."""
+        if indices is None:
+            indices = self.intersecting(rect)
+        areas = {}
+        for i in indices:
+            clipped = clip_to_rect(self.polygons[i], rect)
+            areas[i] = abs(polygon_area(clipped)) if len(clipped) >= 3 else 0.0
+        return areas
+
+
+def build_zone_index(zones, version=''):
+    """
+    Project zone definitions and index them.
+
+    Raises:
+        ValueError: If a zone's geometry is invalid
+    """
+    origin = projection_origin(zones)
+    polygons = tuple(zone_polygon(zone, origin) for zone in zones)
+    boxes = np.array([[p[:, 0].min(), p[:, 1].min(), p[:, 0].max(), p[:, 1].max()] for p in polygons]).reshape(-1, 4)
+    return ZoneIndex(
+        zones=tuple(zones),
+        origin=origin,
+        polygons=polygons,
+        areas=np.array([polygon_area(p) for p in polygons]),
+        boxes=boxes,
+        convex=np.array([is_convex(p) for p in polygons], dtype=bool),
+        tree=build_rtree(boxes),
+        version=version,
+    )
+
+
+def point_in_polygon(polygon, x, y):
+    """Even-odd test of a point against a polygon (boundary points may go either way)."""
+    p, q = polygon, np.roll(polygon, -1, axis=0)
+    crossing = (p[:, 1] > y) != (q[:, 1] > y)
+    xs = p[crossing, 0] + (y - p[crossing, 1]) / (q[crossing, 1] - p[crossing, 1]) * (q[crossing, 0] - p[crossing, 0])
+    return bool(np.count_nonzero(x < xs) % 2)
+
+
+def polygon_intersects_rect(polygon, rect):
+    """
+    Whether a polygon and a box share any point.
+
+    They do when an edge of the polygon passes through the box (Liang-Barsky
+    clipping of all edges at once) or when the box lies wholly inside.
+    """
+    p = polygon
+    d = np.roll(polygon, -1, axis=0) - p
+    t0, t1 = np.zeros(len(p)), np.ones(len(p))
+    for delta, low, high in ((d[:, 0], rect[0] - p[:, 0], rect[2] - p[:, 0]),
+                             (d[:, 1], rect[1] - p[:, 1], rect[3] - p[:, 1])):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            a, b = low / delta, high / delta
+        moving = delta != 0
+        enter = np.where(moving, np.minimum(a, b), np.where(low <= 0, -np.inf, np.inf))
+        leave = np.where(moving, np.maximum(a, b), np.where(high >= 0, np.inf, -np.inf))
+        t0, t1 = np.maximum(t0, enter), np.minimum(t1, leave)
+    if np.any(t0 <= t1):
+        return True
+    return point_in_polygon(polygon, (rect[0] + rect[2]) / 2, (rect[1] + rect[3]) / 2)
+
+
+def clip_to_rect(polygon, rect):
+    """The part of a polygon inside a box (Sutherland-Hodgman)."""
+    points = polygon
+    for axis, bound, keep_above in ((0, rect[0], True), (0, rect[2], False), (1, rect[1], True), (1, rect[3], False)):
+        if not len(points):
+            break
+        inside = points[:, axis] >= bound if keep_above else points[:, axis] <= bound
+        nxt = np.roll(points, -1, axis=0)
+        nxt_inside = np.roll(inside, -1)
+        clipped = []
+        for point, next_point, here, there in zip(points, nxt, inside, nxt_inside):
+            if here:
+                clipped.append(point)
+            if here != there:
+                t = (bound - point[axis]) / (next_point[axis] - point[axis])
+                clipped.append(point + t * (next_point - point))
+        points = np.array(clipped).reshape(-1, 2)
+    return points
+
+
+class ZoneStore:
+    """The current ZoneIndex of a zones file, reloaded when the file changes."""
+
+    def __init__(self, path, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._index = None  # loaded on first use
+        self._stamp = None
+        self._checked = None
+        self.reloads = 0
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self):
+        """Return the current index, reloading it first if the file changed."""
+        now = time.monotonic()
+        if self._checked is not None and now - self._checked < self.check_interval:
+            return self._index
+        with self._lock:
+            if self._checked is not None and now - self._checked < self.check_interval:
+                return self._index
+            self._checked = now
+            stamp = self._file_stamp()
+            if stamp != self._stamp or self._index is None:
+                self._reload(stamp)
+            return self._index
+
+    def _reload(self, stamp):
+        self._stamp = stamp
+        if stamp is None:
+            logger.warning("Zones file %s not found", self.path)
+            self._index = build_zone_index([])
+            return
+        try:
+            self._index = build_zone_index(load_zones(self.path), version=f"{stamp[0]}-{stamp[1]}")
+        except (OSError, ValueError, ValidationError) as e:
+            # json.JSONDecodeError is a ValueError; keep serving the last good index
+            logger.error("Could not load zones from %s: %s", self.path, e)
+            if self._index is None:
+                self._index = build_zone_index([])
+            return
+        self.reloads += 1
+        logger.info("Loaded %d zones from %s", len(self._index.zones), self.path)
+
+
+def init_zones(app):
+    """Create the app's ZoneStore from its configuration."""
+    store = ZoneStore(app.config['ZONES_PATH'], app.config.get('ZONES_CHECK_INTERVAL', 1.0))
+    app.extensions['zones'] = store
+    return store
+
+
+def get_zone_index():
+    """The current app's ZoneIndex."""
+    return current_app.extensions['zones'].get()
@@ -2,5 +2,7 @@
 import os
 from app import create_app
 
-# Get environment from FLASK_ENV environment variable, default to 'production'
+# Get environment from FLASK_ENV environment variable, default to 'production'.
+# With PRELOAD_REFERENCE_DATA=1 (see gunicorn.conf.py) the reference datasets
+# are loaded here, in the master process, before workers are forked.
 app = create_app(os.environ.get('FLASK_ENV', 'production'))
\ No newline at end of file